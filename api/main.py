@@ -16,7 +16,13 @@ from fastapi.exceptions import RequestValidationError
 import uvicorn
 
 from .routes import jobs, training, models
+from .websockets import progress
+from .services.progress_hub import progress_hub
 from .services.stats_reader import StatsReader
+from .services import db_pool
+from .services.job_runner import start_job_runner, stop_job_runner
+from src.utils.thumbnails import shutdown_thumbnail_service
+from src.utils.cache_system import get_cache_manager
 
 logger = logging.getLogger(__name__)
 
@@ -29,8 +35,9 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("AutoTrainX API starting up...")
     
-    # Test database connection
+    # Create the shared database pool and test the connection
     try:
+        await db_pool.init_pool()
         stats_reader = StatsReader()
         # Test connection with a simple query
         await stats_reader.get_job_statistics()
@@ -39,12 +46,28 @@ async def lifespan(app: FastAPI):
         logger.warning(f"Database connection test failed: {e}")
         logger.info("API will continue - stats may be unavailable")
     
+    # Listen for training progress published by trainer processes
+    try:
+        await progress_hub.start()
+    except OSError as e:
+        logger.warning(f"Progress hub unavailable: {e}")
+    
+    # Warm workers for CLI jobs (falls back to subprocesses if unavailable)
+    try:
+        await start_job_runner(training.cli_translator.base_path)
+    except Exception as e:
+        logger.warning(f"Job runner unavailable, using subprocesses: {e}")
+    
     logger.info("AutoTrainX API startup complete")
     
     yield
     
     # Shutdown
     logger.info("AutoTrainX API shutting down...")
+    progress_hub.stop()
+    await stop_job_runner()
+    await db_pool.close_pool()
+    shutdown_thumbnail_service()
     logger.info("AutoTrainX API shutdown complete")
 
 
@@ -113,6 +136,12 @@ def create_app() -> FastAPI:
         prefix="/api/v1/models",
         tags=["models"]
     )
+    
+    app.include_router(
+        progress.router,
+        prefix="/ws",
+        tags=["websockets"]
+    )
 
     # Exception handlers
     @app.exception_handler(RequestValidationError)
@@ -162,8 +191,8 @@ def create_app() -> FastAPI:
         # Check database connection
         db_status = "unhealthy"
         try:
-            stats = StatsReader()
-            await stats.get_job_statistics()
+            async with db_pool.acquire() as conn:
+                await conn.fetchval("SELECT 1")
             db_status = "healthy"
         except:
             pass
@@ -176,6 +205,8 @@ def create_app() -> FastAPI:
                 "cli_translator": cli_status,
                 "database_reader": db_status
             },
+            "database_pool": db_pool.get_pool_metrics(),
+            "cache": get_cache_manager().get_stats(),
             "version": "2.0.0",
             "mode": "cli_bridge"
         }
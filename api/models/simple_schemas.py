@@ -95,6 +95,8 @@ class JobsListResponse(BaseModel):
     total: int
     page: int
     page_size: int
+    next_cursor: Optional[str] = Field(None, description="Pass as `cursor` to get the next page")
+    total_is_estimate: bool = Field(False, description="Total comes from planner statistics")
 
 
 class RunningJobsResponse(BaseModel):
@@ -103,6 +105,16 @@ class RunningJobsResponse(BaseModel):
     count: int
 
 
+class TrainingMetricsResponse(BaseModel):
+    """Downsampled per-step training metrics of a job."""
+    job_id: str
+    method: str = Field(..., description="Downsampling method (lttb or minmax)")
+    total_points: int = Field(..., description="Steps recorded for the job")
+    series: Dict[str, List[List[float]]] = Field(
+        ..., description="[step, value] pairs per metric (loss, lr, it_per_sec)"
+    )
+
+
 class StatisticsResponse(BaseModel):
     """Response for statistics endpoint."""
     job_statistics: JobStatistics
@@ -18,6 +18,7 @@ from ..models.schemas import BaseResponse
 from ..dependencies import get_database_manager
 from ..exceptions import AutoTrainXAPIException
 from src.database.manager_v2 import DatabaseManager
+from src.database.pagination import count_rows, decode_cursor, encode_cursor
 
 logger = logging.getLogger(__name__)
 
@@ -154,16 +155,22 @@ async def get_table_schema(
 async def get_table_data(
     table_name: str = PathParam(..., description="Name of the table"),
     limit: Optional[int] = Query(100, ge=1, le=1000, description="Maximum number of rows to return"),
-    offset: Optional[int] = Query(0, ge=0, description="Number of rows to skip"),
+    offset: Optional[int] = Query(0, ge=0, description="Number of rows to skip (ignored when cursor is given)"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor"),
     db_manager: DatabaseManager = Depends(get_database_manager)
 ) -> BaseResponse:
     """
     Get data from a specific table with pagination.
     
+    Tables with a primary key are paged by key (keyset pagination): pass the
+    returned ``next_cursor`` to continue. On large tables ``total_rows`` is
+    a planner estimate (``total_is_estimate``).
+    
     Args:
         table_name: Name of the table to query
         limit: Maximum number of rows to return
         offset: Number of rows to skip
+        cursor: Cursor returned with the previous page
         
     Returns:
         BaseResponse with table data and row count
@@ -187,20 +194,46 @@ async def get_table_data(
                     error_code="INVALID_TABLE_NAME"
                 )
             
-            # Get total row count
-            count_query = text(f"SELECT COUNT(*) FROM {table_name}")
-            total_rows = session.execute(count_query).scalar()
+            # Get total row count (estimated on large tables)
+            total_rows, total_is_estimate = count_rows(session, db_manager.dialect, table_name)
             
             # Get column names
             columns = [col["name"] for col in inspector.get_columns(table_name)]
             
-            # Get data with pagination
-            data_query = text(f"SELECT * FROM {table_name} LIMIT :limit OFFSET :offset")
-            result = session.execute(data_query, {"limit": limit, "offset": offset})
+            # Get data with keyset pagination over the primary key when there is one
+            key_columns = inspector.get_pk_constraint(table_name).get("constrained_columns") or []
+            params = {"limit": limit + 1}
+            where_clause = ""
+            if cursor and key_columns:
+                try:
+                    key_values = decode_cursor(cursor)
+                except ValueError as e:
+                    raise AutoTrainXAPIException(message=str(e), error_code="INVALID_CURSOR")
+                if len(key_values) != len(key_columns):
+                    raise AutoTrainXAPIException(message="Cursor does not match this table",
+                                                 error_code="INVALID_CURSOR")
+                placeholders = ", ".join(f":key{i}" for i in range(len(key_columns)))
+                where_clause = f"WHERE ({', '.join(key_columns)}) > ({placeholders})"
+                params.update({f"key{i}": value for i, value in enumerate(key_values)})
+            
+            data_sql = f"SELECT * FROM {table_name} {where_clause}"
+            if key_columns:
+                data_sql += f" ORDER BY {', '.join(key_columns)}"
+            data_sql += " LIMIT :limit"
+            if offset and not cursor:
+                data_sql += " OFFSET :offset"
+                params["offset"] = offset
+            result = session.execute(text(data_sql), params).fetchall()
+            
+            next_cursor = None
+            if len(result) > limit and key_columns:
+                result = result[:limit]
+                last = result[-1]._mapping
+                next_cursor = encode_cursor([last[column] for column in key_columns])
             
             # Convert rows to dictionaries
             rows = []
-            for row in result:
+            for row in result[:limit]:
                 row_dict = {}
                 for i, col in enumerate(columns):
                     value = row[i]
@@ -220,8 +253,10 @@ async def get_table_data(
                     "columns": columns,
                     "rows": rows,
                     "total_rows": total_rows,
+                    "total_is_estimate": total_is_estimate,
                     "limit": limit,
-                    "offset": offset
+                    "offset": offset,
+                    "next_cursor": next_cursor
                 }
             )
             
@@ -17,8 +17,10 @@ from sqlalchemy.orm import Session
 
 from ..dependencies import get_pipeline_service
 from ..models.schemas import BaseResponse
-from ...src.database.factory import DatabaseFactory, DatabaseConfig
+from ...src.database.factory import DatabaseConfig
 from ...src.database.config import db_settings
+from ...src.database.engine_registry import get_engine_registry
+from ...src.utils.dataset_scanner import get_dataset_scanner
 
 logger = logging.getLogger(__name__)
 
@@ -86,15 +88,10 @@ class DatasetPathsDB:
                 db_url=db_url
             )
         
-        # Create engine
-        self.engine = DatabaseFactory.create_engine(self.config)
-        
-        # Create tables
-        Base.metadata.create_all(self.engine)
-        
-        # Create session factory
-        from sqlalchemy.orm import sessionmaker
-        self.SessionLocal = sessionmaker(bind=self.engine)
+        # Reuse the process-wide engine; tables are checked once per process
+        entry = get_engine_registry().acquire(self.config, Base.metadata, name='dataset_paths')
+        self.engine = entry.engine
+        self.SessionLocal = entry.session_factory
     
     def get_session(self) -> Session:
         """Get database session."""
@@ -121,59 +118,27 @@ def is_valid_dataset(path: Path) -> tuple[bool, int, int]:
     if not path.is_dir():
         return False, 0, 0
     
-    # Count images and captions
-    image_extensions = {'.jpg', '.jpeg', '.png', '.webp'}
-    images = []
-    captions = []
-    
-    for file in path.iterdir():
-        if file.is_file():
-            if file.suffix.lower() in image_extensions:
-                images.append(file)
-            elif file.suffix.lower() == '.txt':
-                captions.append(file)
+    listing = get_dataset_scanner().list_directory(path)
     
     # A valid dataset should have at least one image
-    is_valid = len(images) > 0
-    
-    return is_valid, len(images), len(captions)
+    return listing.has_images, listing.image_count, listing.caption_count
 
 
 def scan_directory_for_datasets(path: Path, max_depth: int = 3) -> List[DatasetInfo]:
     """
     Recursively scan a directory for datasets.
     """
-    datasets = []
-    
-    def scan_recursive(current_path: Path, depth: int = 0):
-        if depth > max_depth:
-            return
-        
-        try:
-            for item in current_path.iterdir():
-                if item.is_dir() and not item.name.startswith('.'):
-                    # Check if this directory is a dataset
-                    is_valid, image_count, caption_count = is_valid_dataset(item)
-                    
-                    if is_valid:
-                        datasets.append(DatasetInfo(
-                            name=item.name,
-                            path=str(item),
-                            image_count=image_count,
-                            caption_count=caption_count,
-                            has_valid_structure=True,
-                            parent_path=str(path)
-                        ))
-                    else:
-                        # If not a dataset, scan subdirectories
-                        scan_recursive(item, depth + 1)
-        except PermissionError:
-            logger.warning(f"Permission denied accessing: {current_path}")
-        except Exception as e:
-            logger.error(f"Error scanning {current_path}: {e}")
-    
-    scan_recursive(path)
-    return datasets
+    return [
+        DatasetInfo(
+            name=listing.name,
+            path=str(listing.path),
+            image_count=listing.image_count,
+            caption_count=listing.caption_count,
+            has_valid_structure=True,
+            parent_path=str(path)
+        )
+        for listing in get_dataset_scanner().scan(path, max_depth=max_depth)
+    ]
 
 
 @router.get(
@@ -6,12 +6,18 @@ including listing, viewing, preparing, and organizing datasets.
 """
 
 import logging
+import os
 from typing import Optional, List
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, Query, Path as PathParam, UploadFile, File, status
-from fastapi.responses import JSONResponse, FileResponse
-from PIL import Image
+from fastapi import APIRouter, Depends, Query, Path as PathParam, Request, UploadFile, File, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+
+from src.utils.dataset_index import get_dataset_index
+from src.utils.dataset_scanner import get_dataset_scanner
+from src.utils.cache_system import get_dataset_statistics
+from ..services.image_responses import image_response
 
 from ..models.schemas import (
     DatasetInfo, DatasetListResponse, DatasetPreparationRequest, DatasetPreparationResponse,
@@ -64,20 +70,19 @@ async def list_datasets(
         if input_path.exists():
             for dataset_dir in input_path.iterdir():
                 if dataset_dir.is_dir():
-                    # Count files
-                    image_count = len([f for f in dataset_dir.iterdir() 
-                                     if f.suffix.lower() in {'.jpg', '.jpeg', '.png', '.webp'}])
-                    text_count = len([f for f in dataset_dir.iterdir() 
-                                    if f.suffix.lower() == '.txt'])
+                    # Counts come from the cached dataset statistics
+                    stats = await run_in_threadpool(get_dataset_statistics, str(dataset_dir))
+                    if stats is None:
+                        continue
                     
                     datasets.append(DatasetInfo(
                         name=dataset_dir.name,  # Remove "(input)" suffix since we only show input datasets
                         path=str(dataset_dir),
-                        total_images=image_count,
-                        total_texts=text_count,
+                        total_images=stats["total_images"],
+                        total_texts=stats["total_texts"],
                         has_sample_prompts=False,
                         created_at=None,
-                        size_mb=None
+                        size_mb=stats["total_size_mb"]
                     ))
         
         # Apply pagination
@@ -131,17 +136,15 @@ async def get_dataset(
         # Only check input dataset - ignore prepared datasets
         input_path = Path(pipeline.base_path) / "workspace" / "input" / dataset_name
         if input_path.exists() and input_path.is_dir():
-            # Count files
-            image_count = len([f for f in input_path.iterdir() 
-                             if f.suffix.lower() in {'.jpg', '.jpeg', '.png', '.webp'}])
-            text_count = len([f for f in input_path.iterdir() 
-                            if f.suffix.lower() == '.txt'])
+            # Count files in one directory pass
+            scanner = get_dataset_scanner(str(pipeline.base_path))
+            listing = await run_in_threadpool(scanner.list_directory, input_path)
             
             return DatasetInfo(
                 name=dataset_name,  # Remove "(input)" suffix
                 path=str(input_path),
-                total_images=image_count,
-                total_texts=text_count,
+                total_images=listing.image_count,
+                total_texts=listing.caption_count,
                 has_sample_prompts=False,
                 created_at=None,
                 size_mb=None
@@ -212,12 +215,10 @@ async def prepare_dataset(
             )
         
         # Check for image files
-        image_files = list(source_path.glob("*.jpg")) + \
-                     list(source_path.glob("*.jpeg")) + \
-                     list(source_path.glob("*.png")) + \
-                     list(source_path.glob("*.webp"))
+        scanner = get_dataset_scanner(str(pipeline.base_path))
+        listing = await run_in_threadpool(scanner.list_directory, source_path)
         
-        if not image_files:
+        if not listing.has_images:
             raise DatasetPreparationError(
                 request.source_path,
                 "No image files found in source directory"
@@ -244,7 +245,7 @@ async def prepare_dataset(
                 dataset_name=dataset_name,
                 output_path=str(output_path),
                 stats={
-                    "total_images": len(image_files),
+                    "total_images": listing.image_count,
                     "repeats": request.repeats,
                     "class_name": request.class_name,
                     "successful_datasets": result.successful_datasets,
@@ -359,23 +360,46 @@ async def list_dataset_files(
             }
         }
         
-        # Scan training directory
+        # Scan training directory (images and captions come from the metadata index)
         training_dir = dataset_path / "img"
         if training_dir.exists():
             for subdir in training_dir.iterdir():
                 if subdir.is_dir():
-                    for file_path in subdir.iterdir():
-                        if file_path.is_file():
+                    index = await run_in_threadpool(get_dataset_index, subdir)
+                    indexed = set()
+                    for entry in index.images:
+                        indexed.add(entry['filename'])
+                        files_info["files"]["images"].append({
+                            "name": entry['filename'],
+                            "path": str(subdir / entry['filename']),
+                            "size": entry['size'],
+                            "modified": entry['mtime'],
+                            "width": entry['width'],
+                            "height": entry['height']
+                        })
+                        if entry['caption_hash'] is not None:
+                            caption_name = Path(entry['filename']).stem + '.txt'
+                            indexed.add(caption_name)
+                            files_info["files"]["texts"].append({
+                                "name": caption_name,
+                                "path": str(subdir / caption_name),
+                                "size": entry['caption_size'],
+                                "modified": entry['caption_mtime']
+                            })
+                    
+                    # Anything the index does not cover (orphan captions, other files)
+                    with os.scandir(subdir) as dir_entries:
+                        for dir_entry in dir_entries:
+                            if not dir_entry.is_file() or dir_entry.name in indexed:
+                                continue
+                            stat = dir_entry.stat()
                             file_info = {
-                                "name": file_path.name,
-                                "path": str(file_path),
-                                "size": file_path.stat().st_size,
-                                "modified": file_path.stat().st_mtime
+                                "name": dir_entry.name,
+                                "path": dir_entry.path,
+                                "size": stat.st_size,
+                                "modified": stat.st_mtime
                             }
-                            
-                            if file_path.suffix.lower() in {'.jpg', '.jpeg', '.png', '.webp'}:
-                                files_info["files"]["images"].append(file_info)
-                            elif file_path.suffix.lower() == '.txt':
+                            if dir_entry.name.lower().endswith('.txt'):
                                 files_info["files"]["texts"].append(file_info)
                             else:
                                 files_info["files"]["other"].append(file_info)
@@ -383,11 +407,12 @@ async def list_dataset_files(
         # Scan for config files
         if dataset_path.exists():
             for file_path in dataset_path.rglob("*.toml"):
+                stat = file_path.stat()
                 file_info = {
                     "name": file_path.name,
                     "path": str(file_path),
-                    "size": file_path.stat().st_size,
-                    "modified": file_path.stat().st_mtime
+                    "size": stat.st_size,
+                    "modified": stat.st_mtime
                 }
                 files_info["files"]["configs"].append(file_info)
         
@@ -442,91 +467,40 @@ async def get_dataset_details(
         if not input_path.exists() or not input_path.is_dir():
             raise DatasetNotFoundError(dataset_name)
         
-        # Analyze images and captions
-        images_info = []
-        stats = {
-            "min_width": float('inf'),
-            "max_width": 0,
-            "min_height": float('inf'),
-            "max_height": 0,
-            "total_width": 0,
-            "total_height": 0,
-            "total_size_mb": 0
-        }
-        
-        image_files = [f for f in input_path.iterdir() 
-                      if f.suffix.lower() in {'.jpg', '.jpeg', '.png', '.webp'}]
-        
-        for img_file in image_files:
-            try:
-                # Get image info
-                with Image.open(img_file) as img:
-                    width, height = img.size
-                
-                # Check for caption file
-                caption_file = img_file.with_suffix('.txt')
-                has_caption = caption_file.exists()
-                caption = ""
-                
-                if has_caption:
-                    with open(caption_file, 'r', encoding='utf-8') as f:
-                        caption = f.read().strip()
-                
-                # File size
-                size = img_file.stat().st_size
-                
-                # Update stats
-                stats["min_width"] = min(stats["min_width"], width)
-                stats["max_width"] = max(stats["max_width"], width)
-                stats["min_height"] = min(stats["min_height"], height)
-                stats["max_height"] = max(stats["max_height"], height)
-                stats["total_width"] += width
-                stats["total_height"] += height
-                stats["total_size_mb"] += size / (1024 * 1024)
-                
-                images_info.append({
-                    "filename": img_file.name,
-                    "path": str(img_file),
-                    "width": width,
-                    "height": height,
-                    "size": size,
-                    "has_caption": has_caption,
-                    "caption": caption if has_caption else None
-                })
-                
-            except Exception as e:
-                logger.error(f"Error processing image {img_file}: {e}")
-        
-        # Calculate averages
-        if images_info:
-            stats["avg_width"] = int(stats["total_width"] / len(images_info))
-            stats["avg_height"] = int(stats["total_height"] / len(images_info))
-        else:
-            stats["min_width"] = 0
-            stats["min_height"] = 0
-            stats["avg_width"] = 0
-            stats["avg_height"] = 0
-        
-        # Count captions
-        images_with_captions = sum(1 for img in images_info if img["has_caption"])
-        images_without_captions = len(images_info) - images_with_captions
+        # Images, resolutions and captions come from the metadata index,
+        # which only re-reads files whose (mtime, size) changed
+        index = await run_in_threadpool(get_dataset_index, input_path)
+        summary = index.summary()
+        
+        images_info = [
+            {
+                "filename": entry['filename'],
+                "path": str(input_path / entry['filename']),
+                "width": entry['width'],
+                "height": entry['height'],
+                "size": entry['size'],
+                "has_caption": entry['caption_hash'] is not None,
+                "caption": entry['caption']
+            }
+            for entry in index.images
+        ]
         
         return {
             "name": dataset_name,
             "path": str(input_path),
-            "total_images": len(images_info),
+            "total_images": summary["total_images"],
             "total_texts": len([f for f in input_path.glob("*.txt")]),
-            "images_with_captions": images_with_captions,
-            "images_without_captions": images_without_captions,
+            "images_with_captions": summary["images_with_captions"],
+            "images_without_captions": summary["images_without_captions"],
             "images": images_info,
             "stats": {
-                "min_width": stats["min_width"],
-                "max_width": stats["max_width"],
-                "min_height": stats["min_height"],
-                "max_height": stats["max_height"],
-                "avg_width": stats["avg_width"],
-                "avg_height": stats["avg_height"],
-                "total_size_mb": round(stats["total_size_mb"], 2)
+                "min_width": summary["min_width"],
+                "max_width": summary["max_width"],
+                "min_height": summary["min_height"],
+                "max_height": summary["max_height"],
+                "avg_width": summary["avg_width"],
+                "avg_height": summary["avg_height"],
+                "total_size_mb": summary["total_size_mb"]
             }
         }
         
@@ -543,11 +517,19 @@ async def get_dataset_details(
 @router.get(
     "/{dataset_name}/images/{image_name}",
     summary="Get dataset image",
-    description="Serve an image file from a dataset"
+    description="""
+    Serve an image file from a dataset.
+    
+    Pass `size` (128, 256 or 512) to get a cached WebP/JPEG thumbnail instead
+    of the original. Responses carry ETag and Cache-Control headers.
+    """
 )
 async def get_dataset_image(
+    request: Request,
     dataset_name: str = PathParam(..., description="Dataset name"),
     image_name: str = PathParam(..., description="Image filename"),
+    size: Optional[int] = Query(None, ge=1, le=4096, description="Thumbnail size (longest edge)"),
+    format: str = Query("webp", pattern="^(webp|jpeg)$", description="Thumbnail format"),
     pipeline = Depends(get_pipeline_service)
 ):
     """Serve an image from a dataset."""
@@ -571,11 +553,8 @@ async def get_dataset_image(
                 error_code="IMAGE_NOT_FOUND"
             )
         
-        # Serve the image
-        return FileResponse(
-            path=str(image_path),
-            media_type=f"image/{image_path.suffix[1:]}"  # Remove the dot from suffix
-        )
+        # Serve the image (or a cached thumbnail)
+        return await image_response(request, image_path, size, format)
         
     except AutoTrainXAPIException:
         raise
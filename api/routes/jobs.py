@@ -8,14 +8,18 @@ from the PostgreSQL database. No modifications are made - only SELECT queries.
 import logging
 from typing import Optional
 from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
 
 from ..models.simple_schemas import (
     JobInfo,
     JobsListResponse,
     RunningJobsResponse,
-    StatisticsResponse
+    StatisticsResponse,
+    TrainingMetricsResponse
 )
 from ..services.stats_reader import StatsReader
+from ..services.db_pool import get_pool_metrics
+from src.utils.downsampling import METHODS, downsample
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -53,36 +57,79 @@ async def get_job(job_id: str) -> JobInfo:
         )
 
 
+@router.get(
+    "/{job_id}/metrics",
+    response_model=TrainingMetricsResponse,
+    summary="Get training metrics of a job",
+    description="Per-step loss, learning rate and speed, downsampled to at most `points` points per series."
+)
+async def get_job_metrics(
+    job_id: str,
+    points: int = Query(500, ge=10, le=5000, description="Maximum points per series"),
+    method: str = Query("lttb", description="Downsampling method: lttb or minmax")
+) -> TrainingMetricsResponse:
+    """Get downsampled training metrics."""
+    if method not in METHODS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown method '{method}', expected one of: {', '.join(METHODS)}"
+        )
+    
+    rows = await stats_reader.get_training_metrics(job_id)
+    
+    def build_series():
+        series = {}
+        for metric in ('loss', 'lr', 'it_per_sec'):
+            values = [(row['step'], row[metric]) for row in rows if row[metric] is not None]
+            series[metric] = [list(point) for point in downsample(values, points, method)]
+        return series
+    
+    # Downsampling a long run is CPU work; keep it off the event loop
+    series = await run_in_threadpool(build_series)
+    return TrainingMetricsResponse(job_id=job_id, method=method, total_points=len(rows), series=series)
+
+
 @router.get(
     "",
     response_model=JobsListResponse,
     summary="List jobs with pagination and filtering",
-    description="Get a paginated list of jobs with optional filtering by status and mode."
+    description=(
+        "Get a page of jobs, newest first, with optional filtering by status and mode. "
+        "Follow `next_cursor` for further pages; `page` still works but gets slower on deep pages. "
+        "On large tables `total` is an estimate."
+    )
 )
 async def list_jobs(
-    page: int = Query(1, ge=1, description="Page number"),
+    page: int = Query(1, ge=1, description="Page number (ignored when cursor is given)"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
     status: Optional[str] = Query(None, description="Filter by job status"),
-    mode: Optional[str] = Query(None, description="Filter by pipeline mode")
+    mode: Optional[str] = Query(None, description="Filter by pipeline mode"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor")
 ) -> JobsListResponse:
     """List jobs with pagination."""
     try:
-        offset = (page - 1) * page_size
+        offset = 0 if cursor else (page - 1) * page_size
         
-        jobs, total = await stats_reader.get_jobs_list(
+        jobs, total, next_cursor, estimated = await stats_reader.get_jobs_list(
             limit=page_size,
             offset=offset,
             status=status,
-            mode=mode
+            mode=mode,
+            cursor=cursor
         )
         
         return JobsListResponse(
             jobs=[JobInfo(**job) for job in jobs],
             total=total,
             page=page,
-            page_size=page_size
+            page_size=page_size,
+            next_cursor=next_cursor,
+            total_is_estimate=estimated
         )
         
+    except ValueError as e:
+        # The status query parameter shadows fastapi.status here
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to list jobs: {e}")
         raise HTTPException(
@@ -156,11 +203,13 @@ async def health_check():
         return {
             "status": "healthy",
             "message": "Database connection is working",
-            "total_jobs": job_stats.get("total_jobs", 0)
+            "total_jobs": job_stats.get("total_jobs", 0),
+            "pool": get_pool_metrics()
         }
         
     except Exception as e:
         return {
             "status": "unhealthy",
-            "message": f"Database connection failed: {str(e)}"
+            "message": f"Database connection failed: {str(e)}",
+            "pool": get_pool_metrics()
         }
\ No newline at end of file
@@ -4,18 +4,21 @@ Models routes - Manage model paths and browse trained models.
 These routes provide access to model information stored in PostgreSQL.
 """
 
+import asyncio
 import logging
 import os
 import json
-from typing import List, Optional
-from datetime import datetime
-from fastapi import APIRouter, HTTPException, status
-from fastapi.responses import FileResponse
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timezone
+from fastapi import APIRouter, HTTPException, Query, Request, status
 from pydantic import BaseModel
 import asyncpg
 from uuid import uuid4
 
-import os
+from ..services.db_pool import acquire, get_pool_metrics
+from ..services.image_responses import image_response
+from src.utils.cache_system import get_model_info
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -59,32 +62,201 @@ class ScanResponse(BaseModel):
     success: bool
     models_found: int
     message: str
+    models_updated: int = 0
+    models_removed: int = 0
+
+
+MODEL_EXTENSIONS = ('.safetensors', '.ckpt', '.pt', '.pth')
+PREVIEW_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp')
+
+UPSERT_MODEL_QUERY = """
+    INSERT INTO models (id, name, path, type, size,
+                        created_at, modified_at, path_id,
+                        has_preview, preview_images)
+    VALUES ($1, $2, $3, $4, $5::bigint, $6, $7, $8, $9, $10)
+    ON CONFLICT (path) DO UPDATE SET
+        name = EXCLUDED.name,
+        type = EXCLUDED.type,
+        size = EXCLUDED.size,
+        modified_at = EXCLUDED.modified_at,
+        path_id = EXCLUDED.path_id,
+        has_preview = EXCLUDED.has_preview,
+        preview_images = EXCLUDED.preview_images
+"""
 
 
-async def get_connection():
-    """Get database connection."""
-    # Get database configuration from environment variables
-    return await asyncpg.connect(
-        host=os.getenv('AUTOTRAINX_DB_HOST', 'localhost'),
-        port=int(os.getenv('AUTOTRAINX_DB_PORT', '5432')),
-        user=os.getenv('AUTOTRAINX_DB_USER', 'autotrainx'),
-        password=os.getenv('AUTOTRAINX_DB_PASSWORD', '1234'),
-        database=os.getenv('AUTOTRAINX_DB_NAME', 'autotrainx')
+def _list_preview_images(model_dir: str) -> List[str]:
+    """List preview images in a model directory's Preview folder."""
+    try:
+        with os.scandir(os.path.join(model_dir, 'Preview')) as entries:
+            return sorted(
+                entry.name for entry in entries
+                if entry.is_file() and entry.name.lower().endswith(PREVIEW_EXTENSIONS)
+            )
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
+
+def _collect_model_files(root_path: str) -> Dict[str, Dict]:
+    """
+    Walk a model directory once and collect model file candidates.
+    
+    Args:
+        root_path: Directory to scan
+        
+    Returns:
+        Dictionary mapping file path to its name, type, size, timestamps
+        and preview images
+    """
+    candidates = {}
+    pending = [root_path]
+    
+    while pending:
+        current = pending.pop()
+        model_entries = []
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.name.endswith(MODEL_EXTENSIONS):
+                        model_entries.append(entry)
+        except OSError as e:
+            logger.warning(f"Skipping unreadable directory {current}: {e}")
+            continue
+        
+        if not model_entries:
+            continue
+        
+        # Preview folder is shared by every model in the directory
+        preview_images = _list_preview_images(current)
+        for entry in model_entries:
+            stat = entry.stat()
+            candidates[entry.path] = {
+                'name': entry.name,
+                'type': entry.name.split('.')[-1],
+                'size': stat.st_size,
+                'mtime': stat.st_mtime,
+                'created_at': datetime.fromtimestamp(stat.st_ctime, tz=timezone.utc),
+                'modified_at': datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
+                'preview_images': preview_images,
+            }
+    
+    return candidates
+
+
+def _load_preview_images(value) -> List[str]:
+    """Decode a preview_images column value into a list."""
+    if value and isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return []
+    return value or []
+
+
+def _model_changed(existing: asyncpg.Record, candidate: Dict, path_id: str) -> bool:
+    """Check whether a stored model row differs from the file on disk."""
+    modified_at = existing['modified_at']
+    return (
+        existing['size'] != candidate['size']
+        or existing['path_id'] != path_id
+        or modified_at is None
+        or abs(modified_at.timestamp() - candidate['mtime']) > 0.001
+        or _load_preview_images(existing['preview_images']) != candidate['preview_images']
     )
 
 
+def _plan_model_upserts(existing: Dict[str, asyncpg.Record], candidates: Dict[str, Dict],
+                        path_id: str) -> Tuple[List[tuple], int, int]:
+    """
+    Work out which scanned files need a row written.
+    
+    Args:
+        existing: Stored rows of the scanned files, by path
+        candidates: Files found on disk (see _collect_model_files)
+        path_id: Model path the files belong to
+        
+    Returns:
+        Tuple of (UPSERT_MODEL_QUERY records, new models, changed models)
+    """
+    records = []
+    models_found = 0
+    models_updated = 0
+    for file_path, candidate in candidates.items():
+        row = existing.get(file_path)
+        if row is None:
+            models_found += 1
+        elif _model_changed(row, candidate, path_id):
+            models_updated += 1
+        else:
+            continue
+        
+        preview_images = candidate['preview_images']
+        records.append((
+            str(uuid4())[:8], candidate['name'], file_path, candidate['type'],
+            candidate['size'], candidate['created_at'], candidate['modified_at'],
+            path_id, bool(preview_images),
+            json.dumps(preview_images) if preview_images else None
+        ))
+    return records, models_found, models_updated
+
+
+async def _sync_model_rows(conn: asyncpg.Connection, path_id: str,
+                           candidates: Dict[str, Dict]) -> Tuple[int, int, int]:
+    """
+    Bring the stored rows of a model path in line with the files found on disk.
+    
+    Args:
+        conn: Database connection
+        path_id: Scanned model path
+        candidates: Files found on disk (see _collect_model_files)
+        
+    Returns:
+        Tuple of (new, changed, removed) model counts
+    """
+    candidate_paths = list(candidates)
+    
+    # Diff against stored rows in one round trip
+    existing_rows = await conn.fetch("""
+        SELECT path, size, modified_at, path_id, preview_images
+        FROM models
+        WHERE path = ANY($1::text[])
+    """, candidate_paths)
+    records, models_found, models_updated = _plan_model_upserts(
+        {row['path']: row for row in existing_rows}, candidates, path_id)
+    
+    async with conn.transaction():
+        if records:
+            await conn.executemany(UPSERT_MODEL_QUERY, records)
+        
+        # Prune rows whose file has disappeared
+        removed = await conn.execute("""
+            DELETE FROM models
+            WHERE path_id = $1 AND NOT (path = ANY($2::text[]))
+        """, path_id, candidate_paths)
+        models_removed = int(removed.split()[-1])
+        
+        await conn.execute("""
+            UPDATE model_paths 
+            SET last_scan = $1,
+                model_count = (SELECT COUNT(*) FROM models WHERE path_id = $2)
+            WHERE id = $2
+        """, datetime.now(), path_id)
+    
+    return models_found, models_updated, models_removed
+
+
 @router.get("/paths", response_model=ModelPathsResponse)
 async def get_model_paths():
     """Get all registered model paths."""
-    conn = None
     try:
-        conn = await get_connection()
-        
-        rows = await conn.fetch("""
-            SELECT id, path, added_at, last_scan, model_count
-            FROM model_paths
-            ORDER BY path
-        """)
+        async with acquire() as conn:
+            rows = await conn.fetch("""
+                SELECT id, path, added_at, last_scan, model_count
+                FROM model_paths
+                ORDER BY path
+            """)
         
         paths = [
             ModelPath(
@@ -105,15 +277,11 @@ async def get_model_paths():
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve model paths: {str(e)}"
         )
-    finally:
-        if conn:
-            await conn.close()
 
 
 @router.post("/paths", response_model=ModelPath)
 async def add_model_path(request: AddPathRequest):
     """Add a new model path to monitor."""
-    conn = None
     try:
         # Validate path exists
         if not os.path.exists(request.path):
@@ -128,17 +296,16 @@ async def add_model_path(request: AddPathRequest):
                 detail=f"Path is not a directory: {request.path}"
             )
         
-        conn = await get_connection()
-        
         # Generate ID
         path_id = str(uuid4())[:8]
         
         # Insert path
         try:
-            await conn.execute("""
-                INSERT INTO model_paths (id, path, added_at, model_count)
-                VALUES ($1, $2, $3, 0)
-            """, path_id, request.path, datetime.now())
+            async with acquire() as conn:
+                await conn.execute("""
+                    INSERT INTO model_paths (id, path, added_at, model_count)
+                    VALUES ($1, $2, $3, 0)
+                """, path_id, request.path, datetime.now())
         except asyncpg.UniqueViolationError:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
@@ -161,23 +328,19 @@ async def add_model_path(request: AddPathRequest):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to add model path: {str(e)}"
         )
-    finally:
-        if conn:
-            await conn.close()
 
 
 @router.delete("/paths/{path_id}")
 async def remove_model_path(path_id: str):
     """Remove a model path."""
-    conn = None
     try:
-        conn = await get_connection()
-        
-        # Delete associated models first
-        await conn.execute("DELETE FROM models WHERE path_id = $1", path_id)
-        
-        # Delete path
-        result = await conn.execute("DELETE FROM model_paths WHERE id = $1", path_id)
+        async with acquire() as conn:
+            async with conn.transaction():
+                # Delete associated models first
+                await conn.execute("DELETE FROM models WHERE path_id = $1", path_id)
+                
+                # Delete path
+                result = await conn.execute("DELETE FROM model_paths WHERE id = $1", path_id)
         
         if result.split()[-1] == '0':
             raise HTTPException(
@@ -195,24 +358,19 @@ async def remove_model_path(path_id: str):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to remove model path: {str(e)}"
         )
-    finally:
-        if conn:
-            await conn.close()
 
 
 @router.get("", response_model=ModelsResponse)
 async def get_models():
     """Get all models from registered paths."""
-    conn = None
     try:
-        conn = await get_connection()
-        
-        rows = await conn.fetch("""
-            SELECT id, name, path, type, size, created_at, modified_at,
-                   has_preview, preview_images, model_metadata
-            FROM models
-            ORDER BY modified_at DESC
-        """)
+        async with acquire() as conn:
+            rows = await conn.fetch("""
+                SELECT id, name, path, type, size, created_at, modified_at,
+                       has_preview, preview_images, model_metadata
+                FROM models
+                ORDER BY modified_at DESC
+            """)
         
         models = []
         for row in rows:
@@ -254,15 +412,19 @@ async def get_models():
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve models: {str(e)}"
         )
-    finally:
-        if conn:
-            await conn.close()
 
 
 @router.post("/scan", response_model=ScanResponse)
 async def scan_for_models(request: AddPathRequest):
-    """Scan a path for models and update the database."""
-    conn = None
+    """
+    Scan a path for models and update the database.
+    
+    The directory is walked once off the event loop, diffed against stored
+    rows with a single query, and new or changed rows are written with one
+    batched upsert. Rows whose file has disappeared are pruned. No pooled
+    connection is held during the walk, which can be slow on large or
+    network model roots.
+    """
     try:
         if not os.path.exists(request.path):
             raise HTTPException(
@@ -270,13 +432,11 @@ async def scan_for_models(request: AddPathRequest):
                 detail=f"Path does not exist: {request.path}"
             )
         
-        conn = await get_connection()
-        
-        # Get path ID
-        path_row = await conn.fetchrow(
-            "SELECT id FROM model_paths WHERE path = $1",
-            request.path
-        )
+        async with acquire() as conn:
+            path_row = await conn.fetchrow(
+                "SELECT id FROM model_paths WHERE path = $1",
+                request.path
+            )
         
         if not path_row:
             raise HTTPException(
@@ -286,98 +446,20 @@ async def scan_for_models(request: AddPathRequest):
         
         path_id = path_row['id']
         
-        # Scan for model files
-        model_extensions = ['.safetensors', '.ckpt', '.pt', '.pth']
-        models_found = 0
-        
-        for root, dirs, files in os.walk(request.path):
-            for file in files:
-                if any(file.endswith(ext) for ext in model_extensions):
-                    file_path = os.path.join(root, file)
-                    
-                    # Get file info
-                    stat = os.stat(file_path)
-                    
-                    # Generate model ID
-                    model_id = str(uuid4())[:8]
-                    
-                    # Check if model already exists
-                    existing = await conn.fetchval(
-                        "SELECT id FROM models WHERE path = $1",
-                        file_path
-                    )
-                    
-                    if not existing:
-                        # Check for preview images
-                        model_dir = os.path.dirname(file_path)
-                        preview_dir = os.path.join(model_dir, 'Preview')
-                        preview_images = []
-                        has_preview = False
-                        
-                        if os.path.exists(preview_dir) and os.path.isdir(preview_dir):
-                            # Look for image files in Preview directory
-                            image_extensions = ['.png', '.jpg', '.jpeg', '.webp']
-                            for preview_file in os.listdir(preview_dir):
-                                if any(preview_file.lower().endswith(ext) for ext in image_extensions):
-                                    preview_images.append(preview_file)
-                            
-                            if preview_images:
-                                has_preview = True
-                        
-                        # Insert new model
-                        await conn.execute("""
-                            INSERT INTO models (id, name, path, type, size, 
-                                              created_at, modified_at, path_id,
-                                              has_preview, preview_images)
-                            VALUES ($1, $2, $3, $4, $5::bigint, $6, $7, $8, $9, $10)
-                        """, model_id, file, file_path, 
-                            file.split('.')[-1], stat.st_size,
-                            datetime.fromtimestamp(stat.st_ctime),
-                            datetime.fromtimestamp(stat.st_mtime),
-                            path_id, has_preview, 
-                            json.dumps(preview_images) if preview_images else None)
-                        
-                        models_found += 1
-                    else:
-                        # Update existing model with preview info if needed
-                        model_dir = os.path.dirname(file_path)
-                        preview_dir = os.path.join(model_dir, 'Preview')
-                        preview_images = []
-                        has_preview = False
-                        
-                        if os.path.exists(preview_dir) and os.path.isdir(preview_dir):
-                            image_extensions = ['.png', '.jpg', '.jpeg', '.webp']
-                            for preview_file in os.listdir(preview_dir):
-                                if any(preview_file.lower().endswith(ext) for ext in image_extensions):
-                                    preview_images.append(preview_file)
-                            
-                            if preview_images:
-                                has_preview = True
-                        
-                        await conn.execute("""
-                            UPDATE models 
-                            SET has_preview = $1, preview_images = $2
-                            WHERE path = $3
-                        """, has_preview, 
-                            json.dumps(preview_images) if preview_images else None,
-                            file_path)
-        
-        # Update path scan info with total count
-        total_count = await conn.fetchval(
-            "SELECT COUNT(*) FROM models WHERE path_id = $1",
-            path_id
-        )
+        # Scan for model files without blocking the event loop
+        loop = asyncio.get_running_loop()
+        candidates = await loop.run_in_executor(None, _collect_model_files, request.path)
         
-        await conn.execute("""
-            UPDATE model_paths 
-            SET last_scan = $1, model_count = $2
-            WHERE id = $3
-        """, datetime.now(), total_count, path_id)
+        async with acquire() as conn:
+            models_found, models_updated, models_removed = await _sync_model_rows(
+                conn, path_id, candidates)
         
         return ScanResponse(
             success=True,
             models_found=models_found,
-            message=f"Found {models_found} new models"
+            models_updated=models_updated,
+            models_removed=models_removed,
+            message=f"Found {models_found} new models, updated {models_updated}, removed {models_removed}"
         )
         
     except HTTPException:
@@ -388,23 +470,61 @@ async def scan_for_models(request: AddPathRequest):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to scan for models: {str(e)}"
         )
-    finally:
-        if conn:
-            await conn.close()
 
 
-@router.get("/{model_id}/preview/{image_name}")
-async def get_model_preview(model_id: str, image_name: str):
-    """Get a preview image for a model."""
-    conn = None
+@router.get("/{model_id}/info")
+async def get_model_file_info(model_id: str):
+    """
+    Get a model file's size, timestamps and embedded training metadata.
+    
+    The safetensors header is read once per file version and then served
+    from the cache.
+    """
     try:
-        conn = await get_connection()
+        async with acquire() as conn:
+            model = await conn.fetchrow("SELECT path FROM models WHERE id = $1", model_id)
         
-        # Get model info
-        model = await conn.fetchrow(
-            "SELECT path, preview_images FROM models WHERE id = $1",
-            model_id
+        if not model:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Model not found: {model_id}"
+            )
+        
+        loop = asyncio.get_running_loop()
+        info = await loop.run_in_executor(None, get_model_info, model['path'])
+        if info is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Model file not found: {model['path']}"
+            )
+        return info
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to get model info: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve model info: {str(e)}"
         )
+
+
+@router.get("/{model_id}/preview/{image_name}")
+async def get_model_preview(
+    request: Request,
+    model_id: str,
+    image_name: str,
+    size: Optional[int] = Query(None, ge=1, le=4096, description="Thumbnail size (longest edge)"),
+    format: str = Query("webp", pattern="^(webp|jpeg)$", description="Thumbnail format")
+):
+    """Get a preview image (or a cached thumbnail of it) for a model."""
+    try:
+        # Get model info
+        async with acquire() as conn:
+            model = await conn.fetchrow(
+                "SELECT path, preview_images FROM models WHERE id = $1",
+                model_id
+            )
         
         if not model:
             raise HTTPException(
@@ -436,11 +556,8 @@ async def get_model_preview(model_id: str, image_name: str):
                 detail=f"Image file not found: {image_path}"
             )
         
-        # Return the image file
-        return FileResponse(
-            image_path,
-            media_type=f"image/{image_name.split('.')[-1].lower()}"
-        )
+        # Return the image file (or a cached thumbnail)
+        return await image_response(request, Path(image_path), size, format)
         
     except HTTPException:
         raise
@@ -450,22 +567,19 @@ async def get_model_preview(model_id: str, image_name: str):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve preview image: {str(e)}"
         )
-    finally:
-        if conn:
-            await conn.close()
 
 
 @router.get("/health")
 async def health_check():
     """Check if models service is healthy."""
     try:
-        conn = await get_connection()
-        await conn.fetchval("SELECT 1")
-        await conn.close()
+        async with acquire() as conn:
+            await conn.fetchval("SELECT 1")
         
         return {
             "status": "healthy",
-            "message": "Models service is working"
+            "message": "Models service is working",
+            "pool": get_pool_metrics()
         }
     except Exception as e:
         return {
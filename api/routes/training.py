@@ -15,6 +15,7 @@ from ..models.simple_schemas import (
     TrainingResponse
 )
 from ..services.cli_translator import CLITranslator
+from ..services.job_runner import get_job_runner
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -137,6 +138,24 @@ async def variations_training(request: VariationsTrainingRequest) -> TrainingRes
         )
 
 
+@router.get(
+    "/queue/{queue_id}",
+    summary="Get a queued CLI job",
+    description="Returns the status, exit code, output tail and log files of a job run by the job runner."
+)
+async def get_queued_job(queue_id: str):
+    """Get a job runner queue entry."""
+    for runner in (get_job_runner(training=True), get_job_runner()):
+        job = runner.queue.get(queue_id) if runner else None
+        if job is not None:
+            job['stdout_log'], job['stderr_log'] = map(str, runner.log_paths(queue_id))
+            return job
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Queued job {queue_id} not found"
+    )
+
+
 @router.get(
     "/health",
     summary="Check if training service is available",
@@ -152,10 +171,14 @@ async def health_check():
                 "message": "main.py not found"
             }
         
+        runner = get_job_runner()
+        training_runner = get_job_runner(training=True)
         return {
             "status": "healthy",
             "message": "Training service is ready",
-            "cli_path": str(cli_translator.main_script)
+            "cli_path": str(cli_translator.main_script),
+            "job_runner": runner.get_stats() if runner else None,
+            "training_runner": training_runner.get_stats() if training_runner else None
         }
         
     except Exception as e:
@@ -1,14 +1,29 @@
 """
 File upload endpoints for datasets.
+
+Uploads are streamed in fixed-size chunks into a staging directory under
+``workspace/.uploads`` off the event loop, several files at a time, hashed
+while they are written, and moved into ``workspace/input/<dataset>`` with a
+single atomic rename once every file has been verified.
+
+Large files can also be sent with the resumable chunk endpoints:
+``PUT /dataset/{name}/files/{filename}?offset=N`` appends a chunk,
+``GET /dataset/{name}/files/{filename}`` reports how much was received and
+``POST /dataset/{name}/commit`` verifies checksums and publishes the dataset.
 """
 
+import asyncio
+import hashlib
+import json
 import os
 import shutil
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional
+from uuid import uuid4
 import logging
 
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, status, Depends
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Request, Query, status, Depends
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 
 from ..dependencies import get_pipeline_service
@@ -18,6 +33,130 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+CHUNK_SIZE = 1024 * 1024
+UPLOAD_CONCURRENCY = 4
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp'}
+ALLOWED_EXTENSIONS = IMAGE_EXTENSIONS | {'.txt'}
+
+
+def _validate_dataset_name(dataset_name: str) -> None:
+    if not dataset_name or "/" in dataset_name or "\\" in dataset_name or " " in dataset_name \
+            or dataset_name.startswith("."):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid dataset name. Use only letters, numbers, hyphens and underscores."
+        )
+
+
+def _validate_filename(filename: str) -> str:
+    """Strip directory components and check the extension."""
+    name = Path(filename.replace("\\", "/")).name
+    if not name or name.startswith("."):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid file name: {filename}"
+        )
+    file_ext = Path(name).suffix.lower()
+    if file_ext not in ALLOWED_EXTENSIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File type '{file_ext}' not allowed. Allowed types: {', '.join(sorted(ALLOWED_EXTENSIONS))}"
+        )
+    return name
+
+
+def _reject_duplicates(names: List[str]) -> None:
+    """Reject uploads where two files would be written to the same path."""
+    seen = set()
+    duplicates = sorted({name for name in names if name in seen or seen.add(name)})
+    if duplicates:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Duplicate file names in upload: {', '.join(duplicates)}"
+        )
+
+
+def _parse_checksums(checksums: Optional[str]) -> Dict[str, str]:
+    if not checksums:
+        return {}
+    try:
+        parsed = json.loads(checksums)
+    except ValueError:
+        parsed = None
+    if not isinstance(parsed, dict):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="checksums must be a JSON object mapping file name to SHA-256 hex digest"
+        )
+    return {Path(name).name: str(digest).lower() for name, digest in parsed.items()}
+
+
+def _copy_stream(source, destination: Path) -> Dict:
+    """Copy a file object to disk in chunks, hashing as it goes (runs in a worker thread)."""
+    sha256 = hashlib.sha256()
+    size = 0
+    with open(destination, "wb") as out:
+        while True:
+            chunk = source.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            sha256.update(chunk)
+            out.write(chunk)
+            size += len(chunk)
+    return {"size": size, "sha256": sha256.hexdigest()}
+
+
+def _hash_file(path: Path) -> str:
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def _verify_checksums(received: Dict[str, Dict], expected: Dict[str, str]) -> None:
+    mismatched = [
+        name for name, digest in expected.items()
+        if name not in received or received[name]["sha256"] != digest
+    ]
+    if mismatched:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Checksum verification failed for: {', '.join(sorted(mismatched))}"
+        )
+
+
+def _publish(staging_dir: Path, target_dir: Path) -> None:
+    """Atomically move a fully written staging directory into place."""
+    if target_dir.exists():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Dataset '{target_dir.name}' already exists"
+        )
+    target_dir.parent.mkdir(parents=True, exist_ok=True)
+    os.rename(staging_dir, target_dir)
+
+
+def _upload_summary(dataset_name: str, target_dir: Path, base_path: Path,
+                    received: Dict[str, Dict]) -> BaseResponse:
+    image_files = [f for f in received if Path(f).suffix.lower() in IMAGE_EXTENSIONS]
+    text_files = [f for f in received if Path(f).suffix.lower() == '.txt']
+    
+    logger.info(f"Successfully uploaded {len(received)} files to {target_dir}")
+    
+    return BaseResponse(
+        success=True,
+        message=f"Successfully uploaded {len(received)} files",
+        data={
+            "dataset_name": dataset_name,
+            "path": str(target_dir.relative_to(base_path)),
+            "file_count": len(received),
+            "image_count": len(image_files),
+            "caption_count": len(text_files),
+            "checksums": {name: info["sha256"] for name, info in received.items()}
+        }
+    )
+
 
 @router.post(
     "/dataset",
@@ -29,26 +168,26 @@ router = APIRouter()
     
     Files are saved to workspace/input/{dataset_name}/
     Supports images (jpg, jpeg, png, webp) and text files (txt).
+    
+    Optionally pass `checksums` as a JSON object mapping file names to
+    SHA-256 hex digests; the upload is rejected if any file does not match.
     """
 )
 async def upload_dataset_files(
     dataset_name: str = Form(..., description="Name of the dataset"),
     files: List[UploadFile] = File(..., description="Files to upload"),
+    checksums: Optional[str] = Form(None, description="JSON object of file name to SHA-256"),
     pipeline = Depends(get_pipeline_service)
 ) -> BaseResponse:
     """Upload dataset files."""
     
     logger.info(f"Received upload request for dataset: {dataset_name} with {len(files)} files")
     
+    staging_dir = None
     try:
-        # Validate dataset name
-        if not dataset_name or "/" in dataset_name or "\\" in dataset_name or " " in dataset_name:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid dataset name. Use only letters, numbers, hyphens and underscores."
-            )
+        _validate_dataset_name(dataset_name)
+        expected = _parse_checksums(checksums)
         
-        # Create target directory
         base_path = Path(pipeline.base_path)
         target_dir = base_path / "workspace" / "input" / dataset_name
         
@@ -59,71 +198,160 @@ async def upload_dataset_files(
                 detail=f"Dataset '{dataset_name}' already exists"
             )
         
-        # Create directory
-        target_dir.mkdir(parents=True, exist_ok=True)
-        logger.info(f"Created directory: {target_dir}")
+        # Validate every file name before writing anything
+        named_files = [(_validate_filename(file.filename), file) for file in files if file.filename]
+        _reject_duplicates([name for name, _ in named_files])
         
-        uploaded_files = []
+        # Stage on the same filesystem so publishing is a single rename
+        staging_dir = base_path / "workspace" / ".uploads" / f"{dataset_name}-{uuid4().hex[:8]}"
+        staging_dir.mkdir(parents=True)
         
-        for file in files:
-            if not file.filename:
-                continue
-                
-            # Validate file type
-            file_ext = Path(file.filename).suffix.lower()
-            allowed_extensions = {'.jpg', '.jpeg', '.png', '.webp', '.txt'}
-            
-            if file_ext not in allowed_extensions:
-                # Clean up and raise error
-                shutil.rmtree(target_dir)
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"File type '{file_ext}' not allowed. Allowed types: {', '.join(allowed_extensions)}"
-                )
-            
-            # Save file
-            file_path = target_dir / file.filename
-            
-            with open(file_path, "wb") as buffer:
-                content = await file.read()
-                buffer.write(content)
-            
-            uploaded_files.append(file.filename)
-            logger.info(f"Uploaded file: {file_path}")
+        semaphore = asyncio.Semaphore(UPLOAD_CONCURRENCY)
         
-        # Validate that we have both images and captions
-        image_files = [f for f in uploaded_files if Path(f).suffix.lower() in {'.jpg', '.jpeg', '.png', '.webp'}]
-        text_files = [f for f in uploaded_files if Path(f).suffix.lower() == '.txt']
+        async def save(name: str, file: UploadFile) -> Dict:
+            async with semaphore:
+                return await run_in_threadpool(_copy_stream, file.file, staging_dir / name)
         
-        logger.info(f"Successfully uploaded {len(uploaded_files)} files to {target_dir}")
+        results = await asyncio.gather(*(save(name, file) for name, file in named_files))
+        received = {name: info for (name, _), info in zip(named_files, results)}
         
-        return BaseResponse(
-            success=True,
-            message=f"Successfully uploaded {len(uploaded_files)} files",
-            data={
-                "dataset_name": dataset_name,
-                "path": str(target_dir.relative_to(base_path)),
-                "file_count": len(uploaded_files),
-                "image_count": len(image_files),
-                "caption_count": len(text_files)
-            }
-        )
+        _verify_checksums(received, expected)
+        _publish(staging_dir, target_dir)
+        staging_dir = None
+        
+        return _upload_summary(dataset_name, target_dir, base_path, received)
         
     except HTTPException:
         raise
     except Exception as e:
-        # Clean up on error
-        if 'target_dir' in locals() and target_dir.exists():
-            try:
-                shutil.rmtree(target_dir)
-            except:
-                pass
-        
         logger.error(f"Failed to upload dataset: {str(e)}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to upload dataset: {str(e)}"
         )
+    finally:
+        # Nothing reaches workspace/input unless the whole upload succeeded
+        if staging_dir is not None:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+def _resumable_dir(pipeline, dataset_name: str) -> Path:
+    return Path(pipeline.base_path) / "workspace" / ".uploads" / f"{dataset_name}.resumable"
+
+
+def _append_chunk(part_path: Path, offset: int, chunks: List[bytes]) -> int:
+    """Append chunks to a partial file at the given offset (runs in a worker thread)."""
+    current = part_path.stat().st_size if part_path.exists() else 0
+    if offset != current:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Offset mismatch: expected {current}, got {offset}"
+        )
+    with open(part_path, "ab") as out:
+        for chunk in chunks:
+            out.write(chunk)
+    return current + sum(len(chunk) for chunk in chunks)
+
+
+@router.put(
+    "/dataset/{dataset_name}/files/{filename}",
+    summary="Upload a chunk of a dataset file",
+    description="""
+    Append the request body to a partially uploaded file.
+    
+    `offset` must equal the number of bytes already received (see the GET
+    endpoint), so interrupted uploads can resume where they stopped.
+    """
+)
+async def upload_file_chunk(
+    request: Request,
+    dataset_name: str,
+    filename: str,
+    offset: int = Query(0, ge=0, description="Byte offset of this chunk"),
+    pipeline = Depends(get_pipeline_service)
+) -> dict:
+    """Append a chunk to a resumable upload."""
+    _validate_dataset_name(dataset_name)
+    name = _validate_filename(filename)
+    
+    upload_dir = _resumable_dir(pipeline, dataset_name)
+    upload_dir.mkdir(parents=True, exist_ok=True)
+    part_path = upload_dir / name
+    
+    # Buffer at most CHUNK_SIZE bytes before handing them to a worker thread
+    received = offset
+    pending: List[bytes] = []
+    pending_size = 0
+    async for data in request.stream():
+        pending.append(data)
+        pending_size += len(data)
+        if pending_size >= CHUNK_SIZE:
+            received = await run_in_threadpool(_append_chunk, part_path, received, pending)
+            pending, pending_size = [], 0
+    if pending or received == offset:
+        # Also validates the offset (and creates the file) for empty bodies
+        received = await run_in_threadpool(_append_chunk, part_path, received, pending)
+    
+    return {"filename": name, "received": received}
+
+
+@router.get(
+    "/dataset/{dataset_name}/files/{filename}",
+    summary="Get resumable upload status",
+    description="Report how many bytes of a file have been received."
+)
+async def get_file_upload_status(
+    dataset_name: str,
+    filename: str,
+    pipeline = Depends(get_pipeline_service)
+) -> dict:
+    """Get the number of bytes received for a resumable upload."""
+    _validate_dataset_name(dataset_name)
+    name = _validate_filename(filename)
+    part_path = _resumable_dir(pipeline, dataset_name) / name
+    return {"filename": name, "received": part_path.stat().st_size if part_path.exists() else 0}
+
+
+@router.post(
+    "/dataset/{dataset_name}/commit",
+    response_model=BaseResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Publish a resumable dataset upload",
+    description="""
+    Verify checksums of all chunk-uploaded files and atomically move them
+    into workspace/input/{dataset_name}/.
+    """
+)
+async def commit_resumable_upload(
+    dataset_name: str,
+    checksums: Optional[str] = Form(None, description="JSON object of file name to SHA-256"),
+    pipeline = Depends(get_pipeline_service)
+) -> BaseResponse:
+    """Publish a resumable upload."""
+    _validate_dataset_name(dataset_name)
+    expected = _parse_checksums(checksums)
+    
+    base_path = Path(pipeline.base_path)
+    upload_dir = _resumable_dir(pipeline, dataset_name)
+    target_dir = base_path / "workspace" / "input" / dataset_name
+    
+    if not upload_dir.exists():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No pending upload for dataset '{dataset_name}'"
+        )
+    
+    def hash_all() -> Dict[str, Dict]:
+        return {
+            path.name: {"size": path.stat().st_size, "sha256": _hash_file(path)}
+            for path in upload_dir.iterdir() if path.is_file()
+        }
+    
+    received = await run_in_threadpool(hash_all)
+    _verify_checksums(received, expected)
+    _publish(upload_dir, target_dir)
+    
+    return _upload_summary(dataset_name, target_dir, base_path, received)
 
 
 @router.delete(
@@ -12,6 +12,8 @@ from pathlib import Path
 import asyncio
 import json
 
+from .job_runner import get_job_runner
+
 logger = logging.getLogger(__name__)
 
 
@@ -165,6 +167,10 @@ class CLITranslator:
         """
         Execute CLI command asynchronously.
         
+        main.py commands run in a warm job-runner worker when the runner is
+        started (training commands in the training pool); otherwise they are
+        launched as a subprocess.
+        
         Args:
             command: Command as list of arguments
             
@@ -174,6 +180,15 @@ class CLITranslator:
         try:
             logger.info(f"Executing command: {' '.join(command)}")
             
+            runner = get_job_runner(training="--train" in command)
+            if runner is not None and command[1:2] == [str(self.main_script)]:
+                success, stdout_str, stderr_str = await runner.run(command[2:])
+                if success:
+                    logger.info("Command executed successfully")
+                else:
+                    logger.error("Command failed in job runner")
+                return success, stdout_str, stderr_str
+            
             # Run command in subprocess
             process = await asyncio.create_subprocess_exec(
                 *command,
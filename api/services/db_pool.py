@@ -0,0 +1,195 @@
+"""
+Process-wide asyncpg connection pool shared by API services.
+
+The pool is created once in the FastAPI ``lifespan`` handler and reused by
+every request, so handlers no longer pay a TCP + auth handshake per query
+and never block the event loop on synchronous drivers. Hot queries are
+registered with :func:`register_hot_statement` and prepared on every new
+pooled connection; handlers run them through :func:`prepared`, so no request
+re-parses a hot query.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[asyncpg.Pool] = None
+_pool_lock = asyncio.Lock()
+_hot_statements: List[str] = []
+# Raw connection -> {query: PreparedStatement}; entries go away with the connection
+_prepared: "weakref.WeakKeyDictionary[asyncpg.Connection, Dict[str, Any]]" = weakref.WeakKeyDictionary()
+_metrics = {
+    'acquisitions': 0,
+    'acquire_wait_total': 0.0,
+    'acquire_wait_max': 0.0,
+    'acquire_errors': 0,
+    'prepared_statements': 0,
+}
+
+
+def get_db_settings() -> Dict[str, Any]:
+    """Get PostgreSQL connection settings from the environment."""
+    return {
+        'host': os.getenv('DATABASE_HOST') or os.getenv('AUTOTRAINX_DB_HOST', 'localhost'),
+        'port': int(os.getenv('DATABASE_PORT') or os.getenv('AUTOTRAINX_DB_PORT', 5432)),
+        'database': os.getenv('DATABASE_NAME') or os.getenv('AUTOTRAINX_DB_NAME', 'autotrainx'),
+        'user': os.getenv('DATABASE_USER') or os.getenv('AUTOTRAINX_DB_USER', 'autotrainx'),
+        'password': os.getenv('DATABASE_PASSWORD') or os.getenv('AUTOTRAINX_DB_PASSWORD', '1234'),
+    }
+
+
+def register_hot_statement(query: str) -> str:
+    """Register a query to be prepared on every pooled connection.
+
+    Args:
+        query: SQL text using asyncpg ``$n`` placeholders
+
+    Returns:
+        The same query, so it can be used as a module constant
+    """
+    if query not in _hot_statements:
+        _hot_statements.append(query)
+    return query
+
+
+def _raw_connection(conn: asyncpg.Connection) -> asyncpg.Connection:
+    """Unwrap a pool proxy to the connection its statements are bound to."""
+    return getattr(conn, '_con', None) or conn
+
+
+async def _init_connection(conn: asyncpg.Connection) -> None:
+    """Prepare registered hot statements on a new pooled connection."""
+    statements = _prepared.setdefault(conn, {})
+    for query in _hot_statements:
+        try:
+            statements[query] = await conn.prepare(query)
+            _metrics['prepared_statements'] += 1
+        except asyncpg.PostgresError as e:
+            logger.warning(f"Could not prepare hot statement: {e}")
+
+
+async def prepared(conn: asyncpg.Connection, query: str) -> Any:
+    """Get the prepared statement for a hot query on a pooled connection.
+
+    Statements are prepared when the connection is created; a query the
+    warm-up could not prepare is prepared here once and kept.
+
+    Args:
+        conn: Connection from :func:`acquire`
+        query: SQL text previously passed to :func:`register_hot_statement`
+
+    Returns:
+        An asyncpg ``PreparedStatement`` bound to the connection
+    """
+    raw = _raw_connection(conn)
+    statements = _prepared.setdefault(raw, {})
+    statement = statements.get(query)
+    if statement is None:
+        statement = statements[query] = await raw.prepare(query)
+        _metrics['prepared_statements'] += 1
+    return statement
+
+
+async def init_pool(min_size: Optional[int] = None, max_size: Optional[int] = None) -> asyncpg.Pool:
+    """Create the process-wide pool (no-op if it already exists).
+
+    Args:
+        min_size: Minimum pool size (AUTOTRAINX_API_DB_POOL_MIN, default 2)
+        max_size: Maximum pool size (AUTOTRAINX_API_DB_POOL_MAX, default 10)
+
+    Returns:
+        The connection pool
+    """
+    global _pool
+    async with _pool_lock:
+        if _pool is not None:
+            return _pool
+
+        min_size = min_size or int(os.getenv('AUTOTRAINX_API_DB_POOL_MIN', 2))
+        max_size = max_size or int(os.getenv('AUTOTRAINX_API_DB_POOL_MAX', 10))
+
+        _pool = await asyncpg.create_pool(
+            **get_db_settings(),
+            min_size=min_size,
+            max_size=max_size,
+            init=_init_connection,
+            command_timeout=30,
+        )
+        logger.info(f"Database pool ready (min={min_size}, max={max_size})")
+        return _pool
+
+
+async def close_pool() -> None:
+    """Close the process-wide pool."""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+        logger.info("Database pool closed")
+
+
+def get_pool() -> Optional[asyncpg.Pool]:
+    """Get the process-wide pool, or None if it has not been created."""
+    return _pool
+
+
+@asynccontextmanager
+async def acquire():
+    """Acquire a pooled connection, creating the pool lazily if needed.
+
+    Lazy creation keeps services usable outside the FastAPI app (scripts,
+    load tests); inside the app the pool comes from the lifespan handler.
+    """
+    pool = _pool or await init_pool()
+
+    start = time.perf_counter()
+    try:
+        conn = await pool.acquire()
+    except Exception:
+        _metrics['acquire_errors'] += 1
+        raise
+    wait = time.perf_counter() - start
+
+    _metrics['acquisitions'] += 1
+    _metrics['acquire_wait_total'] += wait
+    _metrics['acquire_wait_max'] = max(_metrics['acquire_wait_max'], wait)
+
+    try:
+        yield conn
+    finally:
+        await pool.release(conn)
+
+
+def get_pool_metrics() -> Dict[str, Any]:
+    """Get pool utilisation and acquisition metrics."""
+    acquisitions = _metrics['acquisitions']
+    metrics = {
+        'initialized': _pool is not None,
+        'acquisitions': acquisitions,
+        'acquire_errors': _metrics['acquire_errors'],
+        'avg_acquire_wait_ms': round(_metrics['acquire_wait_total'] / acquisitions * 1000, 3) if acquisitions else 0.0,
+        'max_acquire_wait_ms': round(_metrics['acquire_wait_max'] * 1000, 3),
+        'hot_statements': len(_hot_statements),
+        'prepared_statements': _metrics['prepared_statements'],
+    }
+
+    if _pool is not None:
+        size = _pool.get_size()
+        idle = _pool.get_idle_size()
+        metrics.update({
+            'size': size,
+            'idle': idle,
+            'in_use': size - idle,
+            'min_size': _pool.get_min_size(),
+            'max_size': _pool.get_max_size(),
+        })
+
+    return metrics
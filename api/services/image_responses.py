@@ -0,0 +1,62 @@
+"""
+Cacheable image responses for dataset and model preview routes.
+
+Originals and thumbnails are served with strong ETags and Cache-Control so
+browsers revalidate with a cheap 304 instead of re-downloading images.
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Optional
+
+from fastapi import Request, Response, status
+from fastapi.responses import FileResponse
+
+from src.utils.thumbnails import THUMBNAIL_FORMATS, get_thumbnail_service
+
+# Thumbnail URLs are keyed by source version, so they can be cached longer
+ORIGINAL_CACHE_CONTROL = "public, max-age=300, must-revalidate"
+THUMBNAIL_CACHE_CONTROL = "public, max-age=86400, must-revalidate"
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = {value.strip() for value in if_none_match.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+def _cached_file_response(request: Request, path: Path, etag: str,
+                          media_type: str, cache_control: str) -> Response:
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if _etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return FileResponse(path=str(path), media_type=media_type, headers=headers)
+
+
+async def image_response(request: Request, image_path: Path,
+                         size: Optional[int] = None, fmt: str = "webp") -> Response:
+    """
+    Serve an image or one of its thumbnails with validation headers.
+
+    Args:
+        request: Incoming request (for If-None-Match)
+        image_path: Source image path
+        size: Thumbnail size, or None for the original
+        fmt: Thumbnail format ('webp' or 'jpeg')
+
+    Returns:
+        FileResponse, or an empty 304 response if the client copy is current
+    """
+    if size:
+        thumb_path, key = await get_thumbnail_service().aget_thumbnail(image_path, size, fmt)
+        return _cached_file_response(request, thumb_path, f'"{key}"',
+                                     THUMBNAIL_FORMATS[fmt][1], THUMBNAIL_CACHE_CONTROL)
+
+    stat = image_path.stat()
+    identity = f"{image_path.resolve()}|{stat.st_mtime_ns}|{stat.st_size}"
+    etag = f'"{hashlib.sha1(identity.encode("utf-8")).hexdigest()}"'
+    suffix = image_path.suffix[1:].lower()
+    media_type = f"image/{'jpeg' if suffix == 'jpg' else suffix}"
+    return _cached_file_response(request, image_path, etag, media_type, ORIGINAL_CACHE_CONTROL)
@@ -0,0 +1,466 @@
+"""
+Job runner - executes CLI jobs in warm worker processes.
+
+Launching ``python main.py ...`` per request pays for interpreter startup,
+pipeline/database/preset imports and model verification before any work
+starts. The runner keeps a small pool of long-lived worker processes that
+import ``main`` once and then execute CLI argument lists in-process through
+``async_main(argv)``. Only the sd-scripts trainer is still launched as a
+subprocess (by the trainer itself). Training commands run for hours, so they
+get a pool of their own and never hold up the short commands.
+
+Jobs are recorded in a SQLite queue under ``workspace/.jobs`` before they
+are dispatched, so queued jobs survive an API restart and every job's exit
+code stays inspectable after it finishes. A job's output is streamed to log
+files under ``workspace/.jobs/logs``; the queue keeps only its tail.
+
+Usage:
+    await start_job_runner(base_path)
+    runner = get_job_runner(training=True)
+    success, stdout, stderr = await runner.run(["--train", "--single", ...])
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import sqlite3
+import sys
+import threading
+import time
+import traceback
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 2
+DEFAULT_TRAINING_WORKERS = 2
+DEFAULT_MAX_JOBS_PER_WORKER = 100
+# Output kept in the queue (and returned to the caller) per stream
+OUTPUT_TAIL_BYTES = 64 * 1024
+
+QUEUE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    argv TEXT NOT NULL,
+    status TEXT NOT NULL,
+    returncode INTEGER,
+    stdout TEXT,
+    stderr TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at);
+"""
+
+
+class JobQueue:
+    """Durable FIFO job queue backed by SQLite."""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Initialize the queue.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(QUEUE_SCHEMA)
+        self._lock = threading.Lock()
+
+    def enqueue(self, argv: List[str]) -> str:
+        """Add a job and return its queue id."""
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, argv, status, created_at) VALUES (?, ?, 'queued', ?)",
+                (job_id, json.dumps(argv), time.time()),
+            )
+        return job_id
+
+    def claim(self) -> Optional[Tuple[str, List[str]]]:
+        """
+        Mark the oldest queued job as running.
+
+        Returns:
+            Tuple of (job id, argv), or None if the queue is empty
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT id, argv FROM jobs WHERE status = 'queued' "
+                    "ORDER BY created_at LIMIT 1"
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'running', started_at = ? WHERE id = ?",
+                        (time.time(), row['id']),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        return row['id'], json.loads(row['argv'])
+
+    def complete(self, job_id: str, returncode: int, stdout: str, stderr: str) -> None:
+        """Record a finished job."""
+        status = 'done' if returncode == 0 else 'failed'
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, returncode = ?, stdout = ?, stderr = ?, "
+                "finished_at = ? WHERE id = ?",
+                (status, returncode, stdout, stderr, time.time(), job_id),
+            )
+
+    def recover(self) -> int:
+        """
+        Fail jobs left running by a previous API process.
+
+        They are not re-run automatically since a half-finished training job
+        is not safe to repeat. Queued jobs are kept.
+
+        Returns:
+            Number of interrupted jobs
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = 'failed', returncode = -1, "
+                "stderr = 'Interrupted by API restart', finished_at = ? "
+                "WHERE status = 'running'",
+                (time.time(),),
+            )
+        return cursor.rowcount
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job record."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job['argv'] = json.loads(job['argv'])
+        return job
+
+    def counts(self) -> Dict[str, int]:
+        """Get the number of jobs per status."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"
+            ).fetchall()
+        return {row['status']: row['n'] for row in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _read_tail(path: Path, limit: int) -> str:
+    """Read at most the last ``limit`` bytes of a log file."""
+    try:
+        with open(path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - limit))
+            return f.read().decode('utf-8', errors='replace')
+    except OSError:
+        return ""
+
+
+def _reset_run_state() -> None:
+    """Drop the per-run singletons a job leaves behind in the worker."""
+    from src.utils.job_tracker import reset_tracker
+    from src.utils.logging_config import reset_logging
+
+    # Writes the tracker's queued updates before the next job starts
+    reset_tracker()
+    reset_logging()
+
+
+def _run_cli_job(cli_main, argv: List[str], stdout_path: str, stderr_path: str) -> int:
+    """Run one CLI invocation in the worker, streaming its output to log files."""
+    with open(stdout_path, 'w', encoding='utf-8', buffering=1) as stdout, \
+            open(stderr_path, 'w', encoding='utf-8', buffering=1) as stderr, \
+            contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            returncode = asyncio.run(cli_main.async_main(argv))
+        except SystemExit as e:
+            # argparse exits on invalid arguments
+            returncode = e.code if isinstance(e.code, int) else 1
+        except BaseException:
+            traceback.print_exc()
+            returncode = 1
+        finally:
+            try:
+                _reset_run_state()
+            except Exception:
+                traceback.print_exc()
+    return returncode or 0
+
+
+def _worker_main(base_path: str, conn) -> None:
+    """Worker process loop: import the CLI once, then run jobs from the pipe."""
+    # Interrupts are handled by the API process, which stops the workers
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    os.chdir(base_path)
+    if base_path not in sys.path:
+        sys.path.insert(0, base_path)
+
+    import main as cli_main
+
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+        conn.send(_run_cli_job(cli_main, *message))
+
+
+class _Worker:
+    """
+    Handle for one warm worker process.
+
+    Workers are not daemonic so jobs can still use process pools
+    (thumbnail pre-warming, for example).
+    """
+
+    def __init__(self, context, base_path: str):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(base_path, child_conn),
+                                       name="autotrainx-job-worker")
+        self.process.start()
+        child_conn.close()
+        self.jobs_run = 0
+
+    def stop(self, timeout: float = 5.0) -> None:
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout)
+        self.conn.close()
+
+
+class JobRunner:
+    """Dispatches queued CLI jobs to a pool of warm worker processes."""
+
+    def __init__(self, base_path: Union[str, Path], workers: int = DEFAULT_WORKERS,
+                 queue_path: Optional[Union[str, Path]] = None,
+                 max_jobs_per_worker: int = DEFAULT_MAX_JOBS_PER_WORKER,
+                 output_tail_bytes: int = OUTPUT_TAIL_BYTES):
+        """
+        Initialize the job runner.
+
+        Args:
+            base_path: Project base path (directory containing main.py)
+            workers: Number of worker processes (concurrent jobs)
+            queue_path: SQLite queue file (default: workspace/.jobs/queue.db)
+            max_jobs_per_worker: Jobs after which a worker is recycled
+            output_tail_bytes: Output kept in the queue per stream; the full
+                output stays in the job's log files
+        """
+        self.base_path = str(Path(base_path).resolve())
+        self.workers = max(1, workers)
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.output_tail_bytes = output_tail_bytes
+        self.queue = JobQueue(queue_path or
+                              Config.get_workspace_path(self.base_path) / ".jobs" / "queue.db")
+        self.log_dir = self.queue.path.parent / "logs"
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self._context = multiprocessing.get_context("spawn")
+        self._slots: List[Optional[_Worker]] = []
+        self._tasks: List[asyncio.Task] = []
+        self._pending: Optional[asyncio.Semaphore] = None
+        self._waiters: Dict[str, asyncio.Future] = {}
+        self.jobs_completed = 0
+        self.workers_restarted = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self) -> None:
+        """Start the workers and resume any jobs still queued."""
+        if self.running:
+            return
+        interrupted = self.queue.recover()
+        if interrupted:
+            logger.warning(f"Marked {interrupted} interrupted job(s) as failed")
+
+        loop = asyncio.get_running_loop()
+        self._slots = await asyncio.gather(*(
+            loop.run_in_executor(None, _Worker, self._context, self.base_path)
+            for _ in range(self.workers)
+        ))
+        self._pending = asyncio.Semaphore(self.queue.counts().get('queued', 0))
+        self._tasks = [asyncio.create_task(self._dispatch(slot)) for slot in range(self.workers)]
+        logger.info(f"Job runner started with {self.workers} warm worker(s)")
+
+    async def stop(self) -> None:
+        """Stop dispatching and shut the workers down."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(None, worker.stop) for worker in self._slots if worker
+        ))
+        self._slots = []
+        for future in self._waiters.values():
+            if not future.done():
+                future.set_exception(RuntimeError("Job runner stopped"))
+        self._waiters.clear()
+
+    async def submit(self, argv: List[str]) -> str:
+        """
+        Queue a CLI job.
+
+        Args:
+            argv: Arguments for main.py (without the interpreter and script)
+
+        Returns:
+            Queue id of the job
+        """
+        if not self.running:
+            raise RuntimeError("Job runner is not running")
+        job_id = self.queue.enqueue(argv)
+        self._waiters[job_id] = asyncio.get_running_loop().create_future()
+        self._pending.release()
+        return job_id
+
+    async def wait(self, job_id: str) -> Tuple[bool, str, str]:
+        """Wait for a job submitted by this process and return (success, stdout, stderr)."""
+        returncode, stdout, stderr = await asyncio.shield(self._waiters[job_id])
+        return returncode == 0, stdout, stderr
+
+    async def run(self, argv: List[str]) -> Tuple[bool, str, str]:
+        """Queue a CLI job and wait for it to finish."""
+        return await self.wait(await self.submit(argv))
+
+    def log_paths(self, job_id: str) -> Tuple[Path, Path]:
+        """Get the stdout and stderr log files of a job."""
+        return (self.log_dir / f"{job_id}.stdout.log",
+                self.log_dir / f"{job_id}.stderr.log")
+
+    async def _dispatch(self, slot: int) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._pending.acquire()
+            job = self.queue.claim()
+            if job is None:
+                continue
+            job_id, argv = job
+
+            worker = self._slots[slot]
+            if worker is None or not worker.process.is_alive() or \
+                    worker.jobs_run >= self.max_jobs_per_worker:
+                if worker is not None:
+                    await loop.run_in_executor(None, worker.stop)
+                    self.workers_restarted += 1
+                worker = self._slots[slot] = await loop.run_in_executor(
+                    None, _Worker, self._context, self.base_path)
+
+            stdout_path, stderr_path = self.log_paths(job_id)
+            try:
+                worker.conn.send((argv, str(stdout_path), str(stderr_path)))
+                returncode = await loop.run_in_executor(None, worker.conn.recv)
+                worker.jobs_run += 1
+                stderr = _read_tail(stderr_path, self.output_tail_bytes)
+            except (EOFError, OSError) as e:
+                logger.error(f"Job worker died while running job {job_id}: {e}")
+                self._slots[slot] = None
+                worker.process.join(0)
+                returncode = 1
+                stderr = _read_tail(stderr_path, self.output_tail_bytes) + \
+                    f"Job worker exited unexpectedly (exit code {worker.process.exitcode})"
+            result = (returncode, _read_tail(stdout_path, self.output_tail_bytes), stderr)
+
+            self.queue.complete(job_id, *result)
+            self.jobs_completed += 1
+            future = self._waiters.pop(job_id, None)
+            if future is not None and not future.done():
+                future.set_result(result)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'running': self.running,
+            'workers': self.workers,
+            'workers_alive': sum(1 for w in self._slots if w and w.process.is_alive()),
+            'workers_restarted': self.workers_restarted,
+            'jobs_completed': self.jobs_completed,
+            'queue': self.queue.counts(),
+        }
+
+
+_job_runner: Optional[JobRunner] = None
+_training_runner: Optional[JobRunner] = None
+
+
+def get_job_runner(training: bool = False) -> Optional[JobRunner]:
+    """
+    Get a global job runner.
+
+    Args:
+        training: Get the pool for training commands instead of short commands
+
+    Returns:
+        The running JobRunner, or None if it has not been started
+    """
+    runner = _training_runner if training else _job_runner
+    return runner if runner is not None and runner.running else None
+
+
+async def start_job_runner(base_path: Union[str, Path]) -> None:
+    """
+    Start the global job runners.
+
+    Pool sizes come from AUTOTRAINX_JOB_WORKERS (short commands) and
+    AUTOTRAINX_TRAINING_WORKERS (training commands); 0 disables a pool and
+    its commands fall back to one subprocess per request.
+
+    Args:
+        base_path: Project base path (directory containing main.py)
+    """
+    global _job_runner, _training_runner
+    workers = int(os.getenv('AUTOTRAINX_JOB_WORKERS', DEFAULT_WORKERS))
+    training_workers = int(os.getenv('AUTOTRAINX_TRAINING_WORKERS', DEFAULT_TRAINING_WORKERS))
+    jobs_dir = Config.get_workspace_path(str(base_path)) / ".jobs"
+    if workers > 0 and _job_runner is None:
+        _job_runner = JobRunner(base_path, workers=workers, queue_path=jobs_dir / "queue.db")
+    if training_workers > 0 and _training_runner is None:
+        _training_runner = JobRunner(base_path, workers=training_workers,
+                                     queue_path=jobs_dir / "training.db")
+    for runner in (_job_runner, _training_runner):
+        if runner is not None:
+            await runner.start()
+
+
+async def stop_job_runner() -> None:
+    """Stop the global job runners, if started."""
+    global _job_runner, _training_runner
+    for runner in (_job_runner, _training_runner):
+        if runner is not None:
+            await runner.stop()
+            runner.queue.close()
+    _job_runner = _training_runner = None
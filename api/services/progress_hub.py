@@ -0,0 +1,148 @@
+"""
+Progress hub - fans training progress events out to WebSocket subscribers.
+
+Trainers publish JSON datagrams (see ``src.training.progress_bus``); the hub
+listens on the progress bus port and keeps, per job, the latest progress
+event. Each subscriber owns a coalescing slot: while a client is busy
+receiving, newer progress replaces older progress, so a slow client only
+ever lags by one message and can never back-pressure training or the hub.
+Status events are queued (bounded) so terminal states are not coalesced away.
+"""
+
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from src.training.progress_bus import get_progress_address
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """Coalescing event slot for one subscriber."""
+
+    def __init__(self, job_id: Optional[str], max_status_events: int = 16):
+        self.job_id = job_id
+        self._progress: Optional[Dict[str, Any]] = None
+        self._statuses: Deque[Dict[str, Any]] = deque(maxlen=max_status_events)
+        self._ready = asyncio.Event()
+        self.dropped = 0
+
+    def offer(self, event: Dict[str, Any]) -> None:
+        """Store an event without ever waiting on the subscriber."""
+        if event.get('type') == 'progress':
+            if self._progress is not None:
+                self.dropped += 1
+            self._progress = event
+        else:
+            self._statuses.append(event)
+        self._ready.set()
+
+    async def next(self) -> List[Dict[str, Any]]:
+        """Wait for and return the pending events (statuses first)."""
+        await self._ready.wait()
+        self._ready.clear()
+        events = list(self._statuses)
+        self._statuses.clear()
+        if self._progress is not None:
+            events.append(self._progress)
+            self._progress = None
+        return events
+
+
+class _ProgressProtocol(asyncio.DatagramProtocol):
+    def __init__(self, hub: 'ProgressHub'):
+        self.hub = hub
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        try:
+            event = json.loads(data.decode('utf-8'))
+        except ValueError:
+            return
+        if isinstance(event, dict) and event.get('job_id'):
+            self.hub.publish(event)
+
+
+class ProgressHub:
+    """Receives progress events and distributes them to subscribers."""
+
+    def __init__(self, max_jobs: int = 256):
+        self._subscribers: Dict[Optional[str], Set[Subscription]] = {}
+        self._latest: Dict[str, Dict[str, Any]] = {}
+        self._max_jobs = max_jobs
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self.events_received = 0
+
+    async def start(self, address: Optional[Tuple[str, int]] = None) -> None:
+        """Start listening for progress datagrams."""
+        if self._transport is not None:
+            return
+        address = address or get_progress_address()
+        loop = asyncio.get_running_loop()
+        self._transport, _ = await loop.create_datagram_endpoint(
+            lambda: _ProgressProtocol(self), local_addr=address
+        )
+        logger.info(f"Progress hub listening on {address[0]}:{address[1]}")
+
+    def stop(self) -> None:
+        """Stop listening."""
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+    @property
+    def running(self) -> bool:
+        return self._transport is not None
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        """Record an event and offer it to the job's and global subscribers."""
+        self.events_received += 1
+        job_id = event['job_id']
+
+        latest = self._latest.pop(job_id, {})
+        latest.update(event)
+        self._latest[job_id] = latest
+        if len(self._latest) > self._max_jobs:
+            # Drop the least recently updated job
+            self._latest.pop(next(iter(self._latest)))
+
+        for key in (job_id, None):
+            for subscription in self._subscribers.get(key, ()):
+                subscription.offer(event)
+
+    def subscribe(self, job_id: Optional[str] = None) -> Subscription:
+        """
+        Subscribe to a job's events (or all events when job_id is None).
+
+        The latest known state of the job is offered immediately.
+        """
+        subscription = Subscription(job_id)
+        self._subscribers.setdefault(job_id, set()).add(subscription)
+        if job_id and job_id in self._latest:
+            subscription.offer({**self._latest[job_id], 'type': 'progress'})
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._subscribers.get(subscription.job_id)
+        if subscribers:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.job_id]
+
+    def get_latest(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get the merged latest state of a job."""
+        return self._latest.get(job_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'running': self.running,
+            'events_received': self.events_received,
+            'tracked_jobs': len(self._latest),
+            'subscribers': sum(len(subs) for subs in self._subscribers.values()),
+        }
+
+
+# Global hub instance
+progress_hub = ProgressHub()
@@ -3,35 +3,165 @@ Statistics Reader Service - Read-only access to PostgreSQL statistics.
 
 This service provides read-only access to training statistics and job information
 stored in the PostgreSQL database by the main AutoTrainX application.
+
+Queries run on the process-wide asyncpg pool from ``db_pool`` so requests
+neither open a new connection nor block the event loop. The hottest queries
+are prepared once per pooled connection and run through ``db_pool.prepared``.
 """
 
+import json
 import logging
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
-import psycopg2
-from psycopg2.extras import RealDictCursor
-import os
+
+from .db_pool import acquire, get_db_settings, prepared, register_hot_statement
+from src.database.pagination import EXACT_COUNT_LIMIT, decode_cursor, job_cursor
+from src.utils.cache_system import cached
 
 logger = logging.getLogger(__name__)
 
 
+JOB_BY_ID_QUERY = register_hot_statement("""
+    SELECT 
+        job_id,
+        dataset_name,
+        pipeline_mode,
+        preset,
+        status,
+        created_at,
+        start_time,
+        end_time,
+        output_path,
+        error_message,
+        total_steps,
+        current_step,
+        success
+    FROM executions
+    WHERE job_id = $1
+""")
+
+JOBS_LIST_COLUMNS = """
+        job_id,
+        dataset_name,
+        pipeline_mode,
+        preset,
+        status,
+        created_at,
+        start_time,
+        end_time,
+        success,
+        error_message
+"""
+
+# Listings are keyset-paginated over (created_at, job_id); see src.database.pagination.
+# Unfiltered pages are what the dashboard polls, so they are prepared up front;
+# filtered variants still benefit from asyncpg's per-connection statement cache.
+JOBS_LIST_QUERY = register_hot_statement(f"""
+    SELECT {JOBS_LIST_COLUMNS}
+    FROM executions
+    ORDER BY created_at DESC, job_id DESC
+    LIMIT $1
+""")
+
+JOBS_LIST_AFTER_QUERY = register_hot_statement(f"""
+    SELECT {JOBS_LIST_COLUMNS}
+    FROM executions
+    WHERE (created_at, job_id) < ($1, $2)
+    ORDER BY created_at DESC, job_id DESC
+    LIMIT $3
+""")
+
+JOBS_ESTIMATE_QUERY = register_hot_statement(
+    "SELECT reltuples::bigint FROM pg_class WHERE oid = 'executions'::regclass"
+)
+
+RUNNING_JOBS_QUERY = register_hot_statement("""
+    SELECT 
+        job_id,
+        dataset_name,
+        pipeline_mode,
+        preset,
+        status,
+        start_time,
+        current_step,
+        total_steps,
+        EXTRACT(EPOCH FROM (NOW() - start_time)) as elapsed_seconds
+    FROM executions
+    WHERE status IN ('training', 'preparing_dataset', 'configuring_preset', 'generating_preview')
+    ORDER BY start_time DESC
+""")
+
+# Counters come from job_stats_rollup, which triggers keep current (see
+# src.database.job_rollup); its size depends on days x statuses x presets
+# x modes, not on the number of jobs.
+STATUS_MODE_COUNTS_QUERY = register_hot_statement("""
+    SELECT 
+        status,
+        mode,
+        SUM(job_count) as count,
+        SUM(success_count) as successful
+    FROM job_stats_rollup
+    WHERE job_type = 'execution'
+    GROUP BY status, mode
+""")
+
+JOBS_24H_QUERY = register_hot_statement("""
+    SELECT 
+        COUNT(*) as jobs_24h
+    FROM executions
+    WHERE created_at > NOW() - INTERVAL '24 hours'
+""")
+
+RECENT_COMPLETIONS_QUERY = register_hot_statement("""
+    SELECT 
+        job_id,
+        dataset_name,
+        mode as pipeline_mode,
+        preset,
+        status,
+        created_at,
+        start_time,
+        end_time,
+        success,
+        error_message,
+        EXTRACT(EPOCH FROM (end_time - start_time)) as duration_seconds
+    FROM jobs
+    WHERE job_type = 'execution'
+    AND status IN ('done', 'failed', 'cancelled')
+    AND end_time IS NOT NULL
+    ORDER BY end_time DESC
+    LIMIT $1
+""")
+
+PRESET_STATISTICS_QUERY = register_hot_statement("""
+    SELECT 
+        preset,
+        SUM(job_count) as total_jobs,
+        SUM(success_count) as successful_jobs,
+        SUM(success_duration_sum) / NULLIF(SUM(success_duration_count), 0) as avg_duration_seconds
+    FROM job_stats_rollup
+    WHERE job_type = 'execution'
+    AND status IN ('done', 'failed')
+    GROUP BY preset
+    ORDER BY total_jobs DESC
+""")
+
+TRAINING_METRICS_QUERY = register_hot_statement("""
+    SELECT step, loss, lr, it_per_sec
+    FROM training_metrics
+    WHERE job_id = $1
+    ORDER BY step
+""")
+
+
 class StatsReader:
     """Read-only access to training statistics from PostgreSQL."""
     
     def __init__(self):
         """Initialize database connection parameters."""
-        self.db_config = {
-            'host': os.getenv('DATABASE_HOST') or os.getenv('AUTOTRAINX_DB_HOST', 'localhost'),
-            'port': int(os.getenv('DATABASE_PORT') or os.getenv('AUTOTRAINX_DB_PORT', 5432)),
-            'database': os.getenv('DATABASE_NAME') or os.getenv('AUTOTRAINX_DB_NAME', 'autotrainx'),
-            'user': os.getenv('DATABASE_USER') or os.getenv('AUTOTRAINX_DB_USER', 'autotrainx'),
-            'password': os.getenv('DATABASE_PASSWORD') or os.getenv('AUTOTRAINX_DB_PASSWORD', '1234')
-        }
-    
-    def _get_connection(self):
-        """Get database connection with dict cursor."""
-        return psycopg2.connect(**self.db_config, cursor_factory=RealDictCursor)
+        self.db_config = get_db_settings()
     
+    @cached(ttl=2, key_prefix="job_status")
     async def get_job_by_id(self, job_id: str) -> Optional[Dict]:
         """
         Get job information by ID.
@@ -43,29 +173,10 @@ class StatsReader:
             Job information or None if not found
         """
         try:
-            with self._get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute("""
-                        SELECT 
-                            job_id,
-                            dataset_name,
-                            pipeline_mode,
-                            preset,
-                            status,
-                            created_at,
-                            start_time,
-                            end_time,
-                            output_path,
-                            error_message,
-                            total_steps,
-                            current_step,
-                            success
-                        FROM executions
-                        WHERE job_id = %s
-                    """, (job_id,))
-                    
-                    result = cursor.fetchone()
-                    return dict(result) if result else None
+            async with acquire() as conn:
+                statement = await prepared(conn, JOB_BY_ID_QUERY)
+                result = await statement.fetchrow(job_id)
+                return dict(result) if result else None
                     
         except Exception as e:
             logger.error(f"Failed to get job {job_id}: {e}")
@@ -75,69 +186,100 @@ class StatsReader:
                            limit: int = 20,
                            offset: int = 0,
                            status: Optional[str] = None,
-                           mode: Optional[str] = None) -> Tuple[List[Dict], int]:
+                           mode: Optional[str] = None,
+                           cursor: Optional[str] = None) -> Tuple[List[Dict], int, Optional[str], bool]:
         """
-        Get list of jobs with pagination and filtering.
+        Get list of jobs with keyset pagination and filtering.
         
         Args:
             limit: Number of jobs to return
-            offset: Offset for pagination
+            offset: Offset for pagination (only used without a cursor)
             status: Filter by status
             mode: Filter by pipeline mode
+            cursor: Cursor returned with the previous page
             
         Returns:
-            Tuple of (jobs list, total count)
+            Tuple of (jobs list, total count, next page cursor, whether the total is an estimate)
+            
+        Raises:
+            ValueError: If the cursor is malformed
         """
+        after = decode_cursor(cursor) if cursor else None
         try:
-            with self._get_connection() as conn:
-                with conn.cursor() as cursor:
-                    # Build query conditions
-                    conditions = []
-                    params = []
-                    
-                    if status:
-                        conditions.append("status = %s")
-                        params.append(status)
-                        
-                    if mode:
-                        conditions.append("pipeline_mode = %s")
-                        params.append(mode)
-                    
-                    where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+            async with acquire() as conn:
+                # Build query conditions
+                conditions = []
+                params = []
+                
+                if status:
+                    params.append(status)
+                    conditions.append(f"status = ${len(params)}")
                     
-                    # Get total count
-                    count_query = f"SELECT COUNT(*) as total FROM executions {where_clause}"
-                    cursor.execute(count_query, params)
-                    total = cursor.fetchone()['total']
-                    
-                    # Get jobs
+                if mode:
+                    params.append(mode)
+                    conditions.append(f"pipeline_mode = ${len(params)}")
+                
+                total, estimated = await self._count_jobs(conn, conditions, params)
+                
+                if not conditions and not offset:
+                    if after:
+                        statement = await prepared(conn, JOBS_LIST_AFTER_QUERY)
+                        rows = await statement.fetch(*after, limit + 1)
+                    else:
+                        statement = await prepared(conn, JOBS_LIST_QUERY)
+                        rows = await statement.fetch(limit + 1)
+                else:
+                    page_params = list(params)
+                    page_conditions = list(conditions)
+                    if after:
+                        page_params.extend(after)
+                        page_conditions.append(
+                            f"(created_at, job_id) < (${len(page_params) - 1}, ${len(page_params)})"
+                        )
+                    where_clause = f"WHERE {' AND '.join(page_conditions)}" if page_conditions else ""
+                    page_params.append(limit + 1)
                     query = f"""
-                        SELECT 
-                            job_id,
-                            dataset_name,
-                            pipeline_mode,
-                            preset,
-                            status,
-                            created_at,
-                            start_time,
-                            end_time,
-                            success,
-                            error_message
+                        SELECT {JOBS_LIST_COLUMNS}
                         FROM executions
                         {where_clause}
-                        ORDER BY created_at DESC
-                        LIMIT %s OFFSET %s
+                        ORDER BY created_at DESC, job_id DESC
+                        LIMIT ${len(page_params)}
                     """
-                    
-                    cursor.execute(query, params + [limit, offset])
-                    jobs = [dict(row) for row in cursor.fetchall()]
-                    
-                    return jobs, total
+                    if offset and not after:
+                        page_params.append(offset)
+                        query += f" OFFSET ${len(page_params)}"
+                    rows = await conn.fetch(query, *page_params)
+                
+                jobs = [dict(row) for row in rows[:limit]]
+                next_cursor = None
+                if len(rows) > limit:
+                    last = jobs[-1]
+                    next_cursor = job_cursor(last['created_at'], last['job_id'])
+                
+                return jobs, total, next_cursor, estimated
                     
         except Exception as e:
             logger.error(f"Failed to get jobs list: {e}")
-            return [], 0
+            return [], 0, None, False
     
+    async def _count_jobs(self, conn, conditions: List[str], params: List) -> Tuple[int, bool]:
+        """Count matching executions, using planner estimates on large tables."""
+        statement = await prepared(conn, JOBS_ESTIMATE_QUERY)
+        estimate = await statement.fetchval()
+        if estimate is not None and estimate >= EXACT_COUNT_LIMIT and conditions:
+            plan = await conn.fetchval(
+                f"EXPLAIN (FORMAT JSON) SELECT 1 FROM executions WHERE {' AND '.join(conditions)}",
+                *params
+            )
+            estimate = int(json.loads(plan)[0]['Plan']['Plan Rows'])
+        if estimate is not None and estimate >= EXACT_COUNT_LIMIT:
+            return estimate, True
+        
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        total = await conn.fetchval(f"SELECT COUNT(*) AS total FROM executions {where_clause}", *params)
+        return total, False
+    
+    @cached(ttl=10, key_prefix="job_stats")
     async def get_job_statistics(self) -> Dict:
         """
         Get overall job statistics.
@@ -146,55 +288,31 @@ class StatsReader:
             Dictionary with statistics
         """
         try:
-            with self._get_connection() as conn:
-                with conn.cursor() as cursor:
-                    # Get status counts
-                    cursor.execute("""
-                        SELECT 
-                            status,
-                            COUNT(*) as count
-                        FROM executions
-                        GROUP BY status
-                    """)
-                    status_counts = {row['status']: row['count'] for row in cursor.fetchall()}
-                    
-                    # Get mode counts
-                    cursor.execute("""
-                        SELECT 
-                            pipeline_mode,
-                            COUNT(*) as count
-                        FROM executions
-                        GROUP BY pipeline_mode
-                    """)
-                    mode_counts = {row['pipeline_mode']: row['count'] for row in cursor.fetchall()}
-                    
-                    # Get success rate
-                    cursor.execute("""
-                        SELECT 
-                            COUNT(CASE WHEN success = true THEN 1 END) as successful,
-                            COUNT(*) as total
-                        FROM executions
-                        WHERE status IN ('done', 'failed')
-                    """)
-                    result = cursor.fetchone()
-                    success_rate = (result['successful'] / result['total'] * 100) if result['total'] > 0 else 0
-                    
-                    # Get recent activity
-                    cursor.execute("""
-                        SELECT 
-                            COUNT(*) as jobs_24h
-                        FROM executions
-                        WHERE created_at > NOW() - INTERVAL '24 hours'
-                    """)
-                    jobs_24h = cursor.fetchone()['jobs_24h']
-                    
-                    return {
-                        'status_breakdown': status_counts,
-                        'mode_breakdown': mode_counts,
-                        'success_rate': round(success_rate, 2),
-                        'total_jobs': sum(status_counts.values()),
-                        'jobs_last_24h': jobs_24h
-                    }
+            async with acquire() as conn:
+                # Status and mode counts and the success rate, from the rollup
+                statement = await prepared(conn, STATUS_MODE_COUNTS_QUERY)
+                rows = await statement.fetch()
+                status_counts, mode_counts = {}, {}
+                finished = successful = 0
+                for row in rows:
+                    status_counts[row['status']] = status_counts.get(row['status'], 0) + row['count']
+                    mode_counts[row['mode']] = mode_counts.get(row['mode'], 0) + row['count']
+                    if row['status'] in ('done', 'failed'):
+                        finished += row['count']
+                        successful += row['successful']
+                success_rate = (successful / finished * 100) if finished > 0 else 0
+                
+                # Get recent activity
+                statement = await prepared(conn, JOBS_24H_QUERY)
+                jobs_24h = await statement.fetchval()
+                
+                return {
+                    'status_breakdown': status_counts,
+                    'mode_breakdown': mode_counts,
+                    'success_rate': round(success_rate, 2),
+                    'total_jobs': sum(status_counts.values()),
+                    'jobs_last_24h': jobs_24h
+                }
                     
         except Exception as e:
             logger.error(f"Failed to get statistics: {e}")
@@ -214,35 +332,21 @@ class StatsReader:
             List of running jobs
         """
         try:
-            with self._get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute("""
-                        SELECT 
-                            job_id,
-                            dataset_name,
-                            pipeline_mode,
-                            preset,
-                            status,
-                            start_time,
-                            current_step,
-                            total_steps,
-                            EXTRACT(EPOCH FROM (NOW() - start_time)) as elapsed_seconds
-                        FROM executions
-                        WHERE status IN ('training', 'preparing_dataset', 'configuring_preset', 'generating_preview')
-                        ORDER BY start_time DESC
-                    """)
-                    
-                    jobs = []
-                    for row in cursor.fetchall():
-                        job = dict(row)
-                        # Calculate progress
-                        if job['total_steps'] and job['current_step']:
-                            job['progress_percentage'] = (job['current_step'] / job['total_steps']) * 100
-                        else:
-                            job['progress_percentage'] = 0
-                        jobs.append(job)
-                    
-                    return jobs
+            async with acquire() as conn:
+                statement = await prepared(conn, RUNNING_JOBS_QUERY)
+                rows = await statement.fetch()
+                
+                jobs = []
+                for row in rows:
+                    job = dict(row)
+                    # Calculate progress
+                    if job['total_steps'] and job['current_step']:
+                        job['progress_percentage'] = (job['current_step'] / job['total_steps']) * 100
+                    else:
+                        job['progress_percentage'] = 0
+                    jobs.append(job)
+                
+                return jobs
                     
         except Exception as e:
             logger.error(f"Failed to get running jobs: {e}")
@@ -259,27 +363,10 @@ class StatsReader:
             List of completed jobs
         """
         try:
-            with self._get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute("""
-                        SELECT 
-                            job_id,
-                            dataset_name,
-                            pipeline_mode,
-                            preset,
-                            status,
-                            created_at,
-                            end_time,
-                            success,
-                            EXTRACT(EPOCH FROM (end_time - start_time)) as duration_seconds
-                        FROM executions
-                        WHERE status IN ('done', 'failed', 'cancelled')
-                        AND end_time IS NOT NULL
-                        ORDER BY end_time DESC
-                        LIMIT %s
-                    """, (limit,))
-                    
-                    return [dict(row) for row in cursor.fetchall()]
+            async with acquire() as conn:
+                statement = await prepared(conn, RECENT_COMPLETIONS_QUERY)
+                rows = await statement.fetch(limit)
+                return [dict(row) for row in rows]
                     
         except Exception as e:
             logger.error(f"Failed to get recent completions: {e}")
@@ -293,33 +380,42 @@ class StatsReader:
             Dictionary with preset statistics
         """
         try:
-            with self._get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute("""
-                        SELECT 
-                            preset,
-                            COUNT(*) as total_jobs,
-                            COUNT(CASE WHEN success = true THEN 1 END) as successful_jobs,
-                            AVG(CASE WHEN success = true AND end_time IS NOT NULL 
-                                THEN EXTRACT(EPOCH FROM (end_time - start_time)) 
-                                END) as avg_duration_seconds
-                        FROM executions
-                        WHERE status IN ('done', 'failed')
-                        GROUP BY preset
-                        ORDER BY total_jobs DESC
-                    """)
-                    
-                    stats = {}
-                    for row in cursor.fetchall():
-                        stats[row['preset']] = {
-                            'total_jobs': row['total_jobs'],
-                            'successful_jobs': row['successful_jobs'],
-                            'success_rate': (row['successful_jobs'] / row['total_jobs'] * 100) if row['total_jobs'] > 0 else 0,
-                            'avg_duration_minutes': round(row['avg_duration_seconds'] / 60, 2) if row['avg_duration_seconds'] else None
-                        }
-                    
-                    return stats
+            async with acquire() as conn:
+                statement = await prepared(conn, PRESET_STATISTICS_QUERY)
+                rows = await statement.fetch()
+                
+                stats = {}
+                for row in rows:
+                    avg_duration = row['avg_duration_seconds']
+                    stats[row['preset']] = {
+                        'total_jobs': row['total_jobs'],
+                        'successful_jobs': row['successful_jobs'],
+                        'success_rate': (row['successful_jobs'] / row['total_jobs'] * 100) if row['total_jobs'] > 0 else 0,
+                        'avg_duration_minutes': round(float(avg_duration) / 60, 2) if avg_duration else None
+                    }
+                
+                return stats
                     
         except Exception as e:
             logger.error(f"Failed to get preset statistics: {e}")
-            return {}
\ No newline at end of file
+            return {}
+    
+    async def get_training_metrics(self, job_id: str) -> List[Dict]:
+        """
+        Get the per-step training metrics of a job.
+        
+        Args:
+            job_id: Job identifier
+            
+        Returns:
+            Rows with step, loss, lr and it_per_sec, ordered by step
+        """
+        try:
+            async with acquire() as conn:
+                statement = await prepared(conn, TRAINING_METRICS_QUERY)
+                rows = await statement.fetch(job_id)
+                return [dict(row) for row in rows]
+                    
+        except Exception as e:
+            logger.error(f"Failed to get training metrics for {job_id}: {e}")
+            return []
@@ -1,9 +1,10 @@
 """
-WebSocket handler for real-time updates - Limited in CLI Bridge mode.
+WebSocket handler for real-time updates.
 
-In CLI Bridge mode, real-time progress is not available since the CLI
-executes independently. This module provides basic WebSocket connectivity
-for potential future enhancements.
+Training runs in separate CLI processes, which publish progress events to
+the progress bus; the API's progress hub fans them out to the job-specific
+WebSocket endpoint below. Each client is served from a coalescing slot, so
+slow clients never slow down training or other clients.
 """
 
 import asyncio
@@ -12,7 +13,9 @@ import logging
 from typing import Dict, Set, Optional, Any
 from datetime import datetime
 
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+
+from ..services.progress_hub import progress_hub
 
 logger = logging.getLogger(__name__)
 
@@ -75,8 +78,8 @@ class ConnectionManager:
         return {
             "total_connections": len(self.active_connections),
             "mode": "cli_bridge",
-            "real_time_progress": False,
-            "message": "Real-time progress not available in CLI Bridge mode"
+            "real_time_progress": progress_hub.running,
+            "progress_hub": progress_hub.get_stats()
         }
 
 
@@ -102,11 +105,8 @@ async def websocket_endpoint(websocket: WebSocket):
             "data": {
                 "mode": "cli_bridge",
                 "message": "Connected to AutoTrainX WebSocket (CLI Bridge mode)",
-                "limitations": [
-                    "Real-time job progress not available",
-                    "Job updates must be polled via REST API",
-                    "CLI executes independently"
-                ]
+                "job_progress_endpoint": "/ws/progress/{job_id}",
+                "real_time_progress": progress_hub.running
             },
             "timestamp": datetime.utcnow().isoformat()
         })
@@ -133,7 +133,7 @@ async def websocket_endpoint(websocket: WebSocket):
                     await connection_manager.send_message(websocket, {
                         "type": "info",
                         "data": {
-                            "message": "WebSocket is connected but real-time progress is not available in CLI Bridge mode"
+                            "message": "Subscribe to /ws/progress/{job_id} for real-time job progress"
                         },
                         "timestamp": datetime.utcnow().isoformat()
                     })
@@ -164,32 +164,63 @@ async def websocket_job_endpoint(
     job_id: str
 ):
     """
-    Job-specific WebSocket endpoint - Not functional in CLI Bridge mode.
+    Job-specific WebSocket endpoint streaming real-time training progress.
     
-    Real-time job progress is not available since jobs are executed
-    independently by the CLI. Use the REST API to poll job status instead.
+    Sends the latest known state on connect, then progress events (step,
+    epoch, loss, it/s) and status changes as the trainer publishes them.
+    Intermediate progress events are coalesced for clients that fall behind.
     """
-    await websocket.accept()
+    await connection_manager.connect(websocket)
+    subscription = progress_hub.subscribe(job_id)
+    
+    async def receive_loop():
+        # Handle pings and notice disconnects while events are being pushed
+        while True:
+            data = await websocket.receive_text()
+            try:
+                message = json.loads(data)
+            except json.JSONDecodeError:
+                continue
+            if message.get("type") == "ping":
+                await connection_manager.send_message(websocket, {
+                    "type": "pong",
+                    "timestamp": datetime.utcnow().isoformat()
+                })
+    
+    async def send_loop():
+        while True:
+            for event in await subscription.next():
+                await websocket.send_text(json.dumps({
+                    "type": event.get("type", "progress"),
+                    "job_id": job_id,
+                    "data": event,
+                    "timestamp": datetime.utcnow().isoformat()
+                }))
     
     try:
-        await websocket.send_text(json.dumps({
-            "type": "error",
-            "data": {
-                "message": "Job-specific WebSocket connections are not supported in CLI Bridge mode",
-                "job_id": job_id,
-                "suggestion": "Use GET /api/v1/jobs/{job_id} to poll job status"
-            },
+        await connection_manager.send_message(websocket, {
+            "type": "connection_established",
+            "job_id": job_id,
+            "data": {"real_time_progress": progress_hub.running},
             "timestamp": datetime.utcnow().isoformat()
-        }))
+        })
         
-        # Close connection immediately
-        await websocket.close(
-            code=status.WS_1008_POLICY_VIOLATION,
-            reason="Job progress WebSocket not supported in CLI Bridge mode"
-        )
+        tasks = [asyncio.create_task(receive_loop()), asyncio.create_task(send_loop())]
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        for task in done:
+            exc = task.exception()
+            if exc and not isinstance(exc, WebSocketDisconnect):
+                logger.error(f"Error in job WebSocket: {exc}")
         
+    except WebSocketDisconnect:
+        logger.info("WebSocket client disconnected")
     except Exception as e:
         logger.error(f"Error in job WebSocket: {e}")
+    finally:
+        progress_hub.unsubscribe(subscription)
+        connection_manager.disconnect(websocket)
 
 
 @router.get("/connections/stats")
@@ -245,12 +276,12 @@ async def websocket_health_check():
             "mode": "cli_bridge",
             "connection_stats": stats,
             "features": {
-                "job_specific_connections": False,
-                "real_time_progress": False,
+                "job_specific_connections": True,
+                "real_time_progress": progress_hub.running,
                 "system_messaging": True,
                 "basic_connectivity": True
             },
-            "message": "WebSocket service operational (CLI Bridge mode - limited features)"
+            "message": "WebSocket service operational"
         }
     except Exception as e:
         logger.error(f"WebSocket service health check failed: {e}")
@@ -210,7 +210,7 @@ export default function DatasetDetailsPage() {
               >
                 <div className="aspect-square relative bg-muted">
                   <img
-                    src={`/api/backend/datasets/${datasetName}/images/${image.filename}`}
+                    src={`/api/backend/datasets/${datasetName}/images/${image.filename}?size=256`}
                     alt={image.filename}
                     className="object-cover w-full h-full"
                   />
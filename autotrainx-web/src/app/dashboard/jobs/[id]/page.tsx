@@ -60,14 +60,15 @@ export default function JobDetailPage() {
     ].includes(job.status)
 
     if (isActive) {
+      // Progress is pushed over the WebSocket; polling is only a fallback
       const interval = setInterval(() => {
         refetchJob()
         refetchLogs()
-      }, 3000) // Refresh every 3 seconds
+      }, isConnected ? 15000 : 3000)
 
       return () => clearInterval(interval)
     }
-  }, [job, autoRefresh, refetchJob, refetchLogs])
+  }, [job, autoRefresh, isConnected, refetchJob, refetchLogs])
 
   const handleCancel = async () => {
     if (confirm('Are you sure you want to cancel this job?')) {
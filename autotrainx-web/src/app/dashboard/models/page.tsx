@@ -325,7 +325,7 @@ export default function ModelsPage() {
                   {model.has_preview && model.preview_images && model.preview_images[0] && (
                     <div className="aspect-video relative bg-muted rounded-md overflow-hidden mb-3">
                       <img
-                        src={`/api/backend/models/${model.id}/preview/${model.preview_images[0]}`}
+                        src={`/api/backend/models/${model.id}/preview/${model.preview_images[0]}?size=512`}
                         alt={`${model.name} preview`}
                         className="object-cover w-full h-full"
                       />
@@ -425,7 +425,7 @@ export default function ModelsPage() {
                       {selectedModel.preview_images?.map((image, idx) => (
                         <div key={idx} className="relative aspect-square bg-muted rounded-lg overflow-hidden">
                           <img
-                            src={`/api/backend/models/${selectedModel.id}/preview/${image}`}
+                            src={`/api/backend/models/${selectedModel.id}/preview/${image}?size=512`}
                             alt={`Preview ${idx + 1}`}
                             className="object-contain w-full h-full"
                           />
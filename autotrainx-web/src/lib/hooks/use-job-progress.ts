@@ -1,35 +1,83 @@
 'use client'
 
 import { useEffect, useState } from 'react'
-import { getApiClient } from '@/lib/api/client'
 import type { ProgressUpdate } from '@/types/api'
+import { JobStatus } from '@/types/api'
+
+function progressSocketUrl(jobId: string): string {
+  const base = process.env.NEXT_PUBLIC_API_URL || window.location.origin
+  return `${base.replace(/^http/, 'ws')}/ws/progress/${encodeURIComponent(jobId)}`
+}
 
 export function useJobProgress(jobId: string | null) {
   const [progress, setProgress] = useState<ProgressUpdate | null>(null)
   const [isConnected, setIsConnected] = useState(false)
 
   useEffect(() => {
-    if (!jobId) return
+    if (!jobId || typeof window === 'undefined') return
+
+    let socket: WebSocket | null = null
+    let retryTimer: ReturnType<typeof setTimeout> | null = null
+    let closed = false
+
+    const connect = () => {
+      socket = new WebSocket(progressSocketUrl(jobId))
 
-    const api = getApiClient()
-    
-    // Subscribe to progress updates
-    const unsubscribe = api.subscribeToProgress(jobId, (update) => {
-      setProgress(update)
-    })
+      socket.onopen = () => setIsConnected(true)
+      socket.onclose = () => {
+        setIsConnected(false)
+        if (!closed) {
+          retryTimer = setTimeout(connect, 5000)
+        }
+      }
+      socket.onmessage = (message) => {
+        const event = JSON.parse(message.data)
+        const data = event.data || {}
+
+        if (event.type === 'progress') {
+          const step = data.step ?? 0
+          const total = data.total_steps ?? 0
+          const details = [
+            data.epoch != null && data.total_epochs != null ? `epoch ${data.epoch}/${data.total_epochs}` : null,
+            data.loss != null ? `loss ${Number(data.loss).toFixed(4)}` : null,
+            data.it_per_sec != null ? `${Number(data.it_per_sec).toFixed(2)} it/s` : null,
+          ].filter(Boolean)
+
+          setProgress((previous) => ({
+            job_id: jobId,
+            status: previous?.status ?? JobStatus.TRAINING,
+            progress_percentage: data.progress_percentage ?? 0,
+            current_step: total ? `Step ${step}/${total}` : 'Training',
+            completed_steps: step,
+            total_steps: total,
+            message: details.join(' · '),
+          }))
+        } else if (event.type === 'status') {
+          setProgress((previous) => ({
+            job_id: jobId,
+            progress_percentage: previous?.progress_percentage ?? 0,
+            current_step: previous?.current_step ?? '',
+            completed_steps: previous?.completed_steps ?? 0,
+            total_steps: previous?.total_steps ?? 0,
+            message: previous?.message ?? '',
+            status: Object.values(JobStatus).includes(data.status)
+              ? (data.status as JobStatus)
+              : previous?.status ?? JobStatus.TRAINING,
+          }))
+        }
+      }
+    }
 
-    // Set up connection status
-    const socket = api.connectToProgress(jobId)
-    
-    socket.on('connect', () => setIsConnected(true))
-    socket.on('disconnect', () => setIsConnected(false))
+    connect()
 
     // Cleanup
     return () => {
-      unsubscribe()
+      closed = true
+      if (retryTimer) clearTimeout(retryTimer)
+      socket?.close()
       setIsConnected(false)
     }
   }, [jobId])
 
   return { progress, isConnected }
-}
\ No newline at end of file
+}
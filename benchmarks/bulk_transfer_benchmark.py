@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+"""
+Benchmark for copying the job database between databases.
+
+Builds a synthetic SQLite job database and copies it, reporting per size:
+
+    bulk      BulkTransfer: streamed reads, chunked COPY / executemany in one
+              target transaction, jobs and rollup rebuilt once
+    legacy    the previous approach (only up to --legacy-max rows): on a
+              SQLite target sync_to_sqlite's fetchall() of each table and one
+              executemany; on PostgreSQL DatabaseMigrator's ORM copy over
+              OFFSET/LIMIT batches of 1000 rows, committed per batch
+
+with the wall time, the row rate and the RSS growth during the copy. The
+bulk copy holds one chunk plus a bounded page cache (64MB on SQLite), so its
+RSS stays flat as the size grows. Its wall time includes rebuilding jobs and
+job_stats_rollup, which the legacy copy did not produce; the "copy" column
+is the time until the last chunk was written, before that rebuild.
+
+Every variant writes to a freshly created target. With TARGET_DB_URL the
+target is a PostgreSQL database whose public schema is dropped and
+recreated for each variant, so point it at a scratch database.
+
+Usage:
+    python benchmarks/bulk_transfer_benchmark.py --rows 100000 1000000
+    TARGET_DB_URL=postgresql://... python benchmarks/bulk_transfer_benchmark.py
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import psutil
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import src.pipeline  # noqa: F401  (import order avoids a circular import in src.training)
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from src.database.bulk_transfer import BulkTransfer
+from src.database.factory import DatabaseConfig, DatabaseFactory
+from src.database.job_rollup import drop_job_rollup, rebuild_job_rollup
+from src.database.models_v2 import Base, Execution, Variation
+
+STATUSES = ['done'] * 6 + ['failed', 'cancelled', 'pending', 'training']
+PRESETS = ['FluxLORA', 'SDXLCheckpoint', 'FluxCheckpoint']
+
+
+def fill(engine, rows: int, chunk: int = 50000) -> None:
+    """Write synthetic executions and variations (4:1) with the triggers dropped."""
+    dialect = DatabaseFactory.get_dialect(engine.dialect.name)
+    start = datetime(2023, 1, 1)
+    execution_columns = [column.name for column in Execution.__table__.columns]
+    variation_columns = [column.name for column in Variation.__table__.columns]
+    with engine.begin() as connection:
+        drop_job_rollup(connection, dialect)
+        for offset in range(0, rows, chunk):
+            executions, variations = [], []
+            for i in range(offset, min(offset + chunk, rows)):
+                status = STATUSES[i % len(STATUSES)]
+                created = start + timedelta(seconds=i)
+                row = {
+                    'job_id': f"{i:08x}", 'status': status, 'dataset_name': f"ds{i % 50}",
+                    'preset': PRESETS[i % 3], 'success': status == 'done', 'created_at': created,
+                    'start_time': created, 'updated_at': created, 'total_steps': 1000,
+                    'end_time': created + timedelta(minutes=30) if status in ('done', 'failed') else None,
+                    'duration_seconds': 1800.0 if status in ('done', 'failed') else None,
+                    'output_path': f"/workspace/output/ds{i % 50}",
+                }
+                if i % 5:
+                    row['pipeline_mode'] = 'single'
+                    executions.append(tuple(row.get(column) for column in execution_columns))
+                else:
+                    row.update(variation_id=f"v{i}", experiment_name='exp', total_combinations=4,
+                               varied_parameters={'lr': [1e-4, 2e-4]}, parameter_values={'lr': 1e-4})
+                    variations.append(tuple(row.get(column) for column in variation_columns))
+            dialect.copy_rows(connection, 'executions', execution_columns, executions)
+            dialect.copy_rows(connection, 'variations', variation_columns, variations)
+        rebuild_job_rollup(connection, dialect)
+
+
+class PeakRSS:
+    """Samples the RSS growth of this process from the progress callback."""
+
+    def __init__(self):
+        self.process = psutil.Process()
+        self.baseline = self.process.memory_info().rss
+        self.peak = self.baseline
+        self.started = time.perf_counter()
+        self.copied_at = None
+
+    def sample(self, *_) -> None:
+        self.peak = max(self.peak, self.process.memory_info().rss)
+
+    def chunk(self, *report) -> None:
+        """Progress callback: also remembers when the last chunk was written."""
+        self.sample()
+        self.copied_at = time.perf_counter()
+
+    @property
+    def copy_seconds(self) -> float:
+        return (self.copied_at or time.perf_counter()) - self.started
+
+    @property
+    def growth_mb(self) -> float:
+        return (self.peak - self.baseline) / 2 ** 20
+
+
+def bulk(source, target, chunk_size: int) -> PeakRSS:
+    rss = PeakRSS()
+    BulkTransfer(source, target, chunk_size, progress=rss.chunk).run(replace=True)
+    rss.sample()
+    return rss
+
+
+def legacy(source, target, chunk_size: int) -> PeakRSS:
+    """fetchall() per table, then one executemany, as sync_to_sqlite did."""
+    rss = PeakRSS()
+    source_connection = source.raw_connection()
+    target_connection = target.raw_connection()
+    try:
+        for table_name in ('executions', 'variations'):
+            cursor = source_connection.cursor()
+            cursor.execute(f"SELECT * FROM {table_name}")
+            columns = [description[0] for description in cursor.description]
+            rows = cursor.fetchall()
+            rss.sample()
+            target_cursor = target_connection.cursor()
+            target_cursor.executemany(
+                f"INSERT INTO {table_name} ({', '.join(columns)}) "
+                f"VALUES ({', '.join('%s' if target.dialect.name == 'postgresql' else '?' for _ in columns)})",
+                rows)
+            rss.sample()
+            del rows
+        target_connection.commit()
+    finally:
+        source_connection.close()
+        target_connection.close()
+    return rss
+
+
+def legacy_migrator(source, target, chunk_size: int) -> PeakRSS:
+    """ORM objects over OFFSET/LIMIT batches, as DatabaseMigrator did."""
+    rss = PeakRSS()
+    with sessionmaker(bind=source)() as source_session, sessionmaker(bind=target)() as target_session:
+        for model in (Execution, Variation):
+            names = [model_column.name for model_column in model.__table__.columns]
+            total = source_session.query(model).count()
+            for offset in range(0, total, 1000):
+                batch = source_session.query(model).order_by(model.created_at).offset(offset).limit(1000).all()
+                for record in batch:
+                    target_session.add(model(**{name: getattr(record, name) for name in names}))
+                target_session.commit()
+                source_session.expunge_all()
+                rss.sample()
+    return rss
+
+
+def _target(tmp: Path, name: str):
+    if os.environ.get('TARGET_DB_URL'):
+        engine = DatabaseFactory.create_engine(DatabaseConfig(db_type='postgresql',
+                                                              db_url=os.environ['TARGET_DB_URL']))
+        with engine.begin() as connection:
+            connection.execute(text("DROP SCHEMA public CASCADE"))
+            connection.execute(text("CREATE SCHEMA public"))
+    else:
+        engine = DatabaseFactory.create_engine(DatabaseConfig(db_type='sqlite', db_path=tmp / name))
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Bulk transfer benchmark")
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000, 1000000],
+                        help='Synthetic jobs per source database')
+    parser.add_argument('--chunk-size', type=int, default=10000, help='Rows per chunk')
+    parser.add_argument('--legacy-max', type=int, default=1000000,
+                        help='Largest size the legacy copy is run for')
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'variant':>8} {'seconds':>9} {'copy':>9} {'rows/s':>10} {'RSS growth MB':>14}")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            source = DatabaseFactory.create_engine(DatabaseConfig(db_type='sqlite', db_path=tmp / 'source.db'))
+            Base.metadata.create_all(source)
+            fill(source, rows)
+
+            previous = legacy_migrator if os.environ.get('TARGET_DB_URL') else legacy
+            variants = [('bulk', bulk)] + ([('legacy', previous)] if rows <= args.legacy_max else [])
+            for name, copy in variants:
+                target = _target(tmp, f"{name}.db")
+                start = time.perf_counter()
+                rss = copy(source, target, args.chunk_size)
+                seconds = time.perf_counter() - start
+                with target.connect() as connection:
+                    copied = connection.execute(text("SELECT COUNT(*) FROM jobs")).scalar() \
+                        if name == 'bulk' else rows
+                copy_seconds = rss.copy_seconds if name == 'bulk' else seconds
+                print(f"{rows:>9} {name:>8} {seconds:>9.2f} {copy_seconds:>9.2f} "
+                      f"{copied / seconds:>10.0f} {rss.growth_mb:>14.1f}")
+                target.dispose()
+            source.dispose()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
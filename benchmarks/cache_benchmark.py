@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark for the in-process MemoryCache.
+
+Compares the previous dict backend (datetime timestamps, O(n) scan to find
+the LRU entry on every eviction) with the ordered-dict LRU, reporting ops/s
+for hit-heavy reads and for writes that evict at capacity.
+
+Usage:
+    python benchmarks/cache_benchmark.py --sizes 1000 10000 --ops 200000
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils.cache_system import MemoryCache
+
+
+class LegacyMemoryCache:
+    """The previous implementation, reduced to its synchronous core."""
+
+    def __init__(self, max_size: int = 1000):
+        self._cache: Dict[str, Dict] = {}
+        self.max_size = max_size
+
+    def get_sync(self, key: str) -> Any:
+        if key not in self._cache:
+            return None
+        entry = self._cache[key]
+        if entry['expires_at'] and datetime.now() > entry['expires_at']:
+            del self._cache[key]
+            return None
+        entry['last_accessed'] = datetime.now()
+        return entry['value']
+
+    def set_sync(self, key: str, value: Any, ttl: int = None) -> bool:
+        if len(self._cache) >= self.max_size:
+            oldest_key = min(self._cache.keys(), key=lambda k: self._cache[k]['last_accessed'])
+            del self._cache[oldest_key]
+        self._cache[key] = {
+            'value': value,
+            'created_at': datetime.now(),
+            'last_accessed': datetime.now(),
+            'expires_at': datetime.now() + timedelta(seconds=ttl) if ttl else None,
+        }
+        return True
+
+
+def _ops_per_sec(operation: Callable[[int], Any], ops: int) -> float:
+    start = time.perf_counter()
+    for i in range(ops):
+        operation(i)
+    return ops / (time.perf_counter() - start)
+
+
+def run(cache_factory: Callable[[int], Any], size: int, ops: int) -> Dict[str, float]:
+    cache = cache_factory(size)
+    keys = [f"bench:key{i}" for i in range(size)]
+    for key in keys:
+        cache.set_sync(key, key, 300)
+
+    rng = random.Random(0)
+    lookups = [rng.choice(keys) for _ in range(ops)]
+    get_rate = _ops_per_sec(lambda i: cache.get_sync(lookups[i]), ops)
+
+    # Fresh keys at capacity: every set evicts
+    evict_ops = max(1, ops // 10)
+    set_rate = _ops_per_sec(lambda i: cache.set_sync(f"bench:new{i}", i, 300), evict_ops)
+    return {'get': get_rate, 'set_evict': set_rate}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="MemoryCache micro-benchmark")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000], help='Cache capacities')
+    parser.add_argument('--ops', type=int, default=200000, help='Lookups per scenario')
+    args = parser.parse_args()
+
+    print(f"{'backend':<10} {'size':>8} {'get ops/s':>14} {'set+evict ops/s':>16}")
+    for size in args.sizes:
+        for name, factory in (('legacy', LegacyMemoryCache),
+                              ('lru', lambda n: MemoryCache(max_size=n))):
+            result = run(factory, size, args.ops)
+            print(f"{name:<10} {size:>8} {result['get']:>14,.0f} {result['set_evict']:>16,.0f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
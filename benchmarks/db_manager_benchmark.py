@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+"""
+Benchmark for DatabaseManager construction overhead.
+
+CLI handlers, the job tracker, the signal handler and the process monitor
+each construct their own DatabaseManager. This compares the previous
+constructor (new engine and pool plus Base.metadata.create_all every time)
+with the registry-backed one, reporting:
+
+    startup   time for a fresh interpreter to construct its first manager
+              and run one query (imports are identical for both variants
+              and left out, they would only add noise)
+    command   mean cost of one "construct a manager, run a query" step, as
+              done several times per CLI command
+
+Usage:
+    python benchmarks/db_manager_benchmark.py --managers 200
+    DATABASE_TYPE=postgresql DATABASE_URL=... python benchmarks/db_manager_benchmark.py
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import src.pipeline  # noqa: F401  (import order avoids a circular import in src.training)
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+
+from src.database.factory import DatabaseFactory, DatabaseConfig
+from src.database.manager_v2 import DatabaseManager
+from src.database.models_v2 import Base, Execution
+
+STARTUP_SNIPPET = """
+import sys, time
+sys.path.insert(0, {root!r})
+import src.pipeline
+from sqlalchemy import func, select
+from src.database.factory import DatabaseConfig
+from src.database.manager_v2 import DatabaseManager
+from src.database.models_v2 import Base, Execution
+start = time.perf_counter()
+config = DatabaseConfig(db_type={db_type!r}, db_path={db_path!r}, db_url={db_url!r})
+if {legacy}:
+    from sqlalchemy.orm import sessionmaker
+    from src.database.factory import DatabaseFactory
+    engine = DatabaseFactory.create_engine(config)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+else:
+    session = DatabaseManager(config).get_session()
+session.execute(select(func.count()).select_from(Execution)).scalar()
+print(time.perf_counter() - start)
+"""
+
+
+class LegacyDatabaseManager:
+    """The previous constructor: a new engine and a create_all per instance."""
+
+    def __init__(self, config: DatabaseConfig):
+        self.engine = DatabaseFactory.create_engine(config)
+        Base.metadata.create_all(self.engine)
+        self.SessionLocal = sessionmaker(bind=self.engine)
+
+    def get_session(self):
+        return self.SessionLocal()
+
+
+def _config(db_path: Path) -> DatabaseConfig:
+    if os.environ.get('DATABASE_TYPE', 'sqlite').lower() == 'postgresql':
+        return DatabaseConfig(db_type='postgresql', db_url=os.environ['DATABASE_URL'])
+    return DatabaseConfig(db_type='sqlite', db_path=db_path)
+
+
+def per_command(manager_class, config: DatabaseConfig, managers: int) -> float:
+    start = time.perf_counter()
+    for _ in range(managers):
+        manager = manager_class(config)
+        with manager.get_session() as session:
+            session.execute(select(func.count()).select_from(Execution)).scalar()
+    return (time.perf_counter() - start) / managers
+
+
+def startup(config: DatabaseConfig, legacy: bool, runs: int) -> float:
+    snippet = STARTUP_SNIPPET.format(
+        root=str(Path(__file__).resolve().parent.parent), db_type=config.db_type,
+        db_path=str(config.db_path) if config.db_path else None, db_url=config.db_url, legacy=legacy)
+    times = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', snippet], capture_output=True, text=True, check=True)
+        times.append(float(output.stdout.strip().splitlines()[-1]))
+    return min(times)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="DatabaseManager construction benchmark")
+    parser.add_argument('--managers', type=int, default=200, help='Managers constructed per run')
+    parser.add_argument('--startup-runs', type=int, default=5, help='Fresh interpreters per variant')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = _config(Path(tmp) / 'bench.db')
+        DatabaseManager(config)  # create the schema and marker once
+
+        print(f"{'variant':<10} {'startup ms':>12} {'per manager ms':>16}")
+        for name, manager_class, legacy in (('legacy', LegacyDatabaseManager, True),
+                                            ('registry', DatabaseManager, False)):
+            cold = startup(config, legacy, args.startup_runs)
+            warm = per_command(manager_class, config, args.managers)
+            print(f"{name:<10} {cold * 1000:>12.1f} {warm * 1000:>16.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
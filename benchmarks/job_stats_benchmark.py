@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+"""
+Benchmark for job statistics: full-table aggregates vs the job rollup.
+
+Fills a database with synthetic executions and variations and reports, per
+history size:
+
+    aggregate   one statistics read done the previous way, aggregating both
+                job tables
+    rollup      DatabaseManager.get_statistics(), reading job_stats_rollup
+    update      mean cost of one status transition with the jobs/rollup
+                triggers installed, and without them
+
+Usage:
+    python benchmarks/job_stats_benchmark.py --jobs 1000 10000 100000
+    DATABASE_TYPE=postgresql DATABASE_URL=... python benchmarks/job_stats_benchmark.py
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import src.pipeline  # noqa: F401  (import order avoids a circular import in src.training)
+from sqlalchemy import case, func
+
+from src.database.enums import ExecutionStatus
+from src.database.factory import DatabaseConfig
+from src.database.job_rollup import drop_job_rollup, install_job_rollup
+from src.database.manager_v2 import DatabaseManager
+from src.database.models_v2 import Execution, Variation
+
+STATUSES = ['done'] * 6 + ['failed', 'cancelled', 'pending', 'training']
+PRESETS = ['FluxLORA', 'SDXLCheckpoint', 'FluxCheckpoint']
+
+
+def aggregate_statistics(session) -> dict:
+    """The previous statistics read: aggregates over both job tables."""
+    stats = {}
+    for model in (Execution, Variation):
+        stats[model.__tablename__] = {
+            'by_status': dict(session.query(model.status, func.count()).group_by(model.status).all()),
+            'totals': session.query(
+                func.count(),
+                func.sum(case((model.success == True, 1), else_=0)),  # noqa: E712
+                func.avg(model.duration_seconds),
+            ).one(),
+        }
+    return stats
+
+
+def _config(db_path: Path) -> DatabaseConfig:
+    if os.environ.get('DATABASE_TYPE', 'sqlite').lower() == 'postgresql':
+        return DatabaseConfig(db_type='postgresql', db_url=os.environ['DATABASE_URL'])
+    return DatabaseConfig(db_type='sqlite', db_path=db_path)
+
+
+def fill(manager: DatabaseManager, jobs: int) -> None:
+    """Insert synthetic jobs with the triggers dropped, then backfill once."""
+    rng = random.Random(jobs)
+    start = datetime(2023, 1, 1)
+    executions, variations = [], []
+    for i in range(jobs):
+        status = rng.choice(STATUSES)
+        created = start + timedelta(minutes=i)
+        row = {
+            'job_id': f"{i:08x}", 'status': status, 'dataset_name': f"ds{i % 50}",
+            'preset': rng.choice(PRESETS), 'success': status == 'done', 'created_at': created,
+            'start_time': created, 'updated_at': created,
+            'end_time': created + timedelta(minutes=30) if status in ('done', 'failed') else None,
+            'duration_seconds': 1800.0 if status in ('done', 'failed') else None,
+        }
+        if i % 5:
+            executions.append(dict(row, pipeline_mode=rng.choice(['single', 'batch'])))
+        else:
+            variations.append(dict(row, variation_id=f"v{i}", experiment_name='exp',
+                                   total_combinations=4, varied_parameters={}, parameter_values={}))
+    drop_triggers(manager)
+    with manager.get_session() as session:
+        session.bulk_insert_mappings(Execution, executions)
+        session.bulk_insert_mappings(Variation, variations)
+        session.commit()
+    install_job_rollup(manager.engine, manager.dialect)
+
+
+def drop_triggers(manager: DatabaseManager) -> None:
+    with manager.engine.begin() as connection:
+        drop_job_rollup(connection, manager.dialect)
+
+
+def timed(function, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function()
+    return (time.perf_counter() - start) / repeats
+
+
+def update_cost(manager: DatabaseManager, jobs: int, updates: int) -> float:
+    job_ids = [f"{i:08x}" for i in range(1, jobs) if i % 5][:updates]
+    statuses = [ExecutionStatus.TRAINING, ExecutionStatus.GENERATING_PREVIEW]
+    start = time.perf_counter()
+    for n, job_id in enumerate(job_ids):
+        manager.update_execution_status(job_id, statuses[n % 2])
+    return (time.perf_counter() - start) / max(len(job_ids), 1)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Job statistics benchmark")
+    parser.add_argument('--jobs', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help='History sizes to measure')
+    parser.add_argument('--repeats', type=int, default=20, help='Statistics reads per variant')
+    parser.add_argument('--updates', type=int, default=200, help='Status transitions timed')
+    args = parser.parse_args()
+
+    print(f"{'jobs':>8} {'aggregate ms':>14} {'rollup ms':>11} {'update ms':>11} {'no triggers ms':>16}")
+    for jobs in args.jobs:
+        with tempfile.TemporaryDirectory() as tmp:
+            manager = DatabaseManager(_config(Path(tmp) / 'bench.db'))
+            manager.clear_all_records()
+            fill(manager, jobs)
+
+            def aggregate():
+                with manager.get_session() as session:
+                    aggregate_statistics(session)
+
+            aggregate_ms = timed(aggregate, args.repeats) * 1000
+            rollup_ms = timed(manager.get_statistics, args.repeats) * 1000
+            update_ms = update_cost(manager, jobs, args.updates) * 1000
+            drop_triggers(manager)
+            bare_ms = update_cost(manager, jobs, args.updates) * 1000
+            install_job_rollup(manager.engine, manager.dialect)  # leave the schema consistent
+            print(f"{jobs:>8} {aggregate_ms:>14.2f} {rollup_ms:>11.2f} {update_ms:>11.3f} {bare_ms:>16.3f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+"""
+Throughput benchmark for the shared progress parser.
+
+Feeds the lines of recorded Flux and SDXL training logs (split on ``\\r`` and
+``\\n``, as the output pump does) through the parsing that ran per line
+before the shared parser existed (the progress bus regex plus the progress
+monitor's nine-regex table) and through ``parse_events`` with the bus fields
+and the monitor update, and reports lines/s for each.
+
+Usage:
+    python benchmarks/progress_parser_benchmark.py
+    python benchmarks/progress_parser_benchmark.py --log logs/train_log/<file>.log --repeat 50
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import src.pipeline  # noqa: F401  (same import order as main.py: src.training depends on it)
+from src.training.minimal_progress_monitor import MinimalProgressMonitor
+from src.training.progress_parser import events_to_fields, parse_events
+
+LOG_DIR = Path(__file__).resolve().parent.parent / "logs" / "train_log"
+# Preset names found in the "# Preset:" header of recorded logs
+FAMILIES = {
+    'Flux': ('FluxLORA', 'FL1'),
+    'SDXL': ('SX1',),
+}
+LINE_BREAK = re.compile(r'\r\n|\r|\n')
+
+# The progress bus parser before the shared parser
+BUS_PATTERN = re.compile(
+    r'steps:\s*(?:\d+%\|[^|]*\|\s*)?(?P<step>\d+)/(?P<total_steps>\d+)'
+    r'(?:\s*\[[^,\]]*(?:,\s*(?P<rate>\d+(?:\.\d+)?)(?P<unit>it/s|s/it))?(?P<postfix>[^\]]*)\]?)?'
+    r'|(?i:epoch)\s+(?P<epoch>\d+)/(?P<total_epochs>\d+)'
+)
+POSTFIX_PATTERN = re.compile(r'(\w+)=([-+]?\d*\.?\d+(?:[eE][-+]?\d+)?)')
+
+# The progress monitor patterns before the shared parser
+MONITOR_PATTERNS = {
+    'progress': re.compile(r'steps:\s*(\d+)%\|[^|]+\|\s*(\d+)/(\d+).*?(\d+\.\d+)s/it(?:.*?avr_loss=([\d.]+))?'),
+    'total_steps': re.compile(r'total optimization steps.*?(\d+)'),
+    'total_epochs': re.compile(r'num epochs.*?(\d+)'),
+    'current_epoch': re.compile(r'current_epoch:\s*(\d+),\s*epoch:\s*(\d+)'),
+    'learning_rate': re.compile(r'LR\s+([\d.e-]+)'),
+    'saving': re.compile(r'saving checkpoint:|model saved'),
+    'completed': re.compile(r'Training completed|training finished', re.IGNORECASE),
+    'preparing': re.compile(r'prepare|loading|caching|Building', re.IGNORECASE),
+    'training_start': re.compile(r'running training|学習開始'),
+}
+
+
+def legacy_bus_parse(line):
+    fields = {}
+    for match in BUS_PATTERN.finditer(line):
+        if match.group('epoch') is not None:
+            fields['epoch'] = int(match.group('epoch'))
+            fields['total_epochs'] = int(match.group('total_epochs'))
+            continue
+        fields['step'] = int(match.group('step'))
+        fields['total_steps'] = int(match.group('total_steps'))
+        if match.group('rate'):
+            value = float(match.group('rate'))
+            if match.group('unit') == 's/it':
+                value = 1.0 / value if value else 0.0
+            fields['it_per_sec'] = round(value, 4)
+        postfix = match.group('postfix')
+        if postfix and '=' in postfix:
+            values = dict(POSTFIX_PATTERN.findall(postfix))
+            loss = next((values[key] for key in ('avr_loss', 'loss') if key in values), None)
+            if loss is not None:
+                fields['loss'] = float(loss)
+            if 'lr' in values:
+                fields['lr'] = float(values['lr'])
+    return fields or None
+
+
+def legacy_monitor_parse(state, line):
+    patterns = MONITOR_PATTERNS
+    if patterns['preparing'].search(line):
+        if state['phase'] == 'initializing':
+            state['phase'] = 'preparing'
+    elif patterns['training_start'].search(line):
+        state['phase'] = 'training'
+    elif patterns['saving'].search(line):
+        state['phase'] = 'saving'
+    elif patterns['completed'].search(line):
+        state['phase'] = 'completed'
+    for key in ('total_steps', 'total_epochs'):
+        match = patterns[key].search(line)
+        if match:
+            state[key] = int(match.group(1))
+    match = patterns['current_epoch'].search(line)
+    if match:
+        state['current_epoch'] = int(match.group(2))
+    match = patterns['learning_rate'].search(line)
+    if match:
+        state['learning_rate'] = float(match.group(1))
+    match = patterns['progress'].search(line)
+    if match:
+        state['current_step'] = int(match.group(2))
+        state['time_per_step'] = float(match.group(4))
+        if match.group(5):
+            state['average_loss'] = float(match.group(5))
+
+
+def run_legacy(lines):
+    state = {'phase': 'initializing'}
+    for line in lines:
+        legacy_bus_parse(line)
+        legacy_monitor_parse(state, line)
+
+
+def run_shared(lines):
+    monitor = MinimalProgressMonitor(quiet=True)
+    for line in lines:
+        events = parse_events(line)
+        if events:
+            events_to_fields(events)
+            monitor.apply(events)
+
+
+def preset_of(log_path: Path) -> str:
+    with open(log_path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            if line.startswith('# Preset:'):
+                return line.split(':', 1)[1].strip()
+            if not line.startswith('#'):
+                break
+    return ''
+
+
+def default_logs():
+    """Largest recorded log per model family."""
+    logs = {}
+    for log_path in sorted(LOG_DIR.glob("*.log"), key=lambda path: path.stat().st_size):
+        preset = preset_of(log_path)
+        for family, presets in FAMILIES.items():
+            if preset in presets:
+                logs[family] = log_path
+    if not logs:
+        sys.exit("No recorded Flux or SDXL training logs found; pass --log")
+    return {family: logs[family] for family in FAMILIES if family in logs}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--log', type=Path, action='append', help='Recorded training log (repeatable)')
+    parser.add_argument('--repeat', type=int, default=50, help='Passes over each log')
+    args = parser.parse_args()
+
+    logs = {path.name: path for path in args.log} if args.log else default_logs()
+    for family, log_path in logs.items():
+        text = log_path.read_text(encoding='utf-8', errors='replace')
+        lines = [line for line in LINE_BREAK.split(text) if line.strip()] * args.repeat
+        print(f"{family}: {log_path.name} ({len(lines) // args.repeat} lines x{args.repeat})")
+        for name, runner in (('legacy regexes', run_legacy), ('shared parser', run_shared)):
+            start = time.perf_counter()
+            runner(lines)
+            elapsed = time.perf_counter() - start
+            print(f"  {name:<15} {elapsed:>7.3f}s {len(lines) / elapsed:>12,.0f} lines/s")
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""
+Benchmark for dataset file staging.
+
+Builds a synthetic dataset of image-caption pairs and stages it twice, the
+way dataset preparation does (source -> input -> training image directory),
+with each staging strategy. Reports wall time and bytes copied per strategy.
+The previous behaviour corresponds to 'copy' without the thread pool, which
+is included as 'serial-copy'.
+
+Usage:
+    python benchmarks/staging_benchmark.py --images 10000 --image-kb 512
+    python benchmarks/staging_benchmark.py --dir /mnt/btrfs/tmp   # test reflinks
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils.file_staging import FileStager, remove_staged_tree
+
+STRATEGIES = ('serial-copy', 'copy', 'symlink', 'hardlink', 'reflink', 'auto')
+
+
+def build_dataset(root: Path, images: int, image_kb: int) -> Path:
+    source = root / "source"
+    source.mkdir()
+    payload = os.urandom(image_kb * 1024)
+    for i in range(images):
+        (source / f"{i:06d}.jpg").write_bytes(payload)
+        (source / f"{i:06d}.txt").write_text(f"sample caption number {i}")
+    return source
+
+
+def stage_twice(strategy: str, source: Path, workspace: Path):
+    input_dir = workspace / "input"
+    img_dir = workspace / "output" / "img"
+    input_dir.mkdir(parents=True)
+    img_dir.mkdir(parents=True)
+
+    start = time.perf_counter()
+    if strategy == 'serial-copy':
+        for path in source.iterdir():
+            shutil.copy2(path, input_dir / path.name)
+        for path in input_dir.iterdir():
+            shutil.copy2(path, img_dir / path.name)
+        methods, copied = "copy", 2 * sum(path.stat().st_size for path in source.iterdir())
+    else:
+        stager = FileStager(strategy)
+        stager.stage((Path(e.path), input_dir / e.name) for e in os.scandir(source))
+        stager.stage((Path(e.path), img_dir / e.name) for e in os.scandir(input_dir))
+        methods = ", ".join(f"{n} {m}" for m, n in sorted(stager.report.files.items()))
+        copied = stager.report.copied_bytes
+    return time.perf_counter() - start, methods, copied
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--images', type=int, default=10000)
+    parser.add_argument('--image-kb', type=int, default=256)
+    parser.add_argument('--dir', type=str, default=None, help='Directory to run in (filesystem under test)')
+    parser.add_argument('--strategies', nargs='+', default=list(STRATEGIES), choices=STRATEGIES)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        root = Path(tmp)
+        source = build_dataset(root, args.images, args.image_kb)
+        total_mb = args.images * args.image_kb / 1024
+        print(f"{args.images} images x {args.image_kb} KB ({total_mb:.0f} MB) in {root}\n")
+        print(f"{'strategy':<12} {'seconds':>9} {'copied MB':>10}  methods")
+        for strategy in args.strategies:
+            workspace = root / f"ws-{strategy}"
+            seconds, methods, copied = stage_twice(strategy, source, workspace)
+            print(f"{strategy:<12} {seconds:>9.2f} {copied / 1024 ** 2:>10.0f}  {methods}")
+            remove_staged_tree(workspace)
+
+
+if __name__ == '__main__':
+    main()
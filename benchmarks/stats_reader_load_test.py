@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+"""
+Load test for the API stats reader.
+
+Compares the old connect-per-call psycopg2 reader (run in a thread so it does
+not stall the loop more than it used to) with the pooled asyncpg StatsReader,
+using N concurrent workers hammering the dashboard queries for D seconds.
+
+Usage:
+    python benchmarks/stats_reader_load_test.py --concurrency 32 --duration 10
+    python benchmarks/stats_reader_load_test.py --url http://127.0.0.1:8000/api/v1/jobs/
+
+Connection settings come from the same DATABASE_* / AUTOTRAINX_DB_* env
+variables as the API.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from api.services import db_pool
+from api.services.stats_reader import StatsReader
+
+
+class LegacyStatsReader:
+    """The previous implementation: a fresh psycopg2 connection per call."""
+
+    def __init__(self):
+        self.db_config = db_pool.get_db_settings()
+
+    def _query(self, query: str, params=None) -> List[Dict]:
+        import psycopg2
+        from psycopg2.extras import RealDictCursor
+
+        with psycopg2.connect(**self.db_config) as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                cursor.execute(query, params)
+                return cursor.fetchall()
+
+    async def get_jobs_list(self, limit: int = 20, offset: int = 0):
+        loop = asyncio.get_running_loop()
+        total = await loop.run_in_executor(
+            None, self._query, "SELECT COUNT(*) as total FROM executions")
+        rows = await loop.run_in_executor(
+            None, self._query,
+            "SELECT job_id, status FROM executions ORDER BY created_at DESC LIMIT %s OFFSET %s",
+            (limit, offset))
+        return rows, total[0]['total']
+
+    async def get_job_statistics(self):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, self._query, "SELECT status, COUNT(*) as count FROM executions GROUP BY status")
+
+
+async def run_load(name: str, request: Callable[[], Awaitable], concurrency: int, duration: float) -> Dict:
+    """Run `request` from `concurrency` workers for `duration` seconds."""
+    latencies: List[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                await request()
+                latencies.append(time.perf_counter() - start)
+            except Exception:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000 if latencies else 0.0
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0.0
+    result = {
+        'name': name,
+        'requests': len(latencies),
+        'errors': errors,
+        'req_per_s': len(latencies) / elapsed,
+        'p50_ms': p50,
+        'p99_ms': p99,
+    }
+    print(f"{name:<12} {result['requests']:>8} req  {result['req_per_s']:>9.1f} req/s  "
+          f"p50 {p50:>7.2f} ms  p99 {p99:>7.2f} ms  errors {errors}")
+    return result
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="StatsReader load test")
+    parser.add_argument('--concurrency', type=int, default=32, help='Concurrent workers')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds per scenario')
+    parser.add_argument('--skip-legacy', action='store_true', help='Only run the pooled reader')
+    parser.add_argument('--url', help='Also load-test a running API endpoint via httpx')
+    args = parser.parse_args()
+
+    results = []
+
+    if not args.skip_legacy:
+        legacy = LegacyStatsReader()
+
+        async def legacy_request():
+            await legacy.get_jobs_list()
+            await legacy.get_job_statistics()
+
+        results.append(await run_load('legacy', legacy_request, args.concurrency, args.duration))
+
+    await db_pool.init_pool(max_size=max(args.concurrency // 2, 2))
+    pooled = StatsReader()
+
+    async def pooled_request():
+        await pooled.get_jobs_list()
+        await pooled.get_job_statistics()
+
+    try:
+        results.append(await run_load('pooled', pooled_request, args.concurrency, args.duration))
+        print(f"pool: {db_pool.get_pool_metrics()}")
+    finally:
+        await db_pool.close_pool()
+
+    if args.url:
+        import httpx
+
+        async with httpx.AsyncClient(timeout=30) as client:
+            async def http_request():
+                response = await client.get(args.url)
+                response.raise_for_status()
+
+            results.append(await run_load('http', http_request, args.concurrency, args.duration))
+
+    if len(results) >= 2 and results[0]['name'] == 'legacy' and results[0]['req_per_s']:
+        print(f"speedup: {results[1]['req_per_s'] / results[0]['req_per_s']:.1f}x")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
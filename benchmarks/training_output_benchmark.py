@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+"""
+Replay benchmark for the training output pump.
+
+Replays a captured sd-scripts training log the way the process emits it
+(tqdm redraws terminated by carriage returns) and compares the previous
+per-line loop (print, write and flush on every line, four regexes per line)
+with OutputPump (chunked reads, timed flushes, one combined regex, JSONL
+metrics sidecar). Console output goes to /dev/null in both cases.
+
+Usage:
+    python benchmarks/training_output_benchmark.py
+    python benchmarks/training_output_benchmark.py --log logs/train_log/<file>.log --repeat 200
+"""
+
+import argparse
+import io
+import os
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import src.pipeline  # noqa: F401  (same import order as main.py: src.training depends on it)
+from src.training.output_pump import OutputPump, metrics_path_for
+
+# The parser the trainer used before the pump
+STEP_PATTERN = re.compile(r'steps:\s*(?:\d+%\|[^|]*\|\s*)?(\d+)/(\d+)')
+EPOCH_PATTERN = re.compile(r'epoch\s+(\d+)/(\d+)', re.IGNORECASE)
+LOSS_PATTERN = re.compile(r'(?:avr_loss|loss)[=:]\s*([-+]?\d*\.?\d+(?:[eE][-+]?\d+)?)')
+SPEED_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*(it/s|s/it)')
+
+
+def legacy_parse(line):
+    fields = {}
+    step_match = STEP_PATTERN.search(line)
+    if step_match:
+        fields['step'] = int(step_match.group(1))
+        loss_match = LOSS_PATTERN.search(line)
+        if loss_match:
+            fields['loss'] = float(loss_match.group(1))
+        speed_match = SPEED_PATTERN.search(line)
+        if speed_match:
+            fields['it_per_sec'] = float(speed_match.group(1))
+    epoch_match = EPOCH_PATTERN.search(line)
+    if epoch_match:
+        fields['epoch'] = int(epoch_match.group(1))
+    return fields or None
+
+
+def default_log() -> Path:
+    logs = sorted(Path(__file__).resolve().parent.parent.joinpath("logs", "train_log").glob("*.log"),
+                  key=lambda path: path.stat().st_size)
+    if not logs:
+        sys.exit("No captured training logs found; pass --log")
+    return logs[-1]
+
+
+def build_stream(log_path: Path, repeat: int) -> bytes:
+    """Rebuild raw process output: progress bars end in \\r, other lines in \\n."""
+    lines = log_path.read_text(encoding='utf-8', errors='replace').splitlines()
+    body = lines[next((i for i, line in enumerate(lines) if line.startswith('=' * 20)), -1) + 1:]
+    steps = [line for line in body if line.startswith('steps:')]
+    other = [line for line in body if not line.startswith('steps:')]
+    raw = "".join(line + "\n" for line in other)
+    raw += "".join(line + "\r" for line in steps) * repeat
+    return raw.encode('utf-8')
+
+
+def run_legacy(raw: bytes, directory: Path, console) -> int:
+    count = 0
+    stdout = io.TextIOWrapper(io.BytesIO(raw), encoding='utf-8', newline=None)
+    with open(directory / "legacy.log", 'w', encoding='utf-8') as log_file:
+        for line in stdout:
+            print(line, end='', file=console)
+            log_file.write(line)
+            log_file.flush()
+            legacy_parse(line)
+            count += 1
+    return count
+
+
+def run_pump(raw: bytes, directory: Path, console, metrics: bool = True) -> int:
+    log_path = directory / "pump.log"
+    with open(log_path, 'w', encoding='utf-8') as log_file:
+        return OutputPump(io.BytesIO(raw), log_file,
+                          metrics_path=metrics_path_for(log_path) if metrics else None,
+                          echo=console).run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--log', type=Path, default=None, help='Captured training log to replay')
+    parser.add_argument('--repeat', type=int, default=100, help='Times to replay the progress lines')
+    args = parser.parse_args()
+
+    log_path = args.log or default_log()
+    raw = build_stream(log_path, args.repeat)
+    print(f"Replaying {log_path.name} x{args.repeat} ({len(raw) / 1024 ** 2:.1f} MB)\n")
+
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, 'w') as console:
+        directory = Path(tmp)
+        runners = (
+            ('per-line loop', run_legacy),
+            ('pump, no jsonl', lambda *a: run_pump(*a, metrics=False)),
+            ('pump + jsonl', run_pump),
+        )
+        for name, runner in runners:
+            start = time.perf_counter()
+            lines = runner(raw, directory, console)
+            elapsed = time.perf_counter() - start
+            print(f"{name:<14} {lines:>9} lines {elapsed:>7.2f}s {lines / elapsed:>12,.0f} lines/s")
+        records = sum(1 for _ in open(directory / "pump.metrics.jsonl"))
+        print(f"\nmetrics sidecar: {records} step records")
+
+
+if __name__ == '__main__':
+    main()
@@ -157,10 +157,10 @@ def migrate_simple():
     # Create indexes
     print("\nCreating indexes...")
     indexes = [
-        "CREATE INDEX IF NOT EXISTS idx_executions_status ON executions(status)",
-        "CREATE INDEX IF NOT EXISTS idx_executions_dataset ON executions(dataset_name)",
-        "CREATE INDEX IF NOT EXISTS idx_executions_created ON executions(created_at)",
-        "CREATE INDEX IF NOT EXISTS idx_variations_status ON variations(status)",
+        "CREATE INDEX IF NOT EXISTS idx_exec_created_job ON executions(created_at, job_id)",
+        "CREATE INDEX IF NOT EXISTS idx_exec_status_created_job ON executions(status, created_at, job_id)",
+        "CREATE INDEX IF NOT EXISTS idx_exec_dataset_created_job ON executions(dataset_name, created_at, job_id)",
+        "CREATE INDEX IF NOT EXISTS idx_var_status_created_job ON variations(status, created_at, job_id)",
         "CREATE INDEX IF NOT EXISTS idx_variations_experiment ON variations(experiment_name)",
     ]
     
@@ -53,8 +53,13 @@ from src.config import Config
 # Commented out: daemon runs independently now
 
 
-async def async_main():
-    """Async main entry point with simplified argument handling."""
+async def async_main(argv=None):
+    """
+    Async main entry point with simplified argument handling.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:])
+    """
     # Register signal handler for graceful shutdown
     shutdown_handler = get_shutdown_handler()
     shutdown_handler.register()
@@ -74,7 +79,7 @@ async def async_main():
     
     # Parse arguments using unified system
     try:
-        args = UnifiedArgumentParser.parse_args()
+        args = UnifiedArgumentParser.parse_args(argv)
     except ValueError as e:
         print(f"Error: {e}")
         shutdown_handler.unregister()
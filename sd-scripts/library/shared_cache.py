@@ -0,0 +1,164 @@
+# workspace-level content-addressed cache for latents and text encoder outputs (AutoTrainX)
+#
+# When the config sets `shared_cache_dir`, the latents and text encoder outputs caching strategies look entries up
+# in that directory instead of next to each image, so every job and variation that trains on the same images with
+# the same models and augmentation flags reuses the same .npz files.
+#
+# - latents are keyed by image content + model identity + flip_aug / alpha_mask / random_crop; the bucket
+#   resolution stays in the file name (and in the multi-resolution keys inside the file)
+# - text encoder outputs are keyed by caption text + text encoder identity + encoding options
+# - writes go to a per-process temporary file that is renamed into place, so concurrent jobs never read a
+#   partially written entry
+# - hits touch the file's mtime, which the AutoTrainX side uses for LRU eviction
+
+import hashlib
+import json
+import os
+import shutil
+from typing import Any, Callable, Dict, List, Optional
+
+from library.utils import setup_logging
+
+setup_logging()
+import logging
+
+logger = logging.getLogger(__name__)
+
+LATENTS_DIR = "latents"
+TEXT_ENCODER_DIR = "text_encoder"
+
+LATENTS_IDENTITY_ARGS = ["pretrained_model_name_or_path", "vae", "ae", "flip_aug", "alpha_mask", "random_crop"]
+TEXT_ENCODER_IDENTITY_ARGS = [
+    "pretrained_model_name_or_path",
+    "text_encoder",
+    "clip_l",
+    "clip_g",
+    "t5xxl",
+    "t5xxl_max_token_length",
+    "apply_t5_attn_mask",
+    "apply_lg_attn_mask",
+    "max_token_length",
+    "v2",
+    "v_parameterization",
+    "caption_prefix",
+    "caption_suffix",
+]
+
+_config: Optional[Dict[str, Any]] = None
+_image_digests: Dict[str, str] = {}
+
+
+def _identity(args, names: List[str]) -> Dict[str, Any]:
+    identity = {}
+    for name in names:
+        value = getattr(args, name, None)
+        if isinstance(value, str) and os.path.isfile(value):
+            # a model file replaced in place must not reuse old entries
+            stat = os.stat(value)
+            value = f"{os.path.abspath(value)}:{stat.st_size}:{int(stat.st_mtime)}"
+        identity[name] = value if isinstance(value, (str, int, float, bool, type(None))) else str(value)
+    return identity
+
+
+def configure(args) -> None:
+    """enable the shared cache if the config sets shared_cache_dir"""
+    global _config
+    cache_dir = getattr(args, "shared_cache_dir", None)
+    if not cache_dir:
+        _config = None
+        return
+    _config = {
+        "dir": cache_dir,
+        "latents": json.dumps(_identity(args, LATENTS_IDENTITY_ARGS), sort_keys=True),
+        "text_encoder": json.dumps(_identity(args, TEXT_ENCODER_IDENTITY_ARGS), sort_keys=True),
+        "caption_extension": getattr(args, "caption_extension", None) or ".caption",
+    }
+    logger.info(f"using shared latents / text encoder outputs cache: {cache_dir}")
+
+
+def _image_digest(image_abs_path: str) -> str:
+    digest = _image_digests.get(image_abs_path)
+    if digest is None:
+        sha = hashlib.sha256()
+        with open(image_abs_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                sha.update(chunk)
+        digest = _image_digests[image_abs_path] = sha.hexdigest()
+    return digest
+
+
+def _shared_path(kind: str, key: str, tail: str) -> str:
+    digest = hashlib.sha256((_config[kind] + "\n" + key).encode("utf-8")).hexdigest()[:40]
+    directory = os.path.join(_config["dir"], kind, digest[:2])
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, digest + tail)
+    if os.path.exists(path):
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+    return path
+
+
+def _tail(local_path: str, image_abs_path: str) -> str:
+    # resolution and suffix part of the local name, e.g. "_1024x0768_flux.npz"
+    return local_path[len(os.path.splitext(image_abs_path)[0]) :]
+
+
+def _atomic_cache_batch(cache_batch: Callable, attribute: str) -> Callable:
+    # run the strategy's batch caching against temporary files, then rename them into the cache
+    def wrapper(*args, **kwargs):
+        batch = next((arg for arg in args if isinstance(arg, list) and arg and hasattr(arg[0], attribute)), [])
+        finals = {}
+        for info in batch:
+            final = getattr(info, attribute)
+            if final is None or not final.startswith(_config["dir"]):
+                continue
+            temporary = f"{os.path.splitext(final)[0]}.{os.getpid()}.tmp.npz"
+            if os.path.exists(final):
+                shutil.copyfile(final, temporary)  # latents may add a resolution to an existing file
+            setattr(info, attribute, temporary)
+            finals[id(info)] = (final, temporary)
+        try:
+            return cache_batch(*args, **kwargs)
+        finally:
+            for info in batch:
+                if id(info) not in finals:
+                    continue
+                final, temporary = finals[id(info)]
+                setattr(info, attribute, final)
+                if os.path.exists(temporary):
+                    os.replace(temporary, final)
+
+    return wrapper
+
+
+def install_latents(strategy) -> None:
+    if _config is None or not strategy.cache_to_disk:
+        return
+    get_path = strategy.get_latents_npz_path
+
+    def get_latents_npz_path(absolute_path: str, image_size) -> str:
+        local_path = get_path(absolute_path, image_size)
+        return _shared_path(LATENTS_DIR, _image_digest(absolute_path), _tail(local_path, absolute_path))
+
+    strategy.get_latents_npz_path = get_latents_npz_path
+    strategy.cache_batch_latents = _atomic_cache_batch(strategy.cache_batch_latents, "latents_npz")
+
+
+def install_text_encoder_outputs(strategy) -> None:
+    if _config is None or not strategy.cache_to_disk:
+        return
+    get_path = strategy.get_outputs_npz_path
+
+    def get_outputs_npz_path(image_abs_path: str) -> str:
+        local_path = get_path(image_abs_path)
+        caption_path = os.path.splitext(image_abs_path)[0] + _config["caption_extension"]
+        if not os.path.isfile(caption_path):
+            return local_path  # caption comes from class tokens or metadata: keep the per-image cache
+        with open(caption_path, "r", encoding="utf-8") as f:
+            caption = f.read().strip()
+        return _shared_path(TEXT_ENCODER_DIR, caption, _tail(local_path, image_abs_path))
+
+    strategy.get_outputs_npz_path = get_outputs_npz_path
+    strategy.cache_batch_outputs = _atomic_cache_batch(strategy.cache_batch_outputs, "text_encoder_outputs_npz")
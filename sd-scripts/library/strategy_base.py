@@ -12,6 +12,7 @@ from transformers import CLIPTokenizer, CLIPTextModel, CLIPTextModelWithProjecti
 # TODO remove circular import by moving ImageInfo to a separate file
 # from library.train_util import ImageInfo
 
+from library import shared_cache
 from library.utils import setup_logging
 
 setup_logging()
@@ -340,6 +341,7 @@ class TextEncoderOutputsCachingStrategy:
     def set_strategy(cls, strategy):
         if cls._strategy is not None:
             raise RuntimeError(f"Internal error. {cls.__name__} strategy is already set")
+        shared_cache.install_text_encoder_outputs(strategy)
         cls._strategy = strategy
 
     @classmethod
@@ -391,6 +393,7 @@ class LatentsCachingStrategy:
     def set_strategy(cls, strategy):
         if cls._strategy is not None:
             raise RuntimeError(f"Internal error. {cls.__name__} strategy is already set")
+        shared_cache.install_latents(strategy)
         cls._strategy = strategy
 
     @classmethod
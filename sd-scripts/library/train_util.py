@@ -60,7 +60,7 @@ from diffusers import (
     KDPM2AncestralDiscreteScheduler,
     AutoencoderKL,
 )
-from library import custom_train_functions, sd3_utils
+from library import custom_train_functions, sd3_utils, shared_cache
 from library.original_unet import UNet2DConditionModel
 from huggingface_hub import hf_hub_download
 import numpy as np
@@ -4668,6 +4668,9 @@ def read_config_from_file(args: argparse.Namespace, parser: argparse.ArgumentPar
     args = parser.parse_args(namespace=config_args)
     args.config_file = os.path.splitext(args.config_file)[0]
 
+    # AutoTrainX: shared latents / text encoder outputs cache
+    shared_cache.configure(args)
+
     return args
 
 
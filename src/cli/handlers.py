@@ -12,6 +12,7 @@ from src.pipeline.pipeline import AutoTrainPipeline
 from src.cli.formatter import ResultFormatter
 from src.training.trainer import SDScriptsTrainer
 from src.scripts.preset_manager import get_preset_info
+from src.utils.dataset_scanner import get_dataset_scanner
 
 
 class CommandHandlers:
@@ -108,28 +109,16 @@ class CommandHandlers:
         return 0
     
     def _scan_for_datasets(self, source_dir: Path, args) -> List[Dict[str, Any]]:
-        """Scan directory for valid dataset subdirectories."""
-        batch_datasets = []
-        
-        for subdir in source_dir.iterdir():
-            if subdir.is_dir() and not subdir.name.startswith('.'):
-                # Check if it contains images (basic dataset validation)
-                if self._has_images(subdir):
-                    batch_datasets.append({
-                        'source_path': str(subdir),
-                        'repeats': args.repeats,
-                        'class_name': args.class_name
-                    })
-        
-        return batch_datasets
-    
-    def _has_images(self, directory: Path) -> bool:
-        """Check if directory contains image files."""
-        image_extensions = ['.jpg', '.jpeg', '.png', '.webp']
-        for ext in image_extensions:
-            if list(directory.glob(f'*{ext}')):
-                return True
-        return False
+        """Scan directory for valid dataset subdirectories (those containing images)."""
+        listings = get_dataset_scanner(str(self.pipeline.base_path)).scan(source_dir, max_depth=0)
+        return [
+            {
+                'source_path': str(listing.path),
+                'repeats': args.repeats,
+                'class_name': args.class_name
+            }
+            for listing in listings
+        ]
     
     def _parse_variations(self, variations_args: List[str]) -> Dict[str, List[Any]]:
         """Parse variation arguments into a dictionary."""
@@ -32,6 +32,7 @@ class Operation(Enum):
     DB_STATS = "db-stats"
     CLEAR_DB = "clear-db"
     CLEANUP_STALE = "cleanup-stale"
+    CACHE_STATS = "cache-stats"
     # Path profile operations
     LIST_PROFILES = "list-profiles"
     SAVE_PROFILE = "save-profile"
@@ -60,6 +61,9 @@ class UnifiedArgs:
     
     # Mode-specific arguments
     variations: Optional[Dict[str, List[Any]]] = None
+    search: str = "grid"  # Variations search: grid or halving
+    halving_eta: int = 3
+    halving_metric: str = "smoothed"
     parallel: bool = False
     continue_on_error: bool = False
     
@@ -100,6 +104,7 @@ class UnifiedArgs:
     limit: int = 20
     filter_status: Optional[str] = None
     filter_dataset: Optional[str] = None
+    cursor: Optional[str] = None
     
 
 class UnifiedArgumentParser:
@@ -123,6 +128,10 @@ Examples:
   python main.py --train --mode variations --source /home/eqx/datasets/1/b09g13 --preset FluxLORA \\
          --variations network_dim=32,64,128 network_alpha=16,32
   
+  # Prune weak variations early with successive halving
+  python main.py --train --mode variations --source b09g13 --preset FluxLORA \\
+         --variations learning_rate=1e-4,2e-4,4e-4 network_dim=16,32,64 --search halving
+  
   # Just prepare dataset without training
   python main.py --prepare --single --source /home/eqx/datasets/1/b09g13
   
@@ -247,6 +256,13 @@ Examples:
             dest='operation',
             help='Clean up stale processes that are stuck in active states'
         )
+        parser.add_argument(
+            '--cache-stats',
+            action='store_const',
+            const=Operation.CACHE_STATS,
+            dest='operation',
+            help='Show shared latents / text encoder outputs cache statistics'
+        )
         
         # Mode selection (shortcuts for common modes)
         mode_group = parser.add_mutually_exclusive_group()
@@ -296,6 +312,24 @@ Examples:
             type=str,
             help='Parameter variations: param=val1,val2,val3'
         )
+        parser.add_argument(
+            '--search',
+            choices=['grid', 'halving'],
+            default='grid',
+            help='Variations search: train every combination (grid) or prune by loss with successive halving'
+        )
+        parser.add_argument(
+            '--halving-eta',
+            type=int,
+            default=3,
+            help='Successive halving: keep the best 1/eta variations per rung (default: 3)'
+        )
+        parser.add_argument(
+            '--halving-metric',
+            choices=['final', 'smoothed'],
+            default='smoothed',
+            help='Successive halving: rank by final or smoothed training loss (default: smoothed)'
+        )
         
         # Batch mode arguments
         parser.add_argument(
@@ -447,7 +481,7 @@ Examples:
             dest='filter_status',
             type=str,
             choices=['pending', 'in_queue', 'preparing_dataset', 'configuring_preset', 
-                    'ready_for_training', 'training', 'generating_preview', 'done', 'failed', 'cancelled'],
+                    'ready_for_training', 'training', 'generating_preview', 'done', 'failed', 'cancelled', 'pruned'],
             help='Filter results by status'
         )
         parser.add_argument(
@@ -456,6 +490,12 @@ Examples:
             type=str,
             help='Filter results by dataset name'
         )
+        parser.add_argument(
+            '--cursor',
+            dest='cursor',
+            type=str,
+            help='Continue job history after a previous page (printed below each page)'
+        )
         
         return parser
     
@@ -518,6 +558,9 @@ Examples:
             mode=mode,
             base_path=base_path,
             variations=variations,
+            search=parsed.search,
+            halving_eta=parsed.halving_eta,
+            halving_metric=parsed.halving_metric,
             parallel=parsed.parallel,
             continue_on_error=parsed.continue_on_error,
             repeats=parsed.repeats,
@@ -538,6 +581,7 @@ Examples:
             limit=parsed.limit if hasattr(parsed, 'limit') else 20,
             filter_status=parsed.filter_status if hasattr(parsed, 'filter_status') else None,
             filter_dataset=parsed.filter_dataset if hasattr(parsed, 'filter_dataset') else None,
+            cursor=parsed.cursor if hasattr(parsed, 'cursor') else None,
             custom_path=parsed.custom_path if hasattr(parsed, 'custom_path') else None,
             save_profile=parsed.save_profile if hasattr(parsed, 'save_profile') else None,
             use_profile=parsed.use_profile if hasattr(parsed, 'use_profile') else None,
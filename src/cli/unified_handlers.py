@@ -3,14 +3,20 @@ Simplified command handlers using the unified argument system.
 """
 
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 
 from src.pipeline.pipeline import AutoTrainPipeline
 from src.cli.formatter import ResultFormatter
 from src.cli.unified_args import UnifiedArgs, Operation, Mode
 from src.training import get_trainer
+from src.training.scheduler import DeviceInventory, TrainingScheduler, TrainingTask
+from src.training.successive_halving import SuccessiveHalvingSearch
+from src.pipeline.strategies import PipelinedBatchExecutor
+from src.pipeline.utils.shared_pipeline_utils import format_stage_timings
 from src.scripts.preset_manager import get_preset_info
 from src.utils.path_manager import PathManager, PathProfile
+from src.utils.training_cache import get_training_cache
+from src.utils.dataset_scanner import get_dataset_scanner
 from src.config import Config
 
 
@@ -42,6 +48,7 @@ class UnifiedCommandHandler:
             Operation.DB_STATS: self._handle_db_stats,
             Operation.CLEAR_DB: self._handle_clear_db,
             Operation.CLEANUP_STALE: self._handle_cleanup_stale,
+            Operation.CACHE_STATS: self._handle_cache_stats,
             Operation.LIST_PROFILES: self._handle_list_profiles,
             Operation.SAVE_PROFILE: self._handle_save_profile,
             Operation.DELETE_PROFILE: self._handle_delete_profile,
@@ -57,6 +64,16 @@ class UnifiedCommandHandler:
     
     def _handle_train(self, args: UnifiedArgs) -> int:
         """Handle training operation (includes preparation)."""
+        # Keep the shared latents / text encoder cache within its size bound
+        try:
+            get_training_cache(str(self.pipeline.base_path)).evict()
+        except OSError as e:
+            print(f"Warning: Could not evict training cache entries: {e}")
+        
+        # Sequential batch runs overlap preparation, training and hooks
+        if args.mode == Mode.BATCH and not args.parallel:
+            return self._train_batch_pipelined(args)
+        
         # First prepare the dataset
         prepare_result = self._prepare_dataset(args)
         
@@ -471,108 +488,97 @@ class UnifiedCommandHandler:
         return 0 if success else 1
     
     def _train_batch(self, args: UnifiedArgs, prepare_result, trainer) -> int:
-        """Train multiple datasets in batch."""
+        """Train multiple datasets in batch, concurrently when devices allow."""
         preset_info = get_preset_info(args.preset)
         if not preset_info:
             print(f"Error: Preset '{args.preset}' not found")
             return 1
         
-        total_success = True
+        tasks = []
+        total_datasets = len(prepare_result.results)
         
-        # Iterate through results dictionary
-        for dataset_name, dataset_result in prepare_result.results.items():
+        for current_idx, (dataset_name, dataset_result) in enumerate(prepare_result.results.items(), 1):
             if dataset_result.success:
-                # Get the actual config path from dataset result
-                config_path = None
-                if dataset_result.configs and len(dataset_result.configs) > 0:
-                    for config in dataset_result.configs:
-                        if preset_info.name in config:
-                            config_path = Path(config)
-                            break
-                
-                if config_path and config_path.exists():
-                    toml_path = config_path
-                else:
-                    # Fallback to old behavior
-                    toml_path = self.pipeline.base_path / "workspace" / "Presets" / preset_info.name / f"{dataset_name}_{preset_info.name}.toml"
-                
-                if toml_path.exists():
-                    # Extract job_id from TOML config
-                    job_id = None
-                    try:
-                        import toml
-                        with open(toml_path, 'r') as f:
-                            config = toml.load(f)
-                            job_id = config.get('job_id')
-                    except Exception:
-                        pass
-                    
-                    # Get current and total for batch mode
-                    current_idx = list(prepare_result.results.keys()).index(dataset_name) + 1
-                    total_datasets = len(prepare_result.results)
-                    
-                    success = trainer.execute_training(toml_path, preset_info, dataset_name, job_id, 
-                                                     mode="batch", current=current_idx, total=total_datasets)
-                    
-                    # Execute post-training hooks if training was successful
-                    if success and hasattr(self.pipeline, 'execute_hooks'):
-                        # Update status to GENERATING_PREVIEW if preview is requested
-                        if job_id and args.preview and args.preview > 0:
-                            from src.utils.job_tracker import get_tracker
-                            from src.database import ExecutionStatus
-                            tracker = get_tracker()
-                            tracker.update_status(job_id, ExecutionStatus.GENERATING_PREVIEW)
-                        
-                        hook_context = {
-                            'success': True,  # FileMoveHook checks for this field
-                            'training_success': True,  # Keep for backward compatibility
-                            'dataset_name': dataset_name,
-                            'preset': args.preset,
-                            'model_type': args.preset,
-                            'preview_count': args.preview or 0,
-                            'job_id': job_id,
-                            'mode': 'batch',
-                            'config_path': str(toml_path),
-                            'preview_enabled': bool(args.preview and args.preview > 0)
-                        }
-                        
-                        try:
-                            hook_results = self.pipeline.execute_hooks('post_training', hook_context)
-                            
-                            # Display file move results to user (compact for batch mode)
-                            self._display_hook_results(hook_results, args.json, compact=True)
-                            
-                            # Update to DONE after successful preview (or if no preview)
-                            if job_id:
-                                tracker.update_status(job_id, ExecutionStatus.DONE)
-                                # Update output path with exact model file
-                                self._update_model_path(job_id, dataset_name, preset_info.name)
-                                
-                        except Exception as e:
-                            # If preview generation fails, still mark as done (training succeeded)
-                            if job_id:
-                                tracker.update_status(job_id, ExecutionStatus.DONE)
-                            import logging
-                            logging.error(f"Preview generation failed for {dataset_name}: {e}")
-                    else:
-                        # Training failed, status already updated by trainer
-                        pass
-                    
-                    if not success:
-                        total_success = False
-                        if not args.continue_on_error:
-                            return 1
-                else:
-                    print(f"Warning: Configuration file not found for {dataset_name}, skipping")
+                task = self._batch_task(args, preset_info, current_idx, total_datasets,
+                                        dataset_name, dataset_result)
+                if task:
+                    tasks.append(task)
+        
+        results = self._schedule_training(args, tasks, stop_on_error=not args.continue_on_error)
+        return 0 if all(results.values()) else 1
+    
+    def _train_batch_pipelined(self, args: UnifiedArgs) -> int:
+        """Prepare and train a batch with preparation, training and hooks overlapped."""
+        preset_info = get_preset_info(args.preset)
+        if not preset_info:
+            print(f"Error: Preset '{args.preset}' not found")
+            return 1
+        
+        source_dir = Path(args.source)
+        batch_datasets = self._scan_for_datasets(source_dir, args)
+        if not batch_datasets:
+            self.formatter.print_result_summary(
+                self._create_error_result(f"No valid datasets found in {source_dir}"))
+            return 1
+        
+        total_datasets = len(batch_datasets)
+        executor = PipelinedBatchExecutor(self._make_scheduler(args))
+        try:
+            result = executor.run(
+                self.pipeline.iter_batch(batch_datasets, args.continue_on_error, args.preset),
+                make_task=lambda current_idx, dataset_name, dataset_result: self._batch_task(
+                    args, preset_info, current_idx, total_datasets, dataset_name, dataset_result),
+                on_complete=lambda task, success: self._post_training(args, task, success),
+                stop_on_error=not args.continue_on_error
+            )
+        except ValueError as e:
+            self.formatter.print_result_summary(self._create_error_result(str(e)))
+            return 1
         
-        return 0 if total_success else 1
+        if not args.json:
+            print()
+            print(format_stage_timings(result.timings))
+        return 0 if result.success else 1
+    
+    def _batch_task(self, args: UnifiedArgs, preset_info, current_idx: int, total_datasets: int,
+                    dataset_name: str, dataset_result) -> Optional[TrainingTask]:
+        """Build the training task for a prepared batch dataset, or None if it has no config."""
+        # Get the actual config path from dataset result
+        config_path = None
+        if dataset_result.configs and len(dataset_result.configs) > 0:
+            for config in dataset_result.configs:
+                if preset_info.name in config:
+                    config_path = Path(config)
+                    break
+        
+        if config_path and config_path.exists():
+            toml_path = config_path
+        else:
+            # Fallback to old behavior
+            toml_path = self.pipeline.base_path / "workspace" / "Presets" / preset_info.name / f"{dataset_name}_{preset_info.name}.toml"
+        
+        if not toml_path.exists():
+            print(f"Warning: Configuration file not found for {dataset_name}, skipping")
+            return None
+        
+        return TrainingTask(
+            key=dataset_name,
+            toml_path=toml_path,
+            preset_info=preset_info,
+            dataset_name=dataset_name,
+            job_id=self._read_job_id(toml_path),
+            mode="batch",
+            current=current_idx,
+            total=total_datasets,
+            metadata={'preset': args.preset}
+        )
     
     def _train_variations(self, args: UnifiedArgs, prepare_result, trainer) -> int:
-        """Train all variations."""
-        total_success = True
+        """Train all variations, concurrently when devices allow."""
+        tasks = []
+        total_variations = len(prepare_result.results)
         
-        # Iterate through results dictionary for variations
-        for variation_name, variation_result in prepare_result.results.items():
+        for current_idx, (variation_name, variation_result) in enumerate(prepare_result.results.items(), 1):
             if variation_result.success:
                 # Get the first config path from the configs list
                 if variation_result.configs:
@@ -582,105 +588,149 @@ class UnifiedCommandHandler:
                     preset_info = get_preset_info(preset_name)
                     
                     if preset_info and config_path.exists():
-                        # Extract job_id from TOML config
-                        job_id = None
-                        try:
-                            import toml
-                            with open(config_path, 'r') as f:
-                                config = toml.load(f)
-                                job_id = config.get('job_id')
-                        except Exception:
-                            pass
-                        
-                        # Get current and total for variations mode
-                        current_idx = list(prepare_result.results.keys()).index(variation_name) + 1
-                        total_variations = len(prepare_result.results)
-                        
-                        # Extract experiment name and variation parameters from metadata
-                        experiment_name = variation_result.metadata.get('experiment_name', None)
-                        variation_params = variation_result.metadata.get('variation_params', None)
-                        
-                        success = trainer.execute_training(config_path, preset_info, variation_name, job_id,
-                                                         mode="variations", current=current_idx, total=total_variations,
-                                                         experiment_name=experiment_name, variation_params=variation_params)
-                        
-                        # Execute post-training hooks if training was successful
-                        if success and hasattr(self.pipeline, 'execute_hooks'):
-                            # Update status to GENERATING_PREVIEW if preview is requested
-                            if job_id and args.preview and args.preview > 0:
-                                from src.utils.job_tracker import get_tracker
-                                from src.database import ExecutionStatus
-                                tracker = get_tracker()
-                                tracker.update_status(job_id, ExecutionStatus.GENERATING_PREVIEW)
-                            
-                            # Extract variation_id from metadata
-                            variation_id = variation_result.metadata.get('variation_id', None)
-                            
-                            hook_context = {
-                                'success': True,  # FileMoveHook checks for this field
-                                'training_success': True,  # Keep for backward compatibility
-                                'dataset_name': variation_name,
+                        tasks.append(TrainingTask(
+                            key=variation_name,
+                            toml_path=config_path,
+                            preset_info=preset_info,
+                            dataset_name=variation_name,
+                            job_id=self._read_job_id(config_path),
+                            mode="variations",
+                            current=current_idx,
+                            total=total_variations,
+                            experiment_name=variation_result.metadata.get('experiment_name', None),
+                            variation_params=variation_result.metadata.get('variation_params', None),
+                            metadata={
                                 'preset': preset_name,
-                                'model_type': preset_name,
-                                'preview_count': args.preview or 0,
-                                'variation_id': variation_id,  # Add variation_id to context
-                                'job_id': job_id,
-                                'mode': 'variations',
-                                'experiment_name': variation_name,
-                                'config_path': str(config_path),
-                                'preview_enabled': bool(args.preview and args.preview > 0)
+                                'variation_id': variation_result.metadata.get('variation_id', None)
                             }
-                            
-                            try:
-                                hook_results = self.pipeline.execute_hooks('post_training', hook_context)
-                                
-                                # Display file move results to user (compact for variations mode)
-                                self._display_hook_results(hook_results, args.json, compact=True)
-                                
-                                # Update to DONE after successful preview (or if no preview)
-                                if job_id:
-                                    tracker.update_status(job_id, ExecutionStatus.DONE)
-                                    # Update output path with exact model file for variations
-                                    self._update_variation_model_path(job_id, variation_name)
-                                    
-                            except Exception as e:
-                                # If preview generation fails, still mark as done (training succeeded)
-                                if job_id:
-                                    tracker.update_status(job_id, ExecutionStatus.DONE)
-                                import logging
-                                logging.error(f"Preview generation failed for {variation_name}: {e}")
-                        else:
-                            # Training failed, status already updated by trainer
-                            pass
-                        
-                        if not success:
-                            total_success = False
+                        ))
+        
+        if args.search == 'halving':
+            return self._train_variations_halving(args, tasks)
         
-        return 0 if total_success else 1
+        results = self._schedule_training(args, tasks)
+        return 0 if all(results.values()) else 1
     
-    def _scan_for_datasets(self, source_dir: Path, args: UnifiedArgs) -> List[Dict[str, Any]]:
-        """Scan directory for valid dataset subdirectories."""
-        batch_datasets = []
-        
-        for subdir in source_dir.iterdir():
-            if subdir.is_dir() and not subdir.name.startswith('.'):
-                # Check if it contains images
-                if self._has_images(subdir):
-                    batch_datasets.append({
-                        'source_path': str(subdir),
-                        'repeats': args.repeats,
-                        'class_name': args.class_name
-                    })
-        
-        return batch_datasets
+    def _train_variations_halving(self, args: UnifiedArgs, tasks: List[TrainingTask]) -> int:
+        """Train variations with successive halving, pruning the weakest after each rung."""
+        experiment_path = None
+        variation_id = tasks[0].metadata.get('variation_id') if tasks else None
+        if variation_id:
+            if self.pipeline.config.path_manager:
+                variations_base = self.pipeline.config.path_manager.get_variations_base_path()
+            else:
+                variations_base = self.pipeline.base_path / "workspace" / "variations"
+            experiment_path = variations_base / f"exp_{variation_id}" / "experiment.json"
+        
+        search = SuccessiveHalvingSearch(
+            lambda: self._make_scheduler(args),
+            self.pipeline.base_path,
+            eta=args.halving_eta,
+            metric=args.halving_metric
+        )
+        results = search.run(
+            tasks,
+            on_complete=lambda task, success: self._post_training(args, task, success),
+            experiment_path=experiment_path
+        )
+        
+        trained = sum(1 for result in results.values() if result)
+        pruned = sum(1 for result in results.values() if result is None)
+        failed = len(results) - trained - pruned
+        print(f"\nSuccessive halving: {trained} trained to full budget, {pruned} pruned, {failed} failed")
+        return 0 if failed == 0 else 1
+    
+    def _read_job_id(self, toml_path: Path) -> Optional[str]:
+        """Extract job_id from a TOML training config."""
+        try:
+            import toml
+            with open(toml_path, 'r') as f:
+                return toml.load(f).get('job_id')
+        except Exception:
+            return None
+    
+    def _schedule_training(self, args: UnifiedArgs, tasks: List[TrainingTask],
+                           stop_on_error: bool = False) -> Dict[str, bool]:
+        """Run training tasks on the configured devices and post-process each one."""
+        return self._make_scheduler(args).run(
+            tasks,
+            on_complete=lambda task, success: self._post_training(args, task, success),
+            stop_on_error=stop_on_error
+        )
+    
+    def _make_scheduler(self, args: UnifiedArgs) -> TrainingScheduler:
+        """Create a training scheduler over the configured device inventory."""
+        show_progress = not args.raw_output if hasattr(args, 'raw_output') else None
+        return TrainingScheduler(
+            lambda: get_trainer(self.pipeline.base_path, show_progress),
+            DeviceInventory.from_config(str(self.pipeline.base_path))
+        )
+    
+    def _post_training(self, args: UnifiedArgs, task: TrainingTask, success: bool) -> None:
+        """Run post-training hooks (previews, file moves) and mark the job done."""
+        # Training failed: status already updated by trainer
+        if not success or not hasattr(self.pipeline, 'execute_hooks'):
+            return
+        
+        from src.utils.job_tracker import get_tracker
+        from src.database import ExecutionStatus
+        tracker = get_tracker()
+        job_id = task.job_id
+        preset_name = task.metadata.get('preset', task.preset_info.name)
+        
+        # Update status to GENERATING_PREVIEW if preview is requested
+        if job_id and args.preview and args.preview > 0:
+            tracker.update_status(job_id, ExecutionStatus.GENERATING_PREVIEW)
+        
+        hook_context = {
+            'success': True,  # FileMoveHook checks for this field
+            'training_success': True,  # Keep for backward compatibility
+            'dataset_name': task.dataset_name,
+            'preset': preset_name,
+            'model_type': preset_name,
+            'preview_count': args.preview or 0,
+            'job_id': job_id,
+            'mode': task.mode,
+            'config_path': str(task.toml_path),
+            'preview_enabled': bool(args.preview and args.preview > 0)
+        }
+        if task.mode == 'variations':
+            hook_context['variation_id'] = task.metadata.get('variation_id')
+            hook_context['experiment_name'] = task.dataset_name
+        
+        try:
+            hook_results = self.pipeline.execute_hooks('post_training', hook_context)
+            
+            # Display file move results to user (compact for batch/variations modes)
+            self._display_hook_results(hook_results, args.json, compact=True)
+            
+            # Update to DONE after successful preview (or if no preview)
+            if job_id:
+                tracker.update_status(job_id, ExecutionStatus.DONE)
+                # Update output path with exact model file
+                if task.mode == 'variations':
+                    self._update_variation_model_path(job_id, task.dataset_name)
+                else:
+                    self._update_model_path(job_id, task.dataset_name, task.preset_info.name)
+                
+        except Exception as e:
+            # If preview generation fails, still mark as done (training succeeded)
+            if job_id:
+                tracker.update_status(job_id, ExecutionStatus.DONE)
+            import logging
+            logging.error(f"Preview generation failed for {task.dataset_name}: {e}")
     
-    def _has_images(self, directory: Path) -> bool:
-        """Check if directory contains image files."""
-        image_extensions = ['.jpg', '.jpeg', '.png', '.webp']
-        for ext in image_extensions:
-            if list(directory.glob(f'*{ext}')):
-                return True
-        return False
+    def _scan_for_datasets(self, source_dir: Path, args: UnifiedArgs) -> List[Dict[str, Any]]:
+        """Scan directory for valid dataset subdirectories (those containing images)."""
+        listings = get_dataset_scanner(str(self.pipeline.base_path)).scan(source_dir, max_depth=0)
+        return [
+            {
+                'source_path': str(listing.path),
+                'repeats': args.repeats,
+                'class_name': args.class_name
+            }
+            for listing in listings
+        ]
     
     def _create_error_result(self, error_message: str):
         """Create an error result object."""
@@ -711,15 +761,17 @@ class UnifiedCommandHandler:
                 print(f"Invalid status: {args.filter_status}")
                 return 1
         
-        # Get recent jobs
-        jobs = tracker.get_recent_jobs(limit=args.limit)
-        
-        # Apply filters
-        if args.filter_dataset:
-            jobs = [j for j in jobs if j.get('dataset_name', '').lower() == args.filter_dataset.lower()]
-        
-        if status_filter:
-            jobs = [j for j in jobs if j.get('status') == status_filter.value]
+        # Get one page of jobs, filtered by the database
+        try:
+            jobs, next_cursor = tracker.list_jobs(
+                limit=args.limit,
+                status=status_filter.value if status_filter else None,
+                dataset_name=args.filter_dataset,
+                cursor=args.cursor
+            )
+        except ValueError as e:
+            print(str(e))
+            return 1
         
         if args.json:
             print(json.dumps(jobs, indent=2))
@@ -776,6 +828,7 @@ class UnifiedCommandHandler:
                     'preparing_dataset': '\033[94m',   # Blue
                     'configuring_preset': '\033[95m',  # Magenta
                     'generating_preview': '\033[93m',  # Yellow
+                    'pruned': '\033[90m',    # Gray
                 }
                 color = status_colors.get(status, '')
                 reset = '\033[0m' if color else ''
@@ -791,11 +844,15 @@ class UnifiedCommandHandler:
                     'configuring_preset': 'Configuring preset',
                     'generating_preview': 'Generating preview',
                     'in_queue': 'In queue',
-                    'cancelled': 'Cancelled'
+                    'cancelled': 'Cancelled',
+                    'pruned': 'Pruned'
                 }
                 display_status = status_display.get(status, status)
                 
                 print(f"{job_id:<10} {color}{display_status:<20}{reset} {job_type:<12} {dataset:<25} {preset:<15} {duration_str:<10} {created_str:<20}")
+            
+            if next_cursor:
+                print(f"\nMore jobs: add --cursor {next_cursor}")
         
         return 0
     
@@ -924,6 +981,38 @@ class UnifiedCommandHandler:
         
         return 0
     
+    def _handle_cache_stats(self, args: UnifiedArgs) -> int:
+        """Handle shared training cache statistics display."""
+        import json
+        
+        stats = get_training_cache(str(self.pipeline.base_path)).get_stats()
+        
+        if args.json:
+            print(json.dumps(stats, indent=2))
+            return 0
+        
+        def size(value: int) -> str:
+            return f"{value / 1024 ** 3:.2f} GB" if value >= 1024 ** 3 else f"{value / 1024 ** 2:.1f} MB"
+        
+        def age(seconds) -> str:
+            if seconds is None:
+                return "N/A"
+            return f"{seconds / 3600:.1f}h ago" if seconds >= 3600 else f"{seconds / 60:.0f}m ago"
+        
+        print("\n\033[1mTraining Cache Statistics\033[0m\n")
+        print(f"Path:                 {stats['path']}")
+        usage = stats['bytes'] / stats['max_bytes'] * 100 if stats['max_bytes'] else 0
+        print(f"Size:                 {size(stats['bytes'])} of {size(stats['max_bytes'])} ({usage:.0f}%)")
+        print(f"Entries:              {stats['entries']}")
+        for kind, kind_stats in stats['kinds'].items():
+            print(f"\n{kind.replace('_', ' ').title()}:")
+            print(f"  {'entries':<20} {kind_stats['entries']}")
+            print(f"  {'size':<20} {size(kind_stats['bytes'])}")
+            print(f"  {'last used':<20} {age(kind_stats['newest_use_seconds'])}")
+            print(f"  {'least recently used':<20} {age(kind_stats['oldest_use_seconds'])}")
+        
+        return 0
+    
     def _handle_clear_db(self, args: UnifiedArgs) -> int:
         """Handle database clearing with confirmation."""
         from src.database import DatabaseManager
@@ -221,6 +221,55 @@ class Config:
         Config.save_config(config, base_path)
         print(f"✓ Training progress setting saved: {'progress bar' if show_progress else 'raw logs'}")
     
+    @staticmethod
+    def get_training_devices(base_path: Optional[str] = None) -> list:
+        """Get the declared training device inventory.
+
+        Configured in config.json as, for example:
+            "training_devices": [{"id": "0", "slots": 2}, {"id": "1", "slots": 1}]
+        where slots is the number of LoRA jobs a device may run at once.
+
+        Args:
+            base_path: Optional base path override
+
+        Returns:
+            List of device dictionaries (empty if not configured)
+        """
+        config = Config.load_config(base_path)
+        return config.get('training_devices', [])
+
+    @staticmethod
+    def get_training_cache_max_gb(base_path: Optional[str] = None) -> float:
+        """Get the size bound of the shared latents / text encoder outputs cache.
+        
+        Configured in config.json as "training_cache_max_gb" (default 50).
+        
+        Args:
+            base_path: Optional base path override
+            
+        Returns:
+            Maximum cache size in GB
+        """
+        config = Config.load_config(base_path)
+        return float(config.get('training_cache_max_gb', 50))
+    
+    @staticmethod
+    def get_dataset_staging(base_path: Optional[str] = None) -> str:
+        """Get how dataset preparation places files in the workspace.
+        
+        Configured in config.json as "dataset_staging": one of "auto"
+        (default: reflink, then hardlink, then copy), "reflink", "hardlink",
+        "symlink" or "copy".
+        
+        Args:
+            base_path: Optional base path override
+            
+        Returns:
+            Staging strategy name
+        """
+        config = Config.load_config(base_path)
+        return config.get('dataset_staging', 'auto')
+    
     @staticmethod
     def get_custom_output_path(base_path: Optional[str] = None) -> Optional[str]:
         """Get the custom output path if configured.
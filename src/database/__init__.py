@@ -4,7 +4,7 @@ from .enums import ExecutionStatus, PipelineMode
 
 # Import v2 modules with backward compatibility
 try:
-    from .models_v2 import Execution, Variation, Base
+    from .models_v2 import Execution, Variation, TrainingMetric, JobProcess, Base
     from .manager_v2 import DatabaseManager
     from .enhanced_manager_v2 import EnhancedDatabaseManager
     from .connection_pool_v2 import PooledDatabaseManager, ConnectionMonitor
@@ -14,7 +14,7 @@ try:
     from .schema_improvements_v2 import SchemaOptimizer
 except ImportError:
     # Fallback to original modules if v2 not available
-    from .models import Execution, Variation, Base
+    from .models import Execution, Variation, TrainingMetric, JobProcess, Base
     from .manager import DatabaseManager
     from .enhanced_manager import EnhancedDatabaseManager
     from .connection_pool import PooledDatabaseManager, ConnectionMonitor
@@ -39,6 +39,8 @@ __all__ = [
     # Models
     'Execution',
     'Variation',
+    'TrainingMetric',
+    'JobProcess',
     'Base',
     
     # Managers
@@ -0,0 +1,188 @@
+"""
+Streaming bulk copy of the job database between SQLite and PostgreSQL.
+
+Rows are read through a streaming cursor (a server-side cursor on
+PostgreSQL) in chunks of ``chunk_size`` and written with the target
+dialect's bulk path: ``COPY FROM STDIN`` on PostgreSQL, one executemany per
+chunk on SQLite. The whole load is one target transaction, and at most one
+chunk is held in memory, so memory use does not grow with the table size.
+
+The jobs/rollup triggers are dropped for the load and the derived tables
+rebuilt once at the end (see job_rollup.rebuild_job_rollup), instead of
+firing several trigger statements per copied row.
+
+Usage:
+    BulkTransfer(sqlite_engine, postgres_engine).run()
+    export_to_sqlite(postgres_engine, Path('DB/executions_view.db'))
+"""
+
+import logging
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import column, inspect, select, table as sql_table, text
+from sqlalchemy.engine import Connection, Engine
+
+from .factory import DatabaseConfig, DatabaseFactory
+from .job_rollup import drop_job_rollup, rebuild_job_rollup
+from .models_v2 import Base
+from .pagination import count_rows
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 10000
+
+# Copied tables, parents before children (models references model_paths).
+# jobs and job_stats_rollup are rebuilt from executions and variations;
+# job_processes describes processes of the source host and is not copied.
+TRANSFER_TABLES = [
+    'executions', 'variations', 'training_metrics', 'job_summary_cache', 'model_paths', 'models',
+]
+
+# Source column names of older schemas, per table and current column
+LEGACY_COLUMNS = {
+    'models': {'model_metadata': 'metadata'},
+}
+
+# progress(table_name, rows_copied, rows_total)
+ProgressCallback = Callable[[str, int, int], None]
+
+
+class BulkTransfer:
+    """Copies the job tables from one database to another in streamed chunks."""
+
+    def __init__(self, source_engine: Engine, target_engine: Engine,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 progress: Optional[ProgressCallback] = None):
+        """Initialize the transfer.
+
+        Args:
+            source_engine: Engine to read from
+            target_engine: Engine to write to; its tables must exist
+            chunk_size: Rows fetched and written per round trip
+            progress: Called after every chunk; logs the row rate if None
+        """
+        self.source_engine = source_engine
+        self.target_engine = target_engine
+        self.source_dialect = DatabaseFactory.get_dialect(source_engine.dialect.name)
+        self.target_dialect = DatabaseFactory.get_dialect(target_engine.dialect.name)
+        self.chunk_size = chunk_size
+        self.progress = progress
+
+    def run(self, tables: Optional[List[str]] = None, replace: bool = False) -> Dict[str, int]:
+        """Copy tables in one target transaction, then rebuild jobs and the rollup.
+
+        Rows are appended to an empty target table; into a non-empty one they
+        are upserted by primary key.
+
+        Args:
+            tables: Tables to copy (TRANSFER_TABLES by default); tables
+                missing from the source are skipped
+            replace: Empty the target tables first
+
+        Returns:
+            Dictionary of rows copied per table
+        """
+        source_tables = set(inspect(self.source_engine).get_table_names())
+        tables = [name for name in (tables or TRANSFER_TABLES) if name in source_tables]
+
+        copied = {}
+        with self.target_engine.begin() as target:
+            for statement in self.target_dialect.get_bulk_load_statements():
+                target.execute(text(statement))
+            drop_job_rollup(target, self.target_dialect)
+            if replace:
+                for table_name in reversed(tables):
+                    target.execute(text(f"DELETE FROM {table_name}"))
+            for table_name in tables:
+                copied[table_name] = self.copy_table(table_name, target)
+            jobs = rebuild_job_rollup(target, self.target_dialect)
+
+        # Fresh planner statistics (and row estimates for count_rows)
+        with self.target_engine.begin() as target:
+            for table_name in tables + ['jobs', 'job_stats_rollup']:
+                target.execute(text(f"ANALYZE {table_name}"))
+        logger.info(f"Bulk transfer done: {sum(copied.values())} rows, {jobs} jobs rebuilt")
+        return copied
+
+    def copy_table(self, table_name: str, target: Connection) -> int:
+        """Stream one table into the target connection's transaction.
+
+        Args:
+            table_name: Table to copy
+            target: Target connection inside an open transaction
+
+        Returns:
+            Number of rows copied
+        """
+        table = Base.metadata.tables[table_name]
+        source_columns = {info['name'] for info in inspect(self.source_engine).get_columns(table_name)}
+        legacy = LEGACY_COLUMNS.get(table_name, {})
+
+        # Untyped columns: values pass through as the source driver returns
+        # them, without a parse/format round trip per value. Both bulk paths
+        # take either form (COPY parses SQLite's text, SQLite stores
+        # PostgreSQL's datetimes and JSON through _sqlite_rows).
+        selected, names = [], []
+        for model_column in table.columns:
+            if model_column.name in source_columns:
+                selected.append(column(model_column.name))
+            elif legacy.get(model_column.name) in source_columns:
+                selected.append(column(legacy[model_column.name]).label(model_column.name))
+            else:
+                continue
+            names.append(model_column.name)
+        keys = [model_column.name for model_column in table.primary_key.columns]
+        query = select(*selected).select_from(sql_table(table_name)).order_by(*map(column, keys))
+
+        empty = target.execute(text(f"SELECT 1 FROM {table_name} LIMIT 1")).first() is None
+        # Loading an empty table is faster with its secondary indexes built afterwards
+        indexes = table.indexes if empty else set()
+        for index in indexes:
+            index.drop(target, checkfirst=True)
+        with self.source_engine.connect() as source:
+            total, _ = count_rows(source, self.source_dialect, table_name)
+            started = time.perf_counter()
+            copied = 0
+            # yield_per streams from a server-side cursor on PostgreSQL
+            result = source.execution_options(yield_per=self.chunk_size).execute(query)
+            for chunk in result.partitions():
+                rows = [tuple(row) for row in chunk]
+                if empty:
+                    copied += self.target_dialect.copy_rows(target, table_name, names, rows)
+                else:
+                    copied += self.target_dialect.bulk_upsert(target, table_name, names, keys, rows)
+                self._report(table_name, copied, max(total, copied), started)
+        for index in indexes:
+            index.create(target)
+        return copied
+
+    def _report(self, table_name: str, copied: int, total: int, started: float) -> None:
+        if self.progress:
+            self.progress(table_name, copied, total)
+            return
+        rate = copied / max(time.perf_counter() - started, 1e-9)
+        logger.info(f"{table_name}: {copied}/{total} rows ({rate:.0f} rows/s)")
+
+
+def export_to_sqlite(source_engine: Engine, target_path: Path,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE,
+                     progress: Optional[ProgressCallback] = None) -> Dict[str, int]:
+    """Copy the job database into a SQLite file, replacing its contents.
+
+    Args:
+        source_engine: Engine of the database to export (usually PostgreSQL)
+        target_path: SQLite file, created if missing
+        chunk_size: Rows fetched and written per round trip
+        progress: Progress callback, see BulkTransfer
+
+    Returns:
+        Dictionary of rows copied per table
+    """
+    target_engine = DatabaseFactory.create_engine(DatabaseConfig(db_type='sqlite', db_path=target_path))
+    try:
+        Base.metadata.create_all(target_engine)
+        return BulkTransfer(source_engine, target_engine, chunk_size, progress).run(replace=True)
+    finally:
+        target_engine.dispose()
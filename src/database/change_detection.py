@@ -0,0 +1,209 @@
+"""Cheap change detection for job tables.
+
+Detectors answer "did executions/variations change since the last poll?"
+without reading the tables themselves:
+
+- ``AggregateProbeDetector``: one ``count(*)`` + ``max(updated_at)`` probe per
+  table on a long-lived engine. Works on every dialect.
+- ``SQLiteDataVersionDetector``: ``PRAGMA data_version`` on a dedicated
+  connection; changes whenever another connection commits.
+- ``PostgreSQLNotifyDetector``: triggers + ``LISTEN/NOTIFY`` push the changed
+  job_ids, so callers can sync exactly those rows.
+"""
+
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, Optional, Set, Tuple, Any
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from .factory import DatabaseFactory
+
+logger = logging.getLogger(__name__)
+
+JOB_TABLES = ['executions', 'variations']
+NOTIFY_CHANNEL = 'autotrainx_job_changes'
+
+
+@dataclass
+class ChangeSet:
+    """Result of a poll that detected changes.
+
+    ``job_ids`` maps table name to changed job_ids when the detector knows
+    them, and is None when only "something changed" is known.
+    """
+    job_ids: Optional[Dict[str, Set[str]]] = None
+
+    def merge(self, other: 'ChangeSet') -> 'ChangeSet':
+        """Combine two change sets (unknown rows win over known ones)."""
+        if self.job_ids is None or other.job_ids is None:
+            return ChangeSet()
+        merged = {table: set(ids) for table, ids in self.job_ids.items()}
+        for table, ids in other.job_ids.items():
+            merged.setdefault(table, set()).update(ids)
+        return ChangeSet(merged)
+
+
+class ChangeDetector(ABC):
+    """Base class for job table change detectors."""
+
+    def __init__(self, engine: Engine):
+        """Initialize detector.
+
+        Args:
+            engine: Long-lived SQLAlchemy engine to probe
+        """
+        self.engine = engine
+
+    def start(self) -> None:
+        """Prepare the detector and take the initial snapshot."""
+        pass
+
+    @abstractmethod
+    def poll(self) -> Optional[ChangeSet]:
+        """Check for changes since the previous poll.
+
+        Returns:
+            ChangeSet if anything changed, None otherwise
+        """
+        pass
+
+    def fileno(self) -> Optional[int]:
+        """File descriptor that becomes readable when changes arrive (push detectors)."""
+        return None
+
+    def close(self) -> None:
+        """Release any dedicated connections."""
+        pass
+
+
+class AggregateProbeDetector(ChangeDetector):
+    """Detects changes with a single aggregate query per poll."""
+
+    PROBE_QUERY = " UNION ALL ".join(
+        f"SELECT '{table}', COUNT(*), MAX(updated_at) FROM {table}" for table in JOB_TABLES
+    )
+
+    def __init__(self, engine: Engine):
+        super().__init__(engine)
+        self._snapshot: Optional[Tuple[Any, ...]] = None
+
+    def _probe(self) -> Tuple[Any, ...]:
+        with self.engine.connect() as conn:
+            rows = conn.execute(text(self.PROBE_QUERY)).fetchall()
+        return tuple((table, count, str(max_updated)) for table, count, max_updated in rows)
+
+    def start(self) -> None:
+        self._snapshot = self._probe()
+
+    def poll(self) -> Optional[ChangeSet]:
+        snapshot = self._probe()
+        if snapshot == self._snapshot:
+            return None
+        self._snapshot = snapshot
+        return ChangeSet()
+
+
+class SQLiteDataVersionDetector(ChangeDetector):
+    """Detects commits from other connections via PRAGMA data_version."""
+
+    def __init__(self, engine: Engine):
+        super().__init__(engine)
+        self._query = DatabaseFactory.get_dialect('sqlite').get_data_version_query()
+        self._connection = None
+        self._version = None
+
+    def _read_version(self) -> int:
+        cursor = self._connection.cursor()
+        try:
+            cursor.execute(self._query)
+            return cursor.fetchone()[0]
+        finally:
+            cursor.close()
+
+    def start(self) -> None:
+        # data_version is per connection, so keep one checked out for good
+        self._connection = self.engine.raw_connection()
+        self._version = self._read_version()
+
+    def poll(self) -> Optional[ChangeSet]:
+        version = self._read_version()
+        if version == self._version:
+            return None
+        self._version = version
+        return ChangeSet()
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+class PostgreSQLNotifyDetector(ChangeDetector):
+    """Receives changed job_ids pushed by triggers over LISTEN/NOTIFY."""
+
+    def __init__(self, engine: Engine, channel: str = NOTIFY_CHANNEL):
+        super().__init__(engine)
+        self.channel = channel
+        self._connection = None
+
+    def start(self) -> None:
+        dialect = DatabaseFactory.get_dialect('postgresql')
+        with self.engine.begin() as conn:
+            for statement in dialect.get_change_notification_ddl(self.channel, JOB_TABLES):
+                conn.execute(text(statement))
+
+        self._connection = self.engine.raw_connection()
+        driver_connection = self._connection.driver_connection
+        driver_connection.autocommit = True
+        cursor = driver_connection.cursor()
+        cursor.execute(f"LISTEN {self.channel}")
+        cursor.close()
+        logger.info(f"Listening for job changes on channel '{self.channel}'")
+
+    def poll(self) -> Optional[ChangeSet]:
+        driver_connection = self._connection.driver_connection
+        driver_connection.poll()
+        if not driver_connection.notifies:
+            return None
+
+        job_ids: Dict[str, Set[str]] = {}
+        while driver_connection.notifies:
+            notify = driver_connection.notifies.pop(0)
+            table, _, job_id = notify.payload.partition(':')
+            job_ids.setdefault(table, set()).add(job_id)
+        return ChangeSet(job_ids)
+
+    def fileno(self) -> Optional[int]:
+        return self._connection.driver_connection.fileno() if self._connection else None
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def create_change_detector(engine: Engine, db_type: str, mode: str = 'auto') -> ChangeDetector:
+    """Create a change detector for a database.
+
+    Args:
+        engine: Long-lived engine to probe
+        db_type: 'sqlite' or 'postgresql'
+        mode: 'auto', 'probe', 'notify' (PostgreSQL) or 'data_version' (SQLite)
+
+    Returns:
+        Change detector (not yet started)
+    """
+    db_type = db_type.lower()
+    if mode == 'auto':
+        mode = 'notify' if db_type == 'postgresql' else 'data_version'
+
+    if mode == 'notify' and db_type == 'postgresql':
+        return PostgreSQLNotifyDetector(engine)
+    if mode == 'data_version' and db_type == 'sqlite':
+        return SQLiteDataVersionDetector(engine)
+    if mode != 'probe':
+        logger.warning(f"Change detection mode '{mode}' not supported for {db_type}, using probe")
+    return AggregateProbeDetector(engine)
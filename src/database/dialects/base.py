@@ -1,8 +1,8 @@
 """Abstract base class for database dialects."""
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional, Type
-from sqlalchemy import TypeDecorator
+from typing import Any, Dict, List, Optional, Type
+from sqlalchemy import TypeDecorator, text
 from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.sql.type_api import TypeEngine
 
@@ -140,4 +140,145 @@ class AbstractDialect(ABC):
         Returns:
             Formatted datetime value
         """
-        pass
\ No newline at end of file
+        pass
+    
+    def get_change_notification_ddl(self, channel: str, tables: List[str]) -> List[str]:
+        """Get SQL statements installing row-change notifications.
+        
+        Args:
+            channel: Notification channel name
+            tables: Tables whose inserts/updates should be announced
+            
+        Returns:
+            List of SQL statements (empty if push notifications are unsupported)
+        """
+        return []
+    
+    def get_data_version_query(self) -> Optional[str]:
+        """Get SQL query returning a counter that changes on foreign commits.
+        
+        Returns:
+            SQL query string or None if not supported
+        """
+        return None
+    
+    def estimate_row_count(self, connection: Connection, table_name: str,
+                           where_clause: str = '', params: Optional[Dict[str, Any]] = None) -> Optional[int]:
+        """Estimate how many rows of a table match a condition, without counting them.
+        
+        Args:
+            connection: Database connection
+            table_name: Table to estimate
+            where_clause: SQL condition without WHERE, using :name parameters
+            params: Parameters of the condition
+            
+        Returns:
+            Estimated row count, or None if the database cannot estimate
+        """
+        return None
+
+    @abstractmethod
+    def get_trigger_ddl(self, name: str, table_name: str, event: str,
+                        statements: List[str], when: Optional[str] = None) -> List[str]:
+        """Get SQL statements (re)creating a row-level AFTER trigger.
+
+        Args:
+            name: Trigger name
+            table_name: Table the trigger is attached to
+            event: Triggering event, e.g. ``INSERT`` or ``UPDATE OF status``
+            statements: SQL statements of the trigger body, using NEW/OLD
+            when: Optional condition on NEW/OLD for the trigger to fire
+
+        Returns:
+            List of SQL statements, dropping any previous version first
+        """
+        pass
+
+    @abstractmethod
+    def get_drop_trigger_ddl(self, name: str, table_name: str) -> List[str]:
+        """Get SQL statements dropping a trigger created by get_trigger_ddl.
+
+        Args:
+            name: Trigger name
+            table_name: Table the trigger is attached to
+
+        Returns:
+            List of SQL statements
+        """
+        pass
+
+    @abstractmethod
+    def get_trigger_names_query(self) -> str:
+        """Get SQL query returning the name of every user-defined trigger."""
+        pass
+
+    def get_date_expression(self, column: str) -> str:
+        """Get SQL expression truncating a timestamp column to its (UTC) date."""
+        return f"CAST({column} AS DATE)"
+
+    def get_distinct_expression(self, left: str, right: str) -> str:
+        """Get SQL condition true when two values differ, treating NULLs as equal."""
+        return f"{left} IS DISTINCT FROM {right}"
+
+    def get_bulk_load_statements(self) -> List[str]:
+        """Get SQL statements tuning a connection for one long bulk-load transaction.
+        
+        Returns:
+            List of SQL statements (empty if no tuning applies)
+        """
+        return []
+
+    def copy_rows(self, connection: Connection, table_name: str, columns: List[str],
+                  rows: List[tuple]) -> int:
+        """Load rows in bulk into a table, without conflict handling.
+        
+        The default runs one executemany of a plain INSERT; dialects
+        override it with their fastest loading path.
+        
+        Args:
+            connection: Connection inside an open transaction
+            table_name: Target table
+            columns: Column names, in row order
+            rows: Row tuples
+            
+        Returns:
+            Number of rows loaded
+        """
+        if not rows:
+            return 0
+        placeholders = ', '.join(f':{column}' for column in columns)
+        statement = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+        connection.execute(text(statement), [dict(zip(columns, row)) for row in rows])
+        return len(rows)
+
+    def bulk_upsert(self, connection: Connection, table_name: str, columns: List[str],
+                    key_columns: List[str], rows: List[tuple]) -> int:
+        """Insert rows in bulk, overwriting rows whose key already exists.
+        
+        The default runs one executemany of ``INSERT ... ON CONFLICT``,
+        which both SQLite (3.24+) and PostgreSQL accept.
+        
+        Args:
+            connection: Connection inside an open transaction
+            table_name: Target table
+            columns: Column names, in row order
+            key_columns: Columns of the table's primary or unique key
+            rows: Row tuples
+            
+        Returns:
+            Number of rows written
+        """
+        if not rows:
+            return 0
+        placeholders = ', '.join(f':{column}' for column in columns)
+        statement = (f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders}) "
+                     f"{upsert_conflict_clause(columns, key_columns)}")
+        connection.execute(text(statement), [dict(zip(columns, row)) for row in rows])
+        return len(rows)
+
+
+def upsert_conflict_clause(columns: List[str], key_columns: List[str]) -> str:
+    """Build the ON CONFLICT clause overwriting every non-key column."""
+    updates = [f"{column} = excluded.{column}" for column in columns if column not in key_columns]
+    action = f"DO UPDATE SET {', '.join(updates)}" if updates else "DO NOTHING"
+    return f"ON CONFLICT ({', '.join(key_columns)}) {action}"
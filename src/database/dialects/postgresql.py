@@ -1,7 +1,9 @@
 """PostgreSQL dialect implementation."""
 
-from typing import Any, Dict, Optional, Type
-from datetime import datetime
+import io
+import json
+from typing import Any, Dict, List, Optional, Type
+from datetime import date, datetime
 from sqlalchemy import Integer, text
 from sqlalchemy.dialects.postgresql import JSONB, TIMESTAMP
 from sqlalchemy.engine import Connection, Engine
@@ -9,7 +11,21 @@ from sqlalchemy.sql.type_api import TypeEngine
 from sqlalchemy.exc import OperationalError
 import psycopg2
 
-from .base import AbstractDialect
+from .base import AbstractDialect, upsert_conflict_clause
+
+
+def _csv_field(value: Any) -> str:
+    """Format one value for COPY ... WITH (FORMAT csv); None becomes NULL."""
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    elif isinstance(value, (datetime, date)):
+        return value.isoformat()
+    elif not isinstance(value, str):
+        return str(value)
+    # Quoted, so an empty string stays distinct from NULL
+    return '"' + value.replace('"', '""') + '"'
 
 
 class PostgreSQLDialect(AbstractDialect):
@@ -134,4 +150,138 @@ class PostgreSQLDialect(AbstractDialect):
     
     def format_datetime_for_insert(self, dt) -> Any:
         """PostgreSQL handles datetime objects natively."""
-        return dt
\ No newline at end of file
+        return dt
+    
+    def get_change_notification_ddl(self, channel: str, tables: List[str]) -> List[str]:
+        """PostgreSQL announces changed job_ids through triggers and NOTIFY.
+        
+        Payloads have the form ``<table>:<job_id>``.
+        """
+        statements = [
+            """
+            CREATE OR REPLACE FUNCTION autotrainx_notify_job_change() RETURNS trigger AS $$
+            BEGIN
+                PERFORM pg_notify(TG_ARGV[0], TG_TABLE_NAME || ':' || NEW.job_id);
+                RETURN NEW;
+            END;
+            $$ LANGUAGE plpgsql
+            """
+        ]
+        for table in tables:
+            statements.append(f"DROP TRIGGER IF EXISTS {table}_notify_change ON {table}")
+            statements.append(
+                f"CREATE TRIGGER {table}_notify_change "
+                f"AFTER INSERT OR UPDATE ON {table} "
+                f"FOR EACH ROW EXECUTE FUNCTION autotrainx_notify_job_change('{channel}')"
+            )
+        return statements
+
+    def get_trigger_ddl(self, name: str, table_name: str, event: str,
+                        statements: List[str], when: Optional[str] = None) -> List[str]:
+        """PostgreSQL triggers call a PL/pgSQL function of the same name."""
+        condition = f"WHEN ({when}) " if when else ''
+        body = ''.join(f"    {statement};\n" for statement in statements)
+        return [
+            f"""
+            CREATE OR REPLACE FUNCTION {name}() RETURNS trigger AS $$
+            BEGIN
+            {body}    RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+            """,
+            *self.get_drop_trigger_ddl(name, table_name),
+            f"CREATE TRIGGER {name} AFTER {event} ON {table_name} "
+            f"FOR EACH ROW {condition}EXECUTE FUNCTION {name}()",
+        ]
+
+    def get_drop_trigger_ddl(self, name: str, table_name: str) -> List[str]:
+        """PostgreSQL trigger names are scoped to their table."""
+        return [f"DROP TRIGGER IF EXISTS {name} ON {table_name}"]
+
+    def get_trigger_names_query(self) -> str:
+        """PostgreSQL lists triggers in pg_trigger; internal ones enforce constraints."""
+        return "SELECT tgname FROM pg_trigger WHERE NOT tgisinternal"
+
+    def get_date_expression(self, column: str) -> str:
+        """Timestamps are stored WITH TIME ZONE; take the date in UTC."""
+        return f"CAST(timezone('UTC', {column}) AS DATE)"
+
+    def estimate_row_count(self, connection: Connection, table_name: str,
+                           where_clause: str = '', params: Optional[Dict[str, Any]] = None) -> Optional[int]:
+        """Use the planner's statistics: pg_class.reltuples, or EXPLAIN for a condition."""
+        if not where_clause:
+            estimate = connection.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"),
+                {'table_name': table_name}
+            ).scalar()
+            # -1 until the table is first analyzed
+            return estimate if estimate is not None and estimate >= 0 else None
+        plan = connection.execute(
+            text(f"EXPLAIN (FORMAT JSON) SELECT 1 FROM {table_name} WHERE {where_clause}"),
+            params or {}
+        ).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+    
+    def get_bulk_load_statements(self) -> List[str]:
+        """Lift the statement timeout and give index builds more memory, for this transaction only."""
+        return [
+            "SET LOCAL statement_timeout = 0",
+            "SET LOCAL maintenance_work_mem = '256MB'",
+        ]
+    
+    def copy_rows(self, connection: Connection, table_name: str, columns: List[str],
+                  rows: List[tuple]) -> int:
+        """Load rows with a single COPY ... FROM STDIN.
+        
+        Args:
+            connection: Connection inside an open transaction
+            table_name: Target table
+            columns: Column names, in row order
+            rows: Row tuples
+            
+        Returns:
+            Number of rows copied
+        """
+        if not rows:
+            return 0
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write(','.join(_csv_field(value) for value in row))
+            buffer.write('\n')
+        buffer.seek(0)
+        cursor = connection.connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {table_name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer
+            )
+        finally:
+            cursor.close()
+        return len(rows)
+    
+    def bulk_upsert(self, connection: Connection, table_name: str, columns: List[str],
+                    key_columns: List[str], rows: List[tuple]) -> int:
+        """COPY rows into a session-local staging table, then upsert them in one statement.
+        
+        COPY itself cannot resolve key conflicts, so it never targets the
+        real table directly.
+        """
+        if not rows:
+            return 0
+        staging = f"{table_name}_staging"
+        column_list = ', '.join(columns)
+        connection.execute(text(
+            f"CREATE TEMP TABLE IF NOT EXISTS {staging} "
+            f"(LIKE {table_name} INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+        ))
+        # Earlier chunks of the same transaction are still staged
+        connection.execute(text(f"TRUNCATE {staging}"))
+        self.copy_rows(connection, staging, columns, rows)
+        # DISTINCT ON keeps one row per key, as ON CONFLICT may touch a row only once
+        connection.execute(text(
+            f"INSERT INTO {table_name} ({column_list}) "
+            f"SELECT DISTINCT ON ({', '.join(key_columns)}) {column_list} FROM {staging} "
+            f"{upsert_conflict_clause(columns, key_columns)}"
+        ))
+        return len(rows)
@@ -1,15 +1,15 @@
 """SQLite dialect implementation."""
 
 import json
-from typing import Any, Dict, Optional, Type
-from datetime import datetime
+from typing import Any, Dict, List, Optional, Type
+from datetime import datetime, timezone
 from sqlalchemy import Integer, Text, DateTime, text
 from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.sql.type_api import TypeEngine
 from sqlalchemy.types import TypeDecorator
 from sqlalchemy.exc import OperationalError
 
-from .base import AbstractDialect
+from .base import AbstractDialect, upsert_conflict_clause
 
 
 class SQLiteDialect(AbstractDialect):
@@ -108,6 +108,91 @@ class SQLiteDialect(AbstractDialect):
             return dt.isoformat()
         return dt
 
+    
+    def get_data_version_query(self) -> Optional[str]:
+        """SQLite bumps PRAGMA data_version when another connection commits."""
+        return "PRAGMA data_version"
+
+    def get_trigger_ddl(self, name: str, table_name: str, event: str,
+                        statements: List[str], when: Optional[str] = None) -> List[str]:
+        """SQLite triggers hold their statements inline between BEGIN and END."""
+        condition = f"WHEN {when} " if when else ''
+        body = ''.join(f"    {statement};\n" for statement in statements)
+        return self.get_drop_trigger_ddl(name, table_name) + [
+            f"CREATE TRIGGER {name} AFTER {event} ON {table_name} "
+            f"FOR EACH ROW {condition}BEGIN\n{body}END"
+        ]
+
+    def get_drop_trigger_ddl(self, name: str, table_name: str) -> List[str]:
+        """SQLite trigger names are unique per database."""
+        return [f"DROP TRIGGER IF EXISTS {name}"]
+
+    def get_trigger_names_query(self) -> str:
+        """SQLite lists triggers in sqlite_master."""
+        return "SELECT name FROM sqlite_master WHERE type = 'trigger'"
+
+    def get_date_expression(self, column: str) -> str:
+        """SQLite stores timestamps as UTC text; date() keeps the YYYY-MM-DD part."""
+        return f"date({column})"
+
+    def get_distinct_expression(self, left: str, right: str) -> str:
+        """SQLite spells IS DISTINCT FROM as IS NOT (older versions lack the former)."""
+        return f"{left} IS NOT {right}"
+
+    def get_bulk_load_statements(self) -> List[str]:
+        """A bounded 64MB page cache, so a large transaction does not spill to the journal."""
+        return ["PRAGMA cache_size=-64000"]
+
+    def copy_rows(self, connection: Connection, table_name: str, columns: List[str],
+                  rows: List[tuple]) -> int:
+        """SQLite has no COPY; run one executemany on the driver cursor."""
+        if not rows:
+            return 0
+        placeholders = ', '.join('?' for _ in columns)
+        statement = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+        connection.exec_driver_sql(statement, _sqlite_rows(rows))
+        return len(rows)
+
+    def bulk_upsert(self, connection: Connection, table_name: str, columns: List[str],
+                    key_columns: List[str], rows: List[tuple]) -> int:
+        """SQLite has no COPY; run one executemany on the driver cursor."""
+        if not rows:
+            return 0
+        placeholders = ', '.join('?' for _ in columns)
+        statement = (f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders}) "
+                     f"{upsert_conflict_clause(columns, key_columns)}")
+        connection.exec_driver_sql(statement, _sqlite_rows(rows))
+        return len(rows)
+
+
+def _sqlite_value(value: Any) -> Any:
+    """Convert a value for the driver the way SQLAlchemy's column types store it."""
+    if value is None or type(value) in _DRIVER_TYPES:
+        return value
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:  # e.g. TIMESTAMP WITH TIME ZONE read from PostgreSQL
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        # Same text format as DateTime ('%Y-%m-%d %H:%M:%S.%f'), so stored values compare consistently
+        return value.isoformat(sep=' ', timespec='microseconds')
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+_DRIVER_TYPES = frozenset([str, int, float, bool, bytes])
+
+
+def _sqlite_rows(rows: List[tuple]) -> List[tuple]:
+    """Convert rows column by column, skipping columns the driver takes as they are."""
+    columns = list(zip(*rows))
+    converted = False
+    for i, values in enumerate(columns):
+        sample = next((value for value in values if value is not None), None)
+        if sample is not None and type(sample) not in _DRIVER_TYPES:
+            columns[i] = map(_sqlite_value, values)
+            converted = True
+    return list(zip(*columns)) if converted else rows
+
 
 class SQLiteJSONType(TypeDecorator):
     """Custom JSON type for SQLite that handles serialization."""
@@ -0,0 +1,238 @@
+"""Process-wide registry of database engines and session factories.
+
+Database managers used to build their own engine (and pool) on every
+construction and run ``Base.metadata.create_all`` each time, which reflects
+every table. The registry keeps one engine and one session factory per
+connection URL for the whole process, and runs the schema check once per
+engine. The check itself is guarded by a ``schema_versions`` marker table:
+when the recorded fingerprint of the models matches, no DDL or reflection
+is done at all.
+"""
+
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import Column, DateTime, Engine, MetaData, String, Table, event, select, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import sessionmaker
+
+from .factory import DatabaseFactory, DatabaseConfig
+
+logger = logging.getLogger(__name__)
+
+_marker_metadata = MetaData()
+schema_versions = Table(
+    'schema_versions', _marker_metadata,
+    Column('name', String(100), primary_key=True),
+    Column('version', String(64), nullable=False),
+    Column('applied_at', DateTime, default=datetime.utcnow),
+)
+
+
+def schema_fingerprint(metadata: MetaData) -> str:
+    """Fingerprint of the tables, columns and indexes of a metadata.
+
+    Changes whenever a model gains a table, column or index, so the schema
+    check reruns without anyone bumping a version number by hand.
+    """
+    parts = []
+    for table in sorted(metadata.tables.values(), key=lambda t: t.name):
+        parts.append(table.name)
+        parts.extend(f"{column.name}:{column.type}" for column in table.columns)
+        parts.extend(sorted(index.name or '' for index in table.indexes))
+    return hashlib.sha1('\n'.join(parts).encode('utf-8')).hexdigest()
+
+
+def config_url(config: DatabaseConfig) -> str:
+    """Connection URL a configuration resolves to."""
+    if config.db_type == 'sqlite':
+        return f"sqlite:///{config.db_path}"
+    return config.db_url
+
+
+class _EngineEntry:
+    """Engine, session factory and counters of one connection URL."""
+
+    def __init__(self, config: DatabaseConfig, engine: Engine):
+        self.config = config
+        self.engine = engine
+        self.session_factory = sessionmaker(bind=engine)
+        self.schemas: Dict[str, str] = {}  # metadata name -> fingerprint checked
+        self.stats = {
+            'managers': 0,
+            'connections_created': 0,
+            'checkouts': 0,
+            'connection_errors': 0,
+            'schema_checks': 0,
+            'schema_updates': 0,
+        }
+        event.listen(engine, 'connect', self._on_connect)
+        event.listen(engine, 'checkout', self._on_checkout)
+        event.listen(engine, 'handle_error', self._on_error)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        self.stats['connections_created'] += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        self.stats['checkouts'] += 1
+
+    def _on_error(self, context):
+        if context.is_disconnect:
+            self.stats['connection_errors'] += 1
+
+
+class EngineRegistry:
+    """One engine per connection URL, shared by every manager in the process."""
+
+    def __init__(self):
+        self._entries: Dict[str, _EngineEntry] = {}
+        self._lock = threading.RLock()
+
+    def _entry(self, config: DatabaseConfig) -> _EngineEntry:
+        url = config_url(config)
+        entry = self._entries.get(url)
+        if entry is None:
+            with self._lock:
+                entry = self._entries.get(url)
+                if entry is None:
+                    entry = _EngineEntry(config, DatabaseFactory.create_engine(config))
+                    self._entries[url] = entry
+        return entry
+
+    def get_engine(self, config: DatabaseConfig) -> Engine:
+        """Get the shared engine for a configuration, creating it on first use."""
+        return self._entry(config).engine
+
+    def get_session_factory(self, config: DatabaseConfig) -> sessionmaker:
+        """Get the shared session factory for a configuration."""
+        return self._entry(config).session_factory
+
+    def acquire(self, config: DatabaseConfig, metadata: Optional[MetaData] = None,
+                name: str = 'core') -> _EngineEntry:
+        """Get the shared entry for a manager and make sure its schema exists.
+
+        Args:
+            config: Database configuration
+            metadata: Models to create if the schema is missing or outdated
+            name: Name of the metadata in the schema_versions table
+
+        Returns:
+            Entry with ``engine`` and ``session_factory``
+        """
+        entry = self._entry(config)
+        entry.stats['managers'] += 1
+        if metadata is not None:
+            self.ensure_schema(entry, metadata, name)
+        return entry
+
+    def ensure_schema(self, entry: _EngineEntry, metadata: MetaData, name: str = 'core',
+                      on_update: Optional[Callable[[Engine], None]] = None) -> bool:
+        """Create missing tables once per process, skipping it if the marker matches.
+
+        Args:
+            entry: Registry entry of the engine
+            metadata: Models the schema must contain
+            name: Name of the metadata in the schema_versions table
+            on_update: Called with the engine after the tables exist and before
+                the marker is recorded, for DDL the models cannot express
+                (triggers); if it raises, the next check runs it again
+
+        Returns:
+            True if tables were created or updated
+        """
+        fingerprint = schema_fingerprint(metadata)
+        if entry.schemas.get(name) == fingerprint:
+            return False
+
+        with self._lock:
+            if entry.schemas.get(name) == fingerprint:
+                return False
+            entry.stats['schema_checks'] += 1
+            engine = entry.engine
+
+            recorded = None
+            try:
+                with engine.connect() as connection:
+                    recorded = connection.execute(
+                        select(schema_versions.c.version).where(schema_versions.c.name == name)
+                    ).scalar()
+            except SQLAlchemyError:
+                pass  # Marker table does not exist yet
+
+            updated = recorded != fingerprint
+            if updated:
+                metadata.create_all(engine)
+                # create_all skips existing tables, including indexes added to them since
+                for table in metadata.sorted_tables:
+                    for index in table.indexes:
+                        index.create(engine, checkfirst=True)
+                # ...and never drops indexes the models no longer declare
+                with engine.begin() as connection:
+                    for index_name in metadata.info.get('dropped_indexes', ()):
+                        connection.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+                if on_update is not None:
+                    on_update(engine)
+                _marker_metadata.create_all(engine)
+                with engine.begin() as connection:
+                    connection.execute(schema_versions.delete().where(schema_versions.c.name == name))
+                    connection.execute(schema_versions.insert().values(
+                        name=name, version=fingerprint, applied_at=datetime.utcnow()
+                    ))
+                entry.stats['schema_updates'] += 1
+                logger.debug(f"Schema '{name}' updated to {fingerprint[:12]}")
+
+            entry.schemas[name] = fingerprint
+            return updated
+
+    def pool_status(self, engine: Engine) -> Optional[Dict[str, Any]]:
+        """Get pool statistics of a registered engine (None if not registered)."""
+        for entry in list(self._entries.values()):
+            if entry.engine is engine:
+                return self._entry_status(entry)
+        return None
+
+    def pool_statistics(self) -> List[Dict[str, Any]]:
+        """Get pool statistics of every registered engine."""
+        return [self._entry_status(entry) for entry in list(self._entries.values())]
+
+    @staticmethod
+    def _entry_status(entry: _EngineEntry) -> Dict[str, Any]:
+        pool = entry.engine.pool
+        status = {
+            'url': entry.engine.url.render_as_string(hide_password=True),
+            'type': type(pool).__name__,
+            'database_type': entry.config.db_type,
+            'size': 0,
+            'checked_in': 0,
+            'checked_out': 0,
+            'overflow': 0,
+        }
+        # Pool statistics (available for QueuePool)
+        if hasattr(pool, 'size'):
+            status.update({
+                'size': pool.size(),
+                'checked_in': pool.checkedin(),
+                'checked_out': pool.checkedout(),
+                'overflow': pool.overflow(),
+            })
+        status['stats'] = dict(entry.stats)
+        return status
+
+    def dispose_all(self) -> None:
+        """Close all pools and forget every engine (mainly for tests)."""
+        with self._lock:
+            for entry in self._entries.values():
+                entry.engine.dispose()
+            self._entries.clear()
+
+
+# Global registry instance
+_engine_registry = EngineRegistry()
+
+
+def get_engine_registry() -> EngineRegistry:
+    """Get the global engine registry."""
+    return _engine_registry
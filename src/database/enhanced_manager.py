@@ -55,7 +55,15 @@ class EnhancedDatabaseManager:
         Base.metadata.create_all(self.pool_manager.engine)
         SchemaOptimizer.apply_optimizations(self.pool_manager.engine)
         SchemaOptimizer.create_materialized_view(self.pool_manager.engine)
-        
+
+        # Jobs table and statistics rollup read by QueryOptimizer; the triggers
+        # keep both current, so the backfill only runs when they are missing
+        from .dialects.sqlite import SQLiteDialect
+        from .job_rollup import install_job_rollup, job_rollup_installed
+        dialect = SQLiteDialect()
+        if not job_rollup_installed(self.pool_manager.engine, dialect):
+            install_job_rollup(self.pool_manager.engine, dialect)
+
         # Initialize components
         self.query_optimizer = QueryOptimizer()
         self.transaction_metrics = TransactionMetrics()
@@ -9,7 +9,7 @@ import logging
 from contextlib import contextmanager
 
 from sqlalchemy import create_engine, desc, and_, or_, text
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError, OperationalError
 
 from .models_v2 import Base, Execution, Variation, JobSummaryCache
@@ -20,6 +20,8 @@ from .schema_improvements import SchemaOptimizer
 from .transactions import TransactionManager, TransactionMetrics, OptimisticLock
 from .factory import DatabaseFactory, DatabaseConfig
 from .config import db_settings
+from .engine_registry import get_engine_registry
+from .job_rollup import ensure_job_rollup
 
 logger = logging.getLogger(__name__)
 
@@ -55,22 +57,21 @@ class EnhancedDatabaseManager:
         self.config = config
         self.dialect = DatabaseFactory.get_dialect(config.db_type)
         
-        # Create engine using factory
-        self.engine = DatabaseFactory.create_engine(config)
+        # Reuse the process-wide engine and session factory for this URL
+        registry = get_engine_registry()
+        entry = registry.acquire(config, Base.metadata)
+        self.engine = entry.engine
+        self.SessionLocal = entry.session_factory
+        ensure_job_rollup(entry, self.dialect)
         
-        # Create tables and apply optimizations
-        Base.metadata.create_all(self.engine)
-        
-        # Apply schema optimizations based on database type
-        if config.db_type == 'sqlite':
-            SchemaOptimizer.apply_optimizations(self.engine)
-            SchemaOptimizer.create_materialized_view(self.engine)
-        else:
-            # PostgreSQL-specific optimizations
-            self._apply_postgresql_optimizations()
-        
-        # Create session factory
-        self.SessionLocal = sessionmaker(bind=self.engine)
+        # Apply schema optimizations once per schema version
+        if registry.ensure_schema(entry, Base.metadata, name='optimizations'):
+            if config.db_type == 'sqlite':
+                SchemaOptimizer.apply_optimizations(self.engine)
+                SchemaOptimizer.create_materialized_view(self.engine)
+            else:
+                # PostgreSQL-specific optimizations
+                self._apply_postgresql_optimizations()
         
         # Initialize components
         self.query_optimizer = QueryOptimizer()
@@ -16,6 +16,7 @@ class ExecutionStatus(Enum):
     COMPLETED = "done"  # Alias for DONE
     FAILED = "failed"
     CANCELLED = "cancelled"
+    PRUNED = "pruned"  # Stopped early by an adaptive variations search
 
 
 class PipelineMode(Enum):
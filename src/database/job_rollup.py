@@ -0,0 +1,342 @@
+"""
+Unified jobs table and incrementally maintained job statistics.
+
+Statistics used to re-aggregate executions and variations on every call,
+and active-job queries UNIONed both tables. Two trigger-maintained
+relations replace those scans:
+
+- ``jobs`` mirrors every execution and variation (one row per job_id),
+  indexed for active-job, history and completion queries.
+- ``job_stats_rollup`` holds job counters per (created day, job type,
+  status, preset, mode). Every insert, status transition or delete on
+  ``jobs`` moves one job between buckets, so statistics read a handful of
+  rows per day no matter how long the history is.
+
+Both are maintained by triggers, on SQLite as well as on PostgreSQL, so
+bulk and raw-SQL status writes (the write-behind status queue,
+QueryOptimizer.batch_update_status) are counted like ORM updates.
+
+Usage:
+    ensure_job_rollup(entry, dialect)  # installs once per schema version
+    with manager.get_session() as session:
+        stats = job_statistics(session)
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import desc, func, text
+from sqlalchemy.engine import Connection, Engine
+
+from .dialects.base import AbstractDialect
+from .engine_registry import get_engine_registry
+from .models_v2 import Base, Job, JobStatsRollup
+
+logger = logging.getLogger(__name__)
+
+# Columns of the jobs table, in insert order
+JOB_COLUMNS = [
+    'job_id', 'job_type', 'status', 'mode', 'dataset_name', 'preset',
+    'experiment_name', 'variation_id', 'total_steps', 'start_time', 'end_time',
+    'duration_seconds', 'success', 'error_message', 'output_path', 'created_at', 'updated_at',
+]
+
+# Expression of each jobs column per source table, over a row alias {row}
+JOB_SOURCES = {
+    'executions': {
+        'job_type': "'execution'",
+        'mode': '{row}.pipeline_mode',
+        'experiment_name': 'NULL',
+        'variation_id': 'NULL',
+    },
+    'variations': {
+        'job_type': "'variation'",
+        'mode': "'variations'",
+    },
+}
+
+ROLLUP_KEY = ['day', 'job_type', 'status', 'preset', 'mode']
+ROLLUP_COUNTERS = [
+    'job_count', 'success_count', 'failed_count',
+    'duration_sum', 'duration_count', 'success_duration_sum', 'success_duration_count',
+]
+
+# Statuses of jobs that are queued or running
+ACTIVE_STATUSES = ('pending', 'in_queue', 'training', 'preparing_dataset')
+
+# (trigger, table) of every trigger maintaining jobs and the rollup
+JOB_ROLLUP_TRIGGERS = [
+    (f'{table_name}_sync_jobs_{event}', table_name)
+    for table_name in JOB_SOURCES for event in ('insert', 'update', 'delete')
+] + [(f'jobs_rollup_{event}', 'jobs') for event in ('insert', 'update', 'delete')]
+
+
+def _source_expressions(table_name: str, row: str) -> List[str]:
+    """Expressions filling the jobs columns from a row of a source table."""
+    overrides = JOB_SOURCES[table_name]
+    expressions = []
+    for column in JOB_COLUMNS:
+        expression = overrides.get(column, f'{{row}}.{column}')
+        if column == 'created_at':
+            expression = 'COALESCE({row}.created_at, CURRENT_TIMESTAMP)'
+        expressions.append(expression.format(row=row))
+    return expressions
+
+
+def _counter_expressions(row: str) -> List[str]:
+    """Expressions of the rollup counters contributed by one jobs row."""
+    success = f"{row}.success = TRUE"
+    return [
+        '1',
+        f"CASE WHEN {success} THEN 1 ELSE 0 END",
+        f"CASE WHEN {row}.end_time IS NOT NULL AND NOT COALESCE({row}.success, FALSE) THEN 1 ELSE 0 END",
+        f"COALESCE({row}.duration_seconds, 0)",
+        f"CASE WHEN {row}.duration_seconds IS NOT NULL THEN 1 ELSE 0 END",
+        f"CASE WHEN {success} THEN COALESCE({row}.duration_seconds, 0) ELSE 0 END",
+        f"CASE WHEN {success} AND {row}.duration_seconds IS NOT NULL THEN 1 ELSE 0 END",
+    ]
+
+
+def _key_expressions(dialect: AbstractDialect, row: str) -> List[str]:
+    return [dialect.get_date_expression(f'{row}.created_at')] + [
+        f'{row}.{column}' for column in ROLLUP_KEY[1:]
+    ]
+
+
+def _rollup_add(dialect: AbstractDialect, row: str, sign: int) -> List[str]:
+    """Statements adding (sign=1) or removing (sign=-1) one jobs row from its bucket."""
+    keys = _key_expressions(dialect, row)
+    values = keys + [f"{sign} * ({expression})" for expression in _counter_expressions(row)]
+    updates = ', '.join(f"{column} = job_stats_rollup.{column} + excluded.{column}"
+                        for column in ROLLUP_COUNTERS)
+    statements = [
+        f"INSERT INTO job_stats_rollup ({', '.join(ROLLUP_KEY + ROLLUP_COUNTERS)}) "
+        f"VALUES ({', '.join(values)}) "
+        f"ON CONFLICT ({', '.join(ROLLUP_KEY)}) DO UPDATE SET {updates}"
+    ]
+    if sign < 0:
+        match = ' AND '.join(f"{column} = {key}" for column, key in zip(ROLLUP_KEY, keys))
+        statements.append(f"DELETE FROM job_stats_rollup WHERE {match} AND job_count <= 0")
+    return statements
+
+
+def _sync_triggers(dialect: AbstractDialect) -> List[str]:
+    """Triggers copying executions and variations rows into jobs."""
+    statements = []
+    updates = ', '.join(f"{column} = excluded.{column}" for column in JOB_COLUMNS[1:])
+    for table_name in JOB_SOURCES:
+        upsert = (f"INSERT INTO jobs ({', '.join(JOB_COLUMNS)}) "
+                  f"VALUES ({', '.join(_source_expressions(table_name, 'NEW'))}) "
+                  f"ON CONFLICT (job_id) DO UPDATE SET {updates}")
+        statements += dialect.get_trigger_ddl(f'{table_name}_sync_jobs_insert', table_name,
+                                              'INSERT', [upsert])
+        statements += dialect.get_trigger_ddl(f'{table_name}_sync_jobs_update', table_name, 'UPDATE', [
+            "DELETE FROM jobs WHERE job_id = OLD.job_id AND OLD.job_id <> NEW.job_id",
+            upsert,
+        ])
+        statements += dialect.get_trigger_ddl(f'{table_name}_sync_jobs_delete', table_name, 'DELETE', [
+            "DELETE FROM jobs WHERE job_id = OLD.job_id",
+        ])
+    return statements
+
+
+# Jobs columns that decide a row's bucket and counters
+_ROLLUP_INPUTS = ['created_at', 'job_type', 'status', 'preset', 'mode',
+                  'success', 'end_time', 'duration_seconds']
+
+
+def _rollup_triggers(dialect: AbstractDialect) -> List[str]:
+    """Triggers moving jobs rows between rollup buckets."""
+    changed = ' OR '.join(dialect.get_distinct_expression(f'OLD.{column}', f'NEW.{column}')
+                          for column in _ROLLUP_INPUTS)
+    return (
+        dialect.get_trigger_ddl('jobs_rollup_insert', 'jobs', 'INSERT', _rollup_add(dialect, 'NEW', 1))
+        + dialect.get_trigger_ddl('jobs_rollup_update', 'jobs', f"UPDATE OF {', '.join(_ROLLUP_INPUTS)}",
+                                  _rollup_add(dialect, 'OLD', -1) + _rollup_add(dialect, 'NEW', 1),
+                                  when=changed)
+        + dialect.get_trigger_ddl('jobs_rollup_delete', 'jobs', 'DELETE', _rollup_add(dialect, 'OLD', -1))
+    )
+
+
+def _drop_triggers(connection: Connection, dialect: AbstractDialect, table_names: List[str]) -> None:
+    for name, table_name in JOB_ROLLUP_TRIGGERS:
+        if table_name in table_names:
+            for statement in dialect.get_drop_trigger_ddl(name, table_name):
+                connection.execute(text(statement))
+
+
+def drop_job_rollup(connection: Connection, dialect: AbstractDialect) -> None:
+    """Drop the jobs and rollup triggers, e.g. ahead of a bulk load.
+
+    Writes to executions and variations then no longer reach jobs or the
+    rollup until rebuild_job_rollup runs, normally in the same transaction.
+
+    Args:
+        connection: Connection inside an open transaction
+        dialect: Database dialect
+    """
+    # PostgreSQL cannot drop a trigger of a missing table, even IF EXISTS
+    Job.__table__.create(connection, checkfirst=True)
+    JobStatsRollup.__table__.create(connection, checkfirst=True)
+    _drop_triggers(connection, dialect, ['executions', 'variations', 'jobs'])
+
+
+def rebuild_job_rollup(connection: Connection, dialect: AbstractDialect) -> int:
+    """Create the jobs and rollup tables and their triggers, and refill both.
+
+    The rollup triggers and the secondary indexes of jobs are dropped while
+    jobs is refilled, and the rollup is rebuilt with a single GROUP BY, so
+    the backfill neither fires a trigger nor updates the indexes per row.
+
+    Args:
+        connection: Connection inside an open transaction
+        dialect: Database dialect
+
+    Returns:
+        Number of jobs backfilled
+    """
+    Job.__table__.create(connection, checkfirst=True)
+    JobStatsRollup.__table__.create(connection, checkfirst=True)
+
+    # The backfill scans whole tables
+    for statement in dialect.get_bulk_load_statements():
+        connection.execute(text(statement))
+    if connection.dialect.name == 'postgresql':
+        # Hold off writers until the sync triggers exist
+        connection.execute(text("LOCK TABLE executions, variations IN SHARE ROW EXCLUSIVE MODE"))
+    _drop_triggers(connection, dialect, ['jobs'])
+    for statement in _sync_triggers(dialect):
+        connection.execute(text(statement))
+
+    # Refilling is faster with the secondary indexes built afterwards
+    for index in Job.__table__.indexes:
+        index.drop(connection, checkfirst=True)
+    connection.execute(text("DELETE FROM jobs"))
+    for table_name in JOB_SOURCES:
+        connection.execute(text(
+            f"INSERT INTO jobs ({', '.join(JOB_COLUMNS)}) "
+            f"SELECT {', '.join(_source_expressions(table_name, table_name))} FROM {table_name}"
+        ))
+    for index in Job.__table__.indexes:
+        index.create(connection)
+
+    keys = _key_expressions(dialect, 'jobs')
+    sums = [f"SUM({expression})" for expression in _counter_expressions('jobs')]
+    connection.execute(text("DELETE FROM job_stats_rollup"))
+    connection.execute(text(
+        f"INSERT INTO job_stats_rollup ({', '.join(ROLLUP_KEY + ROLLUP_COUNTERS)}) "
+        f"SELECT {', '.join(keys + sums)} FROM jobs GROUP BY {', '.join(keys)}"
+    ))
+    for statement in _rollup_triggers(dialect):
+        connection.execute(text(statement))
+
+    return connection.execute(text("SELECT COUNT(*) FROM jobs")).scalar()
+
+
+def install_job_rollup(engine: Engine, dialect: AbstractDialect) -> None:
+    """Create the jobs and rollup tables, their triggers, and backfill both.
+
+    Runs rebuild_job_rollup in one transaction.
+
+    Args:
+        engine: Engine of the job database
+        dialect: Database dialect
+    """
+    with engine.begin() as connection:
+        jobs = rebuild_job_rollup(connection, dialect)
+    logger.info(f"Installed jobs table and statistics rollup ({jobs} jobs backfilled)")
+
+
+def job_rollup_installed(engine: Engine, dialect: AbstractDialect) -> bool:
+    """Check whether every jobs and rollup trigger exists.
+
+    Args:
+        engine: Engine of the job database
+        dialect: Database dialect
+
+    Returns:
+        True if all triggers in JOB_ROLLUP_TRIGGERS are present
+    """
+    with engine.connect() as connection:
+        names = set(connection.execute(text(dialect.get_trigger_names_query())).scalars())
+    return all(name in names for name, _ in JOB_ROLLUP_TRIGGERS)
+
+
+def ensure_job_rollup(entry, dialect: AbstractDialect) -> bool:
+    """Install the jobs and rollup triggers unless this schema version has them.
+
+    Args:
+        entry: Engine registry entry (see EngineRegistry.acquire)
+        dialect: Database dialect
+
+    Returns:
+        True if the triggers were (re)installed
+    """
+    return get_engine_registry().ensure_schema(
+        entry, Base.metadata, name='job_rollup',
+        on_update=lambda engine: install_job_rollup(engine, dialect)
+    )
+
+
+def job_statistics(session) -> Dict[str, Dict[str, Any]]:
+    """Read job counters from the rollup, per job type.
+
+    One aggregate over the rollup rows; its cost depends on the number of
+    distinct buckets, not on the number of jobs.
+
+    Returns:
+        Dictionary keyed by 'execution' and 'variation', each with total,
+        success, failed, by_status, by_mode, duration_sum and duration_count
+    """
+    query = session.query(
+        JobStatsRollup.job_type, JobStatsRollup.status, JobStatsRollup.mode,
+        *[func.sum(getattr(JobStatsRollup, column)) for column in ROLLUP_COUNTERS]
+    ).group_by(JobStatsRollup.job_type, JobStatsRollup.status, JobStatsRollup.mode)
+
+    stats = {
+        job_type: {'total': 0, 'success': 0, 'failed': 0, 'by_status': {}, 'by_mode': {},
+                   'duration_sum': 0.0, 'duration_count': 0}
+        for job_type in ('execution', 'variation')
+    }
+    for job_type, status, mode, jobs, success, failed, duration_sum, duration_count, _, _ in query:
+        if job_type not in stats or not jobs:
+            continue
+        kind = stats[job_type]
+        kind['total'] += int(jobs)
+        kind['success'] += int(success or 0)
+        kind['failed'] += int(failed or 0)
+        kind['by_status'][status] = kind['by_status'].get(status, 0) + int(jobs)
+        kind['by_mode'][mode] = kind['by_mode'].get(mode, 0) + int(jobs)
+        kind['duration_sum'] += float(duration_sum or 0)
+        kind['duration_count'] += int(duration_count or 0)
+    return stats
+
+
+def active_jobs(session, limit: int = 100,
+                statuses: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Get queued and running jobs of both types, newest first, from the jobs table.
+
+    Args:
+        session: Database session
+        limit: Maximum number of jobs
+        statuses: Statuses counted as active (ACTIVE_STATUSES by default)
+
+    Returns:
+        Job dictionaries with type and mode
+    """
+    rows = session.query(Job) \
+        .filter(Job.status.in_(list(statuses or ACTIVE_STATUSES))) \
+        .order_by(desc(Job.created_at), desc(Job.job_id)) \
+        .limit(limit)
+    return [{
+        'job_id': job.job_id,
+        'status': job.status,
+        'dataset_name': job.dataset_name,
+        'preset': job.preset,
+        'start_time': job.start_time,
+        'created_at': job.created_at,
+        'type': job.job_type,
+        'mode': job.mode,
+        'experiment_name': job.experiment_name,
+        'variation_id': job.variation_id,
+    } for job in rows]
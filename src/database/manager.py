@@ -2,7 +2,7 @@
 
 import os
 from pathlib import Path
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Tuple, Union
 from datetime import datetime
 import json
 import logging
@@ -13,6 +13,7 @@ from sqlalchemy.exc import SQLAlchemyError
 
 from .models import Base, Execution, Variation
 from .enums import ExecutionStatus, PipelineMode
+from .pagination import list_jobs_page
 
 
 logger = logging.getLogger(__name__)
@@ -114,7 +115,8 @@ class DatabaseManager:
                 execution.error_message = error_message
             
             # Handle completion
-            if status in [ExecutionStatus.DONE, ExecutionStatus.FAILED, ExecutionStatus.CANCELLED]:
+            if status in [ExecutionStatus.DONE, ExecutionStatus.FAILED, ExecutionStatus.CANCELLED,
+                          ExecutionStatus.PRUNED]:
                 execution.end_time = datetime.utcnow()
                 if execution.start_time:
                     duration = (execution.end_time - execution.start_time).total_seconds()
@@ -255,7 +257,8 @@ class DatabaseManager:
                 variation.error_message = error_message
             
             # Handle completion
-            if status in [ExecutionStatus.DONE, ExecutionStatus.FAILED, ExecutionStatus.CANCELLED]:
+            if status in [ExecutionStatus.DONE, ExecutionStatus.FAILED, ExecutionStatus.CANCELLED,
+                          ExecutionStatus.PRUNED]:
                 variation.end_time = datetime.utcnow()
                 if variation.start_time:
                     duration = (variation.end_time - variation.start_time).total_seconds()
@@ -263,7 +266,7 @@ class DatabaseManager:
                 
                 if status == ExecutionStatus.DONE:
                     variation.success = True
-                elif status == ExecutionStatus.CANCELLED:
+                elif status in (ExecutionStatus.CANCELLED, ExecutionStatus.PRUNED):
                     variation.success = False
             
             session.commit()
@@ -368,6 +371,30 @@ class DatabaseManager:
         jobs.sort(key=lambda x: x['created_at'] or '', reverse=True)
         return jobs[:limit]
     
+    def list_jobs(self, limit: int = 20, status: Optional[str] = None,
+                  dataset_name: Optional[str] = None,
+                  cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """List executions and variations together, newest first, filtered in SQL.
+        
+        Args:
+            limit: Page size
+            status: Only jobs with this status
+            dataset_name: Only jobs of this dataset
+            cursor: Cursor returned with the previous page
+            
+        Returns:
+            Tuple of (job dictionaries, cursor of the next page or None)
+        """
+        with self.get_session() as session:
+            page, next_cursor = list_jobs_page(session, [Execution, Variation], limit,
+                                               status, dataset_name, cursor)
+            jobs = []
+            for model, job in page:
+                job_dict = job.to_dict()
+                job_dict['type'] = 'variation' if model is Variation else 'execution'
+                jobs.append(job_dict)
+            return jobs, next_cursor
+    
     def get_statistics(self) -> Dict[str, Any]:
         """Get database statistics.
         
@@ -2,20 +2,23 @@
 
 import os
 from pathlib import Path
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Tuple, Union
 from datetime import datetime
 import json
 import logging
 
 from sqlalchemy import desc, and_, or_, text
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from datetime import timedelta
 
-from .models_v2 import Base, Execution, Variation
+from .models_v2 import Base, Execution, Variation, Job
 from .enums import ExecutionStatus, PipelineMode
 from .factory import DatabaseFactory, DatabaseConfig
 from .config import db_settings
+from .engine_registry import get_engine_registry
+from .pagination import count_rows, keyset_query, list_jobs_page
+from .job_rollup import ensure_job_rollup, job_statistics
 
 logger = logging.getLogger(__name__)
 
@@ -50,16 +53,14 @@ class DatabaseManager:
         self.config = config
         self.dialect = DatabaseFactory.get_dialect(config.db_type)
         
-        # Create engine using factory
-        self.engine = DatabaseFactory.create_engine(config)
+        # Reuse the process-wide engine and session factory for this URL;
+        # tables are checked once per process (see engine_registry)
+        entry = get_engine_registry().acquire(config, Base.metadata)
+        self.engine = entry.engine
+        self.SessionLocal = entry.session_factory
+        ensure_job_rollup(entry, self.dialect)
         
-        # Create tables if they don't exist
-        Base.metadata.create_all(self.engine)
-        
-        # Create session factory
-        self.SessionLocal = sessionmaker(bind=self.engine)
-        
-        logger.info(f"✅ Database ready ({config.db_type})")
+        logger.debug(f"Database ready ({config.db_type})")
     
     def get_session(self) -> Session:
         """Get a new database session."""
@@ -165,8 +166,14 @@ class DatabaseManager:
                        status: Optional[str] = None,
                        dataset_name: Optional[str] = None,
                        limit: int = 100,
-                       offset: int = 0) -> List[Execution]:
-        """List executions with optional filters."""
+                       offset: int = 0,
+                       cursor: Optional[str] = None) -> List[Execution]:
+        """List executions with optional filters, newest first.
+        
+        Pass ``cursor=job_cursor(last.created_at, last.job_id)`` to continue
+        after the last execution of a page (keyset pagination); ``offset``
+        is kept for callers that still page by position.
+        """
         with self.get_session() as session:
             query = session.query(Execution)
             
@@ -175,10 +182,25 @@ class DatabaseManager:
             if dataset_name:
                 query = query.filter(Execution.dataset_name == dataset_name)
             
-            return query.order_by(desc(Execution.created_at)) \
-                       .limit(limit) \
-                       .offset(offset) \
-                       .all()
+            query = keyset_query(query, Execution, cursor).limit(limit)
+            if offset and not cursor:
+                query = query.offset(offset)
+            return query.all()
+    
+    def list_executions_updated_since(self, since: Optional[datetime] = None,
+                                      job_ids: Optional[List[str]] = None) -> List[Execution]:
+        """List executions updated at or after a timestamp (all if None).
+        
+        Used by incremental synchronizers that track an updated_at watermark.
+        When job_ids is given only those executions are considered.
+        """
+        with self.get_session() as session:
+            query = session.query(Execution)
+            if since is not None:
+                query = query.filter(Execution.updated_at >= since)
+            if job_ids is not None:
+                query = query.filter(Execution.job_id.in_(list(job_ids)))
+            return query.order_by(Execution.updated_at).all()
     
     # ===== Variation CRUD Operations =====
     
@@ -234,6 +256,14 @@ class DatabaseManager:
                     variation.duration_seconds = (
                         variation.end_time - variation.start_time
                     ).total_seconds()
+            elif status == ExecutionStatus.PRUNED:
+                variation.error_message = error_message
+                variation.success = False
+                variation.end_time = datetime.utcnow()
+                if variation.start_time:
+                    variation.duration_seconds = (
+                        variation.end_time - variation.start_time
+                    ).total_seconds()
             
             session.commit()
             return True
@@ -247,8 +277,9 @@ class DatabaseManager:
                        experiment_name: Optional[str] = None,
                        status: Optional[str] = None,
                        limit: int = 100,
-                       offset: int = 0) -> List[Variation]:
-        """List variations with optional filters."""
+                       offset: int = 0,
+                       cursor: Optional[str] = None) -> List[Variation]:
+        """List variations with optional filters, newest first (see list_executions)."""
         with self.get_session() as session:
             query = session.query(Variation)
             
@@ -257,91 +288,99 @@ class DatabaseManager:
             if status:
                 query = query.filter(Variation.status == status)
             
-            return query.order_by(desc(Variation.created_at)) \
-                       .limit(limit) \
-                       .offset(offset) \
-                       .all()
+            query = keyset_query(query, Variation, cursor).limit(limit)
+            if offset and not cursor:
+                query = query.offset(offset)
+            return query.all()
+    
+    def list_variations_updated_since(self, since: Optional[datetime] = None,
+                                      job_ids: Optional[List[str]] = None) -> List[Variation]:
+        """List variations updated at or after a timestamp (all if None)."""
+        with self.get_session() as session:
+            query = session.query(Variation)
+            if since is not None:
+                query = query.filter(Variation.updated_at >= since)
+            if job_ids is not None:
+                query = query.filter(Variation.job_id.in_(list(job_ids)))
+            return query.order_by(Variation.updated_at).all()
     
     # ===== Utility Methods =====
     
     def get_recent_jobs(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get recent jobs across both executions and variations."""
         with self.get_session() as session:
-            # Get recent executions
-            executions = session.query(Execution) \
-                .order_by(desc(Execution.created_at)) \
-                .limit(limit) \
-                .all()
-            
-            # Get recent variations
-            variations = session.query(Variation) \
-                .order_by(desc(Variation.created_at)) \
+            jobs = session.query(Job) \
+                .order_by(desc(Job.created_at), desc(Job.job_id)) \
                 .limit(limit) \
                 .all()
             
-            # Combine and sort
             all_jobs = []
-            
-            for exec in executions:
-                job_dict = exec.to_dict()
-                job_dict['job_type'] = 'execution'
-                all_jobs.append(job_dict)
-            
-            for var in variations:
-                job_dict = var.to_dict()
-                job_dict['job_type'] = 'variation'
+            for job in jobs:
+                job_dict = job.to_dict()
+                job_dict['job_type'] = job.job_type
                 all_jobs.append(job_dict)
+            return all_jobs
+    
+    def list_jobs(self, limit: int = 20, status: Optional[str] = None,
+                  dataset_name: Optional[str] = None,
+                  cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """List executions and variations together, newest first, filtered in SQL.
+        
+        Reads the unified jobs table, so one indexed query serves both types.
+        
+        Args:
+            limit: Page size
+            status: Only jobs with this status
+            dataset_name: Only jobs of this dataset
+            cursor: Cursor returned with the previous page
             
-            # Sort by created_at
-            all_jobs.sort(key=lambda x: x['created_at'] or '', reverse=True)
-            
-            return all_jobs[:limit]
+        Returns:
+            Tuple of (job dictionaries, cursor of the next page or None)
+        """
+        with self.get_session() as session:
+            page, next_cursor = list_jobs_page(session, [Job], limit,
+                                               status, dataset_name, cursor)
+            return [job.to_dict() for _, job in page], next_cursor
+    
+    def count_jobs(self, status: Optional[str] = None,
+                   dataset_name: Optional[str] = None) -> Tuple[int, bool]:
+        """Count executions and variations, estimated on large tables.
+        
+        Returns:
+            Tuple of (count, True if the count is an estimate)
+        """
+        conditions, params = [], {}
+        if status:
+            conditions.append("status = :status")
+            params['status'] = status
+        if dataset_name:
+            conditions.append("dataset_name = :dataset_name")
+            params['dataset_name'] = dataset_name
+        where_clause = ' AND '.join(conditions)
+        
+        with self.get_session() as session:
+            return count_rows(session, self.dialect, 'jobs', where_clause, params)
     
     def get_job_stats(self) -> Dict[str, Any]:
-        """Get overall job statistics."""
+        """Get overall job statistics from the job rollup (see job_rollup)."""
         with self.get_session() as session:
-            # Execution stats
-            exec_total = session.query(Execution).count()
-            exec_success = session.query(Execution).filter_by(success=True).count()
-            exec_failed = session.query(Execution).filter_by(success=False).count()
-            exec_running = session.query(Execution).filter(
-                Execution.status.in_([
-                    ExecutionStatus.TRAINING.value,
-                    ExecutionStatus.PENDING.value
-                ])
-            ).count()
-            
-            # Variation stats
-            var_total = session.query(Variation).count()
-            var_success = session.query(Variation).filter_by(success=True).count()
-            var_failed = session.query(Variation).filter_by(success=False).count()
-            var_running = session.query(Variation).filter(
-                Variation.status.in_([
-                    ExecutionStatus.TRAINING.value,
-                    ExecutionStatus.PENDING.value
-                ])
-            ).count()
-            
-            return {
-                'executions': {
-                    'total': exec_total,
-                    'success': exec_success,
-                    'failed': exec_failed,
-                    'running': exec_running,
-                },
-                'variations': {
-                    'total': var_total,
-                    'success': var_success,
-                    'failed': var_failed,
-                    'running': var_running,
-                },
-                'total': {
-                    'total': exec_total + var_total,
-                    'success': exec_success + var_success,
-                    'failed': exec_failed + var_failed,
-                    'running': exec_running + var_running,
-                }
+            stats = job_statistics(session)
+        
+        running_statuses = (ExecutionStatus.TRAINING.value, ExecutionStatus.PENDING.value)
+        summary = {}
+        for key, job_type in (('executions', 'execution'), ('variations', 'variation')):
+            kind = stats[job_type]
+            summary[key] = {
+                'total': kind['total'],
+                'success': kind['success'],
+                'failed': kind['failed'],
+                'running': sum(kind['by_status'].get(status, 0) for status in running_statuses),
             }
+        summary['total'] = {
+            field: summary['executions'][field] + summary['variations'][field]
+            for field in ('total', 'success', 'failed', 'running')
+        }
+        return summary
     
     def cleanup_old_records(self, days: int = 30) -> int:
         """Clean up old records."""
@@ -368,63 +407,35 @@ class DatabaseManager:
     def get_statistics(self) -> Dict[str, Any]:
         """Get database statistics.
         
+        Read from the job rollup, which triggers keep up to date, so the
+        cost does not grow with the number of jobs.
+        
         Returns:
             Dictionary with database statistics
         """
         with self.get_session() as session:
-            # Count records
-            total_executions = session.query(Execution).count()
-            total_variations = session.query(Variation).count()
-            
-            # Status breakdown for executions
-            exec_by_status = {}
-            for status in ExecutionStatus:
-                count = session.query(Execution).filter_by(status=status.value).count()
-                if count > 0:
-                    exec_by_status[status.value] = count
-            
-            # Status breakdown for variations
-            var_by_status = {}
-            for status in ExecutionStatus:
-                count = session.query(Variation).filter_by(status=status.value).count()
-                if count > 0:
-                    var_by_status[status.value] = count
-            
-            # Calculate success rate
-            total_completed = (
-                session.query(Execution).filter_by(success=True).count() +
-                session.query(Variation).filter_by(success=True).count()
-            )
-            total_failed = (
-                session.query(Execution).filter_by(success=False)\
-                    .filter(Execution.end_time != None).count() +
-                session.query(Variation).filter_by(success=False)\
-                    .filter(Variation.end_time != None).count()
-            )
-            
-            success_rate = 0
-            if total_completed + total_failed > 0:
-                success_rate = total_completed / (total_completed + total_failed)
-            
-            # Calculate average duration
-            exec_durations = [e.duration_seconds for e in 
-                            session.query(Execution).filter(Execution.duration_seconds != None).all()]
-            var_durations = [v.duration_seconds for v in 
-                           session.query(Variation).filter(Variation.duration_seconds != None).all()]
-            
-            all_durations = exec_durations + var_durations
-            average_duration = 0
-            if all_durations:
-                average_duration = sum(all_durations) / len(all_durations)
-            
-            return {
-                'total_executions': total_executions,
-                'total_variations': total_variations,
-                'executions_by_status': exec_by_status,
-                'variations_by_status': var_by_status,
-                'success_rate': success_rate,
-                'average_duration': average_duration
-            }
+            stats = job_statistics(session)
+        executions, variations = stats['execution'], stats['variation']
+        
+        total_completed = executions['success'] + variations['success']
+        total_failed = executions['failed'] + variations['failed']
+        success_rate = 0
+        if total_completed + total_failed > 0:
+            success_rate = total_completed / (total_completed + total_failed)
+        
+        duration_count = executions['duration_count'] + variations['duration_count']
+        average_duration = 0
+        if duration_count:
+            average_duration = (executions['duration_sum'] + variations['duration_sum']) / duration_count
+        
+        return {
+            'total_executions': executions['total'],
+            'total_variations': variations['total'],
+            'executions_by_status': executions['by_status'],
+            'variations_by_status': variations['by_status'],
+            'success_rate': success_rate,
+            'average_duration': average_duration
+        }
     
     def clear_all_records(self) -> Dict[str, int]:
         """Clear all records from the database.
@@ -0,0 +1,130 @@
+"""
+Batched writer for per-step training metrics.
+
+The output pump produces one metrics record per training step. Writing
+each one in its own transaction would cost a commit per step for every
+concurrent job. Instead, records are buffered in memory and a background
+thread flushes them every few seconds. Each flush is a single bulk upsert
+through the database dialect: COPY into a staging table on PostgreSQL, or
+one executemany on SQLite.
+
+Rows are keyed by (job_id, step). A step that is reported again, for example
+after a resumed run, overwrites the earlier row.
+
+Usage:
+    writer = TrainingMetricsWriter(manager.engine, manager.dialect)
+    writer.add(job_id, {'step': 10, 'loss': 0.12, 'lr': 1e-4, 'it_per_sec': 1.9})
+    writer.close()
+"""
+
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy.engine import Engine
+
+from .dialects import AbstractDialect
+
+logger = logging.getLogger(__name__)
+
+TABLE_NAME = 'training_metrics'
+COLUMNS = ['job_id', 'step', 'epoch', 'loss', 'lr', 'it_per_sec', 'recorded_at']
+KEY_COLUMNS = ['job_id', 'step']
+DEFAULT_FLUSH_INTERVAL = 5.0
+# Flush early when this many rows are pending
+DEFAULT_MAX_PENDING = 5000
+
+
+class TrainingMetricsWriter:
+    """Buffers training metrics and writes them in timed bulk upserts."""
+
+    def __init__(self, engine: Engine, dialect: AbstractDialect,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 max_pending: int = DEFAULT_MAX_PENDING):
+        """
+        Initialize the writer.
+
+        Args:
+            engine: Engine of the tracking database
+            dialect: Dialect of that database
+            flush_interval: Seconds between background flushes
+            max_pending: Pending rows that trigger an early flush
+        """
+        self.engine = engine
+        self.dialect = dialect
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.rows_written = 0
+        self.flushes = 0
+        self._pending: Dict[Tuple[str, int], tuple] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='training-metrics-writer', daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def add(self, job_id: str, record: Dict[str, Any]) -> None:
+        """
+        Queue one step's metrics.
+
+        Args:
+            job_id: Job the step belongs to
+            record: Parsed metrics with step and any of epoch, loss, lr, it_per_sec
+        """
+        step = record.get('step')
+        if step is None or self._closed:
+            return
+        timestamp = record.get('time')
+        row = (job_id, step, record.get('epoch'), record.get('loss'), record.get('lr'),
+               record.get('it_per_sec'),
+               datetime.utcfromtimestamp(timestamp) if timestamp else datetime.utcnow())
+        with self._lock:
+            self._pending[(job_id, step)] = row
+            pending = len(self._pending)
+        self._ensure_thread()
+        if pending >= self.max_pending:
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        """
+        Write all pending rows in one transaction.
+
+        Returns:
+            Number of rows written (0 if nothing was pending or the write failed)
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                rows = list(self._pending.values())
+                self._pending = {}
+            try:
+                with self.engine.begin() as connection:
+                    written = self.dialect.bulk_upsert(connection, TABLE_NAME, COLUMNS, KEY_COLUMNS, rows)
+            except Exception as e:
+                # Metrics are best effort: never let them interrupt training
+                logger.warning(f"Dropped {len(rows)} training metric rows: {e}")
+                return 0
+            self.rows_written += written
+            self.flushes += 1
+            return written
+
+    def close(self) -> None:
+        """Stop the background thread and write what is still pending."""
+        self._closed = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 5)
+        self.flush()
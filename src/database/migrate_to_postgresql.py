@@ -13,20 +13,20 @@ Usage:
 
 import os
 import sys
-import json
 import logging
 import argparse
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 
-from sqlalchemy import create_engine, text, inspect
+from sqlalchemy import create_engine, inspect
 from sqlalchemy.orm import sessionmaker, Session
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from src.database.models_v2 import Base, Execution, Variation, JobSummaryCache, ModelPath, Model
+from src.database.models_v2 import Base, Execution, Variation
+from src.database.bulk_transfer import BulkTransfer, DEFAULT_CHUNK_SIZE, TRANSFER_TABLES
 from src.database.factory import DatabaseFactory, DatabaseConfig
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -71,6 +71,7 @@ class DatabaseMigrator:
         self.stats = {
             'executions': {'total': 0, 'migrated': 0, 'errors': 0},
             'variations': {'total': 0, 'migrated': 0, 'errors': 0},
+            'training_metrics': {'total': 0, 'migrated': 0, 'errors': 0},
             'job_summary_cache': {'total': 0, 'migrated': 0, 'errors': 0},
             'model_paths': {'total': 0, 'migrated': 0, 'errors': 0},
             'models': {'total': 0, 'migrated': 0, 'errors': 0},
@@ -126,7 +127,7 @@ class DatabaseMigrator:
             logger.error(f"Error preparing target database: {e}")
             return False
     
-    def migrate_executions(self, batch_size: int = 1000) -> int:
+    def migrate_executions(self, batch_size: int = DEFAULT_CHUNK_SIZE) -> int:
         """Migrate executions table.
         
         Args:
@@ -135,62 +136,10 @@ class DatabaseMigrator:
         Returns:
             Number of records migrated
         """
-        logger.info("Migrating executions table...")
-        
-        with self.SourceSession() as source_session:
-            with self.TargetSession() as target_session:
-                # Get total count
-                total = source_session.query(Execution).count()
-                self.stats['executions']['total'] = total
-                logger.info(f"Found {total} executions to migrate")
-                
-                # Process in batches
-                offset = 0
-                while offset < total:
-                    try:
-                        # Fetch batch from source
-                        batch = source_session.query(Execution)\
-                            .order_by(Execution.created_at)\
-                            .offset(offset)\
-                            .limit(batch_size)\
-                            .all()
-                        
-                        # Insert into target
-                        for execution in batch:
-                            # Create new instance to avoid session conflicts
-                            new_exec = Execution(
-                                job_id=execution.job_id,
-                                status=execution.status,
-                                pipeline_mode=execution.pipeline_mode,
-                                dataset_name=execution.dataset_name,
-                                preset=execution.preset,
-                                total_steps=execution.total_steps,
-                                start_time=execution.start_time,
-                                end_time=execution.end_time,
-                                duration_seconds=execution.duration_seconds,
-                                success=execution.success,
-                                error_message=execution.error_message,
-                                output_path=execution.output_path,
-                                created_at=execution.created_at,
-                                updated_at=execution.updated_at
-                            )
-                            target_session.add(new_exec)
-                        
-                        target_session.commit()
-                        self.stats['executions']['migrated'] += len(batch)
-                        
-                        logger.info(f"Migrated {offset + len(batch)}/{total} executions")
-                        offset += batch_size
-                        
-                    except Exception as e:
-                        logger.error(f"Error migrating executions batch at offset {offset}: {e}")
-                        self.stats['executions']['errors'] += batch_size
-                        target_session.rollback()
-                        offset += batch_size
-        
+        self.migrate_tables(['executions'], batch_size)
         return self.stats['executions']['migrated']
     
-    def migrate_variations(self, batch_size: int = 1000) -> int:
+    def migrate_variations(self, batch_size: int = DEFAULT_CHUNK_SIZE) -> int:
         """Migrate variations table.
         
         Args:
@@ -199,175 +148,53 @@ class DatabaseMigrator:
         Returns:
             Number of records migrated
         """
-        logger.info("Migrating variations table...")
-        
-        with self.SourceSession() as source_session:
-            with self.TargetSession() as target_session:
-                # Get total count
-                total = source_session.query(Variation).count()
-                self.stats['variations']['total'] = total
-                logger.info(f"Found {total} variations to migrate")
-                
-                # Process in batches
-                offset = 0
-                while offset < total:
-                    try:
-                        # Fetch batch from source
-                        batch = source_session.query(Variation)\
-                            .order_by(Variation.created_at)\
-                            .offset(offset)\
-                            .limit(batch_size)\
-                            .all()
-                        
-                        # Insert into target
-                        for variation in batch:
-                            # Parse JSON if stored as string
-                            varied_params = variation.varied_parameters
-                            if isinstance(varied_params, str):
-                                varied_params = json.loads(varied_params) if varied_params else {}
-                            
-                            param_values = variation.parameter_values
-                            if isinstance(param_values, str):
-                                param_values = json.loads(param_values) if param_values else {}
-                            
-                            # Create new instance
-                            new_var = Variation(
-                                job_id=variation.job_id,
-                                status=variation.status,
-                                variation_id=variation.variation_id,
-                                experiment_name=variation.experiment_name,
-                                dataset_name=variation.dataset_name,
-                                preset=variation.preset,
-                                total_steps=variation.total_steps,
-                                total_combinations=variation.total_combinations,
-                                varied_parameters=varied_params,
-                                parameter_values=param_values,
-                                start_time=variation.start_time,
-                                end_time=variation.end_time,
-                                duration_seconds=variation.duration_seconds,
-                                success=variation.success,
-                                error_message=variation.error_message,
-                                output_path=variation.output_path,
-                                parent_experiment_id=variation.parent_experiment_id,
-                                created_at=variation.created_at,
-                                updated_at=variation.updated_at
-                            )
-                            target_session.add(new_var)
-                        
-                        target_session.commit()
-                        self.stats['variations']['migrated'] += len(batch)
-                        
-                        logger.info(f"Migrated {offset + len(batch)}/{total} variations")
-                        offset += batch_size
-                        
-                    except Exception as e:
-                        logger.error(f"Error migrating variations batch at offset {offset}: {e}")
-                        self.stats['variations']['errors'] += batch_size
-                        target_session.rollback()
-                        offset += batch_size
-        
+        self.migrate_tables(['variations'], batch_size)
         return self.stats['variations']['migrated']
     
-    def migrate_cache_tables(self) -> bool:
+    def migrate_cache_tables(self, batch_size: int = DEFAULT_CHUNK_SIZE) -> bool:
         """Migrate cache and auxiliary tables if they exist.
         
         Returns:
             True if successful
         """
-        # Check if tables exist in source
-        inspector = inspect(self.source_engine)
-        tables = inspector.get_table_names()
+        return self.migrate_tables(['job_summary_cache', 'model_paths', 'models'], batch_size)
+    
+    def migrate_tables(self, tables: Optional[List[str]] = None,
+                       batch_size: int = DEFAULT_CHUNK_SIZE) -> bool:
+        """Stream tables into PostgreSQL with chunked COPY, in one transaction.
         
-        # Migrate job_summary_cache if exists
-        if 'job_summary_cache' in tables:
-            logger.info("Migrating job_summary_cache table...")
-            try:
-                with self.source_engine.connect() as source_conn:
-                    # Read all cache entries
-                    result = source_conn.execute(text("SELECT * FROM job_summary_cache"))
-                    rows = result.fetchall()
-                    self.stats['job_summary_cache']['total'] = len(rows)
-                    
-                    with self.target_engine.connect() as target_conn:
-                        for row in rows:
-                            target_conn.execute(text("""
-                                INSERT INTO job_summary_cache 
-                                (job_id, job_type, status, dataset_name, preset, 
-                                 start_time, duration_seconds, success, last_updated)
-                                VALUES (:job_id, :job_type, :status, :dataset_name, :preset,
-                                        :start_time, :duration_seconds, :success, :last_updated)
-                            """), dict(row))
-                            self.stats['job_summary_cache']['migrated'] += 1
-                        
-                        target_conn.commit()
-                
-                logger.info(f"Migrated {self.stats['job_summary_cache']['migrated']} cache entries")
-                
-            except Exception as e:
-                logger.error(f"Error migrating cache table: {e}")
-                self.stats['job_summary_cache']['errors'] += 1
+        Rows are read through the source cursor and written batch_size at a
+        time, so memory stays flat however large the tables are. Tables
+        missing from the source are skipped.
         
-        # Migrate model_paths and models if they exist
-        if 'model_paths' in tables:
-            self._migrate_model_tables()
+        Args:
+            tables: Tables to migrate (all job database tables by default)
+            batch_size: Number of records to process at once
+            
+        Returns:
+            True if successful
+        """
+        tables = tables or TRANSFER_TABLES
+        logger.info(f"Migrating {', '.join(tables)}...")
         
-        return True
-    
-    def _migrate_model_tables(self):
-        """Migrate model_paths and models tables."""
-        logger.info("Migrating model tables...")
+        def progress(table_name: str, copied: int, total: int):
+            self.stats[table_name]['total'] = total
+            logger.info(f"Migrated {copied}/{total} {table_name}")
         
-        with self.SourceSession() as source_session:
-            with self.TargetSession() as target_session:
-                # Migrate model_paths
-                model_paths = source_session.query(ModelPath).all()
-                self.stats['model_paths']['total'] = len(model_paths)
-                
-                for path in model_paths:
-                    new_path = ModelPath(
-                        id=path.id,
-                        path=path.path,
-                        added_at=path.added_at,
-                        last_scan=path.last_scan,
-                        model_count=path.model_count
-                    )
-                    target_session.add(new_path)
-                    self.stats['model_paths']['migrated'] += 1
-                
-                target_session.commit()
-                
-                # Migrate models
-                models = source_session.query(Model).all()
-                self.stats['models']['total'] = len(models)
-                
-                for model in models:
-                    # Parse JSON if needed
-                    preview_images = model.preview_images
-                    if isinstance(preview_images, str):
-                        preview_images = json.loads(preview_images) if preview_images else []
-                    
-                    # Handle metadata - check both old and new column names
-                    metadata = getattr(model, 'model_metadata', None) or getattr(model, 'metadata', None)
-                    if isinstance(metadata, str):
-                        metadata = json.loads(metadata) if metadata else {}
-                    
-                    new_model = Model(
-                        id=model.id,
-                        name=model.name,
-                        path=model.path,
-                        type=model.type,
-                        size=model.size,
-                        created_at=model.created_at,
-                        modified_at=model.modified_at,
-                        has_preview=model.has_preview,
-                        preview_images=preview_images,
-                        model_metadata=metadata,
-                        path_id=model.path_id
-                    )
-                    target_session.add(new_model)
-                    self.stats['models']['migrated'] += 1
-                
-                target_session.commit()
+        transfer = BulkTransfer(self.source_engine, self.target_engine, batch_size, progress)
+        try:
+            copied = transfer.run(tables)
+        except Exception as e:
+            # Nothing was committed
+            logger.error(f"Error migrating {', '.join(tables)}: {e}")
+            for table_name in tables:
+                self.stats[table_name]['errors'] = self.stats[table_name]['total']
+            return False
+        
+        for table_name, rows in copied.items():
+            self.stats[table_name]['total'] = max(self.stats[table_name]['total'], rows)
+            self.stats[table_name]['migrated'] = rows
+        return True
     
     def verify_migration(self) -> bool:
         """Verify migration was successful by comparing counts.
@@ -413,11 +240,12 @@ class DatabaseMigrator:
         
         print("\n" + "="*60)
     
-    def migrate(self, drop_existing: bool = False) -> bool:
+    def migrate(self, drop_existing: bool = False, batch_size: int = DEFAULT_CHUNK_SIZE) -> bool:
         """Perform the complete migration.
         
         Args:
             drop_existing: Drop existing tables in target
+            batch_size: Number of records to process at once
             
         Returns:
             True if successful
@@ -433,9 +261,7 @@ class DatabaseMigrator:
             return False
         
         # Migrate data
-        self.migrate_executions()
-        self.migrate_variations()
-        self.migrate_cache_tables()
+        self.migrate_tables(batch_size=batch_size)
         
         # Verify
         success = self.verify_migration()
@@ -457,8 +283,8 @@ def main():
                        default=os.environ.get('TARGET_DB_URL'))
     parser.add_argument('--drop-existing', action='store_true',
                        help='Drop existing tables in target database')
-    parser.add_argument('--batch-size', type=int, default=1000,
-                       help='Batch size for migration (default: 1000)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                       help=f'Batch size for migration (default: {DEFAULT_CHUNK_SIZE})')
     
     args = parser.parse_args()
     print(f"Arguments parsed: source={args.source}, target={args.target[:30]}...")
@@ -478,7 +304,7 @@ def main():
         # Perform migration
         migrator = DatabaseMigrator(args.source, args.target)
         print("Migrator created, starting migration...")
-        success = migrator.migrate(drop_existing=args.drop_existing)
+        success = migrator.migrate(drop_existing=args.drop_existing, batch_size=args.batch_size)
         
         sys.exit(0 if success else 1)
     except Exception as e:
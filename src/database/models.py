@@ -38,9 +38,10 @@ class Execution(Base):
     
     # Create indexes
     __table_args__ = (
-        Index('idx_executions_status', 'status'),
-        Index('idx_executions_dataset', 'dataset_name'),
-        Index('idx_executions_created', 'created_at'),
+        # Keyset pagination over (created_at, job_id), optionally filtered
+        Index('idx_exec_created_job', 'created_at', 'job_id'),
+        Index('idx_exec_status_created_job', 'status', 'created_at', 'job_id'),
+        Index('idx_exec_dataset_created_job', 'dataset_name', 'created_at', 'job_id'),
     )
     
     def to_dict(self) -> dict:
@@ -111,9 +112,12 @@ class Variation(Base):
     
     # Create indexes
     __table_args__ = (
-        Index('idx_variations_status', 'status'),
         Index('idx_variations_experiment', 'experiment_name'),
         Index('idx_variations_parent', 'parent_experiment_id'),
+        # Keyset pagination over (created_at, job_id), optionally filtered
+        Index('idx_var_created_job', 'created_at', 'job_id'),
+        Index('idx_var_status_created_job', 'status', 'created_at', 'job_id'),
+        Index('idx_var_dataset_created_job', 'dataset_name', 'created_at', 'job_id'),
     )
     
     def to_dict(self) -> dict:
@@ -180,4 +184,41 @@ class Variation(Base):
     
     def set_parameter_values(self, values: dict):
         """Set parameter values from dictionary."""
-        self.parameter_values = json.dumps(values)
\ No newline at end of file
+        self.parameter_values = json.dumps(values)
+
+
+class TrainingMetric(Base):
+    """Model for per-step training metrics (one row per job and step)."""
+    __tablename__ = 'training_metrics'
+    
+    job_id = Column(String(8), primary_key=True)
+    step = Column(Integer, primary_key=True, autoincrement=False)
+    epoch = Column(Integer)
+    loss = Column(Float)
+    lr = Column(Float)
+    it_per_sec = Column(Float)
+    recorded_at = Column(DateTime, default=datetime.utcnow)
+    
+    def to_dict(self) -> dict:
+        """Convert model to dictionary."""
+        return {
+            'job_id': self.job_id,
+            'step': self.step,
+            'epoch': self.epoch,
+            'loss': self.loss,
+            'lr': self.lr,
+            'it_per_sec': self.it_per_sec,
+            'recorded_at': self.recorded_at.isoformat() if self.recorded_at else None,
+        }
+
+
+class JobProcess(Base):
+    """Model for the training process and last heartbeat of a running job."""
+    __tablename__ = 'job_processes'
+    
+    job_id = Column(String(8), primary_key=True)
+    pid = Column(Integer, nullable=False)
+    create_time = Column(Float)  # Process start time, guards against PID reuse
+    hostname = Column(String(255))
+    heartbeat_at = Column(Float, nullable=False)  # Unix time
+    registered_at = Column(DateTime, default=datetime.utcnow)
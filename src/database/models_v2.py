@@ -6,7 +6,7 @@ import json
 
 from sqlalchemy import (
     Column, String, Integer, Float, Boolean, Text, 
-    DateTime, Index, ForeignKey
+    Date, DateTime, Index, ForeignKey
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.dialects import postgresql, sqlite
@@ -16,6 +16,12 @@ from .enums import ExecutionStatus, PipelineMode
 from .dialects.sqlite import SQLiteJSONType
 
 Base = declarative_base()
+# Indexes left out of the models because a newer composite index starts with
+# the same columns; the schema check drops them from existing databases
+Base.metadata.info['dropped_indexes'] = [
+    'idx_executions_status', 'idx_executions_dataset', 'idx_executions_created',
+    'idx_exec_status_created', 'idx_variations_status', 'idx_var_status_created',
+]
 
 
 # Helper function for conditional types
@@ -59,12 +65,12 @@ class Execution(Base):
     
     # Create indexes
     __table_args__ = (
-        Index('idx_executions_status', 'status'),
-        Index('idx_executions_dataset', 'dataset_name'),
-        Index('idx_executions_created', 'created_at'),
         # Composite indexes for performance
-        Index('idx_exec_status_created', 'status', 'created_at'),
         Index('idx_exec_dataset_status', 'dataset_name', 'status'),
+        # Keyset pagination over (created_at, job_id), optionally filtered
+        Index('idx_exec_created_job', 'created_at', 'job_id'),
+        Index('idx_exec_status_created_job', 'status', 'created_at', 'job_id'),
+        Index('idx_exec_dataset_created_job', 'dataset_name', 'created_at', 'job_id'),
     )
     
     def to_dict(self) -> dict:
@@ -135,12 +141,14 @@ class Variation(Base):
     
     # Create indexes
     __table_args__ = (
-        Index('idx_variations_status', 'status'),
         Index('idx_variations_experiment', 'experiment_name'),
         Index('idx_variations_parent', 'parent_experiment_id'),
         # Composite indexes
-        Index('idx_var_status_created', 'status', 'created_at'),
         Index('idx_var_experiment_status', 'experiment_name', 'status', 'created_at'),
+        # Keyset pagination over (created_at, job_id), optionally filtered
+        Index('idx_var_created_job', 'created_at', 'job_id'),
+        Index('idx_var_status_created_job', 'status', 'created_at', 'job_id'),
+        Index('idx_var_dataset_created_job', 'dataset_name', 'created_at', 'job_id'),
     )
     
     def to_dict(self) -> dict:
@@ -207,6 +215,145 @@ class Variation(Base):
         self.parameter_values = values
 
 
+class TrainingMetric(Base):
+    """Per-step training metrics (one row per job and step)."""
+    __tablename__ = 'training_metrics'
+    
+    job_id = Column(String(8), primary_key=True)
+    step = Column(Integer, primary_key=True, autoincrement=False)
+    epoch = Column(Integer)
+    loss = Column(Float)
+    lr = Column(Float)
+    it_per_sec = Column(Float)
+    recorded_at = get_datetime_column(default=datetime.utcnow)
+    
+    def to_dict(self) -> dict:
+        """Convert model to dictionary."""
+        return {
+            'job_id': self.job_id,
+            'step': self.step,
+            'epoch': self.epoch,
+            'loss': self.loss,
+            'lr': self.lr,
+            'it_per_sec': self.it_per_sec,
+            'recorded_at': self.recorded_at.isoformat() if self.recorded_at else None,
+        }
+
+
+class JobProcess(Base):
+    """Training process and last heartbeat of a running job."""
+    __tablename__ = 'job_processes'
+    
+    job_id = Column(String(8), primary_key=True)
+    pid = Column(Integer, nullable=False)
+    create_time = Column(Float)  # Process start time, guards against PID reuse
+    hostname = Column(String(255))
+    heartbeat_at = Column(Float, nullable=False)  # Unix time
+    registered_at = get_datetime_column(default=datetime.utcnow)
+
+
+class Job(Base):
+    """Executions and variations in one table, kept in sync by triggers.
+
+    Read-only for the application: rows are written by the triggers that
+    src/database/job_rollup.py installs on executions and variations.
+    """
+    __tablename__ = 'jobs'
+
+    job_id = Column(String(8), primary_key=True)
+    job_type = Column(String(20), nullable=False)  # 'execution' or 'variation'
+    status = Column(String(50), nullable=False)
+    mode = Column(String(20), nullable=False)  # pipeline_mode, 'variations' for variations
+    dataset_name = Column(String(255), nullable=False)
+    preset = Column(String(100), nullable=False)
+    experiment_name = Column(String(255))
+    variation_id = Column(String(100))
+    total_steps = Column(Integer)
+    start_time = get_datetime_column()
+    end_time = get_datetime_column()
+    duration_seconds = Column(Float)
+    success = Column(Boolean)
+    error_message = Column(Text)
+    output_path = Column(Text)
+    created_at = get_datetime_column(nullable=False)
+    updated_at = get_datetime_column()
+
+    __table_args__ = (
+        # Active jobs, history and filtered history, newest first
+        Index('idx_jobs_status_created_job', 'status', 'created_at', 'job_id'),
+        Index('idx_jobs_created_job', 'created_at', 'job_id'),
+        Index('idx_jobs_dataset_created_job', 'dataset_name', 'created_at', 'job_id'),
+        # Recent completions
+        Index('idx_jobs_type_end', 'job_type', 'end_time'),
+    )
+
+    def to_dict(self) -> dict:
+        """Convert model to dictionary."""
+        def format_timestamp(dt):
+            """Format datetime to string with 3 decimal places for microseconds."""
+            if dt:
+                return dt.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+            return None
+
+        def format_duration(seconds):
+            """Format duration in seconds to human readable format."""
+            if not seconds:
+                return None
+
+            hours = int(seconds // 3600)
+            minutes = int((seconds % 3600) // 60)
+            secs = int(seconds % 60)
+
+            if hours > 0:
+                return f"{hours}h {minutes}m {secs}s"
+            elif minutes > 0:
+                return f"{minutes}m {secs}s"
+            else:
+                return f"{secs}s"
+
+        return {
+            'job_id': self.job_id,
+            'type': self.job_type,
+            'status': self.status,
+            'mode': self.mode,
+            'dataset_name': self.dataset_name,
+            'preset': self.preset,
+            'experiment_name': self.experiment_name,
+            'variation_id': self.variation_id,
+            'total_steps': self.total_steps,
+            'start_time': format_timestamp(self.start_time),
+            'end_time': format_timestamp(self.end_time),
+            'duration_seconds': format_duration(self.duration_seconds),
+            'success': self.success,
+            'error_message': self.error_message,
+            'output_path': self.output_path,
+            'created_at': format_timestamp(self.created_at),
+            'updated_at': format_timestamp(self.updated_at),
+        }
+
+
+class JobStatsRollup(Base):
+    """Job counters per creation day, type, status, preset and mode.
+
+    Maintained by triggers on the jobs table, so statistics read a few
+    rows per day instead of aggregating the whole job history.
+    """
+    __tablename__ = 'job_stats_rollup'
+
+    day = Column(Date, primary_key=True)  # UTC date of created_at
+    job_type = Column(String(20), primary_key=True)
+    status = Column(String(50), primary_key=True)
+    preset = Column(String(100), primary_key=True)
+    mode = Column(String(20), primary_key=True)
+    job_count = Column(Integer, nullable=False, default=0)
+    success_count = Column(Integer, nullable=False, default=0)
+    failed_count = Column(Integer, nullable=False, default=0)  # Ended without success
+    duration_sum = Column(Float, nullable=False, default=0)
+    duration_count = Column(Integer, nullable=False, default=0)
+    success_duration_sum = Column(Float, nullable=False, default=0)
+    success_duration_count = Column(Integer, nullable=False, default=0)
+
+
 class JobSummaryCache(Base):
     """Materialized view for job summaries."""
     __tablename__ = 'job_summary_cache'
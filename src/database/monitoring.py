@@ -10,6 +10,8 @@ import logging
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from .engine_registry import get_engine_registry
+
 logger = logging.getLogger(__name__)
 
 
@@ -72,7 +74,14 @@ class DatabaseHealthMonitor:
     def _check_connection_pool(self) -> Dict[str, Any]:
         """Check connection pool health."""
         try:
-            pool_status = self.db_manager.pool_manager.get_pool_status()
+            pool_manager = getattr(self.db_manager, 'pool_manager', None)
+            if pool_manager is not None:
+                pool_status = pool_manager.get_pool_status()
+            else:
+                # Managers share engines through the registry
+                pool_status = get_engine_registry().pool_status(self.db_manager.engine)
+                if pool_status is None:
+                    return {'status': 'unknown', 'error': 'Engine is not registered'}
             
             # Calculate utilization
             total_connections = pool_status['size'] + pool_status['overflow']
@@ -83,7 +92,8 @@ class DatabaseHealthMonitor:
                 'utilization': f"{utilization:.1f}%",
                 'active_connections': pool_status['checked_out'],
                 'total_connections': total_connections,
-                'connection_errors': pool_status['stats']['connection_errors']
+                'connection_errors': pool_status['stats']['connection_errors'],
+                'engines': self.get_pool_statistics()
             }
             
             # Check for issues
@@ -103,6 +113,10 @@ class DatabaseHealthMonitor:
             self.health_history[-1]['errors'].append(f"Connection pool check failed: {e}")
             return {'status': 'error', 'error': str(e)}
     
+    def get_pool_statistics(self) -> List[Dict[str, Any]]:
+        """Get pool statistics of every engine shared through the registry."""
+        return get_engine_registry().pool_statistics()
+    
     def _check_query_performance(self) -> Dict[str, Any]:
         """Check query performance metrics."""
         try:
@@ -2,9 +2,8 @@
 
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
-from sqlalchemy import func, case, and_, or_
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Query
-from sqlalchemy.sql import text
 
 from .models import Execution, Variation
 from .enums import ExecutionStatus
@@ -15,90 +14,42 @@ class QueryOptimizer:
     
     @staticmethod
     def get_active_jobs_optimized(session, limit: int = 100) -> List[Dict[str, Any]]:
-        """Get active jobs using a single optimized query with UNION.
+        """Get active jobs of both types with one indexed query.
         
-        This replaces the current approach of two separate queries + Python sorting.
+        Reads the unified jobs table (see job_rollup) through its
+        (status, created_at, job_id) index instead of UNIONing both tables.
         """
-        query = text("""
-            SELECT * FROM (
-                SELECT 
-                    job_id, status, dataset_name, preset, start_time, 
-                    created_at, 'execution' as type, pipeline_mode as mode,
-                    NULL as experiment_name, NULL as variation_id
-                FROM executions
-                WHERE status IN ('pending', 'in_queue', 'training', 'preparing_dataset')
-                
-                UNION ALL
-                
-                SELECT 
-                    job_id, status, dataset_name, preset, start_time,
-                    created_at, 'variation' as type, 'variations' as mode,
-                    experiment_name, variation_id
-                FROM variations
-                WHERE status IN ('pending', 'in_queue', 'training', 'preparing_dataset')
-            ) AS combined
-            ORDER BY created_at DESC
-            LIMIT :limit
-        """)
-        
-        result = session.execute(query, {"limit": limit})
-        return [dict(row) for row in result]
+        from .job_rollup import active_jobs
+        return active_jobs(session, limit)
     
     @staticmethod
     def get_statistics_optimized(session) -> Dict[str, Any]:
-        """Get statistics using optimized aggregate queries.
+        """Get statistics from the incrementally maintained job rollup.
         
-        This replaces multiple count() queries with a single aggregate query.
+        The rollup holds counters per day, status, preset and mode, so this
+        does not scan the executions or variations tables.
         """
-        # Single query for all execution statistics
-        exec_stats = session.query(
-            func.count(Execution.job_id).label('total'),
-            func.sum(case((Execution.success == True, 1), else_=0)).label('successful'),
-            func.sum(case((Execution.success == False, 1), else_=0)).label('failed'),
-            func.avg(Execution.duration_seconds).label('avg_duration'),
-            func.sum(case((Execution.status == ExecutionStatus.PENDING.value, 1), else_=0)).label('pending'),
-            func.sum(case((Execution.status == ExecutionStatus.TRAINING.value, 1), else_=0)).label('training'),
-            func.sum(case((Execution.status == ExecutionStatus.DONE.value, 1), else_=0)).label('done'),
-            func.sum(case((Execution.status == ExecutionStatus.FAILED.value, 1), else_=0)).label('failed_status')
-        ).filter(
-            Execution.duration_seconds.isnot(None)
-        ).first()
+        from .job_rollup import job_statistics
+        stats = job_statistics(session)
+        executions, variations = stats['execution'], stats['variation']
         
-        # Single query for all variation statistics
-        var_stats = session.query(
-            func.count(Variation.job_id).label('total'),
-            func.sum(case((Variation.success == True, 1), else_=0)).label('successful'),
-            func.sum(case((Variation.success == False, 1), else_=0)).label('failed'),
-            func.avg(Variation.duration_seconds).label('avg_duration'),
-            func.sum(case((Variation.status == ExecutionStatus.PENDING.value, 1), else_=0)).label('pending'),
-            func.sum(case((Variation.status == ExecutionStatus.TRAINING.value, 1), else_=0)).label('training'),
-            func.sum(case((Variation.status == ExecutionStatus.DONE.value, 1), else_=0)).label('done'),
-            func.sum(case((Variation.status == ExecutionStatus.FAILED.value, 1), else_=0)).label('failed_status')
-        ).filter(
-            Variation.duration_seconds.isnot(None)
-        ).first()
+        def by_status(kind: Dict[str, Any]) -> Dict[str, int]:
+            return {status: kind['by_status'].get(status, 0)
+                    for status in ('pending', 'training', 'done', 'failed')}
         
+        duration_count = executions['duration_count'] + variations['duration_count']
         return {
-            'total_executions': exec_stats.total or 0,
-            'total_variations': var_stats.total or 0,
-            'executions_by_status': {
-                'pending': exec_stats.pending or 0,
-                'training': exec_stats.training or 0,
-                'done': exec_stats.done or 0,
-                'failed': exec_stats.failed_status or 0
-            },
-            'variations_by_status': {
-                'pending': var_stats.pending or 0,
-                'training': var_stats.training or 0,
-                'done': var_stats.done or 0,
-                'failed': var_stats.failed_status or 0
-            },
+            'total_executions': executions['total'],
+            'total_variations': variations['total'],
+            'executions_by_status': by_status(executions),
+            'variations_by_status': by_status(variations),
             'success_rate': calculate_success_rate(
-                (exec_stats.successful or 0) + (var_stats.successful or 0),
-                (exec_stats.failed or 0) + (var_stats.failed or 0)
+                executions['success'] + variations['success'],
+                executions['failed'] + variations['failed']
             ),
-            'average_duration': calculate_average(
-                [exec_stats.avg_duration, var_stats.avg_duration]
+            'average_duration': (
+                (executions['duration_sum'] + variations['duration_sum']) / duration_count
+                if duration_count else 0.0
             )
         }
     
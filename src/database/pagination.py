@@ -0,0 +1,134 @@
+"""
+Keyset (cursor) pagination and approximate counts for job listings.
+
+LIMIT/OFFSET makes the database read and discard every skipped row, so
+later pages get slower as history grows. Listings are instead ordered by
+(created_at, job_id) descending and continue after the last row of the
+previous page; the composite (status, created_at, job_id) and
+(dataset_name, created_at, job_id) indexes serve both the filter and the
+order. The cursor is an opaque token holding that last key.
+
+Exact COUNT(*) totals are just as linear. On large tables the totals come
+from the planner instead (see AbstractDialect.estimate_row_count) and are
+flagged as estimates.
+
+Usage:
+    jobs, next_cursor = list_jobs_page(session, [Execution, Variation], limit=20,
+                                       status='failed', cursor=request_cursor)
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import desc, text, tuple_
+
+# Tables estimated below this many matching rows are counted exactly
+EXACT_COUNT_LIMIT = 10_000
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort key of the last row of a page into an opaque cursor."""
+    payload = [{'dt': value.isoformat()} if isinstance(value, datetime) else value
+               for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """
+    Decode a cursor made by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if not isinstance(payload, list):
+            raise ValueError
+        return [datetime.fromisoformat(value['dt']) if isinstance(value, dict) else value
+                for value in payload]
+    except (ValueError, TypeError, KeyError, UnicodeError, json.JSONDecodeError):
+        raise ValueError(f"Invalid cursor: {cursor!r}") from None
+
+
+def job_cursor(created_at: datetime, job_id: str) -> str:
+    """Cursor continuing after a job in (created_at, job_id) order."""
+    return encode_cursor([created_at, job_id])
+
+
+def keyset_query(query, model, cursor: Optional[str] = None):
+    """
+    Order a job query by (created_at, job_id) descending and start it after a cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if cursor:
+        created_at, job_id = decode_cursor(cursor)
+        query = query.filter(tuple_(model.created_at, model.job_id) < (created_at, job_id))
+    return query.order_by(desc(model.created_at), desc(model.job_id))
+
+
+def list_jobs_page(session, models: Sequence[Any], limit: int = 20,
+                   status: Optional[str] = None, dataset_name: Optional[str] = None,
+                   cursor: Optional[str] = None) -> Tuple[List[Tuple[Any, Any]], Optional[str]]:
+    """
+    Get one page of jobs across job tables, newest first.
+
+    Each table is read with the filters and the keyset in SQL, limit + 1
+    rows at most, and the results are merged on the shared sort key.
+
+    Args:
+        session: Database session
+        models: Job models to list (e.g. Execution, Variation)
+        limit: Page size
+        status: Only jobs with this status
+        dataset_name: Only jobs of this dataset
+        cursor: Cursor returned with the previous page
+
+    Returns:
+        Tuple of ([(model, row), ...], cursor of the next page or None)
+    """
+    rows = []
+    for model in models:
+        query = session.query(model)
+        if status:
+            query = query.filter(model.status == status)
+        if dataset_name:
+            query = query.filter(model.dataset_name == dataset_name)
+        for row in keyset_query(query, model, cursor).limit(limit + 1):
+            rows.append((model, row))
+
+    rows.sort(key=lambda item: (item[1].created_at, item[1].job_id), reverse=True)
+    page = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit and page:
+        last = page[-1][1]
+        next_cursor = job_cursor(last.created_at, last.job_id)
+    return page, next_cursor
+
+
+def count_rows(connection, dialect, table_name: str, where_clause: str = '',
+               params: Optional[Dict[str, Any]] = None) -> Tuple[int, bool]:
+    """
+    Count the rows of a table matching a filter, estimating on large tables.
+
+    Args:
+        connection: SQLAlchemy connection or session
+        dialect: Database dialect (AbstractDialect)
+        table_name: Table to count
+        where_clause: SQL condition without WHERE, using :name parameters
+        params: Parameters of the condition
+
+    Returns:
+        Tuple of (count, True if the count is an estimate)
+    """
+    params = params or {}
+    estimate = dialect.estimate_row_count(connection, table_name, where_clause, params)
+    if estimate is not None and estimate >= EXACT_COUNT_LIMIT:
+        return estimate, True
+    where = f"WHERE {where_clause}" if where_clause else ''
+    total = connection.execute(text(f"SELECT COUNT(*) FROM {table_name} {where}"), params).scalar()
+    return total, False
@@ -1,16 +1,25 @@
-"""Process monitoring system for AutoTrainX execution tracking."""
+"""Process monitoring system for AutoTrainX execution tracking.
+
+Training processes register their PID (with the process start time, which
+guards against PID reuse) in the ``job_processes`` table and refresh a
+heartbeat there. The monitor checks every active job with one column-only
+query, one pass over the process table and at most two bulk UPDATEs, so the
+cost of a check barely grows with the number of concurrent jobs.
+"""
 
 import os
+import socket
 import time
 import threading
-import signal
-from pathlib import Path
-from typing import List, Optional, Set
-from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set
+from datetime import datetime
 import logging
 
-from .models import Execution, Variation
+from sqlalchemy import select
+
+from .models import Execution, Variation, JobProcess
 from .enums import ExecutionStatus
+from .optimizations import QueryOptimizer
 
 # Try to import psutil for better process checking
 try:
@@ -22,6 +31,76 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+ACTIVE_STATUSES = [
+    ExecutionStatus.TRAINING.value,
+    ExecutionStatus.PREPARING_DATASET.value,
+    ExecutionStatus.CONFIGURING_PRESET.value,
+    ExecutionStatus.GENERATING_PREVIEW.value
+]
+# A job is stale after this long without a heartbeat
+HEARTBEAT_TIMEOUT = 300
+# Process start times from the registry and psutil may differ by rounding
+CREATE_TIME_TOLERANCE = 1.0
+
+
+def _process_create_time(pid: int) -> Optional[float]:
+    """Get a process's start time (None without psutil or if it is gone)."""
+    if not HAS_PSUTIL:
+        return None
+    try:
+        return psutil.Process(pid).create_time()
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return None
+
+
+class ProcessRegistry:
+    """Job PIDs and heartbeats stored in the job_processes table."""
+    
+    def __init__(self, db_manager):
+        """Initialize process registry.
+        
+        Args:
+            db_manager: Database manager instance
+        """
+        self.db_manager = db_manager
+        self.hostname = socket.gethostname()
+    
+    def register(self, job_id: str, pid: int) -> None:
+        """Record the training process of a job (replacing an earlier one).
+        
+        Args:
+            job_id: Job identifier
+            pid: Training process ID
+        """
+        with self.db_manager.get_session() as session:
+            session.merge(JobProcess(
+                job_id=job_id,
+                pid=pid,
+                create_time=_process_create_time(pid),
+                hostname=self.hostname,
+                heartbeat_at=time.time(),
+                registered_at=datetime.utcnow()
+            ))
+            session.commit()
+    
+    def heartbeat(self, job_id: str) -> None:
+        """Refresh the heartbeat of a registered job."""
+        with self.db_manager.get_session() as session:
+            session.query(JobProcess).filter(JobProcess.job_id == job_id).update(
+                {'heartbeat_at': time.time()}, synchronize_session=False
+            )
+            session.commit()
+    
+    def unregister(self, job_ids: List[str]) -> None:
+        """Remove the process records of jobs."""
+        if not job_ids:
+            return
+        with self.db_manager.get_session() as session:
+            session.query(JobProcess).filter(JobProcess.job_id.in_(job_ids)).delete(
+                synchronize_session=False
+            )
+            session.commit()
+
 
 class ProcessStatusMonitor:
     """Monitor for detecting dead/terminated processes automatically."""
@@ -37,7 +116,7 @@ class ProcessStatusMonitor:
         self.check_interval = check_interval
         self.monitoring = False
         self.thread = None
-        self.base_path = Path.cwd()  # Current working directory
+        self.registry = ProcessRegistry(db_manager)
         
     def start_monitoring(self):
         """Start automatic process monitoring."""
@@ -73,202 +152,90 @@ class ProcessStatusMonitor:
         Returns:
             Number of processes cleaned up
         """
-        cleaned_count = 0
-        
         with self.db_manager.get_session() as session:
-            # Find executions in active states
-            active_executions = session.query(Execution).filter(
-                Execution.status.in_([
-                    ExecutionStatus.TRAINING.value,
-                    ExecutionStatus.PREPARING_DATASET.value,
-                    ExecutionStatus.CONFIGURING_PRESET.value,
-                    ExecutionStatus.GENERATING_PREVIEW.value
-                ])
-            ).all()
-            
-            # Find variations in active states
-            active_variations = session.query(Variation).filter(
-                Variation.status.in_([
-                    ExecutionStatus.TRAINING.value,
-                    ExecutionStatus.PREPARING_DATASET.value,
-                    ExecutionStatus.CONFIGURING_PRESET.value,
-                    ExecutionStatus.GENERATING_PREVIEW.value
-                ])
-            ).all()
+            rows = []
+            for model in (Execution, Variation):
+                rows.extend(session.execute(
+                    select(model.job_id, JobProcess.pid, JobProcess.create_time,
+                           JobProcess.hostname, JobProcess.heartbeat_at)
+                    .outerjoin(JobProcess, JobProcess.job_id == model.job_id)
+                    .where(model.status.in_(ACTIVE_STATUSES))
+                ).all())
+            if not rows:
+                return 0
             
-            # Check executions
-            for execution in active_executions:
-                if not self._is_process_alive(execution.job_id):
-                    self._mark_execution_as_failed(
-                        session, execution, 
-                        "Process terminated unexpectedly (auto-detected)"
-                    )
-                    cleaned_count += 1
-                elif self._is_process_stale(execution.job_id, execution.updated_at):
-                    self._mark_execution_as_failed(
-                        session, execution,
-                        "Process appears to be stale (no heartbeat)"
-                    )
-                    cleaned_count += 1
+            # Only processes on this host can be checked; others rely on heartbeats
+            hostnames = (None, self.registry.hostname)
+            live = self._live_processes({row.pid for row in rows
+                                         if row.pid is not None and row.hostname in hostnames})
             
-            # Check variations
-            for variation in active_variations:
-                if not self._is_process_alive(variation.job_id):
-                    self._mark_variation_as_failed(
-                        session, variation,
-                        "Process terminated unexpectedly (auto-detected)"
-                    )
-                    cleaned_count += 1
-                elif self._is_process_stale(variation.job_id, variation.updated_at):
-                    self._mark_variation_as_failed(
-                        session, variation,
-                        "Process appears to be stale (no heartbeat)"
-                    )
-                    cleaned_count += 1
+            now = time.time()
+            dead, stale = [], []
+            for row in rows:
+                if row.pid is None:
+                    dead.append(row.job_id)
+                elif row.hostname in hostnames and not self._is_same_process(live, row.pid, row.create_time):
+                    dead.append(row.job_id)
+                elif now - row.heartbeat_at > HEARTBEAT_TIMEOUT:
+                    logger.debug(f"Job {row.job_id} stale: no heartbeat for {now - row.heartbeat_at:.0f}s")
+                    stale.append(row.job_id)
             
-            session.commit()
-            
-        return cleaned_count
-    
-    def _is_process_alive(self, job_id: str) -> bool:
-        """Check if a process is alive using PID file and system calls.
+            for job_ids, message in ((dead, "Process terminated unexpectedly (auto-detected)"),
+                                     (stale, "Process appears to be stale (no heartbeat)")):
+                if job_ids:
+                    logger.info(f"Marking {len(job_ids)} job(s) as failed: {message}: {', '.join(job_ids)}")
+                    QueryOptimizer.batch_update_status(session, job_ids, ExecutionStatus.FAILED, message)
         
-        Args:
-            job_id: Job identifier
-            
-        Returns:
-            True if process is alive, False otherwise
-        """
-        try:
-            # Look for PID file
-            pid_file = self.base_path / f".training_pid_{job_id}.pid"
-            if not pid_file.exists():
-                logger.debug(f"PID file not found for job {job_id}")
-                return False
-                
-            pid_str = pid_file.read_text().strip()
-            if not pid_str.isdigit():
-                logger.warning(f"Invalid PID in file for job {job_id}: {pid_str}")
-                return False
-                
-            pid = int(pid_str)
-            
-            # Check with psutil if available (more reliable)
-            if HAS_PSUTIL:
-                try:
-                    if psutil.pid_exists(pid):
-                        # Double-check that it's actually our process
-                        proc = psutil.Process(pid)
-                        # Check if it's a Python process (our training script)
-                        cmdline = proc.cmdline()
-                        if any('python' in arg.lower() for arg in cmdline):
-                            return True
-                    return False
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    return False
-            else:
-                # Fallback: use os.kill with signal 0 (doesn't actually kill)
-                try:
-                    os.kill(pid, 0)
-                    return True
-                except (OSError, ProcessLookupError):
-                    return False
-                    
-        except Exception as e:
-            logger.warning(f"Error checking process {job_id}: {e}")
-            return False
+        self.registry.unregister(dead + stale)
+        return len(dead) + len(stale)
     
-    def _is_process_stale(self, job_id: str, last_update: datetime) -> bool:
-        """Check if a process is stale based on heartbeat and last update.
+    def _live_processes(self, pids: Set[int]) -> Dict[int, Optional[float]]:
+        """Find which of the given PIDs are running, in one pass.
         
         Args:
-            job_id: Job identifier
-            last_update: Last database update time
+            pids: Process IDs to look for
             
         Returns:
-            True if process appears stale
+            Start time (None if unknown) of every PID that is running
         """
-        try:
-            # Check heartbeat file first
-            heartbeat_file = self.base_path / f".heartbeat_{job_id}.txt"
-            if heartbeat_file.exists():
-                try:
-                    last_heartbeat_str = heartbeat_file.read_text().strip()
-                    if last_heartbeat_str.isdigit():
-                        last_heartbeat = int(last_heartbeat_str)
-                        heartbeat_age = time.time() - last_heartbeat
-                        
-                        # Consider stale if no heartbeat in last 5 minutes
-                        if heartbeat_age > 300:  # 5 minutes
-                            logger.debug(f"Job {job_id} stale: no heartbeat for {heartbeat_age:.0f}s")
-                            return True
-                        return False
-                except Exception as e:
-                    logger.warning(f"Error reading heartbeat for {job_id}: {e}")
-            
-            # If no heartbeat file, check database update time
-            # Consider stale if no database update in last 10 minutes
-            if last_update:
-                update_age = (datetime.utcnow() - last_update).total_seconds()
-                if update_age > 600:  # 10 minutes
-                    logger.debug(f"Job {job_id} stale: no DB update for {update_age:.0f}s")
-                    return True
-            
-            return False
-            
-        except Exception as e:
-            logger.warning(f"Error checking staleness for {job_id}: {e}")
-            return False
-    
-    def _mark_execution_as_failed(self, session, execution: Execution, error_message: str):
-        """Mark an execution as failed with cleanup."""
-        logger.info(f"Marking execution {execution.job_id} as failed: {error_message}")
-        
-        execution.status = ExecutionStatus.FAILED.value
-        execution.error_message = error_message
-        execution.end_time = datetime.utcnow()
-        execution.updated_at = datetime.utcnow()
+        if not pids:
+            return {}
+        if HAS_PSUTIL:
+            live = {}
+            for proc in psutil.process_iter(['pid', 'create_time']):
+                if proc.info['pid'] in pids:
+                    live[proc.info['pid']] = proc.info['create_time']
+            return live
         
-        if execution.start_time:
-            duration = (execution.end_time - execution.start_time).total_seconds()
-            execution.duration_seconds = duration
-        
-        # Clean up associated files
-        self._cleanup_process_files(execution.job_id)
+        # Fallback: signal 0 checks existence without delivering a signal
+        live = {}
+        for pid in pids:
+            try:
+                os.kill(pid, 0)
+                live[pid] = None
+            except PermissionError:
+                live[pid] = None  # Exists, owned by another user
+            except (OSError, ProcessLookupError):
+                pass
+        return live
     
-    def _mark_variation_as_failed(self, session, variation: Variation, error_message: str):
-        """Mark a variation as failed with cleanup."""
-        logger.info(f"Marking variation {variation.job_id} as failed: {error_message}")
-        
-        variation.status = ExecutionStatus.FAILED.value
-        variation.error_message = error_message
-        variation.end_time = datetime.utcnow()
-        variation.updated_at = datetime.utcnow()
-        
-        if variation.start_time:
-            duration = (variation.end_time - variation.start_time).total_seconds()
-            variation.duration_seconds = duration
-        
-        # Clean up associated files
-        self._cleanup_process_files(variation.job_id)
+    @staticmethod
+    def _is_same_process(live: Dict[int, Optional[float]], pid: int,
+                         create_time: Optional[float]) -> bool:
+        """Check that a PID is running and was not reused by a newer process."""
+        if pid not in live:
+            return False
+        started = live[pid]
+        if create_time is None or started is None:
+            return True
+        return abs(started - create_time) <= CREATE_TIME_TOLERANCE
     
     def _cleanup_process_files(self, job_id: str):
-        """Clean up process-related files for a job."""
+        """Remove the process record of a job."""
         try:
-            # Remove PID file
-            pid_file = self.base_path / f".training_pid_{job_id}.pid"
-            if pid_file.exists():
-                pid_file.unlink()
-                logger.debug(f"Cleaned up PID file for {job_id}")
-            
-            # Remove heartbeat file
-            heartbeat_file = self.base_path / f".heartbeat_{job_id}.txt"
-            if heartbeat_file.exists():
-                heartbeat_file.unlink()
-                logger.debug(f"Cleaned up heartbeat file for {job_id}")
-                
+            self.registry.unregister([job_id])
         except Exception as e:
-            logger.warning(f"Error cleaning up files for {job_id}: {e}")
+            logger.warning(f"Error removing process record for {job_id}: {e}")
     
     def get_active_processes(self) -> Set[str]:
         """Get set of currently active job IDs.
@@ -281,22 +248,12 @@ class ProcessStatusMonitor:
         with self.db_manager.get_session() as session:
             # Get active executions
             active_executions = session.query(Execution.job_id).filter(
-                Execution.status.in_([
-                    ExecutionStatus.TRAINING.value,
-                    ExecutionStatus.PREPARING_DATASET.value,
-                    ExecutionStatus.CONFIGURING_PRESET.value,
-                    ExecutionStatus.GENERATING_PREVIEW.value
-                ])
+                Execution.status.in_(ACTIVE_STATUSES)
             ).all()
             
             # Get active variations
             active_variations = session.query(Variation.job_id).filter(
-                Variation.status.in_([
-                    ExecutionStatus.TRAINING.value,
-                    ExecutionStatus.PREPARING_DATASET.value,
-                    ExecutionStatus.CONFIGURING_PRESET.value,
-                    ExecutionStatus.GENERATING_PREVIEW.value
-                ])
+                Variation.status.in_(ACTIVE_STATUSES)
             ).all()
             
             active_jobs.update(job_id for (job_id,) in active_executions)
@@ -315,20 +272,31 @@ class ProcessStatusMonitor:
 
 
 class HeartbeatWriter:
-    """Utility class for writing process heartbeats."""
+    """Utility class for registering a training process and writing its heartbeats."""
     
-    def __init__(self, job_id: str, base_path: Optional[Path] = None):
+    def __init__(self, job_id: str, registry: ProcessRegistry):
         """Initialize heartbeat writer.
         
         Args:
             job_id: Job identifier
-            base_path: Base path for heartbeat files
+            registry: Registry to write the heartbeats to
         """
         self.job_id = job_id
-        self.base_path = base_path or Path.cwd()
-        self.heartbeat_file = self.base_path / f".heartbeat_{job_id}.txt"
+        self.registry = registry
         self.last_write = 0
         self.write_interval = 30  # Write every 30 seconds minimum
+    
+    def register(self, pid: int):
+        """Register the job's training process (also the first heartbeat).
+        
+        Args:
+            pid: Training process ID
+        """
+        try:
+            self.registry.register(self.job_id, pid)
+            self.last_write = time.time()
+        except Exception as e:
+            logger.warning(f"Error registering process for {self.job_id}: {e}")
         
     def write_heartbeat(self, force: bool = False):
         """Write heartbeat timestamp.
@@ -341,16 +309,15 @@ class HeartbeatWriter:
             
             # Only write if enough time has passed or forced
             if force or (current_time - self.last_write) >= self.write_interval:
-                self.heartbeat_file.write_text(str(int(current_time)))
+                self.registry.heartbeat(self.job_id)
                 self.last_write = current_time
                 
         except Exception as e:
             logger.warning(f"Error writing heartbeat for {self.job_id}: {e}")
     
     def cleanup(self):
-        """Clean up heartbeat file."""
+        """Remove the job's process record."""
         try:
-            if self.heartbeat_file.exists():
-                self.heartbeat_file.unlink()
+            self.registry.unregister([self.job_id])
         except Exception as e:
-            logger.warning(f"Error cleaning up heartbeat for {self.job_id}: {e}")
\ No newline at end of file
+            logger.warning(f"Error cleaning up heartbeat for {self.job_id}: {e}")
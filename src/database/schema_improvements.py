@@ -16,9 +16,8 @@ class SchemaOptimizer:
         with engine.connect() as conn:
             # Create composite indexes for common query patterns
             composite_indexes = [
-                # For filtering by status and ordering by created_at
-                "CREATE INDEX IF NOT EXISTS idx_exec_status_created ON executions(status, created_at DESC);",
-                "CREATE INDEX IF NOT EXISTS idx_var_status_created ON variations(status, created_at DESC);",
+                # Filtering by status and ordering by created_at is covered by
+                # the models' (status, created_at, job_id) indexes
                 
                 # For dataset-specific queries with status
                 "CREATE INDEX IF NOT EXISTS idx_exec_dataset_status ON executions(dataset_name, status);",
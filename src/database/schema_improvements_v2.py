@@ -43,10 +43,8 @@ class SchemaOptimizer:
             # Create additional indexes for performance
             indexes = [
                 # Composite indexes for common queries
-                ("idx_exec_status_created", "executions", ["status", "created_at"]),
                 ("idx_exec_dataset_status", "executions", ["dataset_name", "status"]),
                 ("idx_exec_created_success", "executions", ["created_at", "success"]),
-                ("idx_var_status_created", "variations", ["status", "created_at"]),
                 ("idx_var_dataset_status", "variations", ["dataset_name", "status"]),
                 ("idx_var_created_success", "variations", ["created_at", "success"]),
                 ("idx_var_experiment_status", "variations", ["experiment_name", "status", "created_at"]),
@@ -106,10 +104,8 @@ class SchemaOptimizer:
         with engine.connect() as conn:
             # Create B-tree indexes for common queries
             indexes = [
-                ("idx_exec_status_created", "executions", ["status", "created_at DESC"]),
                 ("idx_exec_dataset_status", "executions", ["dataset_name", "status"]),
                 ("idx_exec_created_success", "executions", ["created_at DESC", "success"]),
-                ("idx_var_status_created", "variations", ["status", "created_at DESC"]),
                 ("idx_var_dataset_status", "variations", ["dataset_name", "status"]),
                 ("idx_var_created_success", "variations", ["created_at DESC", "success"]),
                 ("idx_var_experiment_status", "variations", ["experiment_name", "status", "created_at DESC"]),
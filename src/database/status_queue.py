@@ -0,0 +1,212 @@
+"""
+Write-behind queue for job status, output-path and progress updates.
+
+Batch and variations runs move many jobs through their stages in bursts,
+and each transition used to cost a probe query plus its own transaction.
+In write-behind mode the JobTracker puts updates on this queue instead.
+Updates are coalesced per job_id: the last write of each field wins, but a
+terminal status (done, failed, cancelled, pruned) is never replaced by a
+later non-terminal one. A background thread applies everything pending in
+one transaction per tick: one SELECT and one bulk UPDATE per table.
+
+Usage:
+    queue = JobStatusQueue(manager)
+    queue.put('a1b2c3d4', 'execution', status=ExecutionStatus.TRAINING)
+    queue.flush()  # synchronous, e.g. on shutdown
+"""
+
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from .enums import ExecutionStatus
+from .models_v2 import Execution, Variation
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL = 1.0
+TERMINAL_STATUSES = frozenset({
+    ExecutionStatus.DONE,
+    ExecutionStatus.FAILED,
+    ExecutionStatus.CANCELLED,
+    ExecutionStatus.PRUNED,
+})
+# Table of each job kind
+JOB_MODELS = {'execution': Execution, 'variation': Variation}
+
+
+def apply_status(row: Dict[str, Any], status: ExecutionStatus, error_message: Optional[str],
+                 kind: str, start_time: Optional[datetime], now: datetime) -> None:
+    """Add the columns a status change sets to an update mapping.
+
+    Mirrors DatabaseManager.update_execution_status/update_variation_status.
+    """
+    row['status'] = status.value
+    ends = (status == ExecutionStatus.FAILED and error_message) or status == ExecutionStatus.COMPLETED \
+        or (status == ExecutionStatus.PRUNED and kind == 'variation')
+    if not ends:
+        return
+    if status != ExecutionStatus.COMPLETED:
+        row['error_message'] = error_message
+    row['success'] = status == ExecutionStatus.COMPLETED
+    row['end_time'] = now
+    if start_time:
+        if start_time.tzinfo is not None:  # TIMESTAMP WITH TIME ZONE on PostgreSQL
+            start_time = start_time.astimezone(timezone.utc).replace(tzinfo=None)
+        row['duration_seconds'] = (now - start_time).total_seconds()
+
+
+class JobStatusQueue:
+    """Coalesces job updates in memory and writes them in timed batches."""
+
+    def __init__(self, db_manager, flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 job_kinds: Optional[Dict[str, str]] = None):
+        """
+        Initialize the queue.
+
+        Args:
+            db_manager: Database manager the updates are written through
+            flush_interval: Seconds between background flushes
+            job_kinds: Shared job_id -> kind map, filled in for jobs resolved at flush
+        """
+        self.db_manager = db_manager
+        self.flush_interval = flush_interval
+        self.job_kinds = job_kinds if job_kinds is not None else {}
+        self.updates_queued = 0
+        self.rows_written = 0
+        self.flushes = 0
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='job-status-queue', daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def put(self, job_id: str, kind: Optional[str], **fields: Any) -> None:
+        """
+        Queue an update of one job.
+
+        Args:
+            job_id: Job identifier
+            kind: 'execution', 'variation' or None if unknown (resolved at flush)
+            **fields: Any of status, error_message, output_path, total_steps
+        """
+        with self._lock:
+            pending = self._pending.setdefault(job_id, {'kind': kind})
+            if kind:
+                pending['kind'] = kind
+            status = fields.pop('status', None)
+            if status is not None:
+                current = pending.get('status')
+                if current in TERMINAL_STATUSES and status not in TERMINAL_STATUSES:
+                    logger.debug(f"Kept {current.value} for {job_id} over later {status.value}")
+                else:
+                    pending['status'] = status
+                    pending['error_message'] = fields.pop('error_message', None)
+            fields.pop('error_message', None)
+            pending.update(fields)
+            self.updates_queued += 1
+        self._ensure_thread()
+        if status in TERMINAL_STATUSES:
+            self._wakeup.set()  # Write final states promptly
+
+    def _resolve_kinds(self, session, job_ids: List[str]) -> Dict[str, str]:
+        """Find the table of jobs queued without a kind, one query per table."""
+        kinds = {}
+        for kind, model in JOB_MODELS.items():
+            for (job_id,) in session.query(model.job_id).filter(model.job_id.in_(job_ids)):
+                kinds.setdefault(job_id, kind)
+        return kinds
+
+    def flush(self) -> int:
+        """
+        Write all pending updates in one transaction.
+
+        Returns:
+            Number of job rows updated (0 if nothing was pending or the write failed)
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                pending, self._pending = self._pending, {}
+            try:
+                written = self._write(pending)
+            except Exception as e:
+                logger.error(f"Failed to write {len(pending)} queued job update(s): {e}")
+                self._requeue(pending)
+                return 0
+            self.rows_written += written
+            self.flushes += 1
+            return written
+
+    def _requeue(self, pending: Dict[str, Dict[str, Any]]) -> None:
+        """Put a failed batch back, under anything queued since."""
+        with self._lock:
+            for job_id, update in pending.items():
+                newer = self._pending.get(job_id)
+                if newer is None:
+                    self._pending[job_id] = update
+                    continue
+                merged = dict(update)
+                if newer.get('status') in TERMINAL_STATUSES or update.get('status') not in TERMINAL_STATUSES:
+                    merged.update(newer)
+                else:
+                    merged.update({k: v for k, v in newer.items() if k not in ('status', 'error_message')})
+                merged['kind'] = newer['kind'] or update['kind']
+                self._pending[job_id] = merged
+
+    def _write(self, pending: Dict[str, Dict[str, Any]]) -> int:
+        now = datetime.utcnow()
+        written = 0
+        with self.db_manager.get_session() as session:
+            unknown = [job_id for job_id, update in pending.items() if not update['kind']]
+            kinds = self._resolve_kinds(session, unknown) if unknown else {}
+            self.job_kinds.update(kinds)
+            for job_id in set(unknown) - set(kinds):
+                logger.warning(f"No execution or variation record for queued update of job {job_id}")
+            for kind, model in JOB_MODELS.items():
+                updates = {job_id: update for job_id, update in pending.items()
+                           if (update['kind'] or kinds.get(job_id)) == kind}
+                if not updates:
+                    continue
+                start_times = dict(session.query(model.job_id, model.start_time)
+                                   .filter(model.job_id.in_(list(updates))))
+                mappings = []
+                for job_id, update in updates.items():
+                    if job_id not in start_times:
+                        logger.warning(f"No {kind} record for queued update of job {job_id}")
+                        continue
+                    row = {'job_id': job_id, 'updated_at': now}
+                    if 'status' in update:
+                        apply_status(row, update['status'], update.get('error_message'), kind,
+                                     start_times[job_id], now)
+                    for field in ('output_path', 'total_steps'):
+                        if field in update:
+                            row[field] = update[field]
+                    mappings.append(row)
+                if mappings:
+                    session.bulk_update_mappings(model, mappings)
+                    written += len(mappings)
+            session.commit()
+        return written
+
+    def close(self) -> None:
+        """Stop the background thread and write what is still pending."""
+        self._closed = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 5)
+        self.flush()
@@ -11,6 +11,7 @@ from .comfyui_client import ComfyUIClient
 from .models import PreviewConfig, PreviewResult
 from .utils import ComfyUIManager
 from .model_manager import ComfyUIModelManager
+from ..utils.thumbnails import get_thumbnail_service
 
 logger = logging.getLogger(__name__)
 
@@ -250,6 +251,16 @@ class ImagePreviewPipeline:
         logger.info("Shutting down ComfyUI after preview generation")
         ComfyUIManager.shutdown_comfyui(self.comfyui_client.server_url)
         
+        # Pre-warm the thumbnails the models page requests in the background
+        try:
+            get_thumbnail_service(self.base_path).prewarm(
+                (image for result in results if result.success for image in result.images),
+                sizes=(512,),
+                wait=False
+            )
+        except Exception as e:
+            logger.warning(f"Thumbnail pre-warm failed: {e}")
+        
         return results
             
     def generate_preview(self, 
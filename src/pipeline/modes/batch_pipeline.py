@@ -1,6 +1,6 @@
 """Batch processing pipeline for multiple datasets."""
 
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, Iterator, List, Optional, Any, Tuple, Union
 from pathlib import Path
 import concurrent.futures
 from ..base import PipelineInterface, PipelineConfig, PipelineResult, DatasetResult, PipelineStatus
@@ -169,6 +169,38 @@ class BatchPipeline(PipelineInterface):
                           continue_on_error: bool,
                           preset: Optional[str] = None) -> Dict[str, DatasetResult]:
         """Execute datasets sequentially."""
+        return dict(self._iter_sequential(datasets, context, continue_on_error, preset))
+        
+    def iter_datasets(self, datasets: List[Union[str, Dict[str, Any]]],
+                      continue_on_error: bool = True,
+                      preset: Optional[str] = None) -> Iterator[Tuple[str, DatasetResult]]:
+        """
+        Prepare datasets one at a time, yielding each result as soon as it is ready.
+        
+        Used by the pipelined batch executor so training of a dataset can
+        start while the next one is being prepared. Output (batch table and
+        summary) matches sequential execution.
+        
+        Args:
+            datasets: List of dataset paths or configurations
+            continue_on_error: Whether to continue preparing after a failure
+            preset: Optional specific preset to generate configs for
+            
+        Yields:
+            Tuples of (dataset name, DatasetResult)
+        """
+        context = PipelineContext(pipeline_id=str(uuid.uuid4()))
+        errors = self.validate_inputs(datasets=datasets)
+        if errors:
+            raise ValueError("; ".join(errors))
+        yield from self._iter_sequential(self._normalize_datasets(datasets), context,
+                                         continue_on_error, preset)
+        
+    def _iter_sequential(self, datasets: List[Dict[str, Any]],
+                         context: PipelineContext,
+                         continue_on_error: bool,
+                         preset: Optional[str] = None) -> Iterator[Tuple[str, DatasetResult]]:
+        """Prepare datasets sequentially, yielding (name, result) pairs."""
         results = {}
         total = len(datasets)
         
@@ -202,10 +234,11 @@ class BatchPipeline(PipelineInterface):
                         success=False,
                         error="Dataset already exists and user chose not to clean it"
                     )
+                    yield name, results[name]
                 # Process only non-existing datasets
                 datasets = [d for d in datasets if d['dataset_name'] not in existing_datasets]
                 if not datasets:
-                    return results
+                    return
         
         # Print table header
         print(format_batch_table_header())
@@ -256,6 +289,8 @@ class BatchPipeline(PipelineInterface):
                         error=result.error
                     ))
                 
+                yield dataset_name, result
+                
                 if not result.success and not continue_on_error:
                     break
                     
@@ -279,6 +314,8 @@ class BatchPipeline(PipelineInterface):
                     error=str(e)
                 ))
                 
+                yield dataset_name, error_result
+                
                 if not continue_on_error:
                     break
         
@@ -296,8 +333,6 @@ class BatchPipeline(PipelineInterface):
             datasets_cleaned=total_cleaned
         ))
         print()  # Extra line for spacing
-                    
-        return results
         
     def _execute_parallel(self, datasets: List[Dict[str, Any]],
                          context: PipelineContext,
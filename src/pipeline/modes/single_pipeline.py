@@ -116,7 +116,8 @@ class SinglePipeline(PipelineInterface):
                     class_name=class_name,
                     was_cleaned=was_cleaned,
                     valid_pairs=prep_result.get('valid_pairs', 0),
-                    configs=configs
+                    configs=configs,
+                    staging=prep_result.get('staging')
                 )
                 
             # Create dataset result
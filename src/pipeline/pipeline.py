@@ -392,6 +392,22 @@ class AutoTrainPipeline:
             strategy='parallel' if parallel else 'sequential'
         )
         
+    def iter_batch(self, datasets: List[Union[str, Dict[str, Any]]],
+                   continue_on_error: bool = True,
+                   preset: Optional[str] = None):
+        """
+        Prepare datasets one at a time, yielding each result when it is ready.
+        
+        Args:
+            datasets: List of dataset paths or configurations
+            continue_on_error: Whether to continue after a failed dataset
+            preset: Optional specific preset to generate configs for
+            
+        Returns:
+            Iterator of (dataset name, DatasetResult)
+        """
+        return self._batch_pipeline.iter_datasets(datasets, continue_on_error, preset)
+        
     def create_variations(self, dataset_name: str, base_preset: str,
                          **variations) -> PipelineResult:
         """
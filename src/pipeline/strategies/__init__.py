@@ -1,8 +1,5 @@
 """Pipeline execution strategies."""
 
-# Strategies will be implemented in future iterations
-# This module will contain different execution strategies like:
-# - SequentialStrategy
-# - ParallelStrategy  
-# - DistributedStrategy
-# - AdaptiveStrategy (adjusts based on system resources)
\ No newline at end of file
+from .pipelined_batch import PipelinedBatchExecutor, PipelinedBatchResult
+
+__all__ = ['PipelinedBatchExecutor', 'PipelinedBatchResult']
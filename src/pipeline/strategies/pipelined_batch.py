@@ -0,0 +1,116 @@
+"""
+Pipelined batch execution strategy.
+
+Overlaps the three stages of a batch run instead of running them back to
+back:
+
+- Preparation of dataset N+1 runs on the scheduler's feed thread while
+  dataset N trains, at most ``prefetch`` datasets ahead of training
+- Training runs on the device inventory through the TrainingScheduler
+- Post-training hooks (previews, file moves) for job N-1 run on the
+  scheduler's post-training worker, behind a bounded queue
+
+Per-stage busy time is collected in a StageTimings so the summary can show
+how much of the stage time the overlap saved.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from ..base import DatasetResult
+from ...training.scheduler import TrainingScheduler, TrainingTask
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PipelinedBatchResult:
+    """Outcome of a pipelined batch run."""
+    preparation: Dict[str, DatasetResult] = field(default_factory=dict)
+    training: Dict[str, bool] = field(default_factory=dict)
+    timings: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def success(self) -> bool:
+        """True if every dataset was prepared and trained."""
+        return (all(result.success for result in self.preparation.values())
+                and all(self.training.values()))
+
+
+class PipelinedBatchExecutor:
+    """Runs preparation, training and post-training hooks as overlapping stages."""
+
+    def __init__(self, scheduler: TrainingScheduler, prefetch: int = 1):
+        """
+        Initialize the executor.
+
+        Args:
+            scheduler: Scheduler that runs the training stage; its timings
+                collector also receives the 'preparation' stage
+            prefetch: Prepared datasets that may wait for a device
+        """
+        self.scheduler = scheduler
+        self.timings = scheduler.timings
+        self.prefetch = max(1, prefetch)
+
+    def run(self, prepared: Iterable[Tuple[str, DatasetResult]],
+            make_task: Callable[[int, str, DatasetResult], Optional[TrainingTask]],
+            on_complete: Optional[Callable[[TrainingTask, bool], None]] = None,
+            stop_on_error: bool = False) -> PipelinedBatchResult:
+        """
+        Run the batch and wait for every stage to drain.
+
+        Args:
+            prepared: Lazy source of (dataset name, DatasetResult), e.g.
+                BatchPipeline.iter_datasets(); advanced only as training
+                makes room
+            make_task: Builds the training task for a prepared dataset
+                (1-based position, name, result), or returns None to skip it
+            on_complete: Post-training step, called once per trained dataset
+            stop_on_error: Stop preparing and training after the first failure
+
+        Returns:
+            PipelinedBatchResult with per-dataset outcomes and stage timings
+
+        Raises:
+            Exception: Whatever the prepared source raised (e.g. ValueError
+                from input validation), after the stages have drained
+        """
+        result = PipelinedBatchResult()
+        stop = threading.Event()
+
+        def tasks() -> Iterator[TrainingTask]:
+            iterator = iter(prepared)
+            position = 0
+            while not stop.is_set():
+                start = time.monotonic()
+                item = next(iterator, None)
+                if item is None:
+                    return
+                self.timings.record('preparation', time.monotonic() - start)
+                name, dataset_result = item
+                position += 1
+                result.preparation[name] = dataset_result
+                if not dataset_result.success:
+                    if stop_on_error:
+                        stop.set()
+                    continue
+                task = make_task(position, name, dataset_result)
+                if task is not None:
+                    yield task
+
+        def complete(task: TrainingTask, success: bool) -> None:
+            if not success and stop_on_error:
+                stop.set()
+            if on_complete:
+                on_complete(task, success)
+
+        result.training = self.scheduler.run(
+            tasks(), on_complete=complete, stop_on_error=stop_on_error,
+            max_pending=self.prefetch)
+        self.timings.finish()
+        result.timings = self.timings.summary()
+        return result
@@ -11,6 +11,7 @@ from typing import Dict, Any, Optional
 import copy
 from src.utils.job_id import generate_job_id
 from src.utils.path_manager import PathManager
+from src.utils.training_cache import get_training_cache_dir
 
 
 class ConfigurationGenerator:
@@ -136,6 +137,10 @@ class ConfigurationGenerator:
             "output_name": output_name
         })
         
+        # Share cached VAE latents / text encoder outputs across jobs and variations
+        if config.get("cache_latents_to_disk") or config.get("cache_text_encoder_outputs_to_disk"):
+            config["shared_cache_dir"] = self._normalize_path(get_training_cache_dir(str(self.base_path)))
+        
         return config
     
     def _normalize_path(self, path: Any) -> str:
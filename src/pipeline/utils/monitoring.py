@@ -165,6 +165,63 @@ class ProgressMonitor:
                 pass
 
 
+class StageTimings:
+    """
+    Thread-safe per-stage timing collector for pipelined execution.
+    
+    Records how long each item spent in each stage so the busy time of every
+    stage can be compared with the wall-clock time of the whole run.
+    """
+    
+    def __init__(self):
+        self._durations: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        self._start = time.monotonic()
+        self._end: Optional[float] = None
+        
+    def record(self, stage: str, seconds: float) -> None:
+        """Record one item's time in a stage."""
+        with self._lock:
+            self._durations.setdefault(stage, []).append(seconds)
+            
+    @contextmanager
+    def track(self, stage: str):
+        """Context manager recording the duration of the enclosed block."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record(stage, time.monotonic() - start)
+            
+    def finish(self) -> None:
+        """Mark the end of the run."""
+        self._end = time.monotonic()
+        
+    def summary(self) -> Dict[str, Any]:
+        """
+        Get per-stage totals.
+        
+        Returns:
+            Dictionary with wall_seconds, busy_seconds (sum over stages) and,
+            per stage, count, total_seconds and avg_seconds
+        """
+        with self._lock:
+            stages = {
+                stage: {
+                    'count': len(values),
+                    'total_seconds': round(sum(values), 3),
+                    'avg_seconds': round(sum(values) / len(values), 3) if values else 0.0,
+                }
+                for stage, values in self._durations.items()
+            }
+        wall = (self._end or time.monotonic()) - self._start
+        return {
+            'wall_seconds': round(wall, 3),
+            'busy_seconds': round(sum(stage['total_seconds'] for stage in stages.values()), 3),
+            'stages': stages,
+        }
+
+
 class ConsoleProgressReporter:
     """Enhanced console progress reporter with better visualization."""
     
@@ -636,7 +636,8 @@ def format_batch_table_footer() -> str:
 
 def print_compact_preparation(dataset_name: str, source_path: str, repeats: int, 
                             class_name: str, was_cleaned: bool = False,
-                            valid_pairs: int = 0, configs: List[str] = None) -> None:
+                            valid_pairs: int = 0, configs: List[str] = None,
+                            staging: Optional[Dict[str, Any]] = None) -> None:
     """Print compact dataset preparation output for single mode.
     
     Args:
@@ -647,12 +648,21 @@ def print_compact_preparation(dataset_name: str, source_path: str, repeats: int,
         was_cleaned: Whether existing dataset was cleaned
         valid_pairs: Number of valid image-text pairs
         configs: List of generated config paths
+        staging: Staging reports for the input and output copies
     """
     print_table_header("DATASET PREPARATION")
     
     # Basic info
     print(f"\n  Dataset: {dataset_name} ({repeats} repeats, class '{class_name}')")
     print(f"  Source:  {source_path}")
+    if staging:
+        methods = {}
+        for report in staging.values():
+            for method, count in report.get('files', {}).items():
+                methods[method] = methods.get(method, 0) + count
+        method_text = ", ".join(f"{count} {method}" for method, count in sorted(methods.items()))
+        strategy = next(iter(staging.values())).get('strategy', 'auto')
+        print(f"  Staging: {strategy} ({method_text or 'no files'})")
     if was_cleaned:
         print(f"  Status:  {ColoredOutput.YELLOW}⚠️ Existing dataset cleaned{ColoredOutput.RESET}")
     print()
@@ -718,4 +728,28 @@ def format_batch_summary(total: int, successful: int, configs_generated: int,
     if datasets_cleaned > 0:
         summary += f" • {datasets_cleaned} datasets cleaned"
     
-    return summary
\ No newline at end of file
+    return summary
+
+def format_stage_timings(timings: Dict[str, Any]) -> str:
+    """Format the per-stage timing breakdown of a pipelined run.
+    
+    Args:
+        timings: StageTimings.summary() dictionary
+        
+    Returns:
+        Formatted multi-line string comparing stage busy time to wall time
+    """
+    wall = timings.get('wall_seconds', 0.0)
+    busy = timings.get('busy_seconds', 0.0)
+    lines = [f"{ColoredOutput.BOLD}Stage timings{ColoredOutput.RESET}"]
+    for stage, data in timings.get('stages', {}).items():
+        lines.append(
+            f"  {stage:<14} {data['count']:>3} × {data['avg_seconds']:>8.1f}s avg"
+            f"  {ColoredOutput.DIM}{data['total_seconds']:>9.1f}s busy{ColoredOutput.RESET}"
+        )
+    overlap = busy / wall if wall > 0 else 0.0
+    lines.append(
+        f"  {'wall clock':<14} {wall:>19.1f}s  "
+        f"{ColoredOutput.CYAN}{overlap:.2f}x stage overlap{ColoredOutput.RESET}"
+    )
+    return "\n".join(lines)
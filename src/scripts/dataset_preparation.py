@@ -13,7 +13,6 @@ Usage:
 """
 
 import os
-import shutil
 import argparse
 from pathlib import Path
 from typing import List, Tuple, Optional, Dict
@@ -26,6 +25,10 @@ if __name__ == "__main__":
 
 from src.config import Config
 from src.utils.path_manager import PathManager
+from src.utils.dataset_index import get_dataset_index
+from src.utils.dataset_scanner import get_dataset_scanner
+from src.utils.file_staging import FileStager, remove_staged_tree
+from src.utils.thumbnails import get_thumbnail_service
 from src.pipeline.utils.shared_pipeline_utils import (
     print_dataset_extraction,
     print_cleaning_table,
@@ -58,6 +61,7 @@ class DatasetPreparator:
             self.output_path = self.base_path / "workspace/output"
             self.presets_path = self.base_path / "workspace/Presets"
         self.quiet_mode = quiet_mode
+        self.staging_strategy = Config.get_dataset_staging(str(self.base_path))
         
     def validate_source_dataset(self, source_path: Path) -> List[Tuple[Path, Path]]:
         """
@@ -75,26 +79,18 @@ class DatasetPreparator:
         if not source_path.exists():
             raise ValueError(f"Source path does not exist: {source_path}")
             
-        # Find all image files
-        image_files = []
-        for ext in self.SUPPORTED_IMAGE_FORMATS:
-            image_files.extend(source_path.glob(f"*{ext}"))
-            image_files.extend(source_path.glob(f"*{ext.upper()}"))
-            
-        if not image_files:
+        # Images and captions come from one directory pass of the shared scanner
+        scanner = get_dataset_scanner(str(self.base_path))
+        listing = scanner.list_directory(source_path)
+        if not listing.has_images:
             raise ValueError(f"No image files found in {source_path}")
             
-        # Find corresponding text files and validate pairs
-        valid_pairs = []
-        for image_file in image_files:
-            # Look for corresponding .txt file
-            txt_file = image_file.with_suffix('.txt')
-            
-            if txt_file.exists() and txt_file.stat().st_size > 0:
-                valid_pairs.append((image_file, txt_file))
-            else:
-                if not self.quiet_mode:
-                    print(f"  ⚠️  Warning: No valid text file found for {image_file.name}")
+        valid_pairs = scanner.caption_pairs(source_path, non_empty=True)
+        if not self.quiet_mode and len(valid_pairs) < listing.image_count:
+            paired = {image_file.name for image_file, _ in valid_pairs}
+            for filename in listing.images:
+                if filename not in paired:
+                    print(f"  ⚠️  Warning: No valid text file found for {filename}")
                 
         if not valid_pairs:
             raise ValueError("No valid image-text pairs found")
@@ -133,6 +129,9 @@ class DatasetPreparator:
         """
         Clean all files and directories related to an existing dataset.
         
+        Staged files may be hard links or symlinks to the source dataset;
+        only the workspace's names for them are removed.
+        
         Args:
             dataset_name: Name of the dataset to clean
             
@@ -147,14 +146,14 @@ class DatasetPreparator:
         
         # Clean input directory
         input_dir = self.input_path / dataset_name
-        if input_dir.exists():
-            shutil.rmtree(input_dir)
+        if input_dir.exists() or input_dir.is_symlink():
+            remove_staged_tree(input_dir)
             cleaned['input'].append(str(input_dir))
         
         # Clean output directory
         output_dir = self.output_path / dataset_name
-        if output_dir.exists():
-            shutil.rmtree(output_dir)
+        if output_dir.exists() or output_dir.is_symlink():
+            remove_staged_tree(output_dir)
             cleaned['output'].append(str(output_dir))
         
         # Clean preset configurations
@@ -172,13 +171,15 @@ class DatasetPreparator:
         
         return cleaned
         
-    def copy_to_input(self, source_path: Path, dataset_name: str) -> Path:
+    def copy_to_input(self, source_path: Path, dataset_name: str,
+                      stager: Optional[FileStager] = None) -> Path:
         """
-        Copy dataset files to input directory.
+        Stage dataset files into the input directory.
         
         Args:
             source_path: Source dataset path
             dataset_name: Name of the dataset
+            stager: File stager to use (default: the configured strategy)
             
         Returns:
             Path to created input directory
@@ -193,20 +194,19 @@ class DatasetPreparator:
         # Validate source dataset
         valid_pairs = self.validate_source_dataset(source_path)
         
-        # Copy files
-        copied_files = 0
-        for image_file, txt_file in valid_pairs:
-            # Copy image file
-            shutil.copy2(image_file, input_dir / image_file.name)
-            # Copy text file
-            shutil.copy2(txt_file, input_dir / txt_file.name)
-            copied_files += 2
+        # Link or copy files
+        stager = stager or FileStager(self.staging_strategy)
+        staged = stager.stage(
+            (file, input_dir / file.name) for pair in valid_pairs for file in pair
+        )
+        copied_files = staged.total
             
         # Return info for progress display
         return input_dir, copied_files
         
     def create_output_structure(self, dataset_name: str, repeats: int = 30, 
-                              class_name: str = "person") -> Path:
+                              class_name: str = "person",
+                              stager: Optional[FileStager] = None) -> Path:
         """
         Create output directory structure for training.
         
@@ -214,6 +214,7 @@ class DatasetPreparator:
             dataset_name: Name of the dataset
             repeats: Number of repetitions for training
             class_name: Class name for the object
+            stager: File stager to use (default: the configured strategy)
             
         Returns:
             Path to created output directory
@@ -237,12 +238,14 @@ class DatasetPreparator:
         log_dir.mkdir(exist_ok=True)
         model_dir.mkdir(exist_ok=True)
         
-        # Copy files from input to training directory
+        # Link or copy files from input to training directory
         input_dir = self.input_path / dataset_name
         if input_dir.exists():
-            for file in input_dir.iterdir():
-                if file.is_file():
-                    shutil.copy2(file, img_dir / file.name)
+            stager = stager or FileStager(self.staging_strategy)
+            stager.stage(
+                (Path(entry.path), img_dir / entry.name)
+                for entry in os.scandir(input_dir) if entry.is_file()
+            )
                     
         # Return info for progress display
         return output_dir, img_dir, log_dir, model_dir
@@ -321,8 +324,9 @@ class DatasetPreparator:
         try:
             steps = []
             
-            # Step 1: Copy to input
-            input_dir, copied_files = self.copy_to_input(source_path, dataset_name)
+            # Step 1: Stage to input
+            input_stager = FileStager(self.staging_strategy)
+            input_dir, copied_files = self.copy_to_input(source_path, dataset_name, input_stager)
             valid_pairs = self.validate_source_dataset(source_path)
             steps.append({
                 'number': '1',
@@ -330,18 +334,33 @@ class DatasetPreparator:
                 'status': '✓ Complete',
                 'details': [
                     f'Found {len(valid_pairs)} valid image-text pairs',
-                    f'Copied {copied_files} files'
+                    input_stager.report.summary()
                 ]
             })
             
+            # Pre-warm web UI grid thumbnails for the new input dataset in the background
+            try:
+                input_index = get_dataset_index(input_dir)
+                get_thumbnail_service(str(self.base_path)).prewarm(
+                    (input_dir / entry['filename'] for entry in input_index.images),
+                    wait=False
+                )
+            except Exception as e:
+                if not self.quiet_mode:
+                    print(f"  ⚠️  Warning: Thumbnail pre-warm failed: {e}")
+            
             # Step 2: Create output structure
-            output_dir, img_dir, log_dir, model_dir = self.create_output_structure(dataset_name, repeats, class_name)
+            output_stager = FileStager(self.staging_strategy)
+            output_dir, img_dir, log_dir, model_dir = self.create_output_structure(
+                dataset_name, repeats, class_name, output_stager
+            )
             steps.append({
                 'number': '2',
                 'task': 'Creating output directory structure',
                 'status': '✓ Complete',
                 'details': [
                     f'Training images: {repeats}_{dataset_name} {class_name}',
+                    output_stager.report.summary(),
                     'Log directory created',
                     'Model directory created'
                 ]
@@ -367,7 +386,11 @@ class DatasetPreparator:
                 'dataset_name': dataset_name,
                 'repeats': repeats,
                 'class_name': class_name,
-                'valid_pairs': len(valid_pairs)
+                'valid_pairs': len(valid_pairs),
+                'staging': {
+                    'input': input_stager.report.to_dict(),
+                    'output': output_stager.report.to_dict()
+                }
             }
             
             return result
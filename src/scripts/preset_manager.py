@@ -17,6 +17,12 @@ from dataclasses import dataclass
 
 # Import from the new model management system
 from .models import TrainingConfig, ValidationError, ModelManager
+from ..utils.cache_system import get_cache_manager
+
+# Presets are shared across PresetManager instances through the process
+# cache and rescanned at most this often, so long-lived processes (API job
+# workers) pick up presets created elsewhere
+PRESETS_CACHE_TTL = 60
 
 
 # ===== PRESET MANAGER FUNCTIONALITY =====
@@ -282,9 +288,14 @@ class PresetManager:
     
     def get_presets(self, force_refresh: bool = False) -> Dict[str, PresetInfo]:
         """Get all available presets."""
-        if self._presets_cache is None or force_refresh:
-            self._presets_cache = self._scan_presets()
-        return self._presets_cache
+        cache = get_cache_manager()
+        cache_key = f"presets:{self.presets_root}"
+        presets = None if force_refresh else cache.get_sync(cache_key)
+        if presets is None:
+            presets = self._scan_presets()
+            cache.set_sync(cache_key, presets, PRESETS_CACHE_TTL)
+        self._presets_cache = presets
+        return presets
     
     def get_preset_names(self, force_refresh: bool = False) -> List[str]:
         """Get list of available preset names."""
@@ -6,17 +6,16 @@ to Google Sheets whenever data is modified. Supports both SQLite and PostgreSQL.
 
 import asyncio
 import logging
-import hashlib
-import json
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Dict, Any, Set
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler, FileModifiedEvent
 
-from .integration import manual_full_sync
+from .integration import manual_full_sync, incremental_sync
 from ..config import Config
 from ..database import DatabaseManager, db_settings
+from ..database.change_detection import ChangeDetector, ChangeSet, create_change_detector
 
 logger = logging.getLogger(__name__)
 
@@ -72,8 +71,12 @@ class DatabaseWatcher:
         self.base_path = Path(base_path or ".")
         self.observer = None
         self._running = False
-        self._db_checksum = None
+        self._db_manager: Optional[DatabaseManager] = None
+        self._detector: Optional[ChangeDetector] = None
+        self._wakeup: Optional[asyncio.Event] = None
         self._sync_lock = asyncio.Lock()
+        # Changes of a failed sync, retried with the next sync
+        self._failed_changes: Optional[ChangeSet] = None
         
         # Load configuration
         self.config = Config.load_config(str(self.base_path))
@@ -108,8 +111,18 @@ class DatabaseWatcher:
             logger.warning("Database watcher is already running")
             return
             
-        # Calculate initial checksum
-        self._db_checksum = await self._calculate_db_checksum()
+        # One long-lived manager (engine + pool) serves change probes and syncs
+        self._db_manager = DatabaseManager()
+        detection_mode = self.sheets_config.get('sync_settings', {}).get('change_detection', 'auto')
+        self._detector = create_change_detector(self._db_manager.engine, self.db_type, detection_mode)
+        self._detector.start()
+        logger.info(f"Using {type(self._detector).__name__} for change detection")
+        
+        # Push-based detectors wake the check loop as soon as a change arrives
+        self._wakeup = asyncio.Event()
+        detector_fd = self._detector.fileno()
+        if detector_fd is not None:
+            asyncio.get_running_loop().add_reader(detector_fd, self._wakeup.set)
         
         # Set up monitoring based on database type
         if self.db_type == "sqlite" and self.db_path:
@@ -141,73 +154,72 @@ class DatabaseWatcher:
         if self.observer:
             self.observer.stop()
             self.observer.join()
+        
+        if self._detector:
+            detector_fd = self._detector.fileno()
+            if detector_fd is not None:
+                asyncio.get_running_loop().remove_reader(detector_fd)
+            self._detector.close()
+            self._detector = None
             
         logger.info("Stopped database watcher")
         
-    async def _calculate_db_checksum(self) -> Optional[str]:
-        """Calculate checksum of relevant database content."""
-        try:
-            # DatabaseManager handles connection based on current db_settings
-            db_manager = DatabaseManager()
-            
-            # Get all records
-            executions = db_manager.get_executions()
-            variations = db_manager.get_variations()
-            
-            # Create a deterministic representation of the data
-            data_repr = {
-                'executions': [
-                    {
-                        'job_id': e.job_id,
-                        'status': e.status,
-                        'updated_at': e.updated_at.isoformat() if e.updated_at else None
-                    } for e in executions
-                ],
-                'variations': [
-                    {
-                        'job_id': v.job_id,
-                        'status': v.status,
-                        'updated_at': v.updated_at.isoformat() if v.updated_at else None
-                    } for v in variations
-                ]
-            }
-            
-            # Calculate checksum
-            data_str = json.dumps(data_repr, sort_keys=True)
-            return hashlib.md5(data_str.encode()).hexdigest()
-            
-        except Exception as e:
-            logger.error(f"Error calculating database checksum: {e}")
-            return None
-            
     async def _periodic_check(self):
-        """Periodically check database for changes that might be missed."""
+        """Poll the change detector and sync whenever it reports changes."""
         # Use shorter interval for non-SQLite databases
         check_interval = 10 if self.db_type == "sqlite" else 5
+        loop = asyncio.get_running_loop()
+        
+        # Catch up on anything that changed while the watcher was not running
+        await self._handle_db_change()
         
         while self._running:
             try:
-                await asyncio.sleep(check_interval)
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=check_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
                 
-                # Calculate current checksum
-                current_checksum = await self._calculate_db_checksum()
+                changes = await loop.run_in_executor(None, self._detector.poll)
                 
-                if current_checksum and current_checksum != self._db_checksum:
-                    logger.info(f"Database content change detected via checksum ({self.db_type})")
-                    self._db_checksum = current_checksum
+                if changes:
+                    logger.info(f"Database content change detected ({self.db_type})")
+                    await self._handle_db_change(changes)
+                elif self._failed_changes is not None:
+                    logger.info("Retrying failed sync")
                     await self._handle_db_change()
                     
             except Exception as e:
                 logger.error(f"Error in periodic check: {e}")
                 
-    async def _handle_db_change(self):
-        """Handle database change by triggering sync."""
+    async def _handle_db_change(self, changes: Optional[ChangeSet] = None):
+        """Handle database change by triggering sync.
+        
+        Args:
+            changes: Detected changes; when they carry job_ids only those
+                rows are synced
+        """
         async with self._sync_lock:
+            # Notified job_ids are drained from the detector, so a failed
+            # sync keeps them for the next attempt
+            if self._failed_changes is not None:
+                changes = self._failed_changes.merge(changes or ChangeSet())
+                self._failed_changes = None
             try:
                 logger.info(f"Triggering Google Sheets synchronization from {self.db_type} database...")
                 
-                # Perform full sync
-                result = await manual_full_sync(str(self.base_path))
+                # Incremental sync pushes only changed rows; "full" keeps the
+                # legacy clear-and-rewrite behaviour.
+                sync_mode = self.sheets_config.get('sync_settings', {}).get('sync_mode', 'incremental')
+                if sync_mode == 'full':
+                    result = await manual_full_sync(str(self.base_path))
+                else:
+                    result = await incremental_sync(
+                        str(self.base_path),
+                        job_ids=changes.job_ids if changes else None,
+                        db_manager=self._db_manager
+                    )
                 
                 if result.success:
                     logger.info(f"Sync completed: {result.message}")
@@ -215,9 +227,11 @@ class DatabaseWatcher:
                         logger.info(f"Synced {result.data.get('total_synced', 0)} records")
                 else:
                     logger.error(f"Sync failed: {result.message}")
+                    self._failed_changes = changes or ChangeSet()
                     
             except Exception as e:
                 logger.error(f"Error during sync: {e}")
+                self._failed_changes = changes or ChangeSet()
                 
     async def force_sync(self):
         """Force an immediate synchronization."""
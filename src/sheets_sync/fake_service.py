@@ -0,0 +1,177 @@
+"""In-memory stand-in for the Google Sheets API client.
+
+Mimics the subset of ``googleapiclient`` calls used by the sync code
+(``spreadsheets().get/batchUpdate`` and ``spreadsheets().values()``
+``get/batchGet/clear/update/batchUpdate``) so sync logic can be exercised
+offline. Every executed request is recorded in ``calls``.
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+_CELL_RE = re.compile(r'^([A-Z]+)?(\d+)?$')
+
+
+def _column_index(letters: str) -> int:
+    index = 0
+    for char in letters:
+        index = index * 26 + (ord(char) - ord('A') + 1)
+    return index - 1
+
+
+def _parse_range(range_name: str) -> Tuple[str, str]:
+    """Split ``'Sheet'!A1`` / ``Sheet!A:Z`` into (title, cells)."""
+    title, _, cells = range_name.rpartition('!')
+    if title.startswith("'") and title.endswith("'"):
+        title = title[1:-1].replace("''", "'")
+    return title, cells
+
+
+def _parse_start(cells: str) -> Tuple[int, int]:
+    """Return zero-based (row, col) of the top-left cell of a range."""
+    start = cells.split(':')[0]
+    match = _CELL_RE.match(start)
+    col = _column_index(match.group(1)) if match and match.group(1) else 0
+    row = int(match.group(2)) - 1 if match and match.group(2) else 0
+    return row, col
+
+
+class _Request:
+    """Deferred call mirroring googleapiclient's HttpRequest."""
+
+    def __init__(self, service: 'FakeSheetsService', name: str, func, **kwargs):
+        self._service = service
+        self._name = name
+        self._func = func
+        self._kwargs = kwargs
+
+    def execute(self) -> Dict[str, Any]:
+        self._service.calls.append((self._name, self._kwargs))
+        return self._func(**self._kwargs)
+
+
+class _Values:
+    def __init__(self, service: 'FakeSheetsService'):
+        self._service = service
+
+    def get(self, spreadsheetId: str, range: str, **kwargs) -> _Request:
+        return _Request(self._service, 'values.get', self._service._get, range=range)
+
+    def batchGet(self, spreadsheetId: str, ranges: List[str], **kwargs) -> _Request:
+        return _Request(self._service, 'values.batchGet', self._service._batch_get, ranges=ranges)
+
+    def clear(self, spreadsheetId: str, range: str, **kwargs) -> _Request:
+        return _Request(self._service, 'values.clear', self._service._clear, range=range)
+
+    def update(self, spreadsheetId: str, range: str, body: Dict[str, Any],
+               valueInputOption: Optional[str] = None, **kwargs) -> _Request:
+        return _Request(self._service, 'values.update', self._service._write,
+                        range=range, values=body.get('values', []))
+
+    def batchUpdate(self, spreadsheetId: str, body: Dict[str, Any], **kwargs) -> _Request:
+        return _Request(self._service, 'values.batchUpdate', self._service._batch_write,
+                        data=body.get('data', []))
+
+
+class _Spreadsheets:
+    def __init__(self, service: 'FakeSheetsService'):
+        self._service = service
+
+    def get(self, spreadsheetId: str, **kwargs) -> _Request:
+        return _Request(self._service, 'spreadsheets.get', self._service._metadata)
+
+    def batchUpdate(self, spreadsheetId: str, body: Dict[str, Any], **kwargs) -> _Request:
+        return _Request(self._service, 'spreadsheets.batchUpdate', self._service._apply_requests,
+                        requests=body.get('requests', []))
+
+    def values(self) -> _Values:
+        return _Values(self._service)
+
+
+class FakeSheetsService:
+    """Offline Google Sheets service keeping sheet contents in memory."""
+
+    def __init__(self, sheets: Optional[Dict[str, List[List[str]]]] = None):
+        """Initialize the fake service.
+
+        Args:
+            sheets: Optional initial contents keyed by sheet title
+        """
+        self.sheets: Dict[str, List[List[str]]] = {
+            title: [list(row) for row in rows] for title, rows in (sheets or {}).items()
+        }
+        self.calls: List[Tuple[str, Dict[str, Any]]] = []
+
+    def spreadsheets(self) -> _Spreadsheets:
+        return _Spreadsheets(self)
+
+    # ===== Inspection helpers =====
+
+    def call_names(self) -> List[str]:
+        """Names of all executed requests, in order."""
+        return [name for name, _ in self.calls]
+
+    def reset_calls(self) -> None:
+        self.calls.clear()
+
+    def cells_written(self) -> int:
+        """Total number of cells written by update/batchUpdate calls."""
+        total = 0
+        for name, kwargs in self.calls:
+            if name == 'values.update':
+                total += sum(len(row) for row in kwargs['values'])
+            elif name == 'values.batchUpdate':
+                total += sum(len(row) for entry in kwargs['data'] for row in entry['values'])
+        return total
+
+    # ===== Request handlers =====
+
+    def _metadata(self) -> Dict[str, Any]:
+        return {'sheets': [{'properties': {'title': title}} for title in self.sheets]}
+
+    def _apply_requests(self, requests: List[Dict[str, Any]]) -> Dict[str, Any]:
+        for request in requests:
+            if 'addSheet' in request:
+                self.sheets.setdefault(request['addSheet']['properties']['title'], [])
+        return {'replies': [{} for _ in requests]}
+
+    def _sheet(self, title: str) -> List[List[str]]:
+        if title not in self.sheets:
+            raise ValueError(f"Unable to parse range: {title}")
+        return self.sheets[title]
+
+    def _get(self, range: str) -> Dict[str, Any]:
+        title, cells = _parse_range(range)
+        rows = self._sheet(title)
+        _, col = _parse_start(cells)
+        start, _, end = cells.partition(':')
+        single_column = bool(end) and start.rstrip('0123456789') == end.rstrip('0123456789')
+        values = [row[col:col + 1] if single_column else row[col:] for row in rows]
+        return {'range': range, 'values': values}
+
+    def _batch_get(self, ranges: List[str]) -> Dict[str, Any]:
+        return {'valueRanges': [self._get(range_name) for range_name in ranges]}
+
+    def _clear(self, range: str) -> Dict[str, Any]:
+        title, _ = _parse_range(range)
+        self._sheet(title).clear()
+        return {'clearedRange': range}
+
+    def _write(self, range: str, values: List[List[Any]]) -> Dict[str, Any]:
+        title, cells = _parse_range(range)
+        rows = self._sheet(title)
+        start_row, start_col = _parse_start(cells)
+        for offset, value_row in enumerate(values):
+            index = start_row + offset
+            while len(rows) <= index:
+                rows.append([])
+            row = rows[index]
+            while len(row) < start_col + len(value_row):
+                row.append('')
+            row[start_col:start_col + len(value_row)] = [str(v) for v in value_row]
+        return {'updatedRange': range, 'updatedRows': len(values)}
+
+    def _batch_write(self, data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        responses = [self._write(entry['range'], entry['values']) for entry in data]
+        return {'totalUpdatedRows': sum(r['updatedRows'] for r in responses),
+                'responses': responses}
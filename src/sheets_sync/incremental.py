@@ -0,0 +1,412 @@
+"""Incremental Google Sheets synchronization.
+
+Instead of clearing and rewriting every sheet on each database change, the
+incremental syncer keeps a persisted ``updated_at`` high-water mark and a
+``job_id -> sheet row`` map. Each cycle only fetches rows touched since the
+watermark, skips rows whose rendered values did not change, and pushes the
+rest (updated rows in place, new rows appended) in a single
+``values.batchUpdate`` call. A full rebuild only happens when the persisted
+map cannot be trusted (first run, different spreadsheet, changed headers or a
+sheet that no longer matches the map).
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+EXECUTION_HEADERS = [
+    'job_id', 'status', 'pipeline_mode', 'dataset_name', 'preset',
+    'total_steps', 'start_time', 'end_time', 'duration_seconds',
+    'success', 'error_message', 'output_path', 'created_at', 'updated_at'
+]
+
+VARIATION_HEADERS = [
+    'job_id', 'status', 'variation_id', 'experiment_name', 'dataset_name',
+    'preset', 'total_steps', 'total_combinations', 'varied_parameters',
+    'parameter_values', 'start_time', 'end_time', 'duration_seconds',
+    'success', 'error_message', 'output_path', 'parent_experiment_id',
+    'created_at', 'updated_at'
+]
+
+
+def _format_datetime(dt: Optional[datetime]) -> str:
+    return dt.isoformat() if dt else ''
+
+
+def _format_json(value: Any) -> str:
+    if not value:
+        return ''
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, sort_keys=True)
+
+
+def execution_to_row(execution) -> List[str]:
+    """Render an execution record as a sheet row (matches EXECUTION_HEADERS)."""
+    return [
+        execution.job_id,
+        execution.status,
+        execution.pipeline_mode,
+        execution.dataset_name,
+        execution.preset,
+        str(execution.total_steps) if execution.total_steps else '',
+        _format_datetime(execution.start_time),
+        _format_datetime(execution.end_time),
+        str(execution.duration_seconds) if execution.duration_seconds else '',
+        'TRUE' if execution.success else 'FALSE',
+        execution.error_message or '',
+        execution.output_path or '',
+        _format_datetime(execution.created_at),
+        _format_datetime(execution.updated_at)
+    ]
+
+
+def variation_to_row(variation) -> List[str]:
+    """Render a variation record as a sheet row (matches VARIATION_HEADERS)."""
+    return [
+        variation.job_id,
+        variation.status,
+        variation.variation_id,
+        variation.experiment_name,
+        variation.dataset_name,
+        variation.preset,
+        str(variation.total_steps) if variation.total_steps else '',
+        str(variation.total_combinations) if variation.total_combinations else '',
+        _format_json(variation.varied_parameters),
+        _format_json(variation.parameter_values),
+        _format_datetime(variation.start_time),
+        _format_datetime(variation.end_time),
+        str(variation.duration_seconds) if variation.duration_seconds else '',
+        'TRUE' if variation.success else 'FALSE',
+        variation.error_message or '',
+        variation.output_path or '',
+        variation.parent_experiment_id or '',
+        _format_datetime(variation.created_at),
+        _format_datetime(variation.updated_at)
+    ]
+
+
+def _row_hash(row: List[str]) -> str:
+    return hashlib.sha1(json.dumps(row).encode()).hexdigest()[:16]
+
+
+def _a1(title: str, cell: str) -> str:
+    """Build an A1 range with a quoted sheet title."""
+    escaped = title.replace("'", "''")
+    return f"'{escaped}'!{cell}"
+
+
+@dataclass
+class SheetSpec:
+    """Describes how one table maps onto one sheet."""
+    key: str
+    title: str
+    headers: List[str]
+    to_row: Callable[[Any], List[str]]
+
+
+def default_sheet_specs(sheets_config: Dict[str, Any]) -> List[SheetSpec]:
+    """Build the executions/variations sheet specs from the sync config."""
+    structure = sheets_config.get('sheet_structure', {})
+    return [
+        SheetSpec('executions', structure.get('executions_sheet', 'Executions'),
+                  EXECUTION_HEADERS, execution_to_row),
+        SheetSpec('variations', structure.get('variations_sheet', 'Variations'),
+                  VARIATION_HEADERS, variation_to_row),
+    ]
+
+
+@dataclass
+class SheetState:
+    """Persisted layout of a single sheet."""
+    title: str
+    headers: List[str]
+    rows: Dict[str, int] = field(default_factory=dict)
+    hashes: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def next_row(self) -> int:
+        # Row 1 holds the headers
+        return max(self.rows.values(), default=1) + 1
+
+
+@dataclass
+class SyncState:
+    """Watermark and row maps persisted between sync cycles."""
+    spreadsheet_id: Optional[str] = None
+    watermark: Optional[str] = None
+    sheets: Dict[str, SheetState] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path) -> 'SyncState':
+        """Load state from disk, returning an empty state if missing or corrupt."""
+        if not path.exists():
+            return cls()
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+            sheets = {
+                key: SheetState(
+                    title=sheet['title'],
+                    headers=sheet['headers'],
+                    rows={k: int(v) for k, v in sheet.get('rows', {}).items()},
+                    hashes=sheet.get('hashes', {})
+                )
+                for key, sheet in data.get('sheets', {}).items()
+            }
+            return cls(
+                spreadsheet_id=data.get('spreadsheet_id'),
+                watermark=data.get('watermark'),
+                sheets=sheets
+            )
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable sheets sync state {path}: {e}")
+            return cls()
+
+    def save(self, path: Path) -> None:
+        """Atomically write state to disk."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            'spreadsheet_id': self.spreadsheet_id,
+            'watermark': self.watermark,
+            'sheets': {
+                key: {
+                    'title': sheet.title,
+                    'headers': sheet.headers,
+                    'rows': sheet.rows,
+                    'hashes': sheet.hashes
+                }
+                for key, sheet in self.sheets.items()
+            }
+        }
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        tmp_path.replace(path)
+
+    def watermark_datetime(self) -> Optional[datetime]:
+        return datetime.fromisoformat(self.watermark) if self.watermark else None
+
+
+class IncrementalSheetsSync:
+    """Diff-based synchronizer that pushes only new or changed rows.
+
+    ``fetch`` callables passed to :meth:`sync` receive the current watermark
+    (``None`` for a full rebuild) and must return a mapping of spec key to
+    records whose ``updated_at`` is greater than or equal to it.
+    """
+
+    def __init__(self, service, spreadsheet_id: str, specs: List[SheetSpec],
+                 state_path: Path):
+        """Initialize the synchronizer.
+
+        Args:
+            service: Google Sheets API service (or FakeSheetsService)
+            spreadsheet_id: Target spreadsheet ID
+            specs: Sheet specifications to keep in sync
+            state_path: Where to persist the watermark and row maps
+        """
+        self.service = service
+        self.spreadsheet_id = spreadsheet_id
+        self.specs = specs
+        self.state_path = Path(state_path)
+        self._verified = False
+
+    def sync(self, fetch: Callable[[Optional[datetime]], Dict[str, List[Any]]],
+             force_full: bool = False,
+             fetch_changed: Optional[Callable[[], Dict[str, List[Any]]]] = None) -> Dict[str, Any]:
+        """Run one sync cycle.
+
+        Args:
+            fetch: Callable returning changed records per spec key
+            force_full: Ignore the persisted map and rebuild every sheet
+            fetch_changed: Optional callable returning exactly the changed
+                records (e.g. pushed job_ids); used instead of the watermark
+                query when the persisted map is valid
+
+        Returns:
+            Summary of the cycle
+        """
+        state = SyncState.load(self.state_path)
+
+        if force_full or not self._state_is_valid(state):
+            return self._full_rebuild(fetch(None))
+
+        if fetch_changed is not None:
+            records = fetch_changed()
+        else:
+            records = fetch(state.watermark_datetime())
+        return self._incremental_update(state, records)
+
+    # ===== Validation =====
+
+    def _state_is_valid(self, state: SyncState) -> bool:
+        if state.spreadsheet_id != self.spreadsheet_id:
+            return False
+
+        for spec in self.specs:
+            sheet = state.sheets.get(spec.key)
+            if not sheet or sheet.title != spec.title or sheet.headers != spec.headers:
+                return False
+
+        if self._verified:
+            return True
+
+        # First cycle in this process: make sure nobody reshuffled the sheets
+        # behind our back by comparing column A against the row map.
+        try:
+            response = self.service.spreadsheets().values().batchGet(
+                spreadsheetId=self.spreadsheet_id,
+                ranges=[_a1(spec.title, 'A:A') for spec in self.specs]
+            ).execute()
+        except Exception as e:
+            logger.info(f"Could not read sheets for verification, rebuilding: {e}")
+            return False
+
+        for spec, value_range in zip(self.specs, response.get('valueRanges', [])):
+            sheet = state.sheets[spec.key]
+            column = [row[0] if row else '' for row in value_range.get('values', [])]
+            if not column or column[0] != spec.headers[0]:
+                return False
+            if len(column) != len(sheet.rows) + 1:
+                return False
+            for job_id, row_index in sheet.rows.items():
+                if row_index > len(column) or column[row_index - 1] != job_id:
+                    return False
+
+        self._verified = True
+        return True
+
+    # ===== Full rebuild =====
+
+    def _ensure_sheets_exist(self) -> None:
+        spreadsheet = self.service.spreadsheets().get(
+            spreadsheetId=self.spreadsheet_id
+        ).execute()
+        existing = {s['properties']['title'] for s in spreadsheet.get('sheets', [])}
+        requests = [
+            {'addSheet': {'properties': {'title': spec.title}}}
+            for spec in self.specs if spec.title not in existing
+        ]
+        if requests:
+            self.service.spreadsheets().batchUpdate(
+                spreadsheetId=self.spreadsheet_id,
+                body={'requests': requests}
+            ).execute()
+
+    def _full_rebuild(self, records: Dict[str, List[Any]]) -> Dict[str, Any]:
+        logger.info("Rebuilding Google Sheets from scratch")
+        self._ensure_sheets_exist()
+
+        state = SyncState(spreadsheet_id=self.spreadsheet_id)
+        data = []
+        counts = {}
+        watermark = None
+
+        for spec in self.specs:
+            spec_records = sorted(
+                records.get(spec.key, []),
+                key=lambda r: r.created_at or datetime.min
+            )
+            sheet = SheetState(title=spec.title, headers=list(spec.headers))
+            values = [list(spec.headers)]
+            for record in spec_records:
+                row = spec.to_row(record)
+                values.append(row)
+                sheet.rows[record.job_id] = len(values)
+                sheet.hashes[record.job_id] = _row_hash(row)
+                watermark = _max_updated_at(watermark, record)
+
+            self.service.spreadsheets().values().clear(
+                spreadsheetId=self.spreadsheet_id,
+                range=_a1(spec.title, 'A:Z')
+            ).execute()
+            data.append({'range': _a1(spec.title, 'A1'), 'values': values})
+            state.sheets[spec.key] = sheet
+            counts[spec.key] = len(spec_records)
+
+        self.service.spreadsheets().values().batchUpdate(
+            spreadsheetId=self.spreadsheet_id,
+            body={'valueInputOption': 'USER_ENTERED', 'data': data}
+        ).execute()
+
+        state.watermark = watermark.isoformat() if watermark else None
+        state.save(self.state_path)
+        self._verified = True
+
+        return {
+            'mode': 'full',
+            'rows_written': sum(counts.values()),
+            'appended': sum(counts.values()),
+            'updated': 0,
+            'synced': counts
+        }
+
+    # ===== Incremental update =====
+
+    def _incremental_update(self, state: SyncState,
+                            records: Dict[str, List[Any]]) -> Dict[str, Any]:
+        data = []
+        counts = {}
+        appended = updated = 0
+        watermark = state.watermark_datetime()
+
+        for spec in self.specs:
+            sheet = state.sheets[spec.key]
+            changed = 0
+            spec_records = sorted(
+                records.get(spec.key, []),
+                key=lambda r: r.created_at or datetime.min
+            )
+            for record in spec_records:
+                watermark = _max_updated_at(watermark, record)
+                row = spec.to_row(record)
+                row_hash = _row_hash(row)
+                job_id = record.job_id
+
+                if sheet.hashes.get(job_id) == row_hash:
+                    continue
+
+                if job_id in sheet.rows:
+                    updated += 1
+                else:
+                    sheet.rows[job_id] = sheet.next_row
+                    appended += 1
+
+                data.append({'range': _a1(spec.title, f"A{sheet.rows[job_id]}"), 'values': [row]})
+                sheet.hashes[job_id] = row_hash
+                changed += 1
+            counts[spec.key] = changed
+
+        if data:
+            self.service.spreadsheets().values().batchUpdate(
+                spreadsheetId=self.spreadsheet_id,
+                body={'valueInputOption': 'USER_ENTERED', 'data': data}
+            ).execute()
+
+        state.watermark = watermark.isoformat() if watermark else state.watermark
+        state.save(self.state_path)
+
+        return {
+            'mode': 'incremental',
+            'rows_written': len(data),
+            'appended': appended,
+            'updated': updated,
+            'synced': counts
+        }
+
+
+def _max_updated_at(current: Optional[datetime], record) -> Optional[datetime]:
+    updated_at = getattr(record, 'updated_at', None)
+    if updated_at is None:
+        return current
+    if current is None or updated_at > current:
+        return updated_at
+    return current
@@ -2,12 +2,17 @@
 
 import asyncio
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Set, Tuple
 from pathlib import Path
 from dataclasses import dataclass
+from datetime import datetime
 
 from .service import SheetsSyncService
 from .config import ConfigManager
+from .incremental import (
+    IncrementalSheetsSync, default_sheet_specs,
+    EXECUTION_HEADERS, VARIATION_HEADERS, execution_to_row, variation_to_row
+)
 
 
 logger = logging.getLogger(__name__)
@@ -405,31 +410,10 @@ async def manual_full_sync(base_path: Optional[str] = None) -> SyncResult:
         if executions:
             # Sort executions by created_at ascending (oldest first)
             executions.sort(key=lambda x: x.created_at if x.created_at else datetime.min)
-            # Prepare headers
-            headers = ['job_id', 'status', 'pipeline_mode', 'dataset_name', 'preset', 
-                      'total_steps', 'start_time', 'end_time', 'duration_seconds', 
-                      'success', 'error_message', 'output_path', 'created_at', 'updated_at']
-            
             # Prepare data
-            values = [headers]
+            values = [EXECUTION_HEADERS]
             for exec in executions:
-                row = [
-                    exec.job_id,
-                    exec.status,
-                    exec.pipeline_mode,
-                    exec.dataset_name,
-                    exec.preset,
-                    str(exec.total_steps) if exec.total_steps else '',
-                    exec.start_time.isoformat() if exec.start_time else '',
-                    exec.end_time.isoformat() if exec.end_time else '',
-                    str(exec.duration_seconds) if exec.duration_seconds else '',
-                    'TRUE' if exec.success else 'FALSE',
-                    exec.error_message or '',
-                    exec.output_path or '',
-                    exec.created_at.isoformat() if exec.created_at else '',
-                    exec.updated_at.isoformat() if exec.updated_at else ''
-                ]
-                values.append(row)
+                values.append(execution_to_row(exec))
                 executions_synced += 1
             
             # Clear existing data and write new data
@@ -477,37 +461,9 @@ async def manual_full_sync(base_path: Optional[str] = None) -> SyncResult:
         if variations:
             # Sort variations by created_at ascending (oldest first)
             variations.sort(key=lambda x: x.created_at if x.created_at else datetime.min)
-            # Similar process for variations
-            headers = ['job_id', 'status', 'variation_id', 'experiment_name', 'dataset_name',
-                      'preset', 'total_steps', 'total_combinations', 'varied_parameters',
-                      'parameter_values', 'start_time', 'end_time', 'duration_seconds',
-                      'success', 'error_message', 'output_path', 'parent_experiment_id',
-                      'created_at', 'updated_at']
-            
-            values = [headers]
+            values = [VARIATION_HEADERS]
             for var in variations:
-                row = [
-                    var.job_id,
-                    var.status,
-                    var.variation_id,
-                    var.experiment_name,
-                    var.dataset_name,
-                    var.preset,
-                    str(var.total_steps) if var.total_steps else '',
-                    str(var.total_combinations) if var.total_combinations else '',
-                    var.varied_parameters or '',
-                    var.parameter_values or '',
-                    var.start_time.isoformat() if var.start_time else '',
-                    var.end_time.isoformat() if var.end_time else '',
-                    str(var.duration_seconds) if var.duration_seconds else '',
-                    'TRUE' if var.success else 'FALSE',
-                    var.error_message or '',
-                    var.output_path or '',
-                    var.parent_experiment_id or '',
-                    var.created_at.isoformat() if var.created_at else '',
-                    var.updated_at.isoformat() if var.updated_at else ''
-                ]
-                values.append(row)
+                values.append(variation_to_row(var))
                 variations_synced += 1
             
             # Update variations sheet
@@ -570,6 +526,125 @@ async def manual_full_sync(base_path: Optional[str] = None) -> SyncResult:
         )
 
 
+# Synchronizers are cached per (spreadsheet, state file) so the Sheets API client
+# and the one-time row map verification survive across watcher cycles.
+_incremental_syncers: Dict[Tuple[str, str], IncrementalSheetsSync] = {}
+
+
+def _get_incremental_syncer(base_path: Optional[str],
+                            sheets_config: Dict[str, Any]) -> IncrementalSheetsSync:
+    """Get or build the cached incremental synchronizer for a configuration."""
+    from google.oauth2 import service_account
+    from googleapiclient.discovery import build
+    
+    spreadsheet_id = sheets_config['spreadsheet_id']
+    sync_settings = sheets_config.get('sync_settings', {})
+    state_path = Path(base_path or ".") / sync_settings.get(
+        'incremental_state_path', 'DB/sheets_sync_state.json'
+    )
+    key = (spreadsheet_id, str(state_path.resolve()))
+    
+    syncer = _incremental_syncers.get(key)
+    if syncer is None:
+        creds_path = sheets_config.get('credentials_path', 'settings/google_credentials.json')
+        credentials = service_account.Credentials.from_service_account_file(
+            creds_path,
+            scopes=['https://www.googleapis.com/auth/spreadsheets']
+        )
+        service = build('sheets', 'v4', credentials=credentials)
+        syncer = IncrementalSheetsSync(
+            service, spreadsheet_id, default_sheet_specs(sheets_config), state_path
+        )
+        _incremental_syncers[key] = syncer
+    
+    return syncer
+
+
+async def incremental_sync(base_path: Optional[str] = None,
+                           force_full: bool = False,
+                           job_ids: Optional[Dict[str, Set[str]]] = None,
+                           db_manager=None) -> SyncResult:
+    """Synchronize only new or changed records to Google Sheets.
+    
+    Uses a persisted updated_at watermark and job_id -> row map to push
+    changes with a single values.batchUpdate per call. Falls back to a full
+    rebuild when the persisted map is missing or no longer matches the sheet.
+    
+    Args:
+        base_path: Base path for AutoTrainX
+        force_full: Rebuild every sheet regardless of the persisted state
+        job_ids: Changed job_ids per table (e.g. from LISTEN/NOTIFY); when
+            given only those rows are read instead of the watermark query
+        db_manager: Long-lived DatabaseManager to reuse (created if None)
+        
+    Returns:
+        Sync result information
+    """
+    try:
+        import json
+        
+        config_path = Path(base_path or ".") / "config.json"
+        with open(config_path, 'r') as f:
+            config = json.load(f)
+        
+        sheets_config = config.get('google_sheets_sync', {})
+        if not sheets_config.get('spreadsheet_id'):
+            return SyncResult(
+                success=False,
+                message="No spreadsheet ID configured",
+                data=None
+            )
+        
+        syncer = _get_incremental_syncer(base_path, sheets_config)
+        
+        if db_manager is None:
+            from src.database import DatabaseManager
+            db_manager = DatabaseManager()
+        
+        def fetch(since: Optional[datetime]) -> Dict[str, Any]:
+            return {
+                'executions': db_manager.list_executions_updated_since(since),
+                'variations': db_manager.list_variations_updated_since(since),
+            }
+        
+        fetch_changed = None
+        if job_ids is not None:
+            def fetch_changed() -> Dict[str, Any]:
+                return {
+                    'executions': db_manager.list_executions_updated_since(
+                        job_ids=job_ids['executions']) if job_ids.get('executions') else [],
+                    'variations': db_manager.list_variations_updated_since(
+                        job_ids=job_ids['variations']) if job_ids.get('variations') else [],
+                }
+        
+        summary = await asyncio.get_running_loop().run_in_executor(
+            None, lambda: syncer.sync(fetch, force_full=force_full, fetch_changed=fetch_changed)
+        )
+        
+        synced = summary['synced']
+        return SyncResult(
+            success=True,
+            message=(f"{summary['mode'].capitalize()} sync wrote {summary['rows_written']} rows "
+                     f"({summary['appended']} appended, {summary['updated']} updated)"),
+            data={
+                "mode": summary['mode'],
+                "total_synced": sum(synced.values()),
+                "executions_synced": synced.get('executions', 0),
+                "variations_synced": synced.get('variations', 0),
+                "appended": summary['appended'],
+                "updated": summary['updated'],
+            }
+        )
+        
+    except Exception as e:
+        logger.error(f"Incremental sync failed: {e}")
+        return SyncResult(
+            success=False,
+            message=f"Incremental sync failed: {str(e)}",
+            data=None
+        )
+
+
 async def get_sheets_sync_service(base_path: Optional[str] = None) -> Optional[SheetsSyncService]:
     """Get an initialized sheets sync service instance.
     
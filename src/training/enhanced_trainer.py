@@ -16,6 +16,8 @@ from .minimal_progress_monitor import MinimalProgressMonitor as ProgressMonitor,
 from ..config import Config
 from ..utils.job_tracker import get_tracker
 from ..database import ExecutionStatus
+from .output_pump import OutputPump, metrics_path_for
+from .progress_bus import ProgressPublisher
 
 logger = logging.getLogger(__name__)
 
@@ -42,7 +44,8 @@ class EnhancedSDScriptsTrainer:
                        job_id: Optional[str] = None, mode: str = "single", 
                        current: int = 1, total: int = 1, 
                        experiment_name: Optional[str] = None,
-                       variation_params: Optional[str] = None) -> bool:
+                       variation_params: Optional[str] = None,
+                       cuda_devices: Optional[str] = None) -> bool:
         """
         Execute training with progress monitoring.
         
@@ -56,6 +59,8 @@ class EnhancedSDScriptsTrainer:
             total: Total number of datasets/variations
             experiment_name: Name of the experiment (for variations mode)
             variation_params: Current variation parameters (for variations mode)
+            cuda_devices: CUDA_VISIBLE_DEVICES for the training process
+                (set by the training scheduler; None inherits the environment)
             
         Returns:
             bool: True if training completed successfully, False otherwise
@@ -115,33 +120,25 @@ class EnhancedSDScriptsTrainer:
         if job_id:
             tracker.update_status(job_id, ExecutionStatus.TRAINING)
             if total_steps:
-                # Update total steps if we found it
-                from ..database import DatabaseManager
-                from ..utils.quiet_mode import quiet_database_operations
-                with quiet_database_operations():
-                    db = DatabaseManager()
-                with db.get_session() as session:
-                    from ..database.models import Execution, Variation
-                    # Try both tables
-                    record = session.query(Execution).filter_by(job_id=job_id).first()
-                    if not record:
-                        record = session.query(Variation).filter_by(job_id=job_id).first()
-                    if record:
-                        record.total_steps = total_steps
-                        session.commit()
+                # Update total steps if we found it (queued with write-behind)
+                tracker.set_total_steps(job_id, total_steps)
         
         # Choose execution method based on show_progress setting
         if self.show_progress:
             return self._execute_with_progress(command, dataset_name, preset_info, toml_path, job_id,
-                                             mode, experiment_name, variation_params)
+                                             mode, experiment_name, variation_params, cuda_devices,
+                                             total_steps=total_steps)
         else:
             return self._execute_with_raw_output(command, dataset_name, preset_info, toml_path, job_id,
-                                               mode, experiment_name, variation_params)
+                                               mode, experiment_name, variation_params, cuda_devices,
+                                               total_steps=total_steps)
             
     def _execute_with_progress(self, command: List[str], dataset_name: str, 
                               preset_info: PresetInfo, toml_path: Path, job_id: Optional[str] = None,
                               mode: str = "single", experiment_name: Optional[str] = None,
-                              variation_params: Optional[str] = None) -> bool:
+                              variation_params: Optional[str] = None,
+                              cuda_devices: Optional[str] = None,
+                              total_steps: Optional[int] = None) -> bool:
         """Execute training with progress monitoring."""
         # Create progress monitor with configured display mode
         monitor = self.progress_tracker.create_monitor(dataset_name, preset_info.name)
@@ -149,23 +146,28 @@ class EnhancedSDScriptsTrainer:
         
         # Track training start time
         start_time = time.time()
+        heartbeat_writer = None
         
         try:
             # Set environment to suppress warnings
             env = os.environ.copy()
             env['PYTHONWARNINGS'] = 'ignore::FutureWarning,ignore::DeprecationWarning'
+            if cuda_devices is not None:
+                env['CUDA_VISIBLE_DEVICES'] = cuda_devices
             
             # Execute the training process
             process = subprocess.Popen(
                 command,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                universal_newlines=True,
-                bufsize=1,
+                bufsize=0,
                 cwd=str(self.base_path),
                 env=env
             )
             
+            # Register the process for liveness monitoring
+            heartbeat_writer = self._register_process(job_id, process)
+            
             # Create train_log directory and prepare log file
             train_log_dir = self.base_path / "logs" / "train_log"
             train_log_dir.mkdir(parents=True, exist_ok=True)
@@ -194,30 +196,38 @@ class EnhancedSDScriptsTrainer:
                 log_file.flush()
             
                 # Process output lines
-                output_lines = []
-                
-                for line in process.stdout:
-                    # Write to log file
-                    log_file.write(line)
-                    log_file.flush()
-                    
-                    # Store line for potential debugging
-                    output_lines.append(line.strip())
-                    
-                    # Parse the line to update state
-                    monitor.parse_line(line)
+                def on_line(line: str) -> None:
+                    # Keep the liveness record fresh (rate-limited by the writer)
+                    if heartbeat_writer:
+                        heartbeat_writer.write_heartbeat()
                     
-                    # Update display
+                    # Update display (the pump feeds parsed events to monitor.apply)
                     monitor.display()
                     
                     # Only show actual errors (not warnings)
-                    if "error" in line.lower() and "warning" not in line.lower():
+                    lowered = line.lower()
+                    if "error" in lowered and "warning" not in lowered:
                         # Skip certain non-critical error messages
-                        if not any(skip in line.lower() for skip in ["futurewarn", "deprecat"]):
+                        if not any(skip in lowered for skip in ["futurewarn", "deprecat"]):
                             print(f"\n❌ {line.strip()}\n")
+                
+                progress_publisher = ProgressPublisher(job_id)
+                progress_publisher.status(ExecutionStatus.TRAINING.value, dataset_name=dataset_name,
+                                          preset=preset_info.name)
+                tracker = get_tracker()
+                pump = OutputPump(process.stdout, log_file, metrics_path=metrics_path_for(log_file_path),
+                                  on_line=on_line, on_events=monitor.apply,
+                                  on_progress=self._progress_handler(job_id, progress_publisher, total_steps),
+                                  on_metrics=tracker.metrics_recorder(job_id))
+                pump.run()
+                tracker.flush_metrics()
+                output_lines = [line.strip() for line in pump.tail]
                     
                 # Wait for process to complete
                 return_code = process.wait()
+                progress_publisher.status('training_finished' if return_code == 0 else ExecutionStatus.FAILED.value,
+                                          return_code=return_code)
+                progress_publisher.close()
             
             # Update final state
             if return_code == 0:
@@ -256,31 +266,42 @@ class EnhancedSDScriptsTrainer:
                 tracker = get_tracker()
                 tracker.update_status(job_id, ExecutionStatus.FAILED, error_message=str(e))
             return False
+        finally:
+            # Remove the process record
+            if heartbeat_writer:
+                heartbeat_writer.cleanup()
             
     def _execute_with_raw_output(self, command: List[str], dataset_name: str,
                                 preset_info: PresetInfo, toml_path: Path, job_id: Optional[str] = None,
                                 mode: str = "single", experiment_name: Optional[str] = None,
-                                variation_params: Optional[str] = None) -> bool:
+                                variation_params: Optional[str] = None,
+                                cuda_devices: Optional[str] = None,
+                                total_steps: Optional[int] = None) -> bool:
         """Execute training with raw output (original behavior)."""
         # Track training start time
         start_time = time.time()
+        heartbeat_writer = None
         
         try:
             # Set environment to suppress warnings
             env = os.environ.copy()
             env['PYTHONWARNINGS'] = 'ignore::FutureWarning,ignore::DeprecationWarning'
+            if cuda_devices is not None:
+                env['CUDA_VISIBLE_DEVICES'] = cuda_devices
             
             # Execute the training process
             process = subprocess.Popen(
                 command,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                universal_newlines=True,
-                bufsize=1,
+                bufsize=0,
                 cwd=str(self.base_path),
                 env=env
             )
             
+            # Register the process for liveness monitoring
+            heartbeat_writer = self._register_process(job_id, process)
+            
             # Create train_log directory and prepare log file
             train_log_dir = self.base_path / "logs" / "train_log"
             train_log_dir.mkdir(parents=True, exist_ok=True)
@@ -303,28 +324,22 @@ class EnhancedSDScriptsTrainer:
                 log_file.write("=" * 80 + "\n\n")
                 log_file.flush()
             
-                # Stream output in real-time and parse for progress
-                import re
-                step_pattern = re.compile(r'steps:\s*(\d+)/(\d+)')
-                epoch_pattern = re.compile(r'epoch\s+(\d+)/(\d+)', re.IGNORECASE)
-                
-                for line in process.stdout:
-                    # Write to log file
-                    log_file.write(line)
-                    log_file.flush()
-                    
-                    print(line, end='')
-                    
-                    # Try to extract progress information
-                    if job_id:
-                        # Check for step progress
-                        step_match = step_pattern.search(line)
-                        if step_match:
-                            current_step = int(step_match.group(1))
-                            # Progress tracking removed - using total_steps in config instead
+                # Stream output in real-time and publish parsed progress
+                progress_publisher = ProgressPublisher(job_id)
+                progress_publisher.status(ExecutionStatus.TRAINING.value, dataset_name=dataset_name,
+                                          preset=preset_info.name)
+                tracker = get_tracker()
+                OutputPump(process.stdout, log_file, metrics_path=metrics_path_for(log_file_path),
+                           on_line=(lambda line: heartbeat_writer.write_heartbeat()) if heartbeat_writer else None,
+                           on_progress=self._progress_handler(job_id, progress_publisher, total_steps),
+                           on_metrics=tracker.metrics_recorder(job_id), echo=sys.stdout).run()
+                tracker.flush_metrics()
                 
                 # Wait for process to complete
                 return_code = process.wait()
+                progress_publisher.status('training_finished' if return_code == 0 else ExecutionStatus.FAILED.value,
+                                          return_code=return_code)
+                progress_publisher.close()
             
             # Calculate duration
             duration = time.time() - start_time
@@ -349,7 +364,55 @@ class EnhancedSDScriptsTrainer:
                 tracker = get_tracker()
                 tracker.update_status(job_id, ExecutionStatus.FAILED, error_message=str(e))
             return False
+        finally:
+            # Remove the process record
+            if heartbeat_writer:
+                heartbeat_writer.cleanup()
+            
+    def _progress_handler(self, job_id: Optional[str], publisher: ProgressPublisher,
+                          total_steps: Optional[int] = None):
+        """Build the output pump's progress callback.
+        
+        Publishes every progress update and records the job's total steps
+        the first time sd-scripts reports a value other than the configured one
+        (e.g. when the config sets epochs instead of max_train_steps).
+        
+        Args:
+            job_id: Job the progress belongs to
+            publisher: Progress bus publisher of the job
+            total_steps: Total steps already recorded from the config
+        """
+        tracker = get_tracker()
+        recorded = total_steps
+        
+        def on_progress(fields):
+            nonlocal recorded
+            reported = fields.get('total_steps')
+            if job_id and reported and reported != recorded:
+                recorded = reported
+                tracker.set_total_steps(job_id, reported)
+            publisher.update(fields)
+        
+        return on_progress
+        
+    def _register_process(self, job_id: Optional[str], process: subprocess.Popen):
+        """Register a training process in the job process registry.
+        
+        Args:
+            job_id: Job ID the process trains (nothing is registered without one)
+            process: The training process
             
+        Returns:
+            HeartbeatWriter for the job, or None if the job is not tracked
+        """
+        tracker = get_tracker()
+        if not job_id or not tracker.is_enabled:
+            return None
+        from ..database.process_monitor import HeartbeatWriter, ProcessRegistry
+        heartbeat_writer = HeartbeatWriter(job_id, ProcessRegistry(tracker.db_manager))
+        heartbeat_writer.register(process.pid)  # Initial heartbeat
+        return heartbeat_writer
+        
     def _get_training_command(self, preset_info: PresetInfo, toml_path: Path) -> List[str]:
         """
         Construct the training command with all arguments.
@@ -4,9 +4,19 @@ import re
 import sys
 import shutil
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Any, List
 from dataclasses import dataclass
 
+from .progress_parser import (
+    EpochEvent,
+    LearningRateEvent,
+    PhaseEvent,
+    PlanEvent,
+    ProgressEvent,
+    StepEvent,
+    parse_events,
+)
+
 
 @dataclass
 class TrainingState:
@@ -37,7 +47,6 @@ class MinimalProgressMonitor:
         )
         self.quiet = quiet
         self.step_times = []
-        self._regex_patterns = self._compile_patterns()
         self.term_width = shutil.get_terminal_size().columns
         self.box_width = min(110, self.term_width - 2)
         self.last_display_time = datetime.now()
@@ -45,82 +54,46 @@ class MinimalProgressMonitor:
         self.last_displayed_step = -1  # Track last displayed step to avoid duplicates
         self.display_mode = "box"  # "box" or "line"
         
-    def _compile_patterns(self) -> Dict[str, re.Pattern]:
-        """Compile regex patterns for parsing sd-scripts output."""
-        return {
-            # Training steps progress: "steps:  20%|██        | 6/30 [00:18<01:13,  3.07s/it, avr_loss=0.565]"
-            'progress': re.compile(
-                r'steps:\s*(\d+)%\|[^|]+\|\s*(\d+)/(\d+).*?(\d+\.\d+)s/it(?:.*?avr_loss=([\d.]+))?'
-            ),
-            # Total optimization steps: "total optimization steps / 学習ステップ数: 30"
-            'total_steps': re.compile(r'total optimization steps.*?(\d+)'),
-            # Epochs: "num epochs / epoch数: 1"
-            'total_epochs': re.compile(r'num epochs.*?(\d+)'),
-            # Current epoch: "epoch is incremented. current_epoch: 0, epoch: 1"
-            'current_epoch': re.compile(r'current_epoch:\s*(\d+),\s*epoch:\s*(\d+)'),
-            # Learning rate from optimizer info
-            'learning_rate': re.compile(r'LR\s+([\d.e-]+)'),
-            # Model saving
-            'saving': re.compile(r'saving checkpoint:|model saved'),
-            # Training completion
-            'completed': re.compile(r'Training completed|training finished', re.IGNORECASE),
-            # Phase detection patterns
-            'preparing': re.compile(r'prepare|loading|caching|Building', re.IGNORECASE),
-            'training_start': re.compile(r'running training|学習開始'),
-        }
-        
     def parse_line(self, line: str) -> None:
         """Parse a line of output and update state."""
-        # Check for phase transitions
-        if self._regex_patterns['preparing'].search(line):
-            if self.state.phase == "initializing":
-                self.state.phase = "preparing"
-        elif self._regex_patterns['training_start'].search(line):
-            self.state.phase = "training"
-        elif self._regex_patterns['saving'].search(line):
-            self.state.phase = "saving"
-        elif self._regex_patterns['completed'].search(line):
-            self.state.phase = "completed"
-            
-        # Parse total steps
-        match = self._regex_patterns['total_steps'].search(line)
-        if match:
-            self.state.total_steps = int(match.group(1))
-            
-        # Parse total epochs
-        match = self._regex_patterns['total_epochs'].search(line)
-        if match:
-            self.state.total_epochs = int(match.group(1))
-            
-        # Parse current epoch
-        match = self._regex_patterns['current_epoch'].search(line)
-        if match:
-            self.state.current_epoch = int(match.group(2))
-            
-        # Parse learning rate
-        match = self._regex_patterns['learning_rate'].search(line)
-        if match:
-            self.state.learning_rate = float(match.group(1))
-            
-        # Parse progress line
-        match = self._regex_patterns['progress'].search(line)
-        if match:
-            self.state.current_step = int(match.group(2))
-            if not self.state.total_steps:
-                self.state.total_steps = int(match.group(3))
-            
-            # Time per step
-            time_per_step = float(match.group(4))
-            self.step_times.append(time_per_step)
-            if len(self.step_times) > 10:
-                self.step_times.pop(0)
-            self.state.time_per_step = sum(self.step_times) / len(self.step_times)
-            
-            # Loss
-            if match.group(5):
-                self.state.average_loss = float(match.group(5))
-                
-            self.state.last_update = datetime.now()
+        self.apply(parse_events(line))
+
+    def apply(self, events: List[ProgressEvent]) -> None:
+        """Update state from events of the shared progress parser."""
+        for event in events:
+            if isinstance(event, StepEvent):
+                self.state.current_step = event.step
+                if not self.state.total_steps:
+                    self.state.total_steps = event.total_steps
+
+                # Time per step (it/s bars are converted by the parser)
+                if event.seconds_per_step:
+                    self.step_times.append(event.seconds_per_step)
+                    if len(self.step_times) > 10:
+                        self.step_times.pop(0)
+                    self.state.time_per_step = sum(self.step_times) / len(self.step_times)
+
+                # Loss
+                if event.loss is not None:
+                    self.state.average_loss = event.loss
+
+                self.state.last_update = datetime.now()
+            elif isinstance(event, PlanEvent):
+                if event.total_steps is not None:
+                    self.state.total_steps = event.total_steps
+                if event.total_epochs is not None:
+                    self.state.total_epochs = event.total_epochs
+            elif isinstance(event, EpochEvent):
+                # "epoch N/M" banners go through buffered stdout and can arrive late
+                self.state.current_epoch = max(self.state.current_epoch, event.epoch)
+                if event.total_epochs is not None:
+                    self.state.total_epochs = event.total_epochs
+            elif isinstance(event, LearningRateEvent):
+                self.state.learning_rate = event.lr
+            elif isinstance(event, PhaseEvent):
+                # Loading messages keep appearing during training
+                if event.phase != "preparing" or self.state.phase == "initializing":
+                    self.state.phase = event.phase
             
     def display(self, force: bool = False) -> None:
         """Display current progress if update interval has passed or forced."""
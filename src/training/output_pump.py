@@ -0,0 +1,254 @@
+"""
+Training output pump.
+
+Reads the combined stdout/stderr of an sd-scripts process in large chunks
+instead of line by line. tqdm redraws its progress bar with carriage
+returns, so chunks are split on ``\\r``, ``\\n`` and ``\\r\\n``; each piece is
+one line. Lines go to:
+
+- the training log, through a buffered writer that flushes on a timer
+  instead of after every line
+- the shared progress parser, once per line; parsed steps are written as
+  JSON lines to a ``<log>.metrics.jsonl`` sidecar (one record per step,
+  with the step's final loss) and handed to an optional metrics callback
+  (the database writer), the events go to an optional event callback
+  (progress monitors) and their fields to an optional progress callback
+- an optional line callback (heartbeats, error display)
+
+Console echo, when enabled, writes each chunk unchanged so tqdm still
+redraws in place.
+
+Usage:
+    pump = OutputPump(process.stdout, log_file, metrics_path=metrics_path_for(log_path),
+                      on_progress=publisher.update, echo=sys.stdout)
+    pump.run()
+"""
+
+import codecs
+import json
+import logging
+import os
+import re
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Deque, Dict, List, Optional, TextIO
+
+from .progress_parser import ProgressEvent, events_to_fields, parse_events
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+DEFAULT_FLUSH_INTERVAL = 1.0
+TAIL_LINES = 10
+
+_LINE_BREAK = re.compile(r'\r\n|\r|\n')
+
+
+def metrics_path_for(log_path: Path) -> Path:
+    """Sidecar metrics file for a training log (train_x.log -> train_x.metrics.jsonl)."""
+    log_path = Path(log_path)
+    return log_path.with_name(f"{log_path.stem}.metrics.jsonl")
+
+
+class BufferedLogWriter:
+    """Text writer that flushes at most once per interval."""
+
+    def __init__(self, stream: TextIO, flush_interval: float = DEFAULT_FLUSH_INTERVAL):
+        """
+        Initialize the writer.
+
+        Args:
+            stream: Open text file to write to
+            flush_interval: Seconds between flushes
+        """
+        self.stream = stream
+        self.flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+
+    def write(self, text: str) -> None:
+        self.stream.write(text)
+        now = time.monotonic()
+        if now - self._last_flush >= self.flush_interval:
+            self.stream.flush()
+            self._last_flush = now
+
+    def flush(self) -> None:
+        self.stream.flush()
+        self._last_flush = time.monotonic()
+
+
+class MetricsWriter:
+    """Writes one JSON record per training step to a JSONL sidecar."""
+
+    def __init__(self, path: Optional[Path], flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 on_record: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """
+        Initialize the writer.
+
+        Args:
+            path: Sidecar path (truncated on open; None: no sidecar)
+            flush_interval: Seconds between flushes
+            on_record: Called with every finished step record
+        """
+        self.path = Path(path) if path else None
+        self.on_record = on_record
+        self._file = open(self.path, 'w', encoding='utf-8') if self.path else None
+        self._writer = BufferedLogWriter(self._file, flush_interval) if self._file else None
+        self._epoch: Optional[int] = None
+        self._pending: Optional[Dict[str, Any]] = None
+        self.records = 0
+
+    def update(self, fields: Dict[str, Any]) -> None:
+        """
+        Merge parsed progress fields.
+
+        tqdm prints each step at least twice (after the step and again when
+        the loss postfix is set), so a step's record is written only once the
+        next step starts, carrying the step's last reported values.
+        """
+        if 'epoch' in fields:
+            self._epoch = fields['epoch']
+        step = fields.get('step')
+        if step is None:
+            return
+        pending = self._pending
+        if pending is not None and pending['step'] != step:
+            self._write(pending)
+            pending = None
+        if pending is None:
+            self._pending = pending = {}
+        pending.update(fields)
+        pending['time'] = time.time()
+        if self._epoch is not None:
+            pending['epoch'] = self._epoch
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        if record['step'] == 0:
+            return  # tqdm's initial 0/N bar carries no metrics
+        record.pop('total_epochs', None)
+        record['time'] = round(record['time'], 3)
+        if self._writer:
+            self._writer.write(json.dumps(record) + '\n')
+        if self.on_record:
+            self.on_record(record)
+        self.records += 1
+
+    def close(self) -> None:
+        if self._pending is not None:
+            self._write(self._pending)
+            self._pending = None
+        if self._file:
+            self._writer.flush()
+            self._file.close()
+
+
+class OutputPump:
+    """Pumps a training process's output to the log, metrics sidecar and callbacks."""
+
+    def __init__(self, stream: BinaryIO, log_file: TextIO,
+                 metrics_path: Optional[Path] = None,
+                 on_line: Optional[Callable[[str], None]] = None,
+                 on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 on_events: Optional[Callable[[List[ProgressEvent]], None]] = None,
+                 on_metrics: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 echo: Optional[TextIO] = None,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 chunk_size: int = CHUNK_SIZE):
+        """
+        Initialize the pump.
+
+        Args:
+            stream: Binary stdout of the training process
+            log_file: Open training log (text mode)
+            metrics_path: JSONL sidecar for parsed step metrics (None: no sidecar)
+            on_line: Called with every line, without its line break
+            on_progress: Called with the fields of every line that carries progress
+            on_events: Called with the parser events of every line that has any
+            on_metrics: Called with every finished per-step metrics record
+                (the records written to the sidecar)
+            echo: Console stream to copy the raw output to
+            flush_interval: Seconds between log and sidecar flushes
+            chunk_size: Bytes read per system call
+        """
+        self.stream = stream
+        self.log = BufferedLogWriter(log_file, flush_interval)
+        self.metrics = (MetricsWriter(metrics_path, flush_interval, on_record=on_metrics)
+                        if metrics_path or on_metrics else None)
+        self.on_line = on_line
+        self.on_progress = on_progress
+        self.on_events = on_events
+        self.echo = echo
+        self.chunk_size = chunk_size
+        self.lines = 0
+        self.tail: Deque[str] = deque(maxlen=TAIL_LINES)
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+    def _read(self) -> bytes:
+        try:
+            return os.read(self.stream.fileno(), self.chunk_size)
+        except (AttributeError, OSError, ValueError):
+            # Not backed by a file descriptor (e.g. an in-memory replay)
+            read = getattr(self.stream, 'read1', self.stream.read)
+            return read(self.chunk_size)
+
+    def run(self) -> int:
+        """
+        Pump until the stream is closed.
+
+        Returns:
+            Number of lines processed
+        """
+        pending = ''
+        try:
+            while True:
+                chunk = self._read()
+                if not chunk:
+                    break
+                text = self._decoder.decode(chunk)
+                if self.echo is not None:
+                    self.echo.write(text)
+                    self.echo.flush()
+                text = pending + text
+                # A trailing "\r" may be the first half of "\r\n": keep it pending
+                carry = ''
+                if text.endswith('\r'):
+                    text, carry = text[:-1], '\r'
+                pieces = _LINE_BREAK.split(text)
+                pending = pieces.pop() + carry
+                self._handle(pieces)
+
+            rest = self._decoder.decode(b'', final=True)
+            if self.echo is not None and rest:
+                self.echo.write(rest)
+                self.echo.flush()
+            pending += rest
+            self._handle(_LINE_BREAK.split(pending))
+        finally:
+            self.log.flush()
+            if self.metrics:
+                self.metrics.close()
+        return self.lines
+
+    def _handle(self, pieces: List[str]) -> None:
+        lines = [line for line in pieces if line and not line.isspace()]
+        if not lines:
+            return
+        # One log write per chunk
+        self.lines += len(lines)
+        self.log.write('\n'.join(lines) + '\n')
+        self.tail.extend(lines[-TAIL_LINES:])
+
+        for line in lines:
+            events = parse_events(line)
+            if events:
+                if self.on_events:
+                    self.on_events(events)
+                fields = events_to_fields(events)
+                if fields:
+                    if self.metrics:
+                        self.metrics.update(fields)
+                    if self.on_progress:
+                        self.on_progress(fields)
+            if self.on_line:
+                self.on_line(line)
@@ -0,0 +1,124 @@
+"""
+Training progress event bus.
+
+The trainer parses sd-scripts output into progress events (step, epoch,
+loss, it/s) and publishes them as small JSON datagrams to a local UDP port.
+The API process listens on that port and fans the events out to WebSocket
+subscribers. Publishing is fire-and-forget: a missing or slow listener never
+blocks training, and events are rate-limited at the source.
+"""
+
+import json
+import logging
+import os
+import socket
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from .progress_parser import events_to_fields, parse_events
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROGRESS_HOST = '127.0.0.1'
+DEFAULT_PROGRESS_PORT = 8799
+MAX_DATAGRAM_SIZE = 8192
+
+
+def get_progress_address() -> Tuple[str, int]:
+    """Get the progress bus address from AUTOTRAINX_PROGRESS_HOST/PORT."""
+    return (
+        os.getenv('AUTOTRAINX_PROGRESS_HOST', DEFAULT_PROGRESS_HOST),
+        int(os.getenv('AUTOTRAINX_PROGRESS_PORT', DEFAULT_PROGRESS_PORT)),
+    )
+
+
+def parse_progress_line(line: str) -> Optional[Dict[str, Any]]:
+    """
+    Extract progress fields from one line of sd-scripts output.
+
+    Args:
+        line: Output line (tqdm progress bar, epoch banner or training plan)
+
+    Returns:
+        Dictionary with any of step, total_steps, epoch, total_epochs,
+        loss, lr and it_per_sec, or None if the line carries no progress
+    """
+    return events_to_fields(parse_events(line))
+
+
+class ProgressPublisher:
+    """Publishes rate-limited progress events for one job."""
+
+    def __init__(self, job_id: str, address: Optional[Tuple[str, int]] = None,
+                 min_interval: float = 0.5):
+        """
+        Initialize the publisher.
+
+        Args:
+            job_id: Job the events belong to
+            address: (host, port) of the progress bus listener
+            min_interval: Minimum seconds between progress events
+        """
+        self.job_id = job_id
+        self.address = address or get_progress_address()
+        self.min_interval = min_interval
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.setblocking(False)
+        self._state: Dict[str, Any] = {}
+        self._last_sent = 0.0
+        self._dirty = False
+
+    def _send(self, event: Dict[str, Any]) -> None:
+        event.setdefault('job_id', self.job_id)
+        event.setdefault('timestamp', time.time())
+        try:
+            payload = json.dumps(event).encode('utf-8')
+            if len(payload) <= MAX_DATAGRAM_SIZE:
+                self._socket.sendto(payload, self.address)
+        except (OSError, TypeError, ValueError) as e:
+            # No listener or a full socket buffer: drop, never block training
+            logger.debug(f"Dropped progress event for {self.job_id}: {e}")
+
+    def update(self, fields: Dict[str, Any]) -> bool:
+        """
+        Merge parsed progress fields and publish if the rate limit allows.
+
+        Epoch changes are always published immediately.
+
+        Args:
+            fields: Output of parse_progress_line
+
+        Returns:
+            True if an event was sent
+        """
+        epoch_changed = 'epoch' in fields and fields['epoch'] != self._state.get('epoch')
+        self._state.update(fields)
+        self._dirty = True
+
+        now = time.monotonic()
+        if not epoch_changed and now - self._last_sent < self.min_interval:
+            return False
+        self.flush()
+        return True
+
+    def flush(self) -> None:
+        """Publish the latest progress state if it has not been sent yet."""
+        if not self._dirty:
+            return
+        event = {'type': 'progress', **self._state}
+        step, total = self._state.get('step'), self._state.get('total_steps')
+        if step is not None and total:
+            event['progress_percentage'] = round(step / total * 100, 2)
+        self._send(event)
+        self._last_sent = time.monotonic()
+        self._dirty = False
+
+    def status(self, status: str, **extra: Any) -> None:
+        """Publish a status change (always sent, flushing pending progress first)."""
+        self.flush()
+        self._send({'type': 'status', 'status': status, **extra})
+
+    def close(self) -> None:
+        """Flush pending progress and close the socket."""
+        self.flush()
+        self._socket.close()
@@ -0,0 +1,202 @@
+"""
+Single-pass parser for sd-scripts training output.
+
+Every consumer of training output (the output pump, the progress monitors,
+the progress bus and successive-halving scoring) parses lines through this
+module, so a line is matched once with one precompiled alternation regex
+instead of a dozen separate searches per consumer.
+
+Most output lines carry nothing of interest. A cheap substring prefilter
+rejects them before the regex runs. Lines that pass are scanned once, and
+every match is turned into a typed event:
+
+    StepEvent           tqdm "steps:" bar: step, total, speed, loss, lr
+    EpochEvent          "epoch 2/10" banner or "current_epoch: 1, epoch: 2"
+    PlanEvent           "total optimization steps" / "num epochs" header lines
+    LearningRateEvent   "LR 1e-4" optimizer info
+    PhaseEvent          preparing, training, saving or completed
+
+Usage:
+    for event in parse_events(line):
+        if isinstance(event, StepEvent):
+            print(event.step, event.loss)
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Union
+
+# Phase keywords in priority order: a line is assigned at most one phase
+PHASES = ('preparing', 'training', 'saving', 'completed')
+
+_PATTERN = re.compile(
+    # "steps:  12%|█▏   | 120/1000 [01:02<07:38,  1.92it/s, avr_loss=0.0873]"
+    r'(?P<step_bar>steps:\s*(?:\d+%\|[^|]*\|\s*)?(?P<step>\d+)/(?P<step_total>\d+)'
+    r'(?:\s*\[[^,\]]*(?:,\s*(?P<rate>\d+(?:\.\d+)?)(?P<unit>it/s|s/it))?(?P<postfix>[^\]]*)\]?)?)'
+    # "epoch 2/10"
+    r'|(?P<epoch_banner>(?i:epoch)\s+(?P<epoch>\d+)/(?P<epoch_total>\d+))'
+    # "epoch is incremented. current_epoch: 0, epoch: 1"
+    r'|(?P<epoch_incremented>current_epoch:\s*\d+,\s*epoch:\s*(?P<epoch_now>\d+))'
+    # "total optimization steps / 学習ステップ数: 30"
+    r'|(?P<plan_steps>total optimization steps.*?(?P<planned_steps>\d+))'
+    # "num epochs / epoch数: 1"
+    r'|(?P<plan_epochs>num epochs.*?(?P<planned_epochs>\d+))'
+    r'|(?P<lr_info>LR\s+(?P<lr>[\d.e-]+))'
+    r'|(?P<preparing>(?i:prepare|loading|caching|building))'
+    r'|(?P<training>running training|学習開始)'
+    r'|(?P<saving>saving checkpoint:|model saved)'
+    r'|(?P<completed>(?i:training completed|training finished))'
+)
+# key=value pairs of the tqdm postfix, e.g. "avr_loss=0.123, lr=1e-4"
+_POSTFIX_PATTERN = re.compile(r'(\w+)=([-+]?\d*\.?\d+(?:[eE][-+]?\d+)?)')
+_LOSS_KEYS = ('avr_loss', 'loss')
+
+# Every alternative above contains one of these (after lower-casing)
+_KEYWORDS = ('steps', 'epoch', 'lr', 'prepare', 'loading', 'caching', 'building',
+             'running training', '学習開始', 'saving checkpoint:', 'model saved',
+             'training completed', 'training finished')
+
+
+@dataclass(frozen=True)
+class StepEvent:
+    """A tqdm training progress bar update."""
+    step: int
+    total_steps: int
+    it_per_sec: Optional[float] = None
+    seconds_per_step: Optional[float] = None
+    loss: Optional[float] = None
+    lr: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class EpochEvent:
+    """The current epoch (total_epochs only when the line states it)."""
+    epoch: int
+    total_epochs: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class PlanEvent:
+    """Training plan announced before the first step."""
+    total_steps: Optional[int] = None
+    total_epochs: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class LearningRateEvent:
+    """Learning rate reported by the optimizer setup."""
+    lr: float
+
+
+@dataclass(frozen=True)
+class PhaseEvent:
+    """Training phase change: one of PHASES."""
+    phase: str
+
+
+ProgressEvent = Union[StepEvent, EpochEvent, PlanEvent, LearningRateEvent, PhaseEvent]
+
+
+def _may_match(line: str) -> bool:
+    if 'steps:' in line:
+        return True
+    lowered = line.lower()
+    return any(keyword in lowered for keyword in _KEYWORDS)
+
+
+def _step_event(match: 're.Match') -> StepEvent:
+    it_per_sec = seconds_per_step = None
+    rate = match.group('rate')
+    if rate:
+        value = float(rate)
+        if match.group('unit') == 's/it':
+            seconds_per_step = value
+            it_per_sec = round(1.0 / value, 4) if value else 0.0
+        else:
+            it_per_sec = round(value, 4)
+            seconds_per_step = 1.0 / value if value else None
+
+    loss = lr = None
+    postfix = match.group('postfix')
+    if postfix and '=' in postfix:
+        values = dict(_POSTFIX_PATTERN.findall(postfix))
+        loss = next((float(values[key]) for key in _LOSS_KEYS if key in values), None)
+        if 'lr' in values:
+            lr = float(values['lr'])
+
+    return StepEvent(int(match.group('step')), int(match.group('step_total')),
+                     it_per_sec, seconds_per_step, loss, lr)
+
+
+def parse_events(line: str) -> List[ProgressEvent]:
+    """
+    Parse one line of sd-scripts output.
+
+    Args:
+        line: Output line, with or without its line break
+
+    Returns:
+        Events in the order they appear on the line (empty for most lines)
+    """
+    if not _may_match(line):
+        return []
+
+    events: List[ProgressEvent] = []
+    phases = set()
+    for match in _PATTERN.finditer(line):
+        kind = match.lastgroup
+        if kind == 'step_bar':
+            events.append(_step_event(match))
+        elif kind == 'epoch_banner':
+            events.append(EpochEvent(int(match.group('epoch')), int(match.group('epoch_total'))))
+        elif kind == 'epoch_incremented':
+            events.append(EpochEvent(int(match.group('epoch_now'))))
+        elif kind == 'plan_steps':
+            events.append(PlanEvent(total_steps=int(match.group('planned_steps'))))
+        elif kind == 'plan_epochs':
+            events.append(PlanEvent(total_epochs=int(match.group('planned_epochs'))))
+        elif kind == 'lr_info':
+            try:
+                events.append(LearningRateEvent(float(match.group('lr'))))
+            except ValueError:
+                pass  # "LR" followed by something that is not a number
+        else:
+            phases.add(kind)
+
+    if phases:
+        events.append(PhaseEvent(next(phase for phase in PHASES if phase in phases)))
+    return events
+
+
+def events_to_fields(events: List[ProgressEvent]) -> Optional[Dict[str, Any]]:
+    """
+    Flatten step, epoch and plan events into progress bus fields.
+
+    Args:
+        events: Output of parse_events
+
+    Returns:
+        Dictionary with any of step, total_steps, epoch, total_epochs, loss,
+        lr and it_per_sec, or None if the events carry no progress
+    """
+    fields: Dict[str, Any] = {}
+    for event in events:
+        if isinstance(event, StepEvent):
+            fields['step'] = event.step
+            fields['total_steps'] = event.total_steps
+            if event.it_per_sec is not None:
+                fields['it_per_sec'] = event.it_per_sec
+            if event.loss is not None:
+                fields['loss'] = event.loss
+            if event.lr is not None:
+                fields['lr'] = event.lr
+        elif isinstance(event, EpochEvent):
+            fields['epoch'] = event.epoch
+            if event.total_epochs is not None:
+                fields['total_epochs'] = event.total_epochs
+        elif isinstance(event, PlanEvent):
+            if event.total_steps is not None:
+                fields.setdefault('total_steps', event.total_steps)
+            if event.total_epochs is not None:
+                fields.setdefault('total_epochs', event.total_epochs)
+    return fields or None
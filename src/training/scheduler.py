@@ -0,0 +1,309 @@
+"""
+Resource-aware training scheduler for batch and variations modes.
+
+Training jobs are admitted onto a declared device inventory (config.json
+``training_devices``) and run concurrently, one sd-scripts subprocess per
+job, pinned to their devices through CUDA_VISIBLE_DEVICES:
+
+- LoRA presets that support gpu_ids take one slot on a device, so several
+  small jobs can share a GPU when the device declares more than one slot
+- Full fine-tunes that support gpu_ids take a whole device
+- Presets without gpu_ids support take the whole node and run alone
+
+Without a configured inventory there is a single unpinned slot, which is the
+previous sequential behaviour.
+"""
+
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from ..config import Config
+from ..database import ExecutionStatus
+from ..pipeline.utils.monitoring import StageTimings
+from ..scripts.preset_manager import PresetInfo, get_preset_manager
+from ..utils.job_tracker import get_tracker
+
+logger = logging.getLogger(__name__)
+
+
+class Requirement(Enum):
+    """Resources a training job needs."""
+    SLOT = "slot"        # One slot on one device
+    DEVICE = "device"    # Every slot of one device
+    NODE = "node"        # Every device, unpinned
+
+
+@dataclass
+class Device:
+    """A training device and its concurrent job slots."""
+    id: Optional[str]
+    slots: int = 1
+    free: int = field(init=False)
+
+    def __post_init__(self):
+        self.slots = max(1, int(self.slots))
+        self.free = self.slots
+
+
+@dataclass
+class Allocation:
+    """Slots taken by a running job."""
+    slots: Dict[Optional[str], int]
+    pinned: bool
+
+    @property
+    def cuda_devices(self) -> Optional[str]:
+        """CUDA_VISIBLE_DEVICES value for the job, or None to leave it unset."""
+        if not self.pinned or None in self.slots:
+            return None
+        return ",".join(str(device_id) for device_id in self.slots)
+
+
+@dataclass
+class TrainingTask:
+    """One training run to schedule."""
+    key: str
+    toml_path: Path
+    preset_info: PresetInfo
+    dataset_name: str
+    job_id: Optional[str] = None
+    mode: str = "batch"
+    current: int = 1
+    total: int = 1
+    experiment_name: Optional[str] = None
+    variation_params: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    requirement: Optional[Requirement] = None
+
+    def __post_init__(self):
+        if self.requirement is None:
+            if not get_preset_manager().supports_gpu_ids(self.preset_info.name):
+                self.requirement = Requirement.NODE
+            elif self.preset_info.is_lora:
+                self.requirement = Requirement.SLOT
+            else:
+                self.requirement = Requirement.DEVICE
+
+
+class DeviceInventory:
+    """Tracks free slots per device. Not thread-safe; owned by the scheduler loop."""
+
+    def __init__(self, devices: List[Device]):
+        self.devices = devices or [Device(None)]
+
+    @classmethod
+    def from_config(cls, base_path: Optional[str] = None) -> 'DeviceInventory':
+        """Build the inventory from config.json ``training_devices``."""
+        devices = []
+        for entry in Config.get_training_devices(base_path):
+            if isinstance(entry, dict):
+                devices.append(Device(str(entry['id']), entry.get('slots', 1)))
+            else:
+                devices.append(Device(str(entry)))
+        return cls(devices)
+
+    @property
+    def capacity(self) -> int:
+        return sum(device.slots for device in self.devices)
+
+    @property
+    def idle(self) -> bool:
+        return all(device.free == device.slots for device in self.devices)
+
+    def allocate(self, requirement: Requirement) -> Optional[Allocation]:
+        """Take slots for a job, or return None if they are not free."""
+        if requirement == Requirement.NODE:
+            if not self.idle:
+                return None
+            chosen = self.devices
+        elif requirement == Requirement.DEVICE:
+            chosen = [device for device in self.devices if device.free == device.slots][:1]
+        else:
+            # Spread single-slot jobs over the least loaded device
+            candidates = [device for device in self.devices if device.free > 0]
+            chosen = [max(candidates, key=lambda device: device.free / device.slots)] if candidates else []
+        if not chosen:
+            return None
+
+        taken = {}
+        for device in chosen:
+            count = 1 if requirement == Requirement.SLOT else device.free
+            device.free -= count
+            taken[device.id] = count
+        return Allocation(taken, pinned=requirement != Requirement.NODE)
+
+    def release(self, allocation: Allocation) -> None:
+        for device in self.devices:
+            device.free += allocation.slots.get(device.id, 0)
+
+
+class TrainingScheduler:
+    """Runs training tasks concurrently within the device inventory."""
+
+    def __init__(self, trainer_factory: Callable[[], Any], inventory: DeviceInventory,
+                 timings: Optional[StageTimings] = None, hook_queue_size: int = 4):
+        """
+        Initialize the scheduler.
+
+        Args:
+            trainer_factory: Returns a trainer with execute_training(); called
+                once per task so concurrent jobs never share trainer state
+            inventory: Devices to schedule onto
+            timings: Optional collector for 'training' and 'post_training' times
+            hook_queue_size: Finished jobs that may wait for post-training
+                before training blocks
+        """
+        self.trainer_factory = trainer_factory
+        self.inventory = inventory
+        self.timings = timings or StageTimings()
+        self.hook_queue_size = hook_queue_size
+
+    def run(self, tasks: Iterable[TrainingTask],
+            on_complete: Optional[Callable[[TrainingTask, bool], None]] = None,
+            stop_on_error: bool = False,
+            max_pending: Optional[int] = None) -> Dict[str, bool]:
+        """
+        Run tasks and wait for all of them, including their post-training step.
+
+        Tasks may be a lazily produced iterable (e.g. fed by a preparation
+        stage); each task is admitted as soon as it arrives and fits. A later
+        task may start ahead of one that does not fit yet, except behind a
+        whole-node task, which reserves the node until it runs.
+
+        on_complete runs on a single background post-training worker, after
+        the job's slots are released, so the next training starts while the
+        previous job's hooks run.
+
+        Args:
+            tasks: Tasks to run
+            on_complete: Post-training step, called once per finished task
+            stop_on_error: Do not start new tasks after a failure
+            max_pending: Tasks that may wait for a device before the source
+                is asked for more (bounds lazy preparation ahead of training)
+
+        Returns:
+            Dictionary of task key to success
+
+        Raises:
+            Exception: Whatever the task source raised, once the tasks it
+                produced before failing have finished
+        """
+        tracker = get_tracker()
+        events: "queue.Queue[Tuple[str, Any]]" = queue.Queue()
+        hooks: "queue.Queue[Optional[Tuple[TrainingTask, bool]]]" = queue.Queue(self.hook_queue_size)
+        credits = threading.Semaphore(max_pending) if max_pending else None
+
+        def feed():
+            try:
+                iterator = iter(tasks)
+                while True:
+                    # Take a credit before asking the source, so preparation
+                    # never runs more than max_pending tasks ahead
+                    if credits:
+                        credits.acquire()
+                    task = next(iterator, None)
+                    if task is None:
+                        break
+                    if task.job_id:
+                        tracker.update_status(task.job_id, ExecutionStatus.IN_QUEUE)
+                    events.put(('task', task))
+            except Exception as e:
+                logger.error(f"Training task source failed: {e}")
+                events.put(('error', e))
+            finally:
+                events.put(('end', None))
+
+        def post_training():
+            while True:
+                item = hooks.get()
+                if item is None:
+                    return
+                task, success = item
+                try:
+                    with self.timings.track('post_training'):
+                        on_complete(task, success)
+                except Exception as e:
+                    logger.error(f"Post-training step for {task.key} failed: {e}")
+
+        feeder = threading.Thread(target=feed, name="training-feed", daemon=True)
+        hook_worker = threading.Thread(target=post_training, name="post-training", daemon=True)
+        feeder.start()
+        if on_complete:
+            hook_worker.start()
+
+        results: Dict[str, bool] = {}
+        pending: List[TrainingTask] = []
+        running: Dict[str, Allocation] = {}
+        feeding, failed = True, False
+        source_error: Optional[Exception] = None
+
+        with ThreadPoolExecutor(max_workers=self.inventory.capacity,
+                                thread_name_prefix="training-slot") as pool:
+            while feeding or pending or running:
+                kind, payload = events.get()
+                if kind == 'task':
+                    pending.append(payload)
+                elif kind == 'end':
+                    feeding = False
+                elif kind == 'error':
+                    source_error = payload
+                else:
+                    task, success = payload
+                    self.inventory.release(running.pop(task.key))
+                    results[task.key] = success
+                    failed = failed or not success
+                    if on_complete:
+                        hooks.put((task, success))
+
+                if failed and stop_on_error:
+                    for task in pending:
+                        if credits:
+                            credits.release()
+                        results[task.key] = False
+                        if task.job_id:
+                            tracker.update_status(task.job_id, ExecutionStatus.CANCELLED,
+                                                  error_message="Skipped after an earlier training failure")
+                    pending.clear()
+
+                for task in list(pending):
+                    allocation = self.inventory.allocate(task.requirement)
+                    if allocation is None:
+                        if task.requirement == Requirement.NODE:
+                            break
+                        continue
+                    pending.remove(task)
+                    if credits:
+                        credits.release()
+                    running[task.key] = allocation
+                    logger.info(f"Starting training {task.key} on devices "
+                                f"{allocation.cuda_devices or 'default'}")
+                    pool.submit(self._run_task, task, allocation, events)
+
+        if on_complete:
+            hooks.put(None)
+            hook_worker.join()
+        if source_error is not None:
+            raise source_error
+        return results
+
+    def _run_task(self, task: TrainingTask, allocation: Allocation, events: queue.Queue) -> None:
+        success = False
+        try:
+            with self.timings.track('training'):
+                success = self.trainer_factory().execute_training(
+                    task.toml_path, task.preset_info, task.dataset_name, task.job_id,
+                    mode=task.mode, current=task.current, total=task.total,
+                    experiment_name=task.experiment_name, variation_params=task.variation_params,
+                    cuda_devices=allocation.cuda_devices)
+        except Exception as e:
+            logger.error(f"Training {task.key} raised: {e}")
+            if task.job_id:
+                get_tracker().update_status(task.job_id, ExecutionStatus.FAILED, error_message=str(e))
+        finally:
+            events.put(('done', (task, success)))
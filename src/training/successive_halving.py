@@ -0,0 +1,262 @@
+"""
+Successive-halving search for variations mode.
+
+Instead of training every combination of a variations grid to completion,
+all variations first train for a short budget. They are ranked by the loss
+parsed from their training logs, and only the best 1/eta move on to the
+next rung, which has an eta-times larger budget. The last rung trains the
+survivors to the preset's full budget. Losers are marked PRUNED.
+
+Budgets are expressed in the unit the preset already uses: max_train_epochs
+when it is set, otherwise max_train_steps. Every rung except the last saves
+sd-scripts state at the end of training. Promoted variations resume from
+that state, so the earlier rung's work is not repeated.
+"""
+
+import copy
+import json
+import logging
+import math
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import toml
+
+from ..database import ExecutionStatus
+from ..utils.job_tracker import get_tracker
+from .progress_bus import parse_progress_line
+from .scheduler import TrainingScheduler, TrainingTask
+
+logger = logging.getLogger(__name__)
+
+# sd-scripts default when neither epochs nor steps are configured
+DEFAULT_MAX_TRAIN_STEPS = 1600
+METRICS = ('final', 'smoothed')
+
+
+@dataclass
+class Rung:
+    """One round of a successive-halving bracket."""
+    index: int
+    budget: int
+    candidates: int
+    scores: Dict[str, Optional[float]] = field(default_factory=dict)
+    promoted: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'rung': self.index,
+            'budget': self.budget,
+            'candidates': self.candidates,
+            'scores': self.scores,
+            'promoted': self.promoted,
+        }
+
+
+def build_schedule(candidates: int, max_budget: int, eta: int = 3,
+                   min_budget: int = 1) -> List[Rung]:
+    """
+    Plan the rungs of a successive-halving bracket.
+
+    Args:
+        candidates: Number of variations entering the first rung
+        max_budget: Budget of the last rung (the preset's full budget)
+        eta: Reduction factor; 1/eta of each rung is promoted
+        min_budget: Smallest budget worth training for
+
+    Returns:
+        Rungs in order; a single rung means plain grid search
+    """
+    eta = max(2, int(eta))
+    max_budget = max(1, int(max_budget))
+    min_budget = max(1, min(int(min_budget), max_budget))
+    by_budget = int(math.floor(math.log(max_budget / min_budget, eta) + 1e-9))
+    by_candidates = int(math.floor(math.log(max(candidates, 1), eta) + 1e-9))
+    rounds = max(0, min(by_budget, by_candidates))
+
+    rungs = []
+    for index in range(rounds + 1):
+        budget = max(min_budget, int(round(max_budget * eta ** (index - rounds))))
+        survivors = max(1, candidates // eta ** index)
+        rungs.append(Rung(index=index, budget=budget, candidates=survivors))
+    return rungs
+
+
+def parse_loss_values(log_path: Path) -> List[float]:
+    """Read the loss reported on each progress line of a training log."""
+    losses = []
+    try:
+        with open(log_path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                fields = parse_progress_line(line)
+                if fields and 'loss' in fields:
+                    losses.append(fields['loss'])
+    except OSError as e:
+        logger.warning(f"Could not read training log {log_path}: {e}")
+    return losses
+
+
+def score_losses(losses: List[float], metric: str = 'smoothed', smoothing: float = 0.9) -> Optional[float]:
+    """
+    Reduce a loss curve to a ranking score (lower is better).
+
+    Args:
+        losses: Loss values in training order
+        metric: 'final' for the last value, 'smoothed' for an exponential
+            moving average, which is less sensitive to a noisy last step
+        smoothing: EMA weight of the previous average
+
+    Returns:
+        Score, or None if the log has no loss values
+    """
+    if not losses:
+        return None
+    if metric == 'final':
+        return losses[-1]
+    average = losses[0]
+    for value in losses[1:]:
+        average = smoothing * average + (1 - smoothing) * value
+    return average
+
+
+def find_training_log(base_path: Path, job_id: str) -> Optional[Path]:
+    """Find the newest trainer log for a job (logs/train_log/train_*_<job_id>.log)."""
+    logs = sorted(Path(base_path, "logs", "train_log").glob(f"train_*_{job_id}.log"),
+                  key=lambda path: path.stat().st_mtime)
+    return logs[-1] if logs else None
+
+
+def budget_key(config: Dict[str, Any]) -> str:
+    """The sd-scripts setting that holds a config's training budget."""
+    return 'max_train_epochs' if config.get('max_train_epochs') else 'max_train_steps'
+
+
+class SuccessiveHalvingSearch:
+    """Trains variations through a successive-halving bracket."""
+
+    def __init__(self, scheduler_factory: Callable[[], TrainingScheduler], base_path: Path,
+                 eta: int = 3, metric: str = 'smoothed', min_budget: int = 1):
+        """
+        Initialize the search.
+
+        Args:
+            scheduler_factory: Returns the scheduler used to train each rung
+            base_path: AutoTrainX base path (for training logs)
+            eta: Reduction factor between rungs
+            metric: Ranking metric, 'final' or 'smoothed' loss
+            min_budget: Budget of the first rung will not go below this
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric '{metric}', expected one of {', '.join(METRICS)}")
+        self.scheduler_factory = scheduler_factory
+        self.base_path = Path(base_path)
+        self.eta = eta
+        self.metric = metric
+        self.min_budget = min_budget
+
+    def run(self, tasks: List[TrainingTask],
+            on_complete: Optional[Callable[[TrainingTask, bool], None]] = None,
+            experiment_path: Optional[Path] = None) -> Dict[str, Optional[bool]]:
+        """
+        Run the bracket.
+
+        Args:
+            tasks: One task per variation, pointing at its full-budget config
+            on_complete: Post-training step for variations that finish the
+                last rung
+            experiment_path: experiment.json to record the schedule in
+
+        Returns:
+            Dictionary of task key to True (trained to the full budget),
+            False (failed) or None (pruned)
+        """
+        if not tasks:
+            return {}
+        configs = {task.key: toml.load(task.toml_path) for task in tasks}
+        key = budget_key(configs[tasks[0].key])
+        max_budget = configs[tasks[0].key].get(key) or DEFAULT_MAX_TRAIN_STEPS
+        rungs = build_schedule(len(tasks), max_budget, self.eta, self.min_budget)
+
+        tracker = get_tracker()
+        results: Dict[str, Optional[bool]] = {}
+        alive = list(tasks)
+        for rung in rungs:
+            last = rung.index == len(rungs) - 1
+            logger.info(f"Rung {rung.index + 1}/{len(rungs)}: {len(alive)} variations, {key}={rung.budget}")
+            rung_tasks = [self._rung_task(task, configs[task.key], key, rung, last) for task in alive]
+            outcome = self.scheduler_factory().run(
+                rung_tasks, on_complete=on_complete if last else None)
+
+            trained = []
+            for task in alive:
+                if not outcome.get(task.key):
+                    results[task.key] = False
+                    rung.scores[task.key] = None
+                    continue
+                rung.scores[task.key] = self._score(task)
+                trained.append(task)
+
+            if last:
+                results.update({task.key: True for task in trained})
+                rung.promoted = [task.key for task in trained]
+                break
+
+            keep = rungs[rung.index + 1].candidates
+            ranked = sorted(trained, key=lambda task: (rung.scores[task.key] is None,
+                                                       rung.scores[task.key] or 0.0))
+            alive = ranked[:keep]
+            rung.promoted = [task.key for task in alive]
+            for task in ranked[keep:]:
+                results[task.key] = None
+                if task.job_id:
+                    tracker.update_status(
+                        task.job_id, ExecutionStatus.PRUNED,
+                        error_message=f"Pruned after rung {rung.index + 1} ({key}={rung.budget}, "
+                                      f"{self.metric} loss {rung.scores[task.key]})")
+            if experiment_path:
+                self._record(experiment_path, key, rungs)
+
+        if experiment_path:
+            self._record(experiment_path, key, rungs)
+        return results
+
+    def _rung_task(self, task: TrainingTask, config: Dict[str, Any], key: str,
+                   rung: Rung, last: bool) -> TrainingTask:
+        """Write the rung's config next to the variation's config and point a task at it."""
+        if last and rung.index == 0:
+            # Single-rung bracket: plain full-budget training
+            return task
+        rung_config = copy.deepcopy(config)
+        rung_config[key] = rung.budget
+        if key == 'max_train_epochs':
+            rung_config.pop('max_train_steps', None)
+        if not last:
+            rung_config['save_state_on_train_end'] = True
+        if rung.index > 0:
+            rung_config['resume'] = str(
+                Path(config.get('output_dir', '.')) / f"{config.get('output_name', 'last')}-state")
+
+        rung_path = task.toml_path.with_name(f"{task.toml_path.stem}.rung{rung.index + 1}.toml")
+        with open(rung_path, 'w') as f:
+            toml.dump(rung_config, f)
+        return replace(task, toml_path=rung_path)
+
+    def _score(self, task: TrainingTask) -> Optional[float]:
+        log_path = find_training_log(self.base_path, task.job_id) if task.job_id else None
+        return score_losses(parse_loss_values(log_path), self.metric) if log_path else None
+
+    def _record(self, experiment_path: Path, key: str, rungs: List[Rung]) -> None:
+        """Add the bracket schedule and its outcome to experiment.json."""
+        try:
+            metadata = json.loads(experiment_path.read_text()) if experiment_path.exists() else {}
+            metadata['search'] = {
+                'strategy': 'successive_halving',
+                'eta': self.eta,
+                'metric': self.metric,
+                'budget_key': key,
+                'rungs': [rung.to_dict() for rung in rungs],
+            }
+            experiment_path.write_text(json.dumps(metadata, indent=2))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not record search schedule in {experiment_path}: {e}")
@@ -18,6 +18,8 @@ from ..utils.signal_handler import get_shutdown_handler
 from ..utils.path_manager import PathManager
 from ..config import Config
 from ..pipeline.utils.shared_pipeline_utils import ColoredOutput
+from .progress_bus import ProgressPublisher
+from .output_pump import OutputPump, metrics_path_for
 
 logger = logging.getLogger(__name__)
 
@@ -41,7 +43,8 @@ class SDScriptsTrainer:
                        job_id: Optional[str] = None, mode: str = "single", 
                        current: int = 1, total: int = 1, 
                        experiment_name: Optional[str] = None,
-                       variation_params: Optional[str] = None) -> bool:
+                       variation_params: Optional[str] = None,
+                       cuda_devices: Optional[str] = None) -> bool:
         """
         Execute training with sd-scripts.
         
@@ -55,6 +58,8 @@ class SDScriptsTrainer:
             total: Total number of datasets/variations
             experiment_name: Name of the experiment (for variations mode)
             variation_params: Current variation parameters (for variations mode)
+            cuda_devices: CUDA_VISIBLE_DEVICES for the training process
+                (set by the training scheduler; None inherits the environment)
             
         Returns:
             bool: True if training completed successfully, False otherwise
@@ -159,24 +164,17 @@ class SDScriptsTrainer:
             shutdown_handler.set_current_job(job_id, dataset_name, preset_info.name, mode)
             
             if total_steps:
-                # Update total steps if we found it
-                from ..database import DatabaseManager
-                from ..utils.quiet_mode import quiet_database_operations
-                with quiet_database_operations():
-                    db = DatabaseManager()
-                with db.get_session() as session:
-                    from ..database.models import Execution, Variation
-                    # Try both tables
-                    record = session.query(Execution).filter_by(job_id=job_id).first()
-                    if not record:
-                        record = session.query(Variation).filter_by(job_id=job_id).first()
-                    if record:
-                        record.total_steps = total_steps
-                        session.commit()
+                # Update total steps if we found it (queued with write-behind)
+                tracker.set_total_steps(job_id, total_steps)
         
         # Track training start time
         start_time = time.time()
         
+        # Pin the training process to the devices chosen by the scheduler
+        training_env = os.environ.copy()
+        if cuda_devices is not None:
+            training_env['CUDA_VISIBLE_DEVICES'] = cuda_devices
+        
         try:
             # Execute the training process with signal isolation
             import os
@@ -184,9 +182,6 @@ class SDScriptsTrainer:
             
             # On Unix-like systems, we'll handle signals more robustly
             if sys.platform != "win32":
-                # Store the PID for the signal handler before starting
-                pid_file = self.base_path / f".training_pid_{job_id or 'temp'}.pid"
-                
                 # Check if we're already using external isolation (setsid command or wrapper)
                 using_external_isolation = any(cmd in str(command[0]) for cmd in ['setsid', 'run_isolated.sh', 'subprocess_wrapper.py'])
                 
@@ -196,9 +191,9 @@ class SDScriptsTrainer:
                         command,
                         stdout=subprocess.PIPE,
                         stderr=subprocess.STDOUT,
-                        universal_newlines=True,
-                        bufsize=1,
-                        cwd=str(self.base_path)
+                        bufsize=0,
+                        cwd=str(self.base_path),
+                        env=training_env
                     )
                 else:
                     # Use internal isolation
@@ -211,7 +206,7 @@ class SDScriptsTrainer:
                             signal.signal(sig, signal.SIG_DFL)
                     
                     # Start the process with a clean environment
-                    env = os.environ.copy()
+                    env = dict(training_env)
                     # Tell subprocesses to ignore interrupts
                     env['PYTHONUNBUFFERED'] = '1'
                     
@@ -219,41 +214,34 @@ class SDScriptsTrainer:
                         command,
                         stdout=subprocess.PIPE,
                         stderr=subprocess.STDOUT,
-                        universal_newlines=True,
-                        bufsize=1,
+                        bufsize=0,
                         cwd=str(self.base_path),
                         preexec_fn=preexec_function,
                         env=env,
                         # Start in background, detached from terminal
                         start_new_session=True
                     )
-                
-                # Write PID to file for emergency cleanup
-                try:
-                    pid_file.write_text(str(process.pid))
-                except:
-                    pass
             else:
                 # Windows
                 process = subprocess.Popen(
                     command,
                     stdout=subprocess.PIPE,
                     stderr=subprocess.STDOUT,
-                    universal_newlines=True,
-                    bufsize=1,
+                    bufsize=0,
                     cwd=str(self.base_path),
+                    env=training_env,
                     creationflags=subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.DETACHED_PROCESS
                 )
             
             # Register subprocess with shutdown handler
             shutdown_handler.add_subprocess(process)
             
-            # Initialize heartbeat writer if job_id is available
+            # Register the process for liveness monitoring if job_id is available
             heartbeat_writer = None
-            if job_id:
-                from ..database.process_monitor import HeartbeatWriter
-                heartbeat_writer = HeartbeatWriter(job_id, self.base_path)
-                heartbeat_writer.write_heartbeat(force=True)  # Initial heartbeat
+            if job_id and tracker.is_enabled:
+                from ..database.process_monitor import HeartbeatWriter, ProcessRegistry
+                heartbeat_writer = HeartbeatWriter(job_id, ProcessRegistry(tracker.db_manager))
+                heartbeat_writer.register(process.pid)  # Initial heartbeat
             
             # Create train_log directory and prepare log file
             train_log_dir = self.base_path / "logs" / "train_log"
@@ -284,40 +272,32 @@ class SDScriptsTrainer:
                 log_file.write("=" * 80 + "\n\n")
                 log_file.flush()
             
-                # Stream output in real-time and parse for progress
-                import re
-                step_pattern = re.compile(r'steps:\s*(\d+)/(\d+)')
-                epoch_pattern = re.compile(r'epoch\s+(\d+)/(\d+)', re.IGNORECASE)
+                # Stream output in real-time and publish parsed progress
+                progress_publisher = ProgressPublisher(job_id)
+                progress_publisher.status(ExecutionStatus.TRAINING.value, dataset_name=dataset_name,
+                                          preset=preset_info.name, total_steps=total_steps)
                 line_counter = 0
                 
-                for line in process.stdout:
-                    print(line, end='')
-                    log_file.write(line)
-                    log_file.flush()  # Ensure immediate write to disk
+                def on_line(line: str) -> None:
+                    nonlocal line_counter
                     line_counter += 1
+                    # Write heartbeat periodically
+                    if heartbeat_writer and line_counter % 50 == 0:  # Every 50 lines
+                        heartbeat_writer.write_heartbeat()
                 
-                # Write heartbeat periodically
-                if heartbeat_writer and line_counter % 50 == 0:  # Every 50 lines
-                    heartbeat_writer.write_heartbeat()
-                
-                # Try to extract progress information
-                if job_id:
-                    # Check for step progress
-                    step_match = step_pattern.search(line)
-                    if step_match:
-                        current_step = int(step_match.group(1))
-                        total = int(step_match.group(2))
-                        # Progress tracking removed - using total_steps in config instead
-                    
-                    # Check for epoch progress (fallback)
-                    epoch_match = epoch_pattern.search(line)
-                    if epoch_match and total_steps:
-                        current_epoch = int(epoch_match.group(1))
-                        total_epochs = int(epoch_match.group(2))
-                        # Progress tracking removed - using total_steps in config instead
+                # Echo to the console, log with timed flushes, record step metrics
+                # (sidecar and database) and publish step/epoch/loss/speed to the progress bus
+                tracker = get_tracker()
+                OutputPump(process.stdout, log_file, metrics_path=metrics_path_for(log_file_path),
+                           on_line=on_line, on_progress=progress_publisher.update,
+                           on_metrics=tracker.metrics_recorder(job_id), echo=sys.stdout).run()
+                tracker.flush_metrics()
                 
                 # Wait for process to complete
                 return_code = process.wait()
+                progress_publisher.status('training_finished' if return_code == 0 else ExecutionStatus.FAILED.value,
+                                          return_code=return_code)
+                progress_publisher.close()
             
             # Remove subprocess from tracking
             shutdown_handler.remove_subprocess(process)
@@ -332,14 +312,7 @@ class SDScriptsTrainer:
                 logger.info(f"Process interrupted (code {return_code}), preserving job info: {job_id}")
                 logger.info(f"Current handler state - job_id: {shutdown_handler.current_job_id}")
             
-            # Clean up process files if they exist
-            if sys.platform != "win32" and 'pid_file' in locals():
-                try:
-                    pid_file.unlink(missing_ok=True)
-                except:
-                    pass
-            
-            # Clean up heartbeat file
+            # Remove the process record
             if heartbeat_writer:
                 heartbeat_writer.cleanup()
             
@@ -415,14 +388,7 @@ class SDScriptsTrainer:
             # For exceptions, we should clear the job info since it's not a clean shutdown
             shutdown_handler.clear_current_job()
             
-            # Clean up process files if they exist
-            if sys.platform != "win32" and 'pid_file' in locals():
-                try:
-                    pid_file.unlink(missing_ok=True)
-                except:
-                    pass
-            
-            # Clean up heartbeat file
+            # Remove the process record
             if 'heartbeat_writer' in locals() and heartbeat_writer:
                 heartbeat_writer.cleanup()
             
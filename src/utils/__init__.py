@@ -11,6 +11,7 @@ from .logging_config import (
     setup_logging,
     get_logger,
     get_logging_manager,
+    reset_logging,
     LoggingManager
 )
 
@@ -26,6 +27,7 @@ __all__ = [
     'setup_logging',
     'get_logger',
     'get_logging_manager',
+    'reset_logging',
     'LoggingManager',
     'WorkspaceSetup',
     'PathManager',
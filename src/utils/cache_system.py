@@ -1,101 +1,195 @@
 """
 Intelligent caching system for AutoTrainX
+
+The in-process backend is an O(1) LRU (ordered dict) with monotonic-clock
+TTLs, entry- and byte-bounded eviction and per-namespace hit/miss/eviction
+counters. The namespace of a key is its prefix up to the first ':', which
+for decorated functions is the decorator's key_prefix.
 """
 import asyncio
 import hashlib
+import inspect
 import json
+import os
 import pickle
+import sys
+import threading
 import time
 from abc import ABC, abstractmethod
-from datetime import datetime, timedelta
+from collections import OrderedDict
 from functools import wraps
 from pathlib import Path
-from typing import Any, Callable, Dict, Optional, TypeVar, Union
-import redis
-from diskcache import Cache as DiskCache
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar, Union
 
 T = TypeVar('T')
 
+DEFAULT_NAMESPACE = "default"
+
+
+def _namespace(key: str) -> str:
+    namespace, sep, _ = key.partition(':')
+    return namespace if sep and namespace else DEFAULT_NAMESPACE
+
+
 class CacheBackend(ABC):
-    """Abstract cache backend"""
-    
+    """
+    Abstract cache backend.
+
+    Backends implement the synchronous operations; the async API delegates
+    to them so sync and async callers share the same entries.
+    """
+
     @abstractmethod
-    async def get(self, key: str) -> Optional[Any]:
+    def get_sync(self, key: str) -> Optional[Any]:
         pass
-    
+
     @abstractmethod
-    async def set(self, key: str, value: Any, ttl: int = None) -> bool:
+    def set_sync(self, key: str, value: Any, ttl: int = None) -> bool:
         pass
-    
+
     @abstractmethod
-    async def delete(self, key: str) -> bool:
+    def delete_sync(self, key: str) -> bool:
         pass
-    
+
     @abstractmethod
-    async def clear(self) -> bool:
+    def clear_sync(self) -> bool:
         pass
 
-class MemoryCache(CacheBackend):
-    """In-memory cache backend"""
-    
-    def __init__(self, max_size: int = 1000):
-        self._cache: Dict[str, Dict] = {}
-        self.max_size = max_size
-    
     async def get(self, key: str) -> Optional[Any]:
-        if key not in self._cache:
-            return None
-        
-        entry = self._cache[key]
-        if entry['expires_at'] and datetime.now() > entry['expires_at']:
-            del self._cache[key]
-            return None
-        
-        entry['last_accessed'] = datetime.now()
-        return entry['value']
-    
+        return self.get_sync(key)
+
     async def set(self, key: str, value: Any, ttl: int = None) -> bool:
-        # Evict if at capacity
-        if len(self._cache) >= self.max_size:
-            self._evict_lru()
-        
-        expires_at = None
-        if ttl:
-            expires_at = datetime.now() + timedelta(seconds=ttl)
-        
-        self._cache[key] = {
-            'value': value,
-            'created_at': datetime.now(),
-            'last_accessed': datetime.now(),
-            'expires_at': expires_at
-        }
-        return True
-    
+        return self.set_sync(key, value, ttl)
+
     async def delete(self, key: str) -> bool:
-        return self._cache.pop(key, None) is not None
-    
+        return self.delete_sync(key)
+
     async def clear(self) -> bool:
-        self._cache.clear()
+        return self.clear_sync()
+
+class MemoryCache(CacheBackend):
+    """In-memory LRU cache backend with TTLs and per-namespace metrics"""
+
+    def __init__(self, max_size: int = 1000, max_bytes: Optional[int] = None,
+                 sizeof: Callable[[Any], int] = sys.getsizeof):
+        """
+        Initialize the memory cache.
+
+        Args:
+            max_size: Maximum number of entries
+            max_bytes: Optional bound on the estimated size of cached values
+            sizeof: Size estimator for values (shallow sys.getsizeof by default)
+        """
+        # key -> (value, expires_at on the monotonic clock or None, size)
+        self._cache: "OrderedDict[str, Tuple[Any, Optional[float], int]]" = OrderedDict()
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, key: str, counter: str) -> None:
+        stats = self._stats.get(_namespace(key))
+        if stats is None:
+            stats = self._stats[_namespace(key)] = {
+                'hits': 0, 'misses': 0, 'sets': 0, 'evictions': 0, 'expirations': 0
+            }
+        stats[counter] += 1
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._cache.pop(key)
+        self._bytes -= size
+
+    def get_sync(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                self._count(key, 'misses')
+                return None
+
+            value, expires_at, _ = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                self._remove(key)
+                self._count(key, 'expirations')
+                self._count(key, 'misses')
+                return None
+
+            self._cache.move_to_end(key)
+            self._count(key, 'hits')
+            return value
+
+    def set_sync(self, key: str, value: Any, ttl: int = None) -> bool:
+        expires_at = time.monotonic() + ttl if ttl else None
+        size = self._sizeof(value) if self.max_bytes else 0
+        if self.max_bytes and size > self.max_bytes:
+            return False
+
+        with self._lock:
+            if key in self._cache:
+                self._remove(key)
+            self._cache[key] = (value, expires_at, size)
+            self._bytes += size
+            self._count(key, 'sets')
+
+            # Evict least recently used entries from the front
+            while len(self._cache) > self.max_size or \
+                    (self.max_bytes and self._bytes > self.max_bytes):
+                oldest_key = next(iter(self._cache))
+                self._remove(oldest_key)
+                self._count(oldest_key, 'evictions')
         return True
-    
-    def _evict_lru(self):
-        """Evict least recently used item"""
-        if not self._cache:
-            return
-        
-        oldest_key = min(
-            self._cache.keys(),
-            key=lambda k: self._cache[k]['last_accessed']
-        )
-        del self._cache[oldest_key]
+
+    def delete_sync(self, key: str) -> bool:
+        with self._lock:
+            if key not in self._cache:
+                return False
+            self._remove(key)
+            return True
+
+    def delete_namespace(self, namespace: str) -> int:
+        """Delete every entry of a namespace and return how many were removed."""
+        with self._lock:
+            keys = [key for key in self._cache if _namespace(key) == namespace]
+            for key in keys:
+                self._remove(key)
+        return len(keys)
+
+    def clear_sync(self) -> bool:
+        with self._lock:
+            self._cache.clear()
+            self._bytes = 0
+        return True
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get entry counts and per-namespace counters with hit rates."""
+        with self._lock:
+            namespaces = {}
+            for namespace, stats in self._stats.items():
+                lookups = stats['hits'] + stats['misses']
+                namespaces[namespace] = {
+                    **stats,
+                    'hit_rate': round(stats['hits'] / lookups, 4) if lookups else 0,
+                }
+            return {
+                'entries': len(self._cache),
+                'max_size': self.max_size,
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'namespaces': namespaces,
+            }
 
 class RedisCache(CacheBackend):
     """Redis cache backend"""
-    
+
     def __init__(self, host: str = "localhost", port: int = 6379, db: int = 0):
+        import redis
         self.redis = redis.Redis(host=host, port=port, db=db, decode_responses=False)
-    
-    async def get(self, key: str) -> Optional[Any]:
+
+    def get_sync(self, key: str) -> Optional[Any]:
         try:
             data = self.redis.get(key)
             if data:
@@ -103,8 +197,8 @@ class RedisCache(CacheBackend):
         except Exception:
             pass
         return None
-    
-    async def set(self, key: str, value: Any, ttl: int = None) -> bool:
+
+    def set_sync(self, key: str, value: Any, ttl: int = None) -> bool:
         try:
             data = pickle.dumps(value)
             if ttl:
@@ -113,14 +207,14 @@ class RedisCache(CacheBackend):
                 return self.redis.set(key, data)
         except Exception:
             return False
-    
-    async def delete(self, key: str) -> bool:
+
+    def delete_sync(self, key: str) -> bool:
         try:
             return bool(self.redis.delete(key))
         except Exception:
             return False
-    
-    async def clear(self) -> bool:
+
+    def clear_sync(self) -> bool:
         try:
             self.redis.flushdb()
             return True
@@ -129,15 +223,16 @@ class RedisCache(CacheBackend):
 
 class DiskCacheBackend(CacheBackend):
     """Disk-based cache backend"""
-    
+
     def __init__(self, cache_dir: Path = Path("cache")):
+        from diskcache import Cache as DiskCache
         cache_dir.mkdir(parents=True, exist_ok=True)
         self.cache = DiskCache(str(cache_dir))
-    
-    async def get(self, key: str) -> Optional[Any]:
+
+    def get_sync(self, key: str) -> Optional[Any]:
         return self.cache.get(key)
-    
-    async def set(self, key: str, value: Any, ttl: int = None) -> bool:
+
+    def set_sync(self, key: str, value: Any, ttl: int = None) -> bool:
         try:
             if ttl:
                 self.cache.set(key, value, expire=ttl)
@@ -146,14 +241,14 @@ class DiskCacheBackend(CacheBackend):
             return True
         except Exception:
             return False
-    
-    async def delete(self, key: str) -> bool:
+
+    def delete_sync(self, key: str) -> bool:
         try:
             return self.cache.delete(key)
         except Exception:
             return False
-    
-    async def clear(self) -> bool:
+
+    def clear_sync(self) -> bool:
         try:
             self.cache.clear()
             return True
@@ -162,8 +257,8 @@ class DiskCacheBackend(CacheBackend):
 
 class CacheManager:
     """Main cache manager with multiple backends"""
-    
-    def __init__(self, 
+
+    def __init__(self,
                  primary_backend: CacheBackend,
                  fallback_backend: Optional[CacheBackend] = None):
         self.primary = primary_backend
@@ -174,84 +269,129 @@ class CacheManager:
             'sets': 0,
             'deletes': 0
         }
-    
-    async def get(self, key: str) -> Optional[Any]:
+
+    def get_sync(self, key: str) -> Optional[Any]:
         """Get value from cache with fallback"""
         # Try primary backend
-        value = await self.primary.get(key)
+        value = self.primary.get_sync(key)
         if value is not None:
             self.stats['hits'] += 1
             return value
-        
+
         # Try fallback backend
         if self.fallback:
-            value = await self.fallback.get(key)
+            value = self.fallback.get_sync(key)
             if value is not None:
                 # Restore to primary cache
-                await self.primary.set(key, value)
+                self.primary.set_sync(key, value)
                 self.stats['hits'] += 1
                 return value
-        
+
         self.stats['misses'] += 1
         return None
-    
-    async def set(self, key: str, value: Any, ttl: int = None) -> bool:
+
+    def set_sync(self, key: str, value: Any, ttl: int = None) -> bool:
         """Set value in cache"""
-        success = await self.primary.set(key, value, ttl)
+        success = self.primary.set_sync(key, value, ttl)
         if self.fallback and success:
-            await self.fallback.set(key, value, ttl)
-        
+            self.fallback.set_sync(key, value, ttl)
+
         if success:
             self.stats['sets'] += 1
         return success
-    
-    async def delete(self, key: str) -> bool:
+
+    def delete_sync(self, key: str) -> bool:
         """Delete from cache"""
-        success = await self.primary.delete(key)
+        success = self.primary.delete_sync(key)
         if self.fallback:
-            await self.fallback.delete(key)
-        
+            self.fallback.delete_sync(key)
+
         if success:
             self.stats['deletes'] += 1
         return success
-    
+
+    def invalidate_namespace(self, namespace: str) -> int:
+        """Drop every in-memory entry of a namespace (e.g. a decorator key_prefix)."""
+        removed = 0
+        for backend in (self.primary, self.fallback):
+            if isinstance(backend, MemoryCache):
+                removed += backend.delete_namespace(namespace)
+        return removed
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self.get_sync(key)
+
+    async def set(self, key: str, value: Any, ttl: int = None) -> bool:
+        return self.set_sync(key, value, ttl)
+
+    async def delete(self, key: str) -> bool:
+        return self.delete_sync(key)
+
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
         total_requests = self.stats['hits'] + self.stats['misses']
         hit_rate = (self.stats['hits'] / total_requests) if total_requests > 0 else 0
-        
-        return {
+
+        stats = {
             **self.stats,
             'hit_rate': hit_rate,
             'total_requests': total_requests
         }
+        for name, backend in (('primary', self.primary), ('fallback', self.fallback)):
+            if isinstance(backend, MemoryCache):
+                stats[f'{name}_memory'] = backend.get_stats()
+        return stats
 
 # Cache decorators
 def cached(ttl: int = 3600, key_prefix: str = ""):
-    """Decorator for caching function results"""
+    """
+    Decorator for caching function results.
+
+    Works for sync and async functions. For methods, `self`/`cls` is left
+    out of the key so all instances of a stateless service share entries.
+    None results are not cached.
+    """
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        parameters = list(inspect.signature(func).parameters)
+        skip_first = bool(parameters) and parameters[0] in ('self', 'cls')
+
+        def make_key(args: tuple, kwargs: dict) -> str:
+            return _generate_cache_key(func.__name__, args[1:] if skip_first else args,
+                                       kwargs, key_prefix)
+
         @wraps(func)
         async def async_wrapper(*args, **kwargs):
-            # Generate cache key
-            cache_key = _generate_cache_key(func.__name__, args, kwargs, key_prefix)
-            
+            manager = get_cache_manager()
+            cache_key = make_key(args, kwargs)
+
             # Try to get from cache
-            cached_result = await cache_manager.get(cache_key)
+            cached_result = manager.get_sync(cache_key)
             if cached_result is not None:
                 return cached_result
-            
+
             # Execute function and cache result
             result = await func(*args, **kwargs)
-            await cache_manager.set(cache_key, result, ttl)
+            if result is not None:
+                manager.set_sync(cache_key, result, ttl)
             return result
-        
+
         @wraps(func)
         def sync_wrapper(*args, **kwargs):
-            # For sync functions, run in event loop
-            loop = asyncio.get_event_loop()
-            return loop.run_until_complete(async_wrapper(*args, **kwargs))
-        
-        return async_wrapper if asyncio.iscoroutinefunction(func) else sync_wrapper
+            manager = get_cache_manager()
+            cache_key = make_key(args, kwargs)
+
+            cached_result = manager.get_sync(cache_key)
+            if cached_result is not None:
+                return cached_result
+
+            result = func(*args, **kwargs)
+            if result is not None:
+                manager.set_sync(cache_key, result, ttl)
+            return result
+
+        wrapper = async_wrapper if asyncio.iscoroutinefunction(func) else sync_wrapper
+        wrapper.cache_key = make_key
+        return wrapper
     return decorator
 
 def cache_invalidate(key_pattern: str):
@@ -262,17 +402,16 @@ def cache_invalidate(key_pattern: str):
             result = await func(*args, **kwargs)
             # Invalidate cache entries matching pattern
             cache_key = _generate_cache_key(key_pattern, args, kwargs)
-            await cache_manager.delete(cache_key)
+            get_cache_manager().delete_sync(cache_key)
             return result
-        
+
         @wraps(func)
         def sync_wrapper(*args, **kwargs):
             result = func(*args, **kwargs)
-            loop = asyncio.get_event_loop()
             cache_key = _generate_cache_key(key_pattern, args, kwargs)
-            loop.run_until_complete(cache_manager.delete(cache_key))
+            get_cache_manager().delete_sync(cache_key)
             return result
-        
+
         return async_wrapper if asyncio.iscoroutinefunction(func) else sync_wrapper
     return decorator
 
@@ -283,9 +422,9 @@ def _generate_cache_key(func_name: str, args: tuple, kwargs: dict, prefix: str =
         'args': args,
         'kwargs': sorted(kwargs.items())
     }, sort_keys=True, default=str)
-    
+
     arg_hash = hashlib.md5(arg_string.encode()).hexdigest()
-    
+
     parts = [prefix, func_name, arg_hash]
     return ":".join(filter(None, parts))
 
@@ -295,7 +434,7 @@ cache_manager: Optional[CacheManager] = None
 def setup_cache(backend_type: str = "memory", **kwargs) -> CacheManager:
     """Setup global cache manager"""
     global cache_manager
-    
+
     if backend_type == "redis":
         primary = RedisCache(**kwargs)
         fallback = MemoryCache()
@@ -305,25 +444,65 @@ def setup_cache(backend_type: str = "memory", **kwargs) -> CacheManager:
     else:
         primary = MemoryCache(**kwargs)
         fallback = None
-    
+
     cache_manager = CacheManager(primary, fallback)
     return cache_manager
 
+def get_cache_manager() -> CacheManager:
+    """Get the global cache manager, setting up the memory backend on first use"""
+    if cache_manager is None:
+        setup_cache("memory", max_size=4096, max_bytes=64 * 1024 * 1024)
+    return cache_manager
+
 # Specialized cache functions for AutoTrainX
+def get_model_info(model_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Cached model information retrieval.
+
+    Reads file stats and, for .safetensors files, the header metadata
+    (training parameters written by sd-scripts) without loading tensors.
+    Size and mtime are part of the cache key, so a rewritten file is read again.
+    """
+    path = Path(model_path)
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return _read_model_info(str(path), stat.st_size, stat.st_mtime)
+
 @cached(ttl=1800, key_prefix="model_info")
-async def get_model_info(model_path: str) -> Dict[str, Any]:
-    """Cached model information retrieval"""
-    # This would be implemented to read model metadata
-    pass
-
-@cached(ttl=3600, key_prefix="dataset_stats")
-async def get_dataset_statistics(dataset_path: str) -> Dict[str, Any]:
-    """Cached dataset statistics"""
-    # This would be implemented to analyze dataset
-    pass
-
-@cached(ttl=300, key_prefix="job_status")
-async def get_job_status(job_id: str) -> Dict[str, Any]:
-    """Cached job status information"""
-    # This would be implemented to check job status
-    pass
\ No newline at end of file
+def _read_model_info(model_path: str, size: int, mtime: float) -> Dict[str, Any]:
+    """Read the model information of one version of a file"""
+    path = Path(model_path)
+    info: Dict[str, Any] = {
+        'path': model_path,
+        'name': path.stem,
+        'format': path.suffix.lstrip('.').lower(),
+        'size': size,
+        'modified': mtime,
+        'metadata': {},
+    }
+    if info['format'] == 'safetensors':
+        try:
+            with open(path, 'rb') as f:
+                header_size = int.from_bytes(f.read(8), 'little')
+                if 0 < header_size <= 100 * 1024 * 1024:
+                    header = json.loads(f.read(header_size))
+                    info['metadata'] = header.get('__metadata__', {})
+        except (OSError, ValueError):
+            pass
+    return info
+
+@cached(ttl=60, key_prefix="dataset_stats")
+def get_dataset_statistics(dataset_path: str) -> Optional[Dict[str, Any]]:
+    """Cached dataset statistics from the dataset metadata index"""
+    from .dataset_index import get_dataset_index
+
+    path = Path(dataset_path)
+    if not path.is_dir():
+        return None
+    stats = get_dataset_index(path).summary()
+    with os.scandir(path) as entries:
+        stats['total_texts'] = sum(1 for entry in entries
+                                   if entry.name.lower().endswith('.txt') and entry.is_file())
+    return stats
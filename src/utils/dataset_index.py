@@ -0,0 +1,320 @@
+"""
+Persistent image metadata index for datasets.
+
+Each dataset directory gets a ``.cache/metadata_index.json`` sidecar holding,
+per image: width, height, size, mtime, caption hash and caption text. The
+index is refreshed incrementally: one directory listing plus a ``stat`` per
+file, and only images or captions whose (mtime, size) changed are re-read.
+Image dimensions come from header probing (a few hundred bytes per file)
+instead of decoding with PIL.
+
+Usage:
+    index = get_dataset_index(dataset_path)
+    for entry in index.images:
+        print(entry['filename'], entry['width'], entry['height'])
+"""
+
+import hashlib
+import json
+import logging
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+INDEX_DIR = '.cache'
+INDEX_FILENAME = 'metadata_index.json'
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp'}
+
+# JPEG start-of-frame markers (excluding DHT, JPG and DAC)
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7,
+                     0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def _probe_png(f) -> Optional[Tuple[int, int]]:
+    header = f.read(24)
+    if len(header) == 24 and header[:8] == b'\x89PNG\r\n\x1a\n' and header[12:16] == b'IHDR':
+        return struct.unpack('>II', header[16:24])
+    return None
+
+
+def _probe_webp(f) -> Optional[Tuple[int, int]]:
+    header = f.read(30)
+    if len(header) < 30 or header[:4] != b'RIFF' or header[8:12] != b'WEBP':
+        return None
+    chunk = header[12:16]
+    if chunk == b'VP8 ':
+        width, height = struct.unpack('<HH', header[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b'VP8L':
+        bits = int.from_bytes(header[21:25], 'little')
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b'VP8X':
+        width = int.from_bytes(header[24:27], 'little') + 1
+        height = int.from_bytes(header[27:30], 'little') + 1
+        return width, height
+    return None
+
+
+def _probe_jpeg(f) -> Optional[Tuple[int, int]]:
+    if f.read(2) != b'\xff\xd8':
+        return None
+    while True:
+        byte = f.read(1)
+        while byte and byte != b'\xff':
+            byte = f.read(1)
+        while byte == b'\xff':
+            byte = f.read(1)
+        if not byte:
+            return None
+        marker = byte[0]
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            continue
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack('>H', length_bytes)[0]
+        if marker in _JPEG_SOF_MARKERS:
+            data = f.read(5)
+            if len(data) < 5:
+                return None
+            height, width = struct.unpack('>HH', data[1:5])
+            return width, height
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+_PROBES = {
+    '.png': _probe_png,
+    '.webp': _probe_webp,
+    '.jpg': _probe_jpeg,
+    '.jpeg': _probe_jpeg,
+}
+
+
+def probe_image_size(path: Union[str, Path]) -> Tuple[int, int]:
+    """
+    Read image dimensions from the file header without decoding pixels.
+
+    Args:
+        path: Image file path
+
+    Returns:
+        Tuple of (width, height)
+    """
+    path = Path(path)
+    probe = _PROBES.get(path.suffix.lower())
+    if probe:
+        with open(path, 'rb') as f:
+            size = probe(f)
+        if size:
+            return size
+
+    # Unusual encodings (e.g. mislabelled extensions) fall back to PIL,
+    # which also only parses the header on open.
+    from PIL import Image
+    with Image.open(path) as img:
+        return img.size
+
+
+def _caption_info(caption_path: Path) -> Tuple[str, str]:
+    """Read a caption file and return (text, sha1 hash)."""
+    raw = caption_path.read_bytes()
+    return raw.decode('utf-8', errors='replace').strip(), hashlib.sha1(raw).hexdigest()
+
+
+class DatasetIndex:
+    """Incrementally refreshed image metadata index for one dataset directory."""
+
+    def __init__(self, dataset_path: Union[str, Path], index_path: Optional[Path] = None):
+        """
+        Initialize the index.
+
+        Args:
+            dataset_path: Directory holding images and caption files
+            index_path: Sidecar location (defaults to <dataset>/.cache/metadata_index.json)
+        """
+        self.dataset_path = Path(dataset_path)
+        self.index_path = index_path or self.dataset_path / INDEX_DIR / INDEX_FILENAME
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _load(self) -> None:
+        self._loaded = True
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION:
+                self._entries = data.get('images', {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable dataset index {self.index_path}: {e}")
+
+    def _save(self) -> None:
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': INDEX_VERSION, 'images': self._entries}, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            # Read-only source datasets still get an in-memory index
+            logger.debug(f"Could not persist dataset index {self.index_path}: {e}")
+
+    def refresh(self) -> int:
+        """
+        Bring the index up to date with the directory contents.
+
+        Returns:
+            Number of entries added, changed or removed
+        """
+        with self._lock:
+            if not self._loaded:
+                self._load()
+
+            images = {}
+            captions = {}
+            with os.scandir(self.dataset_path) as entries:
+                for entry in entries:
+                    if not entry.is_file():
+                        continue
+                    stem, ext = os.path.splitext(entry.name)
+                    if ext.lower() in IMAGE_EXTENSIONS:
+                        images[entry.name] = entry
+                    elif ext == '.txt':
+                        captions[stem] = entry
+
+            changes = 0
+            for name in set(self._entries) - set(images):
+                del self._entries[name]
+                changes += 1
+
+            for name, entry in images.items():
+                try:
+                    if self._refresh_entry(name, entry, captions.get(os.path.splitext(name)[0])):
+                        changes += 1
+                except Exception as e:
+                    logger.error(f"Error indexing image {entry.path}: {e}")
+                    self._entries.pop(name, None)
+
+            if changes:
+                self._save()
+            return changes
+
+    def _refresh_entry(self, name: str, entry: os.DirEntry, caption_entry: Optional[os.DirEntry]) -> bool:
+        stat = entry.stat()
+        current = self._entries.get(name)
+        changed = False
+
+        if not current or current['mtime'] != stat.st_mtime or current['size'] != stat.st_size:
+            width, height = probe_image_size(entry.path)
+            current = {
+                'filename': name,
+                'width': width,
+                'height': height,
+                'size': stat.st_size,
+                'mtime': stat.st_mtime,
+                'caption': None,
+                'caption_hash': None,
+                'caption_size': None,
+                'caption_mtime': None,
+            }
+            self._entries[name] = current
+            changed = True
+
+        if caption_entry is None:
+            if current['caption_hash'] is not None:
+                current.update(caption=None, caption_hash=None, caption_size=None, caption_mtime=None)
+                changed = True
+            return changed
+
+        caption_stat = caption_entry.stat()
+        if current['caption_mtime'] != caption_stat.st_mtime or current['caption_size'] != caption_stat.st_size:
+            text, digest = _caption_info(Path(caption_entry.path))
+            current.update(caption=text, caption_hash=digest,
+                           caption_size=caption_stat.st_size, caption_mtime=caption_stat.st_mtime)
+            changed = True
+        return changed
+
+    @property
+    def images(self) -> List[Dict[str, Any]]:
+        """Indexed images sorted by filename."""
+        return [self._entries[name] for name in sorted(self._entries)]
+
+    def get(self, filename: str) -> Optional[Dict[str, Any]]:
+        """Get the index entry for an image filename."""
+        return self._entries.get(filename)
+
+    def caption_pairs(self, non_empty: bool = True) -> List[Tuple[Path, Path]]:
+        """
+        Get (image, caption) path pairs.
+
+        Args:
+            non_empty: Only include captions with a non-zero file size
+
+        Returns:
+            List of (image_file, text_file) tuples
+        """
+        pairs = []
+        for entry in self.images:
+            if entry['caption_hash'] is None or (non_empty and not entry['caption_size']):
+                continue
+            image_path = self.dataset_path / entry['filename']
+            pairs.append((image_path, image_path.with_suffix('.txt')))
+        return pairs
+
+    def summary(self) -> Dict[str, Any]:
+        """Aggregate resolution, size and caption statistics."""
+        images = self.images
+        if not images:
+            return {
+                'total_images': 0, 'images_with_captions': 0, 'images_without_captions': 0,
+                'min_width': 0, 'max_width': 0, 'min_height': 0, 'max_height': 0,
+                'avg_width': 0, 'avg_height': 0, 'total_size_mb': 0,
+            }
+
+        widths = [entry['width'] for entry in images]
+        heights = [entry['height'] for entry in images]
+        with_captions = sum(1 for entry in images if entry['caption_hash'] is not None)
+        return {
+            'total_images': len(images),
+            'images_with_captions': with_captions,
+            'images_without_captions': len(images) - with_captions,
+            'min_width': min(widths),
+            'max_width': max(widths),
+            'min_height': min(heights),
+            'max_height': max(heights),
+            'avg_width': int(sum(widths) / len(images)),
+            'avg_height': int(sum(heights) / len(images)),
+            'total_size_mb': round(sum(entry['size'] for entry in images) / (1024 * 1024), 2),
+        }
+
+
+_indexes: Dict[str, DatasetIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_dataset_index(dataset_path: Union[str, Path], refresh: bool = True) -> DatasetIndex:
+    """
+    Get the shared index for a dataset directory.
+
+    Args:
+        dataset_path: Dataset directory
+        refresh: Bring the index up to date before returning it
+
+    Returns:
+        DatasetIndex instance (shared across callers in this process)
+    """
+    key = str(Path(dataset_path).resolve())
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = DatasetIndex(key)
+    if refresh:
+        index.refresh()
+    return index
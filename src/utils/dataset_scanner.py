@@ -0,0 +1,302 @@
+"""
+Single-pass directory indexer for dataset discovery and validation.
+
+One ``os.scandir`` pass per directory classifies its entries into images,
+captions (``<stem>.txt``) and subdirectories; ``DirEntry`` type checks come
+from the directory listing itself, so no per-file ``stat`` is needed. Trees
+are walked level by level with each level's directories listed in a thread
+pool, which hides per-request latency on network filesystems.
+
+Listings are cached in memory and, optionally, in a JSON file
+(``workspace/.cache/dataset_scan.json``). A cached listing is reused while
+the directory's mtime is unchanged, since adding, removing or renaming a
+file always updates it. Listings taken within a second of a modification
+are not trusted, as coarse mtime resolution could hide a later change.
+
+Usage:
+    scanner = get_dataset_scanner()
+    for listing in scanner.scan(root, max_depth=3):
+        print(listing.path, listing.image_count, listing.caption_count)
+    pairs = scanner.caption_pairs(dataset_path)
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+SCAN_CACHE_VERSION = 1
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp'}
+CAPTION_EXTENSION = '.txt'
+# Listings this close to the directory's mtime may miss a same-tick change
+RACY_SECONDS = 1.0
+
+
+@dataclass
+class DirectoryListing:
+    """Images, captions and subdirectories of one directory."""
+    path: Path
+    mtime_ns: int
+    images: List[str] = field(default_factory=list)
+    captions: List[str] = field(default_factory=list)
+    subdirs: List[str] = field(default_factory=list)
+
+    @property
+    def image_count(self) -> int:
+        return len(self.images)
+
+    @property
+    def caption_count(self) -> int:
+        return len(self.captions)
+
+    @property
+    def has_images(self) -> bool:
+        return bool(self.images)
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    def pair_names(self) -> List[Tuple[str, str]]:
+        """(image, caption) file names for images that have a caption file, sorted by image name."""
+        captions = set(self.captions)
+        pairs = []
+        for image in self.images:
+            caption = os.path.splitext(image)[0] + CAPTION_EXTENSION
+            if caption in captions:
+                pairs.append((image, caption))
+        return pairs
+
+    def pairs(self) -> List[Tuple[Path, Path]]:
+        """(image, caption) paths for images that have a caption file, sorted by image name."""
+        return [(self.path / image, self.path / caption) for image, caption in self.pair_names()]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'mtime_ns': self.mtime_ns, 'images': self.images,
+                'captions': self.captions, 'subdirs': self.subdirs}
+
+
+class DatasetScanner:
+    """Lists dataset directories in one pass each, with mtime-validated caching."""
+
+    def __init__(self, cache_path: Optional[Path] = None, max_workers: int = 16):
+        """
+        Initialize the scanner.
+
+        Args:
+            cache_path: JSON file to persist listings in (None: memory only)
+            max_workers: Threads used to list directories in parallel
+        """
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.max_workers = max_workers
+        self._listings: Dict[str, Tuple[DirectoryListing, float]] = {}
+        self._loaded = False
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _load(self) -> None:
+        self._loaded = True
+        if not self.cache_path:
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != SCAN_CACHE_VERSION:
+                return
+            for path, entry in data.get('dirs', {}).items():
+                listing = DirectoryListing(Path(path), entry['mtime_ns'], entry['images'],
+                                           entry['captions'], entry['subdirs'])
+                self._listings[path] = (listing, entry['scanned_at'])
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable dataset scan cache {self.cache_path}: {e}")
+
+    def save(self) -> None:
+        """Persist cached listings if any changed."""
+        with self._lock:
+            if not self.cache_path or not self._dirty:
+                return
+            dirs = {path: {**listing.to_dict(), 'scanned_at': scanned_at}
+                    for path, (listing, scanned_at) in self._listings.items()}
+            self._dirty = False
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': SCAN_CACHE_VERSION, 'dirs': dirs}, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.debug(f"Could not persist dataset scan cache {self.cache_path}: {e}")
+
+    def list_directory(self, path: Union[str, Path]) -> DirectoryListing:
+        """
+        List one directory, reusing the cached listing if its mtime is unchanged.
+
+        Args:
+            path: Directory to list
+
+        Returns:
+            DirectoryListing with sorted image, caption and subdirectory names
+
+        Raises:
+            OSError: If the directory cannot be read
+        """
+        path = Path(path)
+        key = str(path)
+        mtime_ns = os.stat(path).st_mtime_ns
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            cached = self._listings.get(key)
+        if cached:
+            listing, scanned_at = cached
+            if listing.mtime_ns == mtime_ns and scanned_at - mtime_ns / 1e9 > RACY_SECONDS:
+                return listing
+
+        scanned_at = time.time()
+        listing = DirectoryListing(path, mtime_ns)
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                if entry.is_dir():
+                    listing.subdirs.append(entry.name)
+                elif entry.is_file():
+                    ext = os.path.splitext(entry.name)[1]
+                    if ext.lower() in IMAGE_EXTENSIONS:
+                        listing.images.append(entry.name)
+                    elif ext == CAPTION_EXTENSION:
+                        listing.captions.append(entry.name)
+        listing.images.sort()
+        listing.captions.sort()
+        listing.subdirs.sort()
+
+        with self._lock:
+            self._listings[key] = (listing, scanned_at)
+            self._dirty = True
+        return listing
+
+    def _try_list(self, path: Path) -> Optional[DirectoryListing]:
+        try:
+            return self.list_directory(path)
+        except PermissionError:
+            logger.warning(f"Permission denied accessing: {path}")
+        except OSError as e:
+            logger.error(f"Error scanning {path}: {e}")
+        return None
+
+    def scan(self, root: Union[str, Path], max_depth: int = 3) -> List[DirectoryListing]:
+        """
+        Find dataset directories (directories holding images) under a root.
+
+        A dataset directory is not searched further. Subdirectories of the
+        root are at depth 0; directories without images are descended into
+        until max_depth.
+
+        Args:
+            root: Directory to search
+            max_depth: Deepest level whose subdirectories are still searched
+
+        Returns:
+            Listings of the dataset directories found, sorted by path
+        """
+        root = Path(root)
+        top = self._try_list(root)
+        if top is None:
+            return []
+
+        datasets = []
+        frontier = [root / name for name in top.subdirs]
+        depth = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while frontier:
+                next_frontier = []
+                for listing in executor.map(self._try_list, frontier):
+                    if listing is None:
+                        continue
+                    if listing.has_images:
+                        datasets.append(listing)
+                    elif depth < max_depth:
+                        next_frontier.extend(listing.path / name for name in listing.subdirs)
+                frontier = next_frontier
+                depth += 1
+
+        self.save()
+        return sorted(datasets, key=lambda listing: str(listing.path))
+
+    def caption_pairs(self, path: Union[str, Path], non_empty: bool = True) -> List[Tuple[Path, Path]]:
+        """
+        Get (image, caption) path pairs for a dataset directory.
+
+        Args:
+            path: Dataset directory
+            non_empty: Only include captions with a non-zero file size; the
+                caption files are stat'ed in parallel, since content changes
+                do not show in the directory mtime
+
+        Returns:
+            List of (image_file, text_file) tuples sorted by image name
+        """
+        listing = self.list_directory(path)
+        names = listing.pair_names()
+        if non_empty and names:
+            directory = str(listing.path)
+
+            def non_empty_captions(chunk: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+                kept = []
+                for image, caption in chunk:
+                    try:
+                        if os.stat(os.path.join(directory, caption)).st_size:
+                            kept.append((image, caption))
+                    except OSError:
+                        pass
+                return kept
+
+            # One task per chunk rather than per file keeps the pool overhead low
+            chunk_size = max(256, -(-len(names) // self.max_workers))
+            chunks = [names[i:i + chunk_size] for i in range(0, len(names), chunk_size)]
+            if len(chunks) == 1:
+                names = non_empty_captions(names)
+            else:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                    names = [pair for kept in executor.map(non_empty_captions, chunks) for pair in kept]
+        return [(listing.path / image, listing.path / caption) for image, caption in names]
+
+
+_scanners: Dict[str, DatasetScanner] = {}
+_scanners_lock = threading.Lock()
+
+
+def get_scan_cache_path(base_path: Optional[str] = None) -> Path:
+    """Get the dataset scan cache file (AUTOTRAINX_SCAN_CACHE overrides)."""
+    return Path(os.getenv('AUTOTRAINX_SCAN_CACHE') or
+                Config.get_workspace_path(base_path) / ".cache" / "dataset_scan.json")
+
+
+def get_dataset_scanner(base_path: Optional[str] = None) -> DatasetScanner:
+    """
+    Get the shared dataset scanner for a project.
+
+    Args:
+        base_path: Project base path
+
+    Returns:
+        DatasetScanner persisting its listings in the workspace cache
+    """
+    cache_path = get_scan_cache_path(base_path)
+    key = str(cache_path)
+    with _scanners_lock:
+        scanner = _scanners.get(key)
+        if scanner is None:
+            scanner = _scanners[key] = DatasetScanner(cache_path)
+    return scanner
@@ -0,0 +1,107 @@
+"""
+Downsampling of long metric series for charts.
+
+A long training run records one point per step, far more than a chart can
+show. Both methods keep the first and last points and return a subset of
+the input, so every returned point is a real recorded value:
+
+    lttb     Largest-Triangle-Three-Buckets: per bucket, keeps the point
+             forming the largest triangle with its neighbours. Preserves
+             the visual shape of the curve.
+    minmax   per bucket, keeps the lowest and highest point, so spikes
+             are never lost.
+
+Usage:
+    points = downsample(list(zip(steps, losses)), 500, method='lttb')
+"""
+
+from typing import List, Sequence, Tuple
+
+Point = Tuple[float, float]
+
+METHODS = ('lttb', 'minmax')
+
+
+def lttb(points: Sequence[Point], threshold: int) -> List[Point]:
+    """
+    Downsample with Largest-Triangle-Three-Buckets.
+
+    Args:
+        points: (x, y) points sorted by x
+        threshold: Number of points to return (at least 3)
+
+    Returns:
+        Selected points in x order
+    """
+    n = len(points)
+    if threshold >= n or threshold < 3:
+        return list(points)
+
+    sampled = [points[0]]
+    # The first and last points are fixed; the rest is split into threshold - 2 buckets
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        # Average of the next bucket is the third triangle vertex
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        next_bucket = points[next_start:next_end]
+        avg_x = sum(p[0] for p in next_bucket) / len(next_bucket)
+        avg_y = sum(p[1] for p in next_bucket) / len(next_bucket)
+
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        ax, ay = points[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            x, y = points[j]
+            area = abs((ax - avg_x) * (y - ay) - (ax - x) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        sampled.append(points[best])
+        a = best
+
+    sampled.append(points[-1])
+    return sampled
+
+
+def min_max(points: Sequence[Point], threshold: int) -> List[Point]:
+    """
+    Downsample to the lowest and highest point of each bucket.
+
+    Args:
+        points: (x, y) points sorted by x
+        threshold: Maximum number of points to return (at least 4)
+
+    Returns:
+        Selected points in x order
+    """
+    n = len(points)
+    if threshold >= n or threshold < 4:
+        return list(points)
+
+    sampled = [points[0]]
+    buckets = (threshold - 2) // 2
+    every = (n - 2) / buckets
+    for i in range(buckets):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        low = min(range(start, end), key=lambda j: points[j][1])
+        high = max(range(start, end), key=lambda j: points[j][1])
+        sampled.extend(points[j] for j in sorted({low, high}))
+    sampled.append(points[-1])
+    return sampled
+
+
+def downsample(points: Sequence[Point], threshold: int, method: str = 'lttb') -> List[Point]:
+    """
+    Downsample a series with one of METHODS.
+
+    Raises:
+        ValueError: If the method is unknown
+    """
+    if method == 'lttb':
+        return lttb(points, threshold)
+    if method == 'minmax':
+        return min_max(points, threshold)
+    raise ValueError(f"Unknown downsampling method: {method}")
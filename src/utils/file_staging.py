@@ -0,0 +1,251 @@
+"""
+Dataset file staging with reflinks, hardlinks or symlinks.
+
+Dataset preparation places every image and caption twice: once in
+``workspace/input/<name>`` and once in the training image directory under
+``workspace/output/<name>/img``. Full copies of large datasets cost minutes
+and double the disk usage, while training only ever reads these files.
+
+The stager places each file with the cheapest method the filesystem allows:
+
+    reflink   copy-on-write clone (btrfs, XFS, ...); an independent file
+    hardlink  second name for the same inode on the same device
+    symlink   link to the source path
+    copy      full copy, run in a thread pool
+
+``auto`` tries reflink, then hardlink, then falls back to copy. Every file is
+placed through a temporary name and renamed over the destination, so
+re-staging replaces earlier links instead of writing through them.
+
+Usage:
+    stager = FileStager(Config.get_dataset_staging())
+    stager.stage([(source, destination), ...])
+    print(stager.report.summary())
+"""
+
+import errno
+import logging
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# linux/fs.h: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+# Errors that mean "this method is not available here", not "this file is broken"
+_UNSUPPORTED_ERRNOS = {
+    errno.EXDEV, errno.EPERM, errno.EACCES, errno.EINVAL, errno.ENOTTY,
+    errno.EOPNOTSUPP, errno.EMLINK, errno.ENOSYS,
+    getattr(errno, 'ENOTSUP', errno.EOPNOTSUPP),
+}
+
+
+class StagingStrategy(str, Enum):
+    """How dataset files are placed in the workspace."""
+    AUTO = "auto"
+    REFLINK = "reflink"
+    HARDLINK = "hardlink"
+    SYMLINK = "symlink"
+    COPY = "copy"
+
+    @classmethod
+    def parse(cls, value: Optional[str]) -> 'StagingStrategy':
+        """Parse a configured strategy, falling back to auto for unknown values."""
+        try:
+            return cls(str(value or cls.AUTO.value).lower())
+        except ValueError:
+            logger.warning(f"Unknown dataset staging strategy '{value}', using auto")
+            return cls.AUTO
+
+
+@dataclass
+class StagingReport:
+    """Files placed per method, with the bytes that had to be copied."""
+    strategy: str
+    files: Dict[str, int] = field(default_factory=dict)
+    copied_bytes: int = 0
+    seconds: float = 0.0
+
+    @property
+    def total(self) -> int:
+        return sum(self.files.values())
+
+    def summary(self) -> str:
+        """One-line description for the preparation summary."""
+        methods = ", ".join(f"{count} {method}" for method, count in sorted(self.files.items()))
+        text = f"Staged {self.total} files ({self.strategy}: {methods or 'none'})"
+        if self.copied_bytes:
+            text += f", copied {self.copied_bytes / 1024 ** 2:.1f} MB"
+        return text
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            'strategy': self.strategy,
+            'files': dict(self.files),
+            'copied_bytes': self.copied_bytes,
+            'seconds': round(self.seconds, 3),
+        }
+
+
+def _temporary_path(destination: Path) -> Path:
+    return destination.with_name(f".{destination.name}.{os.getpid()}.{threading.get_ident()}.stage")
+
+
+def _reflink(source: Path, temporary: Path) -> None:
+    if fcntl is None:
+        raise OSError(errno.EOPNOTSUPP, "reflink is not supported on this platform")
+    with open(source, 'rb') as src, open(temporary, 'wb') as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        except OSError:
+            dst.close()
+            os.unlink(temporary)
+            raise
+    shutil.copystat(source, temporary)
+
+
+def _hardlink(source: Path, temporary: Path) -> None:
+    os.link(source, temporary)
+
+
+def _symlink(source: Path, temporary: Path) -> None:
+    # Point at the original file, never at another link in the workspace
+    os.symlink(os.path.realpath(source), temporary)
+
+
+def _copy(source: Path, temporary: Path) -> None:
+    shutil.copy2(source, temporary)
+
+
+_METHODS = {
+    StagingStrategy.REFLINK: _reflink,
+    StagingStrategy.HARDLINK: _hardlink,
+    StagingStrategy.SYMLINK: _symlink,
+    StagingStrategy.COPY: _copy,
+}
+
+
+class FileStager:
+    """Places dataset files using a staging strategy."""
+
+    def __init__(self, strategy: str = StagingStrategy.AUTO.value, max_workers: Optional[int] = None):
+        """
+        Initialize the stager.
+
+        Args:
+            strategy: One of auto, reflink, hardlink, symlink or copy
+            max_workers: Threads used for the files that must be copied
+        """
+        self.strategy = StagingStrategy.parse(strategy)
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 1) + 4)
+        self.report = StagingReport(strategy=self.strategy.value)
+        # Methods found unsupported per (source device, destination device)
+        self._unsupported: Dict[Tuple[int, int], set] = {}
+        self._lock = threading.Lock()
+
+    def _candidates(self, source_dev: int, destination_dev: int) -> List[StagingStrategy]:
+        if self.strategy == StagingStrategy.AUTO:
+            methods = [StagingStrategy.REFLINK, StagingStrategy.HARDLINK]
+        elif self.strategy == StagingStrategy.COPY:
+            methods = []
+        else:
+            methods = [self.strategy]
+        if source_dev != destination_dev:
+            # Neither clones nor hard links cross filesystems
+            methods = [method for method in methods if method == StagingStrategy.SYMLINK]
+        skipped = self._unsupported.get((source_dev, destination_dev), set())
+        return [method for method in methods if method not in skipped]
+
+    def _place(self, method: StagingStrategy, source: Path, destination: Path) -> None:
+        temporary = _temporary_path(destination)
+        try:
+            _METHODS[method](source, temporary)
+            os.replace(temporary, destination)
+            if os.path.lexists(temporary):
+                # rename() is a no-op when both names are already the same inode
+                os.unlink(temporary)
+        except BaseException:
+            if os.path.lexists(temporary):
+                os.unlink(temporary)
+            raise
+
+    def _count(self, method: StagingStrategy, copied_bytes: int = 0) -> None:
+        with self._lock:
+            self.report.files[method.value] = self.report.files.get(method.value, 0) + 1
+            self.report.copied_bytes += copied_bytes
+
+    def stage(self, pairs: Iterable[Tuple[Path, Path]]) -> StagingReport:
+        """
+        Place each source file at its destination.
+
+        Args:
+            pairs: (source, destination) file paths; destination directories
+                must exist
+
+        Returns:
+            The cumulative report for this stager
+        """
+        start = time.perf_counter()
+        to_copy = []
+        device_cache: Dict[Path, int] = {}
+        for source, destination in pairs:
+            source, destination = Path(source), Path(destination)
+            source_dev = os.stat(source).st_dev
+            parent = destination.parent
+            if parent not in device_cache:
+                device_cache[parent] = os.stat(parent).st_dev
+            devices = (source_dev, device_cache[parent])
+
+            for method in self._candidates(*devices):
+                try:
+                    self._place(method, source, destination)
+                except OSError as e:
+                    if e.errno not in _UNSUPPORTED_ERRNOS:
+                        raise
+                    logger.debug(f"{method.value} not available for {destination.parent}: {e}")
+                    self._unsupported.setdefault(devices, set()).add(method)
+                    continue
+                self._count(method)
+                break
+            else:
+                to_copy.append((source, destination))
+
+        if to_copy:
+            def copy_one(pair: Tuple[Path, Path]) -> None:
+                self._place(StagingStrategy.COPY, *pair)
+                self._count(StagingStrategy.COPY, pair[0].stat().st_size)
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                # list() re-raises the first copy error
+                list(executor.map(copy_one, to_copy))
+
+        self.report.seconds += time.perf_counter() - start
+        return self.report
+
+
+def remove_staged_tree(path: Path) -> None:
+    """
+    Remove a staged dataset directory without touching link targets.
+
+    A directory that is itself a symlink is unlinked rather than followed.
+    Inside the tree, rmtree unlinks symlinks and hard links, which only drops
+    the workspace's name for the file, so the original dataset is unaffected.
+    """
+    path = Path(path)
+    if path.is_symlink():
+        path.unlink()
+    elif path.exists():
+        shutil.rmtree(path)
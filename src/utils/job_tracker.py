@@ -1,9 +1,12 @@
 """Job tracking utilities for AutoTrainX pipelines."""
 
+import atexit
 import logging
-from typing import Optional, Dict, Any, List
+import os
+from typing import Optional, Dict, Any, List, Callable, Tuple
 from pathlib import Path
 from contextlib import contextmanager
+import functools
 import traceback
 
 from src.database import DatabaseManager, ExecutionStatus, PipelineMode
@@ -11,19 +14,28 @@ from src.database import DatabaseManager, ExecutionStatus, PipelineMode
 
 logger = logging.getLogger(__name__)
 
+# Set to "true" to queue status updates and write them in batches
+WRITE_BEHIND_ENV = 'AUTOTRAINX_TRACKER_WRITE_BEHIND'
+
 
 class JobTracker:
     """Tracks job execution across pipelines."""
     
-    def __init__(self, enabled: bool = True, db_path: Optional[Path] = None):
+    def __init__(self, enabled: bool = True, db_path: Optional[Path] = None,
+                 write_behind: Optional[bool] = None):
         """Initialize job tracker.
         
         Args:
             enabled: Whether tracking is enabled
             db_path: Optional path to database file
+            write_behind: Queue status, output-path and progress updates and write
+                them in batches. If None, read from AUTOTRAINX_TRACKER_WRITE_BEHIND.
         """
         self.enabled = enabled
         self.db_manager = None
+        self._metrics_writer = None
+        self._status_queue = None
+        self._job_kinds: Dict[str, str] = {}  # job_id -> 'execution' | 'variation'
         
         if self.enabled:
             try:
@@ -34,12 +46,41 @@ class JobTracker:
             except Exception as e:
                 logger.warning(f"Failed to initialize job tracking: {e}")
                 self.enabled = False
+        
+        if write_behind is None:
+            write_behind = os.environ.get(WRITE_BEHIND_ENV, 'false').lower() == 'true'
+        if write_behind and self.is_enabled:
+            from src.database.status_queue import JobStatusQueue
+            self._status_queue = JobStatusQueue(self.db_manager, job_kinds=self._job_kinds)
+            atexit.register(self.flush)
     
     @property
     def is_enabled(self) -> bool:
         """Check if tracking is enabled and functional."""
         return self.enabled and self.db_manager is not None
     
+    @property
+    def write_behind(self) -> bool:
+        """Check if updates are queued and written in batches."""
+        return self._status_queue is not None
+    
+    def _job_kind(self, job_id: str) -> Optional[str]:
+        """Get whether a job is an execution or a variation.
+        
+        Jobs created through this tracker are known without a query; others
+        are looked up once and cached.
+        """
+        kind = self._job_kinds.get(job_id)
+        if kind is None:
+            if self.db_manager.get_variation(job_id):
+                kind = 'variation'
+            elif self.db_manager.get_execution(job_id):
+                kind = 'execution'
+            else:
+                return None
+            self._job_kinds[job_id] = kind
+        return kind
+    
     # ===== Single/Batch Execution Tracking =====
     
     def create_execution(self, job_id: str, pipeline_mode: str,
@@ -68,6 +109,7 @@ class JobTracker:
                 preset=preset,
                 total_steps=total_steps
             )
+            self._job_kinds[job_id] = 'execution'
             logger.debug(f"Created execution record for job {job_id}")
             return True
         except Exception as e:
@@ -84,22 +126,27 @@ class JobTracker:
             error_message: Error message if failed
             
         Returns:
-            True if updated successfully
+            True if updated (or queued) successfully
         """
         if not self.is_enabled:
             return False
         
+        if self._status_queue is not None:
+            self._status_queue.put(job_id, self._job_kinds.get(job_id),
+                                   status=status, error_message=error_message)
+            return True
+        
         try:
-            # Check if it's a variation first to avoid unnecessary warnings
-            if self.db_manager.get_variation(job_id):
+            kind = self._job_kind(job_id)
+            if kind == 'variation':
                 return self.db_manager.update_variation_status(
                     job_id, status, error_message
                 )
-            else:
-                # Try as execution
+            elif kind == 'execution':
                 return self.db_manager.update_execution_status(
                     job_id, status, error_message
                 )
+            return False
         except Exception as e:
             logger.error(f"Failed to update status: {e}")
             return False
@@ -112,22 +159,83 @@ class JobTracker:
             output_path: Path to output model
             
         Returns:
-            True if updated successfully
+            True if updated (or queued) successfully
         """
         if not self.is_enabled:
             return False
         
+        if self._status_queue is not None:
+            self._status_queue.put(job_id, self._job_kinds.get(job_id), output_path=output_path)
+            return True
+        
         try:
-            # Check if it's a variation first to avoid unnecessary warnings
-            if self.db_manager.get_variation(job_id):
+            kind = self._job_kind(job_id)
+            if kind == 'variation':
                 return self.db_manager.set_variation_output(job_id, output_path)
-            else:
-                # Try as execution
+            elif kind == 'execution':
                 return self.db_manager.set_execution_output(job_id, output_path)
+            return False
         except Exception as e:
             logger.error(f"Failed to set output path: {e}")
             return False
     
+    def set_total_steps(self, job_id: str, total_steps: int) -> bool:
+        """Record the total training steps of a job once they are known.
+        
+        Args:
+            job_id: Job identifier
+            total_steps: Total optimization steps
+            
+        Returns:
+            True if updated (or queued) successfully
+        """
+        if not self.is_enabled:
+            return False
+        
+        if self._status_queue is not None:
+            self._status_queue.put(job_id, self._job_kinds.get(job_id), total_steps=total_steps)
+            return True
+        
+        try:
+            from src.database.status_queue import JOB_MODELS
+            kind = self._job_kind(job_id)
+            if kind is None:
+                return False
+            model = JOB_MODELS[kind]
+            with self.db_manager.get_session() as session:
+                updated = session.query(model).filter(model.job_id == job_id).update(
+                    {'total_steps': total_steps}, synchronize_session=False
+                )
+                session.commit()
+            return updated > 0
+        except Exception as e:
+            logger.error(f"Failed to set total steps: {e}")
+            return False
+    
+    def flush(self) -> int:
+        """Write queued status updates and training metrics now.
+        
+        Called synchronously on shutdown so no update is lost.
+        
+        Returns:
+            Number of job rows updated
+        """
+        written = 0
+        if self._status_queue is not None:
+            written = self._status_queue.flush()
+        self.flush_metrics()
+        return written
+    
+    def close(self) -> None:
+        """Stop the write-behind threads and write everything still pending."""
+        if self._status_queue is not None:
+            self._status_queue.close()
+            atexit.unregister(self.flush)
+            self._status_queue = None
+        if self._metrics_writer is not None:
+            self._metrics_writer.close()
+            self._metrics_writer = None
+    
     # ===== Variation Execution Tracking =====
     
     def create_variation(self, job_id: str, variation_id: str,
@@ -169,12 +277,59 @@ class JobTracker:
                 parameter_values=parameter_values,
                 parent_experiment_id=parent_experiment_id
             )
+            self._job_kinds[job_id] = 'variation'
             logger.debug(f"Created variation record for job {job_id}")
             return True
         except Exception as e:
             logger.error(f"Failed to create variation record: {e}")
             return False
     
+    # ===== Training Metrics =====
+    
+    def _get_metrics_writer(self):
+        """Get the shared batched metrics writer (None if unsupported)."""
+        if self._metrics_writer is None and self.is_enabled:
+            dialect = getattr(self.db_manager, 'dialect', None)
+            if dialect is None:
+                return None
+            from src.database.metrics_writer import TrainingMetricsWriter
+            self._metrics_writer = TrainingMetricsWriter(self.db_manager.engine, dialect)
+        return self._metrics_writer
+    
+    def record_metrics(self, job_id: str, record: Dict[str, Any]) -> None:
+        """Queue one training step's metrics for the next batched write.
+        
+        Args:
+            job_id: Job identifier
+            record: Step metrics (step, epoch, loss, lr, it_per_sec, time)
+        """
+        writer = self._get_metrics_writer()
+        if writer is not None:
+            writer.add(job_id, record)
+    
+    def metrics_recorder(self, job_id: Optional[str]) -> Optional[Callable[[Dict[str, Any]], None]]:
+        """Get a callback recording step metrics for a job.
+        
+        Args:
+            job_id: Job identifier
+            
+        Returns:
+            Callable taking one step record, or None if metrics cannot be stored
+        """
+        if not job_id or self._get_metrics_writer() is None:
+            return None
+        return functools.partial(self.record_metrics, job_id)
+    
+    def flush_metrics(self) -> int:
+        """Write queued training metrics now.
+        
+        Returns:
+            Number of rows written
+        """
+        if self._metrics_writer is None:
+            return 0
+        return self._metrics_writer.flush()
+    
     # ===== Context Managers =====
     
     @contextmanager
@@ -224,6 +379,7 @@ class JobTracker:
             raise
     
     # ===== Query Methods =====
+    # Queued updates are written first so queries see them
     
     def get_job_info(self, job_id: str) -> Optional[Dict[str, Any]]:
         """Get job information by ID.
@@ -238,6 +394,8 @@ class JobTracker:
             return None
         
         try:
+            if self._status_queue is not None:
+                self._status_queue.flush()
             # Try as execution first
             execution = self.db_manager.get_execution(job_id)
             if execution:
@@ -266,14 +424,34 @@ class JobTracker:
         Returns:
             List of job dictionaries
         """
+        return self.list_jobs(limit)[0]
+    
+    def list_jobs(self, limit: int = 20, status: Optional[str] = None,
+                  dataset_name: Optional[str] = None,
+                  cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Get one page of jobs, newest first, filtered by the database.
+        
+        Args:
+            limit: Maximum number of jobs
+            status: Only jobs with this status
+            dataset_name: Only jobs of this dataset
+            cursor: Cursor returned with the previous page
+            
+        Returns:
+            Tuple of (job dictionaries, cursor of the next page or None)
+        """
         if not self.is_enabled:
-            return []
+            return [], None
         
         try:
-            return self.db_manager.get_all_jobs(limit)
+            if self._status_queue is not None:
+                self._status_queue.flush()
+            return self.db_manager.list_jobs(limit, status, dataset_name, cursor)
+        except ValueError:
+            raise  # Malformed cursor
         except Exception as e:
             logger.error(f"Failed to get recent jobs: {e}")
-            return []
+            return [], None
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get execution statistics.
@@ -285,6 +463,8 @@ class JobTracker:
             return {}
         
         try:
+            if self._status_queue is not None:
+                self._status_queue.flush()
             return self.db_manager.get_statistics()
         except Exception as e:
             logger.error(f"Failed to get statistics: {e}")
@@ -295,15 +475,17 @@ class JobTracker:
 _tracker: Optional[JobTracker] = None
 
 
-def initialize_tracker(enabled: bool = True, db_path: Optional[Path] = None):
+def initialize_tracker(enabled: bool = True, db_path: Optional[Path] = None,
+                       write_behind: Optional[bool] = None):
     """Initialize global job tracker.
     
     Args:
         enabled: Whether tracking is enabled
         db_path: Optional path to database file
+        write_behind: Queue updates and write them in batches (see JobTracker)
     """
     global _tracker
-    _tracker = JobTracker(enabled, db_path)
+    _tracker = JobTracker(enabled, db_path, write_behind)
 
 
 def get_tracker() -> JobTracker:
@@ -315,4 +497,12 @@ def get_tracker() -> JobTracker:
     global _tracker
     if _tracker is None:
         _tracker = JobTracker()
-    return _tracker
\ No newline at end of file
+    return _tracker
+
+
+def reset_tracker() -> None:
+    """Close and drop the global job tracker; the next get_tracker() creates a new one."""
+    global _tracker
+    if _tracker is not None:
+        _tracker.close()
+        _tracker = None
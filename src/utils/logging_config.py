@@ -263,6 +263,21 @@ def get_logging_manager(base_path: Optional[str] = None) -> LoggingManager:
     return _logging_manager
 
 
+def reset_logging() -> None:
+    """Close the root handlers and drop the global logging manager.
+    
+    For processes that run several commands (job-runner workers): the next
+    setup_logging() call starts a new execution log instead of appending to
+    the previous command's one.
+    """
+    global _logging_manager
+    root_logger = logging.getLogger()
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+        handler.close()
+    _logging_manager = None
+
+
 def setup_logging(log_level: str = None,
                  console: bool = True,
                  file: bool = True,
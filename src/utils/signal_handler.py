@@ -413,6 +413,13 @@ class GracefulShutdownHandler:
         logger.debug(f"Current dataset: {self.current_dataset}")
         logger.debug(f"Current preset: {self.current_preset}")
         
+        # Write queued status updates first so the query below sees them
+        try:
+            from ..utils.job_tracker import get_tracker
+            get_tracker().flush()
+        except Exception as e:
+            logger.debug(f"Error flushing queued job updates: {e}")
+        
         # Find all active jobs to cancel
         status_msg = "Finding active jobs to cancel..."
         print(f"• {status_msg:<50} ", end="", flush=True)
@@ -501,14 +508,8 @@ class GracefulShutdownHandler:
                         monitor._cleanup_process_files(job['job_id'])
                         cancelled_count += 1
                 
-                # Force a sync to ensure all updates are written
-                try:
-                    with quiet_database_operations():
-                        db = DatabaseManager()
-                    with db.get_session() as session:
-                        session.commit()
-                except:
-                    pass
+                # Write the cancellations synchronously before exiting
+                tracker.flush()
                 
                 if cancelled_count == len(jobs_to_cancel):
                     print("\033[92m✓\033[0m")
@@ -0,0 +1,238 @@
+"""
+Thumbnail generation with a content-addressed on-disk cache.
+
+Thumbnails are rendered at a few fixed sizes in a process pool and stored
+under ``workspace/.cache/thumbnails``. The cache key is derived from the
+source path, mtime and size plus the requested size and format, so a
+changed source naturally maps to a new entry and the key doubles as a
+strong ETag.
+
+Usage:
+    service = get_thumbnail_service()
+    thumb_path, etag = service.get_thumbnail(image_path, size=256)
+    service.prewarm(image_paths)
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_SIZES = (128, 256, 512)
+DEFAULT_THUMBNAIL_SIZE = 256
+THUMBNAIL_FORMATS = {
+    'webp': ('WEBP', 'image/webp'),
+    'jpeg': ('JPEG', 'image/jpeg'),
+}
+
+
+def _render_thumbnail(source: str, destination: str, size: int, fmt: str) -> str:
+    """Render one thumbnail (runs in a worker process)."""
+    from PIL import Image, ImageOps
+
+    pil_format = THUMBNAIL_FORMATS[fmt][0]
+    with Image.open(source) as img:
+        # JPEG sources can be decoded at a reduced scale directly
+        img.draft('RGB', (size, size))
+        img = ImageOps.exif_transpose(img)
+        img.thumbnail((size, size), Image.LANCZOS)
+        if pil_format == 'JPEG' and img.mode not in ('RGB', 'L'):
+            img = img.convert('RGB')
+        elif img.mode not in ('RGB', 'RGBA', 'L'):
+            img = img.convert('RGBA')
+
+        save_kwargs = {'quality': 82}
+        if pil_format == 'WEBP':
+            save_kwargs['method'] = 4
+        else:
+            save_kwargs['optimize'] = True
+
+        tmp_path = f"{destination}.{os.getpid()}.tmp"
+        try:
+            img.save(tmp_path, pil_format, **save_kwargs)
+            os.replace(tmp_path, destination)
+        except BaseException:
+            # Never leave a partial rendition behind in the cache
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+    return destination
+
+
+def _log_render_failure(future: Future) -> None:
+    """Log a failed background render (prewarm without wait)."""
+    if not future.cancelled() and future.exception() is not None:
+        logger.warning(f"Thumbnail generation failed: {future.exception()}")
+
+
+class ThumbnailService:
+    """Generates and caches thumbnails for dataset and preview images."""
+
+    def __init__(self, cache_dir: Union[str, Path], max_workers: Optional[int] = None):
+        """
+        Initialize the thumbnail service.
+
+        Args:
+            cache_dir: Directory for cached thumbnails
+            max_workers: Worker processes (default: min(4, cpu count))
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize_size(size: int) -> int:
+        """Snap a requested size to the nearest supported thumbnail size."""
+        return min(THUMBNAIL_SIZES, key=lambda candidate: abs(candidate - size))
+
+    def cache_key(self, source: Union[str, Path], size: int, fmt: str = 'webp') -> str:
+        """
+        Build the content-addressed key for a thumbnail.
+
+        Args:
+            source: Source image path
+            size: Thumbnail size (longest edge)
+            fmt: 'webp' or 'jpeg'
+
+        Returns:
+            Hex digest identifying the source version and rendition
+        """
+        source = Path(source).resolve()
+        stat = source.stat()
+        identity = f"{source}|{stat.st_mtime_ns}|{stat.st_size}|{size}|{fmt}"
+        return hashlib.sha1(identity.encode('utf-8')).hexdigest()
+
+    def _cache_path(self, key: str, fmt: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.{fmt}"
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def _submit(self, source: Union[str, Path], size: int, fmt: str) -> Tuple[Path, str, Optional[Future]]:
+        """Return (path, key, future); future is None when the thumbnail is cached."""
+        if fmt not in THUMBNAIL_FORMATS:
+            raise ValueError(f"Unsupported thumbnail format: {fmt}")
+        size = self.normalize_size(size)
+        key = self.cache_key(source, size, fmt)
+        path = self._cache_path(key, fmt)
+        if path.exists():
+            return path, key, None
+
+        with self._lock:
+            future = self._pending.get(key)
+            if future is None:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                future = self._get_executor().submit(
+                    _render_thumbnail, str(source), str(path), size, fmt)
+                self._pending[key] = future
+                future.add_done_callback(lambda _, key=key: self._pending.pop(key, None))
+        return path, key, future
+
+    def get_thumbnail(self, source: Union[str, Path], size: int = DEFAULT_THUMBNAIL_SIZE,
+                      fmt: str = 'webp') -> Tuple[Path, str]:
+        """
+        Get a thumbnail, rendering it if needed.
+
+        Args:
+            source: Source image path
+            size: Requested size (snapped to THUMBNAIL_SIZES)
+            fmt: 'webp' or 'jpeg'
+
+        Returns:
+            Tuple of (thumbnail path, etag)
+        """
+        path, key, future = self._submit(source, size, fmt)
+        if future is not None:
+            future.result()
+        return path, key
+
+    async def aget_thumbnail(self, source: Union[str, Path], size: int = DEFAULT_THUMBNAIL_SIZE,
+                             fmt: str = 'webp') -> Tuple[Path, str]:
+        """Async variant of get_thumbnail that does not block the event loop."""
+        path, key, future = self._submit(source, size, fmt)
+        if future is not None:
+            await asyncio.wrap_future(future)
+        return path, key
+
+    def prewarm(self, sources: Iterable[Union[str, Path]], sizes: Iterable[int] = (DEFAULT_THUMBNAIL_SIZE,),
+                fmt: str = 'webp', wait: bool = True) -> int:
+        """
+        Render thumbnails ahead of the first request.
+
+        Args:
+            sources: Source image paths
+            sizes: Sizes to render
+            fmt: 'webp' or 'jpeg'
+            wait: Block until all thumbnails are rendered
+
+        Returns:
+            Number of thumbnails that had to be rendered
+        """
+        futures = []
+        for source in sources:
+            for size in sizes:
+                try:
+                    _, _, future = self._submit(source, size, fmt)
+                except (OSError, ValueError) as e:
+                    logger.debug(f"Skipping thumbnail for {source}: {e}")
+                    continue
+                if future is not None:
+                    futures.append(future)
+
+        if wait:
+            for future in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.warning(f"Thumbnail generation failed: {e}")
+        else:
+            for future in futures:
+                future.add_done_callback(_log_render_failure)
+        return len(futures)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+_thumbnail_service: Optional[ThumbnailService] = None
+
+
+def get_thumbnail_service(base_path: Optional[str] = None) -> ThumbnailService:
+    """
+    Get the global thumbnail service.
+
+    Args:
+        base_path: Project base path (used on first call only)
+
+    Returns:
+        ThumbnailService instance
+    """
+    global _thumbnail_service
+    if _thumbnail_service is None:
+        cache_dir = os.getenv('AUTOTRAINX_THUMBNAIL_CACHE') or \
+            Config.get_workspace_path(base_path) / ".cache" / "thumbnails"
+        _thumbnail_service = ThumbnailService(cache_dir)
+    return _thumbnail_service
+
+
+def shutdown_thumbnail_service() -> None:
+    """Stop the global thumbnail service's worker processes, if started."""
+    if _thumbnail_service is not None:
+        _thumbnail_service.shutdown()
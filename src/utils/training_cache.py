@@ -0,0 +1,169 @@
+"""
+Shared latents and text-encoder outputs cache.
+
+sd-scripts caches VAE latents and text-encoder outputs as ``.npz`` files.
+Configs generated by AutoTrainX set ``shared_cache_dir`` so those files live
+in one workspace-level, content-addressed directory
+(``workspace/.cache/training``) instead of next to each job's images. Every
+job and variation that trains on the same images with the same models then
+reuses them. The lookup side lives in ``sd-scripts/library/shared_cache.py``.
+
+Layout:
+    latents/<xx>/<digest>_<W>x<H>_<suffix>.npz
+    text_encoder/<xx>/<digest>_<suffix>.npz
+
+Entries are touched on every hit, so eviction removes the least recently
+used files first until the cache fits its size bound.
+
+Usage:
+    cache = get_training_cache()
+    cache.evict()
+    stats = cache.get_stats()
+"""
+
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+CACHE_KINDS = ('latents', 'text_encoder')
+
+# Entries used this recently may belong to a running job and are never evicted
+DEFAULT_MIN_IDLE_SECONDS = 3600
+# Temporary files left behind by an interrupted write
+STALE_TEMP_SECONDS = 6 * 3600
+
+
+class TrainingCache:
+    """Size-bounded LRU view of the shared training cache directory."""
+
+    def __init__(self, cache_dir: Path, max_bytes: int,
+                 min_idle_seconds: float = DEFAULT_MIN_IDLE_SECONDS):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Cache root directory
+            max_bytes: Size bound enforced by evict()
+            min_idle_seconds: Entries used more recently are kept even when
+                the cache is over its bound
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.min_idle_seconds = min_idle_seconds
+
+    def _scan(self) -> List[Tuple[str, Path, int, float]]:
+        """List (kind, path, size, last used) for every entry."""
+        entries = []
+        for kind in CACHE_KINDS:
+            root = self.cache_dir / kind
+            if not root.is_dir():
+                continue
+            for shard in os.scandir(root):
+                if not shard.is_dir():
+                    continue
+                for entry in os.scandir(shard.path):
+                    if entry.is_file():
+                        stat = entry.stat()
+                        entries.append((kind, Path(entry.path), stat.st_size, stat.st_mtime))
+        return entries
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with path, max_bytes, total entries and bytes, and
+            entries / bytes / oldest / newest use per kind
+        """
+        now = time.time()
+        kinds = {kind: {'entries': 0, 'bytes': 0, 'oldest_use_seconds': None, 'newest_use_seconds': None}
+                 for kind in CACHE_KINDS}
+        for kind, path, size, used in self._scan():
+            if path.name.endswith('.tmp.npz'):
+                continue
+            stats = kinds[kind]
+            stats['entries'] += 1
+            stats['bytes'] += size
+            age = round(now - used, 1)
+            stats['oldest_use_seconds'] = max(age, stats['oldest_use_seconds'] or 0.0)
+            stats['newest_use_seconds'] = age if stats['newest_use_seconds'] is None \
+                else min(age, stats['newest_use_seconds'])
+        return {
+            'path': str(self.cache_dir),
+            'max_bytes': self.max_bytes,
+            'entries': sum(stats['entries'] for stats in kinds.values()),
+            'bytes': sum(stats['bytes'] for stats in kinds.values()),
+            'kinds': kinds,
+        }
+
+    def evict(self) -> Dict[str, int]:
+        """
+        Remove least recently used entries until the cache fits max_bytes.
+
+        Also removes temporary files left by interrupted writes.
+
+        Returns:
+            Dictionary with removed entries and freed bytes
+        """
+        now = time.time()
+        removed, freed = 0, 0
+        entries = []
+        for kind, path, size, used in self._scan():
+            if path.name.endswith('.tmp.npz'):
+                if now - used > STALE_TEMP_SECONDS:
+                    freed += self._remove(path, size)
+                continue
+            entries.append((used, path, size))
+
+        total = sum(size for _, _, size in entries)
+        for used, path, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if now - used < self.min_idle_seconds:
+                logger.warning(f"Training cache over its bound by {total - self.max_bytes} bytes, "
+                               f"but every remaining entry is in recent use")
+                break
+            freed_bytes = self._remove(path, size)
+            if freed_bytes:
+                removed += 1
+                freed += freed_bytes
+                total -= size
+
+        if removed:
+            logger.info(f"Evicted {removed} training cache entries ({freed / 1024 ** 2:.1f} MB)")
+        return {'removed': removed, 'freed_bytes': freed}
+
+    @staticmethod
+    def _remove(path: Path, size: int) -> int:
+        try:
+            path.unlink()
+            return size
+        except OSError as e:
+            logger.debug(f"Could not remove {path}: {e}")
+            return 0
+
+
+def get_training_cache_dir(base_path: Optional[str] = None) -> Path:
+    """Get the shared training cache directory (AUTOTRAINX_TRAINING_CACHE overrides)."""
+    return Path(os.getenv('AUTOTRAINX_TRAINING_CACHE') or
+                Config.get_workspace_path(base_path) / ".cache" / "training")
+
+
+def get_training_cache(base_path: Optional[str] = None) -> TrainingCache:
+    """
+    Get the shared training cache for a project.
+
+    Args:
+        base_path: Project base path
+
+    Returns:
+        TrainingCache bounded by config.json training_cache_max_gb
+    """
+    max_bytes = int(Config.get_training_cache_max_gb(base_path) * 1024 ** 3)
+    return TrainingCache(get_training_cache_dir(base_path), max_bytes)
@@ -0,0 +1,149 @@
+"""Tests for the streaming bulk copy between job databases."""
+
+import csv
+import io
+from datetime import datetime
+
+from sqlalchemy import text
+
+from src.database.bulk_transfer import BulkTransfer, export_to_sqlite
+from src.database.dialects.postgresql import PostgreSQLDialect
+from src.database.enums import ExecutionStatus
+from src.database.factory import DatabaseConfig, DatabaseFactory
+from src.database.job_rollup import job_statistics
+from src.database.manager_v2 import DatabaseManager
+from src.database.models_v2 import Execution, Model, ModelPath, Variation
+
+
+def _fill(manager, executions):
+    with manager.get_session() as session:
+        session.bulk_insert_mappings(Execution, [{
+            'job_id': f"{i:08x}", 'status': 'done' if i % 2 else 'failed', 'pipeline_mode': 'single',
+            'dataset_name': 'cats', 'preset': 'FluxLORA', 'success': bool(i % 2),
+            'duration_seconds': 60.0, 'created_at': datetime(2024, 1, 1 + i % 28, 12),
+        } for i in range(executions)])
+        session.add(Variation(job_id='var00001', status='training', variation_id='v1',
+                              experiment_name='exp', dataset_name='cats', preset='FluxLORA',
+                              total_combinations=2, varied_parameters={'lr': [1, 2]},
+                              parameter_values={'lr': 1}, created_at=datetime(2024, 2, 1)))
+        session.add(ModelPath(id='p1', path='/models'))
+        session.add(Model(id='m1', name='cats', path='/models/cats.safetensors', type='.safetensors',
+                          size=1, path_id='p1', preview_images=['a.png'], model_metadata={'rank': 16}))
+        session.commit()
+
+
+def test_streams_tables_in_chunks_and_rebuilds_the_rollup(tmp_path):
+    source = DatabaseManager(DatabaseConfig(db_type='sqlite', db_path=tmp_path / 'source.db'))
+    _fill(source, 25)
+    progress = []
+
+    copied = export_to_sqlite(source.engine, tmp_path / 'export.db', chunk_size=10,
+                              progress=lambda *report: progress.append(report))
+
+    assert copied['executions'] == 25 and copied['variations'] == 1 and copied['models'] == 1
+    assert [report for report in progress if report[0] == 'executions'] == [
+        ('executions', 10, 25), ('executions', 20, 25), ('executions', 25, 25)]
+    target = DatabaseManager(DatabaseConfig(db_type='sqlite', db_path=tmp_path / 'export.db'))
+    with source.get_session() as session:
+        expected = job_statistics(session)
+    with target.get_session() as session:
+        assert job_statistics(session) == expected
+        variation = session.query(Variation).one()
+        model = session.query(Model).one()
+        assert variation.varied_parameters == {'lr': [1, 2]}
+        assert variation.created_at == datetime(2024, 2, 1)
+        assert (model.preview_images, model.model_metadata) == (['a.png'], {'rank': 16})
+
+    # The jobs triggers are back: later writes reach the rollup
+    target.update_variation_status('var00001', ExecutionStatus.DONE)
+    with target.get_session() as session:
+        assert job_statistics(session)['variation']['by_status'] == {'done': 1}
+
+    # Copying into a non-empty database upserts by primary key
+    with source.engine.begin() as connection:
+        connection.execute(text("UPDATE executions SET status = 'cancelled' WHERE job_id = '00000000'"))
+    BulkTransfer(source.engine, target.engine, chunk_size=10, progress=lambda *report: None).run()
+    with target.get_session() as session:
+        assert session.query(Execution).count() == 25
+        assert session.get(Execution, '00000000').status == 'cancelled'
+
+
+def test_reads_legacy_model_metadata_column(tmp_path):
+    source_engine = DatabaseFactory.create_engine(DatabaseConfig(db_type='sqlite', db_path=tmp_path / 'old.db'))
+    with source_engine.begin() as connection:
+        connection.execute(text("CREATE TABLE model_paths (id TEXT PRIMARY KEY, path TEXT)"))
+        connection.execute(text("CREATE TABLE models (id TEXT PRIMARY KEY, name TEXT, path TEXT, "
+                                "type TEXT, size INTEGER, path_id TEXT, metadata TEXT)"))
+        connection.execute(text("INSERT INTO model_paths VALUES ('p1', '/models')"))
+        connection.execute(text("INSERT INTO models VALUES ('m1', 'cats', '/models/cats.ckpt', '.ckpt', 1, "
+                                "'p1', '{\"rank\": 8}')"))
+
+    export_to_sqlite(source_engine, tmp_path / 'new.db', progress=lambda *report: None)
+
+    target = DatabaseManager(DatabaseConfig(db_type='sqlite', db_path=tmp_path / 'new.db'))
+    with target.get_session() as session:
+        assert session.query(Model).one().model_metadata == {'rank': 8}
+
+
+class _CopyCursor:
+    def __init__(self, copies):
+        self.copies = copies
+
+    def copy_expert(self, sql, buffer):
+        self.copies.append((sql, buffer.read()))
+
+    def close(self):
+        pass
+
+
+class _CopyConnection:
+    """Stands in for a psycopg2 connection: records statements and COPY payloads."""
+
+    def __init__(self):
+        self.statements = []
+        self.copies = []
+        self.connection = self
+
+    def cursor(self):
+        return _CopyCursor(self.copies)
+
+    def execute(self, statement):
+        self.statements.append(str(statement))
+
+
+def test_postgresql_copy_escapes_csv_fields():
+    connection = _CopyConnection()
+    rows = [
+        ('a', None, '', 'x,y', 'say "hi"', 'two\nlines', {'k': 'v, "w"'}, datetime(2024, 1, 2, 3, 4), True, 1.5),
+        ('b', None, None, None, None, None, None, None, None, None),
+    ]
+    columns = ['job_id', 'error', 'stage', 'dataset_name', 'preset', 'output', 'params', 'created_at',
+               'success', 'duration']
+
+    assert PostgreSQLDialect().copy_rows(connection, 'executions', columns, rows) == 2
+
+    [(sql, payload)] = connection.copies
+    assert sql == f"COPY executions ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+    # NULL is an unquoted empty field, the empty string a quoted one
+    assert payload.startswith('"a",,"",')
+    assert payload.endswith('"b",,,,,,,,,\n')
+    first, second = csv.reader(io.StringIO(payload))
+    assert first == ['a', '', '', 'x,y', 'say "hi"', 'two\nlines', '{"k": "v, \\"w\\""}',
+                     '2024-01-02T03:04:00', 'True', '1.5']
+    assert second == ['b'] + [''] * 9
+
+
+def test_postgresql_bulk_upsert_copies_into_staging():
+    connection = _CopyConnection()
+
+    PostgreSQLDialect().bulk_upsert(connection, 'executions', ['job_id', 'status'], ['job_id'],
+                                    [('a', 'done'), ('a', 'failed, twice')])
+
+    [(sql, payload)] = connection.copies
+    assert sql.startswith('COPY executions_staging (job_id, status) FROM STDIN')
+    assert payload == '"a","done"\n"a","failed, twice"\n'
+    create, truncate, upsert = connection.statements
+    assert 'CREATE TEMP TABLE IF NOT EXISTS executions_staging' in create
+    assert truncate == 'TRUNCATE executions_staging'
+    assert 'SELECT DISTINCT ON (job_id) job_id, status FROM executions_staging' in upsert
+    assert 'ON CONFLICT (job_id) DO UPDATE' in upsert
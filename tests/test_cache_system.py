@@ -0,0 +1,93 @@
+"""Tests for the in-process LRU/TTL cache and the cached decorator."""
+
+import asyncio
+import json
+import os
+
+from src.utils import cache_system
+from src.utils.cache_system import CacheManager, MemoryCache, cached
+
+
+def test_lru_eviction_and_namespace_counters():
+    cache = MemoryCache(max_size=2)
+    cache.set_sync("a:1", 1)
+    cache.set_sync("a:2", 2)
+    assert cache.get_sync("a:1") == 1   # a:1 becomes most recently used
+    cache.set_sync("b:3", 3)            # evicts a:2
+
+    assert cache.get_sync("a:2") is None
+    assert cache.get_sync("a:1") == 1
+    stats = cache.get_stats()
+    assert stats['entries'] == 2
+    assert stats['namespaces']['a'] == {
+        'hits': 2, 'misses': 1, 'sets': 2, 'evictions': 1, 'expirations': 0, 'hit_rate': 0.6667
+    }
+    assert stats['namespaces']['b']['sets'] == 1
+
+
+def test_ttl_uses_monotonic_clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache_system.time, 'monotonic', lambda: now[0])
+    cache = MemoryCache()
+    cache.set_sync("job_status:x", "running", ttl=5)
+    assert cache.get_sync("job_status:x") == "running"
+    now[0] += 5
+    assert cache.get_sync("job_status:x") is None
+    assert cache.get_stats()['namespaces']['job_status']['expirations'] == 1
+    assert len(cache) == 0
+
+
+def test_byte_bound_evicts_oldest():
+    cache = MemoryCache(max_size=100, max_bytes=10, sizeof=len)
+    cache.set_sync("k:1", "aaaa")
+    cache.set_sync("k:2", "bbbb")
+    cache.set_sync("k:3", "cccc")
+    assert cache.get_sync("k:1") is None
+    assert cache.get_stats()['bytes'] == 8
+    assert not cache.set_sync("k:big", "x" * 11)
+
+
+def test_cached_decorator_sync_and_methods(monkeypatch):
+    monkeypatch.setattr(cache_system, 'cache_manager', CacheManager(MemoryCache()))
+    calls = []
+
+    @cached(ttl=60, key_prefix="lookup")
+    def lookup(name):
+        calls.append(name)
+        return name.upper()
+
+    class Service:
+        @cached(ttl=60, key_prefix="service")
+        async def fetch(self, job_id):
+            calls.append(job_id)
+            return {'job_id': job_id}
+
+    assert lookup("x") == lookup("x") == "X"
+    # Different instances share entries for the same arguments
+    assert asyncio.run(Service().fetch("j1")) == asyncio.run(Service().fetch("j1"))
+    assert calls == ["x", "j1"]
+    namespaces = cache_system.cache_manager.primary.get_stats()['namespaces']
+    assert namespaces['lookup']['hits'] == 1
+    assert namespaces['service']['hits'] == 1
+
+
+def _write_safetensors(path, metadata):
+    header = json.dumps({'__metadata__': metadata}).encode()
+    path.write_bytes(len(header).to_bytes(8, 'little') + header)
+
+
+def test_model_info_is_cached_per_file_version(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_system, 'cache_manager', CacheManager(MemoryCache()))
+    model = tmp_path / 'cats.safetensors'
+    _write_safetensors(model, {'ss_network_dim': '16'})
+
+    first = cache_system.get_model_info(str(model))
+    assert cache_system.get_model_info(str(model)) == first
+    assert (first['name'], first['format'], first['metadata']) == ('cats', 'safetensors', {'ss_network_dim': '16'})
+    assert cache_system.cache_manager.primary.get_stats()['namespaces']['model_info']['hits'] == 1
+
+    # A rewritten file is a new cache entry
+    _write_safetensors(model, {'ss_network_dim': '32'})
+    os.utime(model, (first['modified'] + 10, first['modified'] + 10))
+    assert cache_system.get_model_info(str(model))['metadata'] == {'ss_network_dim': '32'}
+    assert cache_system.get_model_info(str(tmp_path / 'missing.safetensors')) is None
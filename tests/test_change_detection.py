@@ -0,0 +1,91 @@
+"""Tests for job table change detection and the Sheets watcher's retry of failed syncs."""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.database.change_detection import (
+    AggregateProbeDetector, ChangeSet, SQLiteDataVersionDetector
+)
+from src.database.factory import DatabaseConfig
+from src.database.manager_v2 import DatabaseManager
+from src.sheets_sync import db_watcher_v2
+from src.sheets_sync.integration import SyncResult
+
+
+@pytest.fixture
+def databases(tmp_path):
+    db_path = tmp_path / 'jobs.db'
+    manager = DatabaseManager(DatabaseConfig(db_type='sqlite', db_path=db_path))
+    manager.create_execution('exec0001', 'single', 'ds', 'FluxLORA')
+    # Commits from another process look like commits from another engine
+    writer = create_engine(f"sqlite:///{db_path}")
+    yield manager, writer
+    writer.dispose()
+
+
+@pytest.mark.parametrize('detector_class', [SQLiteDataVersionDetector, AggregateProbeDetector])
+def test_detects_commits_from_another_connection(databases, detector_class):
+    manager, writer = databases
+    detector = detector_class(manager.engine)
+    detector.start()
+    try:
+        assert detector.poll() is None
+
+        with writer.begin() as conn:
+            conn.execute(text("UPDATE executions SET status = 'training', updated_at = :now "
+                              "WHERE job_id = 'exec0001'"), {'now': datetime(2030, 1, 1)})
+
+        assert detector.poll() == ChangeSet()
+        assert detector.poll() is None
+    finally:
+        detector.close()
+
+
+def test_failed_sync_keeps_notified_job_ids(tmp_path, monkeypatch):
+    calls = []
+    results = [SyncResult(False, 'quota exceeded'), SyncResult(True, 'ok'), SyncResult(True, 'ok')]
+
+    async def fake_incremental_sync(base_path, job_ids=None, db_manager=None):
+        calls.append(job_ids)
+        return results.pop(0)
+
+    monkeypatch.setattr(db_watcher_v2, 'incremental_sync', fake_incremental_sync)
+    watcher = db_watcher_v2.DatabaseWatcher(str(tmp_path))
+
+    async def scenario():
+        await watcher._handle_db_change(ChangeSet({'executions': {'a'}}))
+        await watcher._handle_db_change(ChangeSet({'executions': {'b'}, 'variations': {'v'}}))
+        await watcher._handle_db_change(ChangeSet({'executions': {'c'}}))
+
+    asyncio.run(scenario())
+
+    assert calls == [
+        {'executions': {'a'}},
+        {'executions': {'a', 'b'}, 'variations': {'v'}},
+        {'executions': {'c'}},
+    ]
+    assert watcher._failed_changes is None
+
+
+def test_failed_watermark_sync_is_retried_as_watermark_sync(tmp_path, monkeypatch):
+    calls = []
+
+    async def failing_incremental_sync(base_path, job_ids=None, db_manager=None):
+        calls.append(job_ids)
+        raise ConnectionError('network down')
+
+    monkeypatch.setattr(db_watcher_v2, 'incremental_sync', failing_incremental_sync)
+    watcher = db_watcher_v2.DatabaseWatcher(str(tmp_path))
+
+    async def scenario():
+        await watcher._handle_db_change()
+        await watcher._handle_db_change(ChangeSet({'executions': {'a'}}))
+
+    asyncio.run(scenario())
+
+    # Unknown changes win, so the retry syncs everything past the watermark
+    assert calls == [None, None]
+    assert watcher._failed_changes == ChangeSet()
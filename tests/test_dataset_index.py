@@ -0,0 +1,51 @@
+"""Tests for the persistent dataset metadata index."""
+
+import os
+
+from PIL import Image
+
+from src.utils.dataset_index import DatasetIndex, probe_image_size
+
+
+def make_dataset(path):
+    Image.new('RGB', (123, 45)).save(path / 'a.png')
+    Image.new('RGB', (64, 32)).save(path / 'b.jpg', progressive=True)
+    Image.new('RGB', (77, 11)).save(path / 'c.webp', lossless=True)
+    (path / 'a.txt').write_text('a person')
+    (path / 'c.txt').write_text('')
+
+
+def test_probe_matches_pil_dimensions(tmp_path):
+    make_dataset(tmp_path)
+    for name in ('a.png', 'b.jpg', 'c.webp'):
+        with Image.open(tmp_path / name) as img:
+            assert probe_image_size(tmp_path / name) == img.size
+
+
+def test_refresh_is_incremental_and_persisted(tmp_path):
+    make_dataset(tmp_path)
+    index = DatasetIndex(tmp_path)
+
+    assert index.refresh() == 3
+    assert index.get('a.png')['caption'] == 'a person'
+    assert index.refresh() == 0
+
+    # A fresh process reloads the sidecar instead of re-probing
+    assert DatasetIndex(tmp_path).refresh() == 0
+
+    caption = tmp_path / 'b.txt'
+    caption.write_text('new caption')
+    os.remove(tmp_path / 'c.webp')
+
+    assert index.refresh() == 2
+    assert index.get('b.jpg')['caption'] == 'new caption'
+    assert index.get('c.webp') is None
+
+
+def test_caption_pairs_skip_empty_captions(tmp_path):
+    make_dataset(tmp_path)
+    index = DatasetIndex(tmp_path)
+    index.refresh()
+
+    assert index.caption_pairs() == [(tmp_path / 'a.png', tmp_path / 'a.txt')]
+    assert index.summary()['images_with_captions'] == 2
@@ -0,0 +1,74 @@
+"""Tests for the single-pass dataset scanner and its mtime-validated cache."""
+
+import os
+
+import pytest
+
+from src.utils import dataset_scanner as scanner_module
+from src.utils.dataset_scanner import DatasetScanner
+
+
+def _dataset(path, images=2, captions=None, empty_caption=None):
+    path.mkdir(parents=True)
+    for i in range(images):
+        (path / f"img{i}.PNG" if i == 0 else path / f"img{i}.jpg").write_bytes(b"image")
+    for i in range(images if captions is None else captions):
+        (path / f"img{i}.txt").write_text("" if i == empty_caption else f"caption {i}")
+    return path
+
+
+def _age(path, seconds=10):
+    """Move a directory's mtime into the past so its listing is cacheable."""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - seconds * 10 ** 9))
+
+
+def test_list_directory_pairs_in_one_pass(tmp_path):
+    dataset = _dataset(tmp_path / "a", images=3, captions=2)
+    (dataset / ".cache").mkdir()
+    (dataset / "notes.md").write_text("ignored")
+
+    listing = DatasetScanner().list_directory(dataset)
+
+    assert listing.images == ['img0.PNG', 'img1.jpg', 'img2.jpg']
+    assert listing.caption_count == 2 and listing.subdirs == []
+    assert [image.name for image, _ in listing.pairs()] == ['img0.PNG', 'img1.jpg']
+    assert listing.pairs()[0][1] == dataset / "img0.txt"
+
+
+def test_caption_pairs_skip_empty_captions(tmp_path):
+    dataset = _dataset(tmp_path / "a", images=3, empty_caption=1)
+    pairs = DatasetScanner().caption_pairs(dataset, non_empty=True)
+    assert [image.name for image, _ in pairs] == ['img0.PNG', 'img2.jpg']
+
+
+def test_scan_stops_at_datasets_and_respects_depth(tmp_path):
+    _dataset(tmp_path / "people" / "alice")
+    _dataset(tmp_path / "people" / "alice" / "nested")
+    _dataset(tmp_path / "styles" / "deep" / "ink")
+    _dataset(tmp_path / ".hidden")
+    (tmp_path / "empty").mkdir()
+
+    scanner = DatasetScanner(max_workers=4)
+    found = [listing.path.relative_to(tmp_path).as_posix() for listing in scanner.scan(tmp_path, max_depth=3)]
+    assert found == ['people/alice', 'styles/deep/ink']
+    assert [listing.name for listing in scanner.scan(tmp_path / "people", max_depth=0)] == ['alice']
+    assert scanner.scan(tmp_path, max_depth=1) == [scanner.list_directory(tmp_path / "people" / "alice")]
+
+
+def test_cache_is_reused_until_directory_changes(tmp_path, monkeypatch):
+    dataset = _dataset(tmp_path / "a")
+    _age(dataset)
+    cache_path = tmp_path / "scan.json"
+    DatasetScanner(cache_path).scan(tmp_path, max_depth=0)
+    assert cache_path.exists()
+
+    # A fresh scanner serves the persisted listing without listing the directory
+    real_scandir = os.scandir
+    monkeypatch.setattr(scanner_module.os, 'scandir', lambda path: pytest.fail(f"listed {path}"))
+    assert DatasetScanner(cache_path).list_directory(dataset).image_count == 2
+
+    # Adding a file changes the directory mtime and invalidates the listing
+    monkeypatch.setattr(scanner_module.os, 'scandir', real_scandir)
+    (dataset / "img9.jpg").write_bytes(b"image")
+    assert DatasetScanner(cache_path).list_directory(dataset).image_count == 3
@@ -0,0 +1,79 @@
+"""Tests for the process-wide engine registry and its schema marker."""
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, text
+
+from src.database.engine_registry import EngineRegistry, schema_fingerprint
+from src.database.factory import DatabaseConfig
+from src.database.models_v2 import Base
+
+
+def test_managers_share_engine_and_check_schema_once(tmp_path):
+    registry = EngineRegistry()
+    config = DatabaseConfig(db_type='sqlite', db_path=tmp_path / 'registry.db')
+
+    first = registry.acquire(config, Base.metadata)
+    second = registry.acquire(DatabaseConfig(db_type='sqlite', db_path=tmp_path / 'registry.db'),
+                              Base.metadata)
+    assert first is second
+    assert first.session_factory is second.session_factory
+
+    stats = registry.pool_statistics()
+    assert len(stats) == 1
+    assert stats[0]['stats']['managers'] == 2
+    assert stats[0]['stats']['schema_checks'] == 1
+    assert stats[0]['stats']['schema_updates'] == 1
+    assert registry.pool_status(first.engine)['database_type'] == 'sqlite'
+
+    with first.engine.connect() as connection:
+        version = connection.execute(text(
+            "SELECT version FROM schema_versions WHERE name = 'core'"
+        )).scalar()
+    assert version == schema_fingerprint(Base.metadata)
+    registry.dispose_all()
+
+    # A new process finds the marker and skips the DDL
+    registry = EngineRegistry()
+    entry = registry.acquire(config, Base.metadata)
+    assert entry.stats['schema_checks'] == 1 and entry.stats['schema_updates'] == 0
+    registry.dispose_all()
+
+
+def test_changed_models_update_the_schema(tmp_path):
+    registry = EngineRegistry()
+    config = DatabaseConfig(db_type='sqlite', db_path=tmp_path / 'registry.db')
+
+    metadata = MetaData()
+    Table('notes', metadata, Column('id', Integer, primary_key=True))
+    entry = registry.acquire(config, metadata, name='notes')
+    assert not registry.ensure_schema(entry, metadata, name='notes')
+
+    changed = MetaData()
+    Table('notes', changed, Column('id', Integer, primary_key=True))
+    Table('tags', changed, Column('name', String(20), primary_key=True))
+    assert schema_fingerprint(changed) != schema_fingerprint(metadata)
+    assert registry.ensure_schema(entry, changed, name='notes')
+
+    with entry.engine.connect() as connection:
+        assert connection.execute(text("SELECT COUNT(*) FROM tags")).scalar() == 0
+    registry.dispose_all()
+
+
+def test_schema_update_drops_superseded_indexes(tmp_path):
+    config = DatabaseConfig(db_type='sqlite', db_path=tmp_path / 'old.db')
+    registry = EngineRegistry()
+    engine = registry.acquire(config, Base.metadata).engine
+    # A database created before the keyset indexes replaced the old ones
+    with engine.begin() as connection:
+        connection.execute(text("CREATE INDEX idx_exec_status_created ON executions (status, created_at)"))
+        connection.execute(text("UPDATE schema_versions SET version = 'old'"))
+    registry.dispose_all()
+
+    registry = EngineRegistry()
+    engine = registry.acquire(config, Base.metadata).engine
+    with engine.connect() as connection:
+        indexes = {row[0] for row in connection.execute(text(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'executions'"))}
+    registry.dispose_all()
+
+    assert 'idx_exec_status_created_job' in indexes
+    assert not indexes & set(Base.metadata.info['dropped_indexes'])
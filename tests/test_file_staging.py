@@ -0,0 +1,85 @@
+"""Tests for dataset file staging strategies and link-safe cleanup."""
+
+import os
+
+import pytest
+
+from src.utils import file_staging
+from src.utils.file_staging import FileStager, StagingStrategy, remove_staged_tree
+
+
+def _source(tmp_path, count=3):
+    source = tmp_path / "source"
+    source.mkdir()
+    for i in range(count):
+        (source / f"img{i}.png").write_bytes(b"png" * (i + 1))
+        (source / f"img{i}.txt").write_text(f"caption {i}")
+    return source
+
+
+def _stage(stager, source, destination):
+    destination.mkdir(parents=True, exist_ok=True)
+    return stager.stage((path, destination / path.name) for path in sorted(source.iterdir()))
+
+
+def test_hardlink_shares_inode_and_restaging_replaces(tmp_path):
+    source = _source(tmp_path)
+    staged = tmp_path / "input"
+    report = _stage(FileStager('hardlink'), source, staged)
+
+    assert report.files == {'hardlink': 6} and report.copied_bytes == 0
+    assert os.path.samefile(source / "img0.png", staged / "img0.png")
+    # Staging again replaces the links instead of failing on existing files
+    assert _stage(FileStager('hardlink'), source, staged).total == 6
+    assert sorted(os.listdir(staged)) == sorted(os.listdir(source))
+
+
+def test_auto_falls_back_to_copy_when_links_are_unsupported(tmp_path, monkeypatch):
+    def unsupported(source, temporary):
+        raise OSError(file_staging.errno.EOPNOTSUPP, "not supported")
+
+    monkeypatch.setitem(file_staging._METHODS, StagingStrategy.REFLINK, unsupported)
+    monkeypatch.setitem(file_staging._METHODS, StagingStrategy.HARDLINK, unsupported)
+    source = _source(tmp_path)
+    report = _stage(FileStager('auto', max_workers=2), source, tmp_path / "input")
+
+    assert report.files == {'copy': 6}
+    assert report.copied_bytes == sum(path.stat().st_size for path in source.iterdir())
+    assert not os.path.samefile(source / "img1.png", tmp_path / "input" / "img1.png")
+    assert "copy" in report.summary()
+
+
+def test_symlinks_point_at_the_original_file(tmp_path):
+    source = _source(tmp_path, count=1)
+    _stage(FileStager('hardlink'), source, tmp_path / "input")
+    _stage(FileStager('symlink'), tmp_path / "input", tmp_path / "img")
+
+    # Linking a staged hard link still points at a real file, not at the workspace
+    target = os.readlink(tmp_path / "img" / "img0.png")
+    assert os.path.samefile(target, source / "img0.png")
+
+
+def test_unknown_strategy_defaults_to_auto():
+    assert FileStager('fastest').strategy == StagingStrategy.AUTO
+
+
+def test_remove_staged_tree_leaves_sources_intact(tmp_path):
+    source = _source(tmp_path)
+    _stage(FileStager('hardlink'), source, tmp_path / "input")
+    _stage(FileStager('symlink'), source, tmp_path / "output" / "img")
+    linked_dir = tmp_path / "linked"
+    linked_dir.symlink_to(source, target_is_directory=True)
+
+    for path in (tmp_path / "input", tmp_path / "output", linked_dir):
+        remove_staged_tree(path)
+        assert not os.path.lexists(path)
+    assert len(list(source.iterdir())) == 6
+    assert (source / "img2.txt").read_text() == "caption 2"
+
+
+@pytest.mark.parametrize('strategy', ['copy', 'reflink'])
+def test_strategies_produce_identical_content(tmp_path, strategy):
+    source = _source(tmp_path)
+    _stage(FileStager(strategy), source, tmp_path / "input")
+    for path in source.iterdir():
+        assert (tmp_path / "input" / path.name).read_bytes() == path.read_bytes()
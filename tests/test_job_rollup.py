@@ -0,0 +1,94 @@
+"""Tests for the unified jobs table and the job statistics rollup."""
+
+from datetime import datetime
+
+from sqlalchemy import text
+
+from src.database.enums import ExecutionStatus
+from src.database import job_rollup
+from src.database.dialects.sqlite import SQLiteDialect
+from src.database.enhanced_manager import EnhancedDatabaseManager
+from src.database.factory import DatabaseConfig
+from src.database.job_rollup import install_job_rollup, job_statistics
+from src.database.manager_v2 import DatabaseManager
+from src.database.models_v2 import Execution
+from src.database.optimizations import QueryOptimizer
+from src.database.status_queue import JobStatusQueue
+
+ROLLUP_QUERY = "SELECT * FROM job_stats_rollup ORDER BY day, job_type, status, preset, mode"
+
+
+def _aggregated_rollup(manager):
+    """The rollup as a full rebuild from the job tables would produce it."""
+    with manager.engine.connect() as connection:
+        rollup = connection.execute(text(ROLLUP_QUERY)).fetchall()
+    install_job_rollup(manager.engine, manager.dialect)
+    with manager.engine.connect() as connection:
+        return rollup, connection.execute(text(ROLLUP_QUERY)).fetchall()
+
+
+def test_rollup_follows_inserts_transitions_bulk_writes_and_deletes(tmp_path):
+    manager = DatabaseManager(DatabaseConfig(db_type='sqlite', db_path=tmp_path / 'jobs.db'))
+    with manager.get_session() as session:
+        # Rows from before the rollup existed are backfilled by install_job_rollup
+        session.add(Execution(job_id='old00001', pipeline_mode='single', dataset_name='cats',
+                              preset='FluxLORA', status='done', success=True, duration_seconds=60,
+                              end_time=datetime(2024, 1, 1, 1), created_at=datetime(2024, 1, 1)))
+        session.commit()
+    with manager.engine.begin() as connection:
+        connection.execute(text("DELETE FROM jobs"))
+        connection.execute(text("DELETE FROM job_stats_rollup"))
+    install_job_rollup(manager.engine, manager.dialect)
+
+    manager.create_execution('exec0001', 'single', 'cats', 'FluxLORA')
+    manager.create_execution('exec0002', 'batch', 'dogs', 'SDXL')
+    manager.create_variation('var00001', 'v1', 'exp', 'cats', 'FluxLORA', 2, {}, {})
+    manager.update_execution_status('exec0001', ExecutionStatus.TRAINING)
+    manager.update_execution_status('exec0001', ExecutionStatus.DONE)
+    manager.update_variation_status('var00001', ExecutionStatus.FAILED, 'OOM')
+    queue = JobStatusQueue(manager, flush_interval=60)
+    queue.put('exec0002', 'execution', status=ExecutionStatus.TRAINING, total_steps=100)
+    queue.flush()
+
+    with manager.get_session() as session:
+        stats = job_statistics(session)
+        active = QueryOptimizer.get_active_jobs_optimized(session)
+    assert stats['execution']['total'] == 3 and stats['variation']['total'] == 1
+    assert stats['execution']['by_status'] == {'done': 2, 'training': 1}
+    assert stats['execution']['by_mode'] == {'single': 2, 'batch': 1}
+    assert stats['execution']['success'] == 2 and stats['variation']['failed'] == 1
+    assert [(job['job_id'], job['type'], job['mode']) for job in active] == [('exec0002', 'execution', 'batch')]
+
+    assert manager.get_statistics()['executions_by_status'] == {'done': 2, 'training': 1}
+    assert manager.get_job_stats()['total'] == {'total': 4, 'success': 2, 'failed': 1, 'running': 1}
+    jobs, _ = manager.list_jobs(limit=10, dataset_name='cats')
+    assert [job['job_id'] for job in jobs][-1] == 'old00001' and len(jobs) == 3
+
+    incremental, rebuilt = _aggregated_rollup(manager)
+    assert incremental == rebuilt
+
+    manager.cleanup_old_records(days=30)
+    with manager.get_session() as session:
+        assert job_statistics(session)['execution']['by_status'] == {'done': 1, 'training': 1}
+    manager.clear_all_records()
+    with manager.engine.connect() as connection:
+        assert connection.execute(text("SELECT COUNT(*) FROM job_stats_rollup")).scalar() == 0
+        assert connection.execute(text("SELECT COUNT(*) FROM jobs")).scalar() == 0
+
+
+def test_v1_enhanced_manager_installs_rollup_only_when_triggers_are_missing(tmp_path, monkeypatch):
+    installs = []
+    install = job_rollup.install_job_rollup
+    monkeypatch.setattr(job_rollup, 'install_job_rollup',
+                        lambda engine, dialect: installs.append(engine) or install(engine, dialect))
+
+    db_path = tmp_path / 'v1.db'
+    first = EnhancedDatabaseManager(db_path, enable_monitoring=False)
+    assert job_rollup.job_rollup_installed(first.pool_manager.engine, SQLiteDialect())
+    EnhancedDatabaseManager(db_path, enable_monitoring=False)
+    assert len(installs) == 1
+
+    with first.pool_manager.engine.begin() as connection:
+        connection.execute(text("DROP TRIGGER jobs_rollup_update"))
+    EnhancedDatabaseManager(db_path, enable_monitoring=False)
+    assert len(installs) == 2
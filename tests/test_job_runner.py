@@ -0,0 +1,106 @@
+"""Tests for the durable job queue and warm job runner."""
+
+import asyncio
+import textwrap
+
+from api.services.job_runner import JobQueue, JobRunner
+
+
+FAKE_MAIN = textwrap.dedent('''
+    import os
+
+    from src.utils.logging_config import get_logging_manager
+
+    IMPORT_PID = os.getpid()
+    calls = 0
+
+
+    async def async_main(argv=None):
+        global calls
+        calls += 1
+        if argv and argv[0] == "--fail":
+            print("boom")
+            return 1
+        if argv and argv[0] == "--loud":
+            for i in range(1000):
+                print(f"line {i}")
+            return 0
+        if argv and argv[0] == "--logging":
+            manager = get_logging_manager(os.getcwd())
+            print(f"reused={getattr(manager, 'used', False)}")
+            manager.used = True
+            return 0
+        print(f"Job ID: {argv[0]} pid={IMPORT_PID} calls={calls}")
+        return 0
+''')
+
+
+def test_queue_is_fifo_and_durable(tmp_path):
+    queue = JobQueue(tmp_path / "queue.db")
+    first = queue.enqueue(["--train", "a"])
+    second = queue.enqueue(["--train", "b"])
+
+    assert queue.claim() == (first, ["--train", "a"])
+    queue.close()
+
+    # A restart fails the interrupted job and keeps the queued one
+    queue = JobQueue(tmp_path / "queue.db")
+    assert queue.recover() == 1
+    assert queue.get(first)['status'] == 'failed'
+    assert queue.claim() == (second, ["--train", "b"])
+    queue.complete(second, 0, "ok", "")
+    assert queue.get(second)['stdout'] == "ok"
+    assert queue.claim() is None
+    assert queue.counts() == {'failed': 1, 'done': 1}
+    queue.close()
+
+
+def test_runner_reuses_warm_workers(tmp_path):
+    (tmp_path / "main.py").write_text(FAKE_MAIN)
+
+    async def scenario():
+        runner = JobRunner(tmp_path, workers=1, queue_path=tmp_path / "queue.db")
+        await runner.start()
+        try:
+            results = [await runner.run([f"job{i}"]) for i in range(3)]
+            failed = await runner.run(["--fail"])
+        finally:
+            await runner.stop()
+        return results, failed, runner
+
+    results, failed, runner = asyncio.run(scenario())
+
+    assert all(success for success, _, _ in results)
+    # One import, one process, module state kept between jobs
+    pids = {stdout.split("pid=")[1].split()[0] for _, stdout, _ in results}
+    assert len(pids) == 1
+    assert results[2][1].strip().endswith("calls=3")
+    assert failed == (False, "boom\n", "")
+    assert runner.queue.counts() == {'done': 3, 'failed': 1}
+
+
+def test_runner_resets_run_state_and_keeps_output_tail(tmp_path):
+    (tmp_path / "main.py").write_text(FAKE_MAIN)
+
+    async def scenario():
+        runner = JobRunner(tmp_path, workers=1, queue_path=tmp_path / "queue.db",
+                           output_tail_bytes=100)
+        await runner.start()
+        try:
+            first = await runner.run(["--logging"])
+            second = await runner.run(["--logging"])
+            loud_id = await runner.submit(["--loud"])
+            loud = await runner.wait(loud_id)
+        finally:
+            await runner.stop()
+        return first, second, loud_id, loud, runner
+
+    first, second, loud_id, loud, runner = asyncio.run(scenario())
+
+    # Each job gets a new logging manager (and so its own execution log)
+    assert first[1] == second[1] == "reused=False\n"
+    # The caller and the queue get a bounded tail; the log file has everything
+    assert loud[0] and len(loud[1]) == 100 and loud[1].endswith("line 999\n")
+    assert runner.queue.get(loud_id)['stdout'] == loud[1]
+    stdout_log, _ = runner.log_paths(loud_id)
+    assert stdout_log.read_text().splitlines() == [f"line {i}" for i in range(1000)]
@@ -0,0 +1,86 @@
+"""Tests for the write-behind job status queue."""
+
+from datetime import timedelta
+
+# src.training -> src.scripts -> src.pipeline is circular unless src.pipeline loads first
+import src.pipeline  # noqa: F401
+from src.database.enums import ExecutionStatus
+from src.database.factory import DatabaseConfig
+from src.database.manager_v2 import DatabaseManager
+from src.database.status_queue import JobStatusQueue
+from src.training import enhanced_trainer
+from src.utils import job_tracker
+
+
+def _manager(tmp_path):
+    manager = DatabaseManager(DatabaseConfig(db_type='sqlite', db_path=tmp_path / 'jobs.db'))
+    manager.create_execution('exec0001', 'single', 'ds', 'FluxLORA')
+    manager.create_variation('var00001', 'v1', 'exp', 'ds', 'FluxLORA', 2,
+                             {'lr': [1e-4, 2e-4]}, {'lr': 1e-4})
+    return manager
+
+
+def test_updates_are_coalesced_and_terminal_states_kept(tmp_path):
+    manager = _manager(tmp_path)
+    kinds = {'exec0001': 'execution'}
+    queue = JobStatusQueue(manager, flush_interval=60, job_kinds=kinds)
+
+    for status in (ExecutionStatus.PREPARING_DATASET, ExecutionStatus.CONFIGURING_PRESET,
+                   ExecutionStatus.TRAINING):
+        queue.put('exec0001', 'execution', status=status)
+    queue.put('exec0001', 'execution', output_path='/models/exec0001')
+    queue.put('exec0001', 'execution', status=ExecutionStatus.FAILED, error_message='OOM')
+    queue.put('exec0001', 'execution', status=ExecutionStatus.GENERATING_PREVIEW)
+    queue.put('var00001', None, status=ExecutionStatus.DONE, total_steps=300)
+    queue.put('missing1', None, status=ExecutionStatus.TRAINING)
+
+    assert queue.flush() == 2
+    assert queue.flushes == 1 and queue.updates_queued == 8
+    assert kinds['var00001'] == 'variation'
+
+    execution = manager.get_execution('exec0001')
+    assert execution.status == ExecutionStatus.FAILED.value
+    assert execution.error_message == 'OOM'
+    assert execution.output_path == '/models/exec0001'
+    assert execution.success is False and execution.end_time is not None
+    assert execution.end_time - execution.start_time < timedelta(minutes=1)
+
+    variation = manager.get_variation('var00001')
+    assert variation.status == ExecutionStatus.DONE.value
+    assert variation.success is True and variation.total_steps == 300
+    assert variation.duration_seconds is not None
+
+    queue.put('exec0001', 'execution', status=ExecutionStatus.CANCELLED, error_message='Ctrl+C')
+    queue.close()
+    assert manager.get_execution('exec0001').status == ExecutionStatus.CANCELLED.value
+    assert queue.flush() == 0
+
+
+def test_trainer_total_steps_go_through_the_queue(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_tracker, 'DatabaseManager', lambda db_path: _manager(tmp_path))
+    tracker = job_tracker.JobTracker(write_behind=True)
+    monkeypatch.setattr(enhanced_trainer, 'get_tracker', lambda: tracker)
+    published = []
+    publisher = type('Publisher', (), {'update': lambda self, fields: published.append(fields)})()
+
+    on_progress = enhanced_trainer.EnhancedSDScriptsTrainer(tmp_path)._progress_handler(
+        'exec0001', publisher)
+    for step in (1, 2):
+        on_progress({'step': step, 'total_steps': 1200})
+
+    assert len(published) == 2
+    assert tracker._status_queue.updates_queued == 1
+    tracker.flush()
+    assert tracker.db_manager.get_execution('exec0001').total_steps == 1200
+
+
+def test_reset_tracker_writes_queued_updates(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_tracker, 'DatabaseManager', lambda db_path: _manager(tmp_path))
+    monkeypatch.setattr(job_tracker, '_tracker', job_tracker.JobTracker(write_behind=True))
+    tracker = job_tracker.get_tracker()
+    tracker.update_status('exec0001', ExecutionStatus.TRAINING)
+
+    job_tracker.reset_tracker()
+
+    assert tracker.db_manager.get_execution('exec0001').status == ExecutionStatus.TRAINING.value
+    assert job_tracker._tracker is None and tracker._status_queue is None
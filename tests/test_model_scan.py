@@ -0,0 +1,114 @@
+"""Tests for the model scan: directory walk, row diff, upsert and prune."""
+
+import asyncio
+import json
+import os
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from api.routes.models import _collect_model_files, _plan_model_upserts, _sync_model_rows
+from src.database.models_v2 import Model, ModelPath
+
+# PostgreSQL database for the SQL tests, e.g. postgresql://user@localhost/autotrainx_test
+POSTGRES_URL = os.environ.get('AUTOTRAINX_TEST_POSTGRES_URL')
+
+
+def _model_tree(root):
+    (root / 'cats' / 'Preview').mkdir(parents=True)
+    (root / 'cats' / 'cats.safetensors').write_bytes(b'x' * 10)
+    (root / 'cats' / 'Preview' / 'b.png').write_bytes(b'png')
+    (root / 'cats' / 'Preview' / 'a.jpg').write_bytes(b'jpg')
+    (root / 'dogs').mkdir()
+    (root / 'dogs' / 'dogs.ckpt').write_bytes(b'y' * 20)
+    (root / 'dogs' / 'notes.txt').write_text('not a model')
+
+
+def _stored_row(candidate, path_id):
+    return {
+        'size': candidate['size'], 'modified_at': candidate['modified_at'], 'path_id': path_id,
+        'preview_images': json.dumps(candidate['preview_images']) if candidate['preview_images'] else None,
+    }
+
+
+def test_walk_collects_models_and_shared_previews(tmp_path):
+    _model_tree(tmp_path)
+
+    candidates = _collect_model_files(str(tmp_path))
+
+    cats, dogs = str(tmp_path / 'cats' / 'cats.safetensors'), str(tmp_path / 'dogs' / 'dogs.ckpt')
+    assert set(candidates) == {cats, dogs}
+    assert candidates[cats]['type'] == 'safetensors' and candidates[cats]['size'] == 10
+    assert candidates[cats]['preview_images'] == ['a.jpg', 'b.png']
+    assert candidates[dogs]['preview_images'] == []
+
+
+def test_plan_writes_only_new_and_changed_models(tmp_path):
+    _model_tree(tmp_path)
+    candidates = _collect_model_files(str(tmp_path))
+    cats, dogs = str(tmp_path / 'cats' / 'cats.safetensors'), str(tmp_path / 'dogs' / 'dogs.ckpt')
+
+    records, found, updated = _plan_model_upserts({}, candidates, 'p1')
+    assert (len(records), found, updated) == (2, 2, 0)
+    record = next(record for record in records if record[2] == cats)
+    assert record[1:5] == ('cats.safetensors', cats, 'safetensors', 10)
+    assert record[7:] == ('p1', True, '["a.jpg", "b.png"]')
+
+    existing = {path: _stored_row(candidate, 'p1') for path, candidate in candidates.items()}
+    assert _plan_model_upserts(existing, candidates, 'p1') == ([], 0, 0)
+
+    # A changed size, a moved path or a new preview image each rewrite the row
+    existing[dogs]['size'] = 1
+    records, found, updated = _plan_model_upserts(existing, candidates, 'p1')
+    assert [record[2] for record in records] == [dogs] and (found, updated) == (0, 1)
+    assert _plan_model_upserts(existing, candidates, 'p2')[2] == 2
+    existing[dogs]['size'] = 20
+    existing[cats]['preview_images'] = '["a.jpg"]'
+    assert [record[2] for record in _plan_model_upserts(existing, candidates, 'p1')[0]] == [cats]
+
+
+@pytest.mark.skipif(not POSTGRES_URL, reason="AUTOTRAINX_TEST_POSTGRES_URL not set")
+def test_sync_upserts_and_prunes_rows_in_postgresql(tmp_path):
+    import asyncpg
+
+    schema = f"scan_test_{uuid.uuid4().hex[:8]}"
+    engine = create_engine(POSTGRES_URL)
+    with engine.begin() as conn:
+        conn.execute(text(f"CREATE SCHEMA {schema}"))
+        conn.execute(text(f"SET search_path TO {schema}"))
+        ModelPath.__table__.create(conn)
+        Model.__table__.create(conn)
+        conn.execute(text("INSERT INTO model_paths (id, path) VALUES ('p1', :path)"), {'path': str(tmp_path)})
+        conn.execute(text("INSERT INTO models (id, name, path, type, size, path_id) "
+                          "VALUES ('gone', 'old.ckpt', :path, 'ckpt', 1, 'p1')"),
+                     {'path': str(tmp_path / 'old.ckpt')})
+    _model_tree(tmp_path)
+
+    async def scenario():
+        conn = await asyncpg.connect(POSTGRES_URL, server_settings={'search_path': schema})
+        try:
+            first = await _sync_model_rows(conn, 'p1', _collect_model_files(str(tmp_path)))
+            unchanged = await _sync_model_rows(conn, 'p1', _collect_model_files(str(tmp_path)))
+            (tmp_path / 'dogs' / 'dogs.ckpt').write_bytes(b'y' * 30)
+            (tmp_path / 'cats' / 'cats.safetensors').unlink()
+            second = await _sync_model_rows(conn, 'p1', _collect_model_files(str(tmp_path)))
+            rows = await conn.fetch("SELECT id, path, size, has_preview FROM models")
+            model_count = await conn.fetchval("SELECT model_count FROM model_paths WHERE id = 'p1'")
+            return first, unchanged, second, rows, model_count
+        finally:
+            await conn.close()
+
+    try:
+        first, unchanged, second, rows, model_count = asyncio.run(scenario())
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+        engine.dispose()
+
+    assert first == (2, 0, 1)
+    assert unchanged == (0, 0, 0)
+    assert second == (0, 1, 1)
+    [row] = rows
+    assert (row['path'], row['size'], row['has_preview']) == (str(tmp_path / 'dogs' / 'dogs.ckpt'), 30, False)
+    assert model_count == 1
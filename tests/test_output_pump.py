@@ -0,0 +1,74 @@
+"""Tests for the chunked training output pump and its metrics sidecar."""
+
+import io
+import json
+
+# src.training -> src.scripts -> src.pipeline is circular unless src.pipeline loads first
+import src.pipeline  # noqa: F401
+from src.training.minimal_progress_monitor import MinimalProgressMonitor
+from src.training.output_pump import OutputPump, metrics_path_for
+
+OUTPUT = (
+    "loading model… ✓\r\n"
+    "steps:   0%|          | 0/3 [00:00<?, ?it/s]\r"
+    "steps:  33%|###       | 1/3 [00:01<00:02,  1.50it/s]\r"
+    "steps:  33%|###       | 1/3 [00:01<00:02,  1.50it/s, avr_loss=0.5]\r"
+    "steps:  67%|######    | 2/3 [00:02<00:01,  2.00s/it, avr_loss=0.5]\r"
+    "steps:  67%|######    | 2/3 [00:02<00:01,  2.00s/it, avr_loss=0.4, lr=0.0001]\n"
+    "epoch 2/2\n"
+    "steps: 100%|##########| 3/3 [00:03<00:00,  1.00it/s, avr_loss=0.3]"
+)
+
+
+def _pump(tmp_path, chunk_size, **kwargs):
+    log_path = tmp_path / "train_x.log"
+    with open(log_path, 'w', encoding='utf-8') as log_file:
+        pump = OutputPump(io.BytesIO(OUTPUT.encode('utf-8')), log_file,
+                          metrics_path=metrics_path_for(log_path), chunk_size=chunk_size, **kwargs)
+        pump.run()
+    return pump, log_path
+
+
+def test_splits_carriage_returns_across_chunk_boundaries(tmp_path):
+    for chunk_size in (7, 64 * 1024):
+        lines = []
+        pump, log_path = _pump(tmp_path, chunk_size, on_line=lines.append)
+
+        assert lines[0] == "loading model… ✓"
+        assert len(lines) == 8 and pump.lines == 8
+        assert log_path.read_text(encoding='utf-8') == "".join(line + "\n" for line in lines)
+        assert list(pump.tail)[-1].startswith("steps: 100%")
+
+
+def test_metrics_sidecar_has_one_record_per_step(tmp_path):
+    progress = []
+    _pump(tmp_path, 16, on_progress=progress.append)
+
+    records = [json.loads(line) for line in (tmp_path / "train_x.metrics.jsonl").read_text().splitlines()]
+    assert [(r['step'], r['loss']) for r in records] == [(1, 0.5), (2, 0.4), (3, 0.3)]
+    assert records[1]['lr'] == 0.0001 and records[1]['it_per_sec'] == 0.5
+    assert 'epoch' not in records[1] and records[2]['epoch'] == 2
+    assert len(progress) == 7
+
+
+def test_echo_copies_raw_output(tmp_path):
+    console = io.StringIO()
+    _pump(tmp_path, 5, echo=console)
+    assert console.getvalue() == OUTPUT
+
+
+def test_parsed_events_feed_progress_monitor(tmp_path):
+    monitor = MinimalProgressMonitor(quiet=True)
+    _pump(tmp_path, 16, on_events=monitor.apply)
+
+    assert monitor.state.current_step == 3 and monitor.state.total_steps == 3
+    assert monitor.state.average_loss == 0.3 and monitor.state.current_epoch == 2
+    assert monitor.state.phase == 'preparing'
+
+
+def test_finished_step_records_go_to_metrics_callback(tmp_path):
+    records = []
+    _pump(tmp_path, 64 * 1024, on_metrics=records.append)
+
+    sidecar = [json.loads(line) for line in (tmp_path / "train_x.metrics.jsonl").read_text().splitlines()]
+    assert records == sidecar and [r['step'] for r in records] == [1, 2, 3]
@@ -0,0 +1,62 @@
+"""Tests for keyset pagination of job listings."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.database.factory import DatabaseConfig
+from src.database.manager_v2 import DatabaseManager
+from src.database.models_v2 import Execution, Variation
+from src.database.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    created = datetime(2024, 5, 1, 12, 30, 15, 250000)
+    assert decode_cursor(encode_cursor([created, 'a1b2c3d4'])) == [created, 'a1b2c3d4']
+    with pytest.raises(ValueError):
+        decode_cursor('not a cursor')
+
+
+def test_pages_cover_all_jobs_once_with_sql_filters(tmp_path):
+    manager = DatabaseManager(DatabaseConfig(db_type='sqlite', db_path=tmp_path / 'jobs.db'))
+    base = datetime(2024, 1, 1)
+    with manager.get_session() as session:
+        for i in range(30):
+            # Pairs share a timestamp so the job_id tiebreak matters
+            created = base + timedelta(minutes=i // 2)
+            status = 'failed' if i % 3 == 0 else 'done'
+            dataset = 'cats' if i % 2 else 'dogs'
+            if i % 4 == 0:
+                session.add(Variation(job_id=f"v{i:07d}", variation_id=f"v{i}", experiment_name='exp',
+                                      dataset_name=dataset, preset='FluxLORA', total_combinations=4,
+                                      status=status, created_at=created))
+            else:
+                session.add(Execution(job_id=f"e{i:07d}", pipeline_mode='batch', dataset_name=dataset,
+                                      preset='FluxLORA', status=status, created_at=created))
+        session.commit()
+
+    def collect(**filters):
+        seen, cursor = [], None
+        while True:
+            jobs, cursor = manager.list_jobs(limit=4, cursor=cursor, **filters)
+            seen.extend(jobs)
+            if not cursor:
+                return seen
+
+    everything = collect()
+    assert len(everything) == 30
+    keys = [(job['created_at'], job['job_id']) for job in everything]
+    assert keys == sorted(keys, reverse=True)
+    assert {job['type'] for job in everything} == {'execution', 'variation'}
+
+    failed_cats = collect(status='failed', dataset_name='cats')
+    assert failed_cats and all(job['status'] == 'failed' and job['dataset_name'] == 'cats'
+                               for job in failed_cats)
+    assert len(failed_cats) == sum(1 for i in range(30) if i % 3 == 0 and i % 2)
+    assert manager.count_jobs(status='failed', dataset_name='cats') == (len(failed_cats), False)
+    assert manager.count_jobs() == (30, False)
+
+    first = manager.list_executions(limit=5)
+    rest = manager.list_executions(limit=100, cursor=encode_cursor([first[-1].created_at, first[-1].job_id]))
+    assert len(first) + len(rest) == 22
+    assert not {job.job_id for job in first} & {job.job_id for job in rest}
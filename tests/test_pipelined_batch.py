@@ -0,0 +1,117 @@
+"""Tests for the pipelined batch executor: stage overlap, bounded prefetch and timings."""
+
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from src.pipeline.base import DatasetResult
+from src.pipeline.strategies import PipelinedBatchExecutor
+from src.training import scheduler as scheduler_module
+from src.training.scheduler import (
+    Device, DeviceInventory, Requirement, TrainingScheduler, TrainingTask
+)
+
+STAGE_SECONDS = 0.15
+
+
+class SleepTrainer:
+    """Trains by sleeping; datasets named fail* fail."""
+
+    def execute_training(self, toml_path, preset_info, dataset_name, job_id=None, **kwargs):
+        time.sleep(STAGE_SECONDS)
+        return not dataset_name.startswith('fail')
+
+
+@pytest.fixture(autouse=True)
+def tracker(monkeypatch):
+    fake = SimpleNamespace(update_status=lambda *args, **kwargs: True)
+    monkeypatch.setattr(scheduler_module, 'get_tracker', lambda: fake)
+    return fake
+
+
+def _prepare(names, log):
+    for name in names:
+        log.append(('prepare', name))
+        time.sleep(STAGE_SECONDS)
+        yield name, DatasetResult(dataset_name=name, success=True)
+
+
+def _make_task(current, name, result):
+    preset = SimpleNamespace(name='FluxLORA', is_lora=True)
+    return TrainingTask(key=name, toml_path=Path(f"{name}.toml"), preset_info=preset,
+                        dataset_name=name, current=current, requirement=Requirement.DEVICE)
+
+
+def _executor():
+    return PipelinedBatchExecutor(
+        TrainingScheduler(SleepTrainer, DeviceInventory([Device('0')])), prefetch=1)
+
+
+def test_stages_overlap_and_report_timings():
+    names = [f"ds{i}" for i in range(4)]
+    hooks = []
+
+    def on_complete(task, success):
+        time.sleep(STAGE_SECONDS)
+        hooks.append(task.key)
+
+    start = time.monotonic()
+    result = _executor().run(_prepare(names, []), _make_task, on_complete=on_complete)
+    elapsed = time.monotonic() - start
+
+    assert result.success and sorted(result.training) == names
+    assert sorted(hooks) == names
+    # Twelve stage runs back to back would take 12 * STAGE_SECONDS
+    assert elapsed < 8 * STAGE_SECONDS
+    stages = result.timings['stages']
+    assert {stage: data['count'] for stage, data in stages.items()} == {
+        'preparation': 4, 'training': 4, 'post_training': 4
+    }
+    assert result.timings['busy_seconds'] > result.timings['wall_seconds']
+
+
+def test_preparation_stays_bounded_ahead_of_training():
+    names = [f"ds{i}" for i in range(5)]
+    log = []
+    lock = threading.Lock()
+
+    class LoggingTrainer(SleepTrainer):
+        def execute_training(self, toml_path, preset_info, dataset_name, job_id=None, **kwargs):
+            with lock:
+                log.append(('train', dataset_name))
+            return super().execute_training(toml_path, preset_info, dataset_name, job_id)
+
+    executor = PipelinedBatchExecutor(
+        TrainingScheduler(LoggingTrainer, DeviceInventory([Device('0')])), prefetch=1)
+    executor.run(_prepare(names, log), _make_task)
+
+    for index, (stage, _) in enumerate(log):
+        prepared = sum(1 for s, _ in log[:index + 1] if s == 'prepare')
+        trained = sum(1 for s, _ in log[:index + 1] if s == 'train')
+        # One dataset training, one waiting for the device, one being prepared
+        assert prepared - trained <= 2
+
+
+def test_training_failure_stops_preparation():
+    log = []
+    result = _executor().run(_prepare(["fail0", "ds1", "ds2", "ds3"], log), _make_task,
+                             on_complete=lambda task, success: None, stop_on_error=True)
+
+    assert not result.success
+    assert result.training['fail0'] is False
+    assert ('prepare', 'ds3') not in log
+
+
+def test_source_error_is_raised_after_prepared_datasets_train():
+    def prepare_then_fail():
+        yield from _prepare(["ds0"], [])
+        raise ValueError("Invalid dataset path: missing")
+
+    trained = []
+    with pytest.raises(ValueError, match="Invalid dataset path"):
+        _executor().run(prepare_then_fail(), _make_task,
+                        on_complete=lambda task, success: trained.append(task.key))
+    assert trained == ["ds0"]
@@ -0,0 +1,104 @@
+"""Tests for the process registry and batched liveness checks."""
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# src.training -> src.scripts -> src.pipeline is circular unless src.pipeline loads first
+import src.pipeline  # noqa: F401
+from src.database.enums import ExecutionStatus
+from src.database.models import Base, Execution, JobProcess
+from src.database.process_monitor import ProcessStatusMonitor
+from src.training import enhanced_trainer
+
+
+def _exited_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+def test_check_fails_dead_stale_and_unregistered_jobs(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'monitor.db'}")
+    Base.metadata.create_all(engine)
+    db_manager = SimpleNamespace(get_session=sessionmaker(bind=engine))
+    monitor = ProcessStatusMonitor(db_manager)
+    registry = monitor.registry
+
+    with db_manager.get_session() as session:
+        for job_id in ('alive', 'exited', 'missing', 'stale', 'reused', 'remote', 'done'):
+            status = ExecutionStatus.DONE if job_id == 'done' else ExecutionStatus.TRAINING
+            session.add(Execution(job_id=job_id, status=status.value, pipeline_mode='single',
+                                  dataset_name='ds', preset='FluxLORA'))
+        session.commit()
+
+    registry.register('alive', os.getpid())
+    registry.register('exited', _exited_pid())
+    registry.register('stale', os.getpid())
+    registry.register('reused', os.getpid())
+    registry.register('remote', 1)
+    with db_manager.get_session() as session:
+        session.query(JobProcess).filter(JobProcess.job_id == 'stale').update(
+            {'heartbeat_at': time.time() - 3600})
+        session.query(JobProcess).filter(JobProcess.job_id == 'reused').update(
+            {'create_time': 1.0, 'heartbeat_at': time.time()})
+        session.query(JobProcess).filter(JobProcess.job_id == 'remote').update(
+            {'hostname': 'other-host'})
+        session.commit()
+
+    assert monitor.manual_cleanup() == 4
+
+    with db_manager.get_session() as session:
+        statuses = dict(session.query(Execution.job_id, Execution.status))
+        registered = {job_id for (job_id,) in session.query(JobProcess.job_id)}
+        error = session.query(Execution.error_message).filter(Execution.job_id == 'stale').scalar()
+    failed = {job_id for job_id, status in statuses.items() if status == ExecutionStatus.FAILED.value}
+    assert failed == {'exited', 'missing', 'stale', 'reused'}
+    assert statuses['done'] == ExecutionStatus.DONE.value
+    assert registered == {'alive', 'remote'}
+    assert 'heartbeat' in error
+
+    registry.heartbeat('alive')
+    registry.unregister(['alive'])
+    assert monitor.manual_cleanup() == 1
+
+
+def test_enhanced_trainer_registers_its_process(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'monitor.db'}")
+    Base.metadata.create_all(engine)
+    db_manager = SimpleNamespace(get_session=sessionmaker(bind=engine))
+    with db_manager.get_session() as session:
+        session.add(Execution(job_id='job', status=ExecutionStatus.TRAINING.value,
+                              pipeline_mode='single', dataset_name='ds', preset='FluxLORA'))
+        session.commit()
+    tracker = SimpleNamespace(is_enabled=True, db_manager=db_manager,
+                              update_status=lambda *args, **kwargs: True,
+                              metrics_recorder=lambda job_id: None, flush_metrics=lambda: None)
+    monkeypatch.setattr(enhanced_trainer, 'get_tracker', lambda: tracker)
+
+    # The training process checks the liveness monitor while it runs
+    check = (
+        "import sys; sys.path.insert(0, {root!r})\n"
+        "from types import SimpleNamespace\n"
+        "from sqlalchemy import create_engine\n"
+        "from sqlalchemy.orm import sessionmaker\n"
+        "from src.database.process_monitor import ProcessStatusMonitor\n"
+        "engine = create_engine({url!r})\n"
+        "monitor = ProcessStatusMonitor(SimpleNamespace(get_session=sessionmaker(bind=engine)))\n"
+        "sys.exit(monitor.manual_cleanup())\n"
+    ).format(root=str(Path(__file__).resolve().parent.parent),
+             url=f"sqlite:///{tmp_path / 'monitor.db'}")
+    trainer = enhanced_trainer.EnhancedSDScriptsTrainer(tmp_path, show_progress=False)
+    preset = SimpleNamespace(name='FluxLORA')
+    assert trainer._execute_with_raw_output([sys.executable, '-c', check], 'ds', preset,
+                                            tmp_path / 'job.toml', job_id='job')
+
+    with db_manager.get_session() as session:
+        assert session.query(Execution.status).scalar() == ExecutionStatus.TRAINING.value
+        assert session.query(JobProcess).count() == 0
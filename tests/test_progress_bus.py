@@ -0,0 +1,49 @@
+"""Tests for the training progress bus and hub."""
+
+import asyncio
+
+# src.training -> src.scripts -> src.pipeline is circular unless src.pipeline loads first
+import src.pipeline  # noqa: F401
+from api.services.progress_hub import ProgressHub
+from src.training.progress_bus import ProgressPublisher, parse_progress_line
+
+
+def test_parse_sd_scripts_progress_line():
+    line = "steps:  12%|█▏        | 120/1000 [01:02<07:38,  1.92it/s, avr_loss=0.0873]"
+    assert parse_progress_line(line) == {
+        'step': 120, 'total_steps': 1000, 'loss': 0.0873, 'it_per_sec': 1.92
+    }
+    assert parse_progress_line("epoch 2/10") == {'epoch': 2, 'total_epochs': 10}
+    assert parse_progress_line("steps: 5/10 [00:10, 2.00s/it]")['it_per_sec'] == 0.5
+    assert parse_progress_line("loading model") is None
+
+
+def test_publisher_to_hub_coalesces_for_slow_subscribers():
+    async def scenario():
+        hub = ProgressHub()
+        await hub.start(('127.0.0.1', 0))
+        address = hub._transport.get_extra_info('sockname')
+        subscription = hub.subscribe('job1')
+
+        publisher = ProgressPublisher('job1', address=address, min_interval=0)
+        publisher.status('training')
+        for step in range(1, 51):
+            publisher.update({'step': step, 'total_steps': 50})
+        publisher.close()
+
+        # Let the datagrams arrive without the subscriber reading
+        for _ in range(50):
+            await asyncio.sleep(0.01)
+            if hub.events_received >= 51:
+                break
+
+        events = await subscription.next()
+        hub.stop()
+        return hub, events
+
+    hub, events = asyncio.run(scenario())
+
+    assert events[0] == {**events[0], 'type': 'status', 'status': 'training'}
+    assert len(events) == 2
+    assert events[-1]['step'] == 50 and events[-1]['progress_percentage'] == 100.0
+    assert hub.get_latest('job1')['step'] == 50
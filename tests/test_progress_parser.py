@@ -0,0 +1,122 @@
+"""Tests for the shared progress parser and its parity with the previous monitor parser."""
+
+import re
+from pathlib import Path
+
+import pytest
+
+# src.training -> src.scripts -> src.pipeline is circular unless src.pipeline loads first
+import src.pipeline  # noqa: F401
+from src.training.minimal_progress_monitor import MinimalProgressMonitor
+from src.training.progress_parser import (
+    EpochEvent,
+    LearningRateEvent,
+    PhaseEvent,
+    PlanEvent,
+    StepEvent,
+    events_to_fields,
+    parse_events,
+)
+
+LOG_DIR = Path(__file__).resolve().parent.parent / "logs" / "train_log"
+
+# The progress monitor's parser before the shared parser
+LEGACY_PATTERNS = {
+    'progress': re.compile(r'steps:\s*(\d+)%\|[^|]+\|\s*(\d+)/(\d+).*?(\d+\.\d+)s/it(?:.*?avr_loss=([\d.]+))?'),
+    'total_steps': re.compile(r'total optimization steps.*?(\d+)'),
+    'total_epochs': re.compile(r'num epochs.*?(\d+)'),
+    'current_epoch': re.compile(r'current_epoch:\s*(\d+),\s*epoch:\s*(\d+)'),
+    'learning_rate': re.compile(r'LR\s+([\d.e-]+)'),
+    'saving': re.compile(r'saving checkpoint:|model saved'),
+    'completed': re.compile(r'Training completed|training finished', re.IGNORECASE),
+    'preparing': re.compile(r'prepare|loading|caching|Building', re.IGNORECASE),
+    'training_start': re.compile(r'running training|学習開始'),
+}
+
+
+def _legacy_parse(state, line):
+    patterns = LEGACY_PATTERNS
+    if patterns['preparing'].search(line):
+        if state['phase'] == 'initializing':
+            state['phase'] = 'preparing'
+    elif patterns['training_start'].search(line):
+        state['phase'] = 'training'
+    elif patterns['saving'].search(line):
+        state['phase'] = 'saving'
+    elif patterns['completed'].search(line):
+        state['phase'] = 'completed'
+    for key in ('total_steps', 'total_epochs'):
+        match = patterns[key].search(line)
+        if match:
+            state[key] = int(match.group(1))
+    match = patterns['current_epoch'].search(line)
+    if match:
+        state['current_epoch'] = int(match.group(2))
+    match = patterns['learning_rate'].search(line)
+    if match:
+        state['learning_rate'] = float(match.group(1))
+    match = patterns['progress'].search(line)
+    if match:
+        state['current_step'] = int(match.group(2))
+        if not state['total_steps']:
+            state['total_steps'] = int(match.group(3))
+        if match.group(5):
+            state['average_loss'] = float(match.group(5))
+
+
+def _recorded_log(presets):
+    for log_path in sorted(LOG_DIR.glob("*.log"), key=lambda path: -path.stat().st_size):
+        header = log_path.read_text(encoding='utf-8', errors='replace')[:1000]
+        if any(f"# Preset: {preset}\n" in header for preset in presets):
+            return log_path
+    pytest.skip(f"no recorded {'/'.join(presets)} training log")
+
+
+def test_parses_typed_events():
+    bar = "steps:  20%|██        | 6/30 [00:18<01:13,  3.07s/it, avr_loss=0.565, lr=0.0001]"
+    assert parse_events(bar) == [StepEvent(6, 30, round(1 / 3.07, 4), 3.07, 0.565, 0.0001)]
+    assert parse_events("steps: 5/10 [00:02, 2.50it/s]") == [StepEvent(5, 10, 2.5, 0.4)]
+    assert parse_events("epoch 2/10") == [EpochEvent(2, 10)]
+    assert parse_events("INFO epoch is incremented. current_epoch: 0, epoch: 1") == [EpochEvent(1)]
+    assert parse_events("  total optimization steps / 学習ステップ数: 30") == [PlanEvent(total_steps=30)]
+    assert parse_events("  num epochs / epoch数: 2") == [PlanEvent(total_epochs=2)]
+    assert parse_events("use Adafactor optimizer | LR 1e-4") == [LearningRateEvent(0.0001)]
+    assert parse_events("LR -") == []
+    assert parse_events("running training / 学習開始") == [PhaseEvent('training')]
+    assert parse_events("saving checkpoint: out/model.safetensors") == [PhaseEvent('saving')]
+    assert parse_events("import network module: networks.lora_flux") == []
+
+    fields = events_to_fields(parse_events(bar + "\repoch 1/2"))
+    assert fields == {'step': 6, 'total_steps': 30, 'it_per_sec': 0.3257, 'loss': 0.565,
+                      'lr': 0.0001, 'epoch': 1, 'total_epochs': 2}
+    assert events_to_fields(parse_events("running training")) is None
+
+
+def test_one_phase_per_line_by_priority():
+    # Matches both "loading" and "saving checkpoint:"; the old elif chain picked preparing
+    line = "loading state before saving checkpoint: x"
+    assert parse_events(line) == [PhaseEvent('preparing')]
+
+    monitor = MinimalProgressMonitor(quiet=True)
+    monitor.parse_line("running training / 学習開始")
+    monitor.parse_line("loading VAE from checkpoint")
+    assert monitor.state.phase == 'training'
+
+
+@pytest.mark.parametrize('presets', [('FluxLORA', 'FL1'), ('SX1',)], ids=['flux', 'sdxl'])
+def test_monitor_matches_legacy_parser_on_recorded_logs(presets):
+    log_path = _recorded_log(presets)
+    text = log_path.read_text(encoding='utf-8', errors='replace')
+    lines = [line for line in re.split(r'\r\n|\r|\n', text) if line.strip()]
+
+    legacy = {'phase': 'initializing', 'total_steps': None, 'total_epochs': None,
+              'current_epoch': 0, 'current_step': 0, 'average_loss': None, 'learning_rate': None}
+    monitor = MinimalProgressMonitor(quiet=True)
+    steps = 0
+    for line in lines:
+        _legacy_parse(legacy, line)
+        monitor.parse_line(line)
+        state = monitor.state
+        assert {key: getattr(state, key) for key in legacy} == legacy, line
+        steps += 'steps:' in line
+    assert steps and legacy['current_step'] > 0
@@ -0,0 +1,124 @@
+"""Offline tests for the incremental Google Sheets sync."""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from src.sheets_sync.fake_service import FakeSheetsService
+from src.sheets_sync.incremental import (
+    IncrementalSheetsSync, SyncState, default_sheet_specs, EXECUTION_HEADERS
+)
+
+BASE_TIME = datetime(2025, 8, 1, 12, 0, 0)
+
+
+def make_execution(job_id, minutes=0, status='pending'):
+    stamp = BASE_TIME + timedelta(minutes=minutes)
+    return SimpleNamespace(
+        job_id=job_id, status=status, pipeline_mode='single', dataset_name='ds',
+        preset='FluxLORA', total_steps=100, start_time=stamp, end_time=None,
+        duration_seconds=None, success=False, error_message=None, output_path=None,
+        created_at=stamp, updated_at=stamp
+    )
+
+
+class FakeDB:
+    """Tiny records store answering `updated_at >= since` queries."""
+
+    def __init__(self):
+        self.executions = {}
+
+    def fetch(self, since):
+        rows = [e for e in self.executions.values()
+                if since is None or e.updated_at >= since]
+        return {'executions': rows, 'variations': []}
+
+
+def make_syncer(tmp_path, service):
+    return IncrementalSheetsSync(service, 'sheet-id', default_sheet_specs({}),
+                                 tmp_path / 'state.json')
+
+
+def test_first_sync_rebuilds_and_persists_state(tmp_path):
+    service = FakeSheetsService()
+    db = FakeDB()
+    for i, job_id in enumerate(['a1', 'b2', 'c3']):
+        db.executions[job_id] = make_execution(job_id, minutes=i)
+
+    summary = make_syncer(tmp_path, service).sync(db.fetch)
+
+    assert summary['mode'] == 'full'
+    assert service.sheets['Executions'][0] == EXECUTION_HEADERS
+    assert [row[0] for row in service.sheets['Executions'][1:]] == ['a1', 'b2', 'c3']
+    state = SyncState.load(tmp_path / 'state.json')
+    assert state.sheets['executions'].rows == {'a1': 2, 'b2': 3, 'c3': 4}
+    assert state.watermark == (BASE_TIME + timedelta(minutes=2)).isoformat()
+
+
+def test_incremental_cycle_updates_changed_and_appends_new_in_one_call(tmp_path):
+    service = FakeSheetsService()
+    db = FakeDB()
+    for i, job_id in enumerate(['a1', 'b2', 'c3']):
+        db.executions[job_id] = make_execution(job_id, minutes=i)
+    syncer = make_syncer(tmp_path, service)
+    syncer.sync(db.fetch)
+    service.reset_calls()
+
+    changed = db.executions['b2']
+    changed.status = 'training'
+    changed.updated_at = BASE_TIME + timedelta(minutes=10)
+    db.executions['d4'] = make_execution('d4', minutes=11)
+
+    summary = syncer.sync(db.fetch)
+
+    assert summary == {
+        'mode': 'incremental', 'rows_written': 2, 'appended': 1, 'updated': 1,
+        'synced': {'executions': 2, 'variations': 0}
+    }
+    assert service.call_names() == ['values.batchUpdate']
+    rows = service.sheets['Executions']
+    assert rows[2][0] == 'b2' and rows[2][1] == 'training'
+    assert rows[4][0] == 'd4'
+
+
+def test_unchanged_records_at_watermark_are_not_rewritten(tmp_path):
+    service = FakeSheetsService()
+    db = FakeDB()
+    db.executions['a1'] = make_execution('a1')
+    syncer = make_syncer(tmp_path, service)
+    syncer.sync(db.fetch)
+    service.reset_calls()
+
+    summary = syncer.sync(db.fetch)
+
+    assert summary['rows_written'] == 0
+    assert service.call_names() == []
+
+
+def test_tampered_sheet_triggers_full_rebuild_in_new_process(tmp_path):
+    service = FakeSheetsService()
+    db = FakeDB()
+    for i, job_id in enumerate(['a1', 'b2']):
+        db.executions[job_id] = make_execution(job_id, minutes=i)
+    make_syncer(tmp_path, service).sync(db.fetch)
+
+    # Someone sorted the sheet by hand
+    rows = service.sheets['Executions']
+    rows[1], rows[2] = rows[2], rows[1]
+
+    summary = make_syncer(tmp_path, service).sync(db.fetch)
+
+    assert summary['mode'] == 'full'
+    assert [row[0] for row in service.sheets['Executions'][1:]] == ['a1', 'b2']
+
+
+def test_valid_state_is_verified_once_per_process(tmp_path):
+    service = FakeSheetsService()
+    db = FakeDB()
+    db.executions['a1'] = make_execution('a1')
+    make_syncer(tmp_path, service).sync(db.fetch)
+
+    syncer = make_syncer(tmp_path, service)
+    service.reset_calls()
+    assert syncer.sync(db.fetch)['mode'] == 'incremental'
+    assert syncer.sync(db.fetch)['mode'] == 'incremental'
+    assert service.call_names().count('values.batchGet') == 1
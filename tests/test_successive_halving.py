@@ -0,0 +1,109 @@
+"""Tests for successive-halving variations search, using a fake trainer that writes loss logs."""
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+import toml
+
+# src.training -> src.scripts -> src.pipeline is circular unless src.pipeline loads first
+import src.pipeline  # noqa: F401
+from src.training import scheduler as scheduler_module
+from src.training import successive_halving
+from src.training.scheduler import Device, DeviceInventory, Requirement, TrainingScheduler, TrainingTask
+from src.training.successive_halving import (
+    SuccessiveHalvingSearch, build_schedule, parse_loss_values, score_losses
+)
+
+# Final loss each variation converges to; lower ranks better
+FINAL_LOSS = {'v1': 0.30, 'v2': 0.10, 'v3': 0.20, 'v4': 0.50, 'v5': 0.40,
+              'v6': 0.60, 'v7': 0.70, 'v8': 0.80, 'v9': 0.90}
+
+
+class FakeTracker:
+    def __init__(self):
+        self.updates = []
+
+    def update_status(self, job_id, status, error_message=None):
+        self.updates.append((job_id, status.value))
+        return True
+
+
+@pytest.fixture
+def tracker(monkeypatch):
+    fake = FakeTracker()
+    monkeypatch.setattr(scheduler_module, 'get_tracker', lambda: fake)
+    monkeypatch.setattr(successive_halving, 'get_tracker', lambda: fake)
+    return fake
+
+
+def _trainer_factory(base_path, runs):
+    class LogTrainer:
+        """Writes an sd-scripts style log whose loss depends on the variation."""
+
+        def execute_training(self, toml_path, preset_info, dataset_name, job_id=None, **kwargs):
+            config = toml.load(toml_path)
+            runs.append((dataset_name, config['max_train_epochs'], config.get('resume')))
+            log_dir = Path(base_path, "logs", "train_log")
+            log_dir.mkdir(parents=True, exist_ok=True)
+            lines = [f"steps: {step * 10}%|##| {step}/10 [00:01<00:01, 2.00it/s, avr_loss={loss:.3f}]\n"
+                     for step, loss in enumerate([1.0, 0.6, FINAL_LOSS[dataset_name]], 1)]
+            (log_dir / f"train_{dataset_name}_{len(runs)}_{job_id}.log").write_text("".join(lines))
+            return True
+    return LogTrainer
+
+
+def test_build_schedule():
+    rungs = build_schedule(9, max_budget=9, eta=3)
+    assert [(rung.budget, rung.candidates) for rung in rungs] == [(1, 9), (3, 3), (9, 1)]
+    # A budget of one epoch cannot be split: plain grid search
+    assert [(rung.budget, rung.candidates) for rung in build_schedule(9, max_budget=1)] == [(1, 9)]
+    # Fewer candidates than the budget allows limits the number of rungs
+    assert [(rung.budget, rung.candidates) for rung in build_schedule(3, max_budget=27)] == [(9, 3), (27, 1)]
+
+
+def test_loss_parsing_and_scores(tmp_path):
+    log = tmp_path / "train.log"
+    log.write_text("# header\nepoch 1/2\n"
+                   "steps:  50%|#####| 5/10 [00:05<00:05, 1.00it/s, avr_loss=0.4]\n"
+                   "steps: 100%|##########| 10/10 [00:10<00:00, 1.00it/s, avr_loss=0.2]\n")
+    losses = parse_loss_values(log)
+    assert losses == [0.4, 0.2]
+    assert score_losses(losses, 'final') == 0.2
+    assert score_losses(losses, 'smoothed') == pytest.approx(0.38)
+    assert score_losses([], 'final') is None
+
+
+def test_search_prunes_losers_and_records_schedule(tmp_path, tracker):
+    preset = SimpleNamespace(name='FluxLORA', is_lora=True)
+    tasks = []
+    for name in FINAL_LOSS:
+        path = tmp_path / f"{name}.toml"
+        path.write_text(toml.dumps({'max_train_epochs': 9, 'output_dir': str(tmp_path / name),
+                                    'output_name': name, 'job_id': f"job-{name}"}))
+        tasks.append(TrainingTask(key=name, toml_path=path, preset_info=preset, dataset_name=name,
+                                  job_id=f"job-{name}", mode="variations", requirement=Requirement.SLOT))
+    experiment = tmp_path / "experiment.json"
+    experiment.write_text(json.dumps({'variation_id': 'abc'}))
+
+    runs, completed = [], []
+    search = SuccessiveHalvingSearch(
+        lambda: TrainingScheduler(_trainer_factory(tmp_path, runs), DeviceInventory([Device('0', slots=3)])),
+        tmp_path, eta=3, metric='final')
+    results = search.run(tasks, on_complete=lambda task, success: completed.append(task.key),
+                         experiment_path=experiment)
+
+    assert results['v2'] is True
+    assert sorted(key for key, result in results.items() if result is None) == [
+        key for key in FINAL_LOSS if key != 'v2']
+    # 9 short runs, the best 3 for longer, then the winner to the full budget
+    assert sorted(epochs for _, epochs, _ in runs) == [1] * 9 + [3] * 3 + [9]
+    assert ('v2', 9, str(tmp_path / 'v2' / 'v2-state')) in runs
+    assert completed == ['v2']
+    assert sum(1 for _, status in tracker.updates if status == 'pruned') == 8
+
+    search_record = json.loads(experiment.read_text())['search']
+    assert search_record['budget_key'] == 'max_train_epochs'
+    assert [rung['promoted'] for rung in search_record['rungs']] == [['v2', 'v3', 'v1'], ['v2'], ['v2']]
+    assert json.loads(experiment.read_text())['variation_id'] == 'abc'
@@ -0,0 +1,55 @@
+"""Tests for the thumbnail cache."""
+
+import os
+
+import pytest
+from PIL import Image
+
+from src.utils.thumbnails import ThumbnailService, _render_thumbnail
+
+
+def test_thumbnails_are_cached_by_source_version(tmp_path):
+    source = tmp_path / 'image.jpg'
+    Image.new('RGB', (2000, 1000), 'red').save(source)
+    service = ThumbnailService(tmp_path / 'cache', max_workers=1)
+
+    try:
+        path, etag = service.get_thumbnail(source, size=300)
+        with Image.open(path) as thumb:
+            assert thumb.size == (256, 128)
+        assert service.prewarm([source], sizes=(256,)) == 0
+
+        # A rewritten source gets a new key, so stale thumbnails are never served
+        Image.new('RGB', (1000, 1000), 'blue').save(source)
+        os.utime(source, ns=(0, 10**9))
+        new_path, new_etag = service.get_thumbnail(source, size=256)
+        assert new_etag != etag
+        with Image.open(new_path) as thumb:
+            assert thumb.size == (256, 256)
+    finally:
+        service.shutdown()
+
+
+def test_failed_render_leaves_no_temp_file(tmp_path):
+    source = tmp_path / 'image.jpg'
+    Image.new('RGB', (64, 64), 'red').save(source)
+    # A directory at the destination makes the final rename fail
+    destination = tmp_path / 'thumb.webp'
+    destination.mkdir()
+
+    with pytest.raises(OSError):
+        _render_thumbnail(str(source), str(destination), 128, 'webp')
+    assert list(tmp_path.glob('*.tmp')) == []
+
+
+def test_prewarm_without_wait_returns_immediately(tmp_path):
+    source = tmp_path / 'image.jpg'
+    Image.new('RGB', (512, 512), 'green').save(source)
+    service = ThumbnailService(tmp_path / 'cache', max_workers=1)
+
+    try:
+        assert service.prewarm([source], sizes=(128,), wait=False) == 1
+        path, _ = service.get_thumbnail(source, size=128)
+        assert path.exists()
+    finally:
+        service.shutdown()
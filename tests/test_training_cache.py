@@ -0,0 +1,50 @@
+"""Tests for the shared latents / text encoder outputs cache eviction and stats."""
+
+import os
+import time
+
+from src.utils.training_cache import TrainingCache
+
+
+def _entry(cache_dir, kind, name, size, age_seconds):
+    path = cache_dir / kind / name[:2] / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    used = time.time() - age_seconds
+    os.utime(path, (used, used))
+    return path
+
+
+def test_evicts_least_recently_used_until_within_bound(tmp_path):
+    oldest = _entry(tmp_path, 'latents', 'aa01_1024x1024_flux.npz', 400, age_seconds=9000)
+    older = _entry(tmp_path, 'text_encoder', 'bb02_flux_te.npz', 400, age_seconds=8000)
+    recent = _entry(tmp_path, 'latents', 'cc03_1024x1024_flux.npz', 400, age_seconds=7200)
+    stale_temp = _entry(tmp_path, 'latents', 'dd04_1024x1024_flux.123.tmp.npz', 50, age_seconds=7 * 3600)
+
+    result = TrainingCache(tmp_path, max_bytes=500, min_idle_seconds=3600).evict()
+
+    assert result == {'removed': 2, 'freed_bytes': 850}
+    assert not oldest.exists() and not older.exists() and not stale_temp.exists()
+    assert recent.exists()
+
+
+def test_entries_in_recent_use_are_kept(tmp_path):
+    in_use = _entry(tmp_path, 'latents', 'aa01_1024x1024_flux.npz', 400, age_seconds=10)
+
+    result = TrainingCache(tmp_path, max_bytes=100, min_idle_seconds=3600).evict()
+
+    assert result['removed'] == 0 and in_use.exists()
+
+
+def test_stats_per_kind(tmp_path):
+    _entry(tmp_path, 'latents', 'aa01_1024x1024_flux.npz', 300, age_seconds=120)
+    _entry(tmp_path, 'latents', 'ab02_0768x1024_flux.npz', 200, age_seconds=60)
+    _entry(tmp_path, 'text_encoder', 'bb01_flux_te.npz', 100, age_seconds=30)
+
+    stats = TrainingCache(tmp_path, max_bytes=1000).get_stats()
+
+    assert stats['entries'] == 3 and stats['bytes'] == 600
+    assert stats['kinds']['latents']['entries'] == 2
+    assert stats['kinds']['latents']['bytes'] == 500
+    assert 55 <= stats['kinds']['latents']['newest_use_seconds'] <= stats['kinds']['latents']['oldest_use_seconds']
+    assert stats['kinds']['text_encoder']['bytes'] == 100
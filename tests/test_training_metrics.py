@@ -0,0 +1,56 @@
+"""Tests for the training metrics writer and series downsampling."""
+
+import math
+
+from sqlalchemy import create_engine, text
+
+from src.database.dialects import SQLiteDialect
+from src.database.metrics_writer import TrainingMetricsWriter
+from src.database.models_v2 import Base
+from src.utils.downsampling import downsample
+
+
+def _curve(n):
+    points = [(step, math.exp(-step / 2000) + 0.01 * math.sin(step)) for step in range(1, n + 1)]
+    points[n // 2] = (points[n // 2][0], 5.0)  # loss spike
+    return points
+
+
+def test_downsampling_keeps_endpoints_and_spikes():
+    points = _curve(100_000)
+
+    for method in ('lttb', 'minmax'):
+        sampled = downsample(points, 500, method)
+        assert len(sampled) <= 500
+        assert sampled[0] == points[0] and sampled[-1] == points[-1]
+        assert [x for x, _ in sampled] == sorted({x for x, _ in sampled})
+        assert max(y for _, y in sampled) == 5.0
+
+    short = points[:20]
+    assert downsample(short, 500) == short
+
+
+def test_writer_batches_and_overwrites_repeated_steps(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'metrics.db'}")
+    Base.metadata.create_all(engine)
+    writer = TrainingMetricsWriter(engine, SQLiteDialect(), flush_interval=60)
+
+    for step in range(1, 101):
+        writer.add('job1', {'step': step, 'epoch': 1, 'loss': 1.0 / step, 'it_per_sec': 2.0})
+    writer.add('job1', {'step': 100, 'epoch': 2, 'loss': 0.5})
+    writer.add('job2', {'step': 1, 'loss': 0.9, 'lr': 1e-4, 'time': 1_700_000_000.0})
+    assert writer.flush() == 101
+
+    writer.add('job2', {'step': 2, 'loss': 0.8})
+    writer.close()
+
+    with engine.connect() as connection:
+        rows = connection.execute(text(
+            "SELECT job_id, COUNT(*), MAX(step) FROM training_metrics GROUP BY job_id ORDER BY job_id"
+        )).fetchall()
+        last = connection.execute(text(
+            "SELECT epoch, loss, it_per_sec FROM training_metrics WHERE job_id = 'job1' AND step = 100"
+        )).fetchone()
+    assert [tuple(row) for row in rows] == [('job1', 100, 100), ('job2', 2, 2)]
+    assert tuple(last) == (2, 0.5, None)
+    assert writer.flushes == 2 and writer.rows_written == 102
@@ -0,0 +1,112 @@
+"""Tests for the resource-aware training scheduler, using a fake trainer command."""
+
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# src.training -> src.scripts -> src.pipeline is circular unless src.pipeline loads first
+import src.pipeline  # noqa: F401
+from src.training import scheduler as scheduler_module
+from src.training.scheduler import (
+    Device, DeviceInventory, Requirement, TrainingScheduler, TrainingTask
+)
+
+
+class FakeTracker:
+    def __init__(self):
+        self.updates = []
+
+    def update_status(self, job_id, status, error_message=None):
+        self.updates.append((job_id, status.value))
+        return True
+
+
+class FakeTrainer:
+    """Runs a short subprocess instead of sd-scripts and records device usage."""
+
+    active = {}
+    peak = {}
+    lock = threading.Lock()
+
+    def execute_training(self, toml_path, preset_info, dataset_name, job_id=None,
+                         cuda_devices=None, **kwargs):
+        with self.lock:
+            self.active[cuda_devices] = self.active.get(cuda_devices, 0) + 1
+            self.peak[cuda_devices] = max(self.peak.get(cuda_devices, 0), self.active[cuda_devices])
+        try:
+            code = "import os, sys, time; time.sleep(0.2); sys.exit(os.environ.get('FAIL') == '1')"
+            env = {'FAIL': '1' if dataset_name.startswith('fail') else '0'}
+            return subprocess.run([sys.executable, '-c', code], env=env).returncode == 0
+        finally:
+            with self.lock:
+                self.active[cuda_devices] -= 1
+
+
+@pytest.fixture
+def tracker(monkeypatch):
+    fake = FakeTracker()
+    monkeypatch.setattr(scheduler_module, 'get_tracker', lambda: fake)
+    FakeTrainer.active, FakeTrainer.peak = {}, {}
+    return fake
+
+
+def _task(name, requirement):
+    preset = SimpleNamespace(name='FluxLORA', is_lora=True)
+    return TrainingTask(key=name, toml_path=Path(f"{name}.toml"), preset_info=preset,
+                        dataset_name=name, job_id=f"job-{name}", requirement=requirement)
+
+
+def test_inventory_slot_accounting():
+    inventory = DeviceInventory([Device('0', slots=2), Device('1')])
+    first = inventory.allocate(Requirement.SLOT)
+    second = inventory.allocate(Requirement.SLOT)
+    assert {first.cuda_devices, second.cuda_devices} == {'0', '1'}
+    assert inventory.allocate(Requirement.DEVICE) is None
+    assert inventory.allocate(Requirement.NODE) is None
+
+    inventory.release(second)
+    whole = inventory.allocate(Requirement.DEVICE)
+    assert whole.cuda_devices == '1'
+    inventory.release(first)
+    inventory.release(whole)
+    node = inventory.allocate(Requirement.NODE)
+    assert node.cuda_devices is None and inventory.allocate(Requirement.SLOT) is None
+
+
+def test_default_inventory_is_one_unpinned_slot():
+    allocation = DeviceInventory([]).allocate(Requirement.DEVICE)
+    assert allocation.cuda_devices is None
+
+
+def test_scheduler_respects_slots_and_tracks_jobs(tracker):
+    inventory = DeviceInventory([Device('0', slots=2), Device('1', slots=1)])
+    tasks = [_task(f"lora{i}", Requirement.SLOT) for i in range(6)]
+    completed = []
+
+    start = time.monotonic()
+    results = TrainingScheduler(FakeTrainer, inventory).run(
+        tasks, on_complete=lambda task, success: completed.append(task.key))
+    elapsed = time.monotonic() - start
+
+    assert all(results.values()) and len(results) == 6
+    assert sorted(completed) == sorted(results)
+    assert FakeTrainer.peak == {'0': 2, '1': 1}
+    # Three slots: six 0.2s jobs take about two rounds, not six
+    assert elapsed < 6 * 0.2
+    assert inventory.idle
+    assert [status for _, status in tracker.updates] == ['in_queue'] * 6
+
+
+def test_scheduler_stops_on_error(tracker):
+    inventory = DeviceInventory([Device('0')])
+    tasks = [_task("fail", Requirement.DEVICE), _task("next", Requirement.DEVICE)]
+
+    results = TrainingScheduler(FakeTrainer, inventory).run(tasks, stop_on_error=True)
+
+    assert results == {'fail': False, 'next': False}
+    assert ('job-next', 'cancelled') in tracker.updates
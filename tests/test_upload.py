@@ -0,0 +1,80 @@
+"""Tests for dataset uploads: multipart staging and the resumable chunk endpoints."""
+
+import hashlib
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.dependencies import get_pipeline_service
+from api.routes import upload
+
+
+@pytest.fixture
+def client(tmp_path):
+    app = FastAPI()
+    app.include_router(upload.router, prefix="/upload")
+    app.dependency_overrides[get_pipeline_service] = lambda: SimpleNamespace(base_path=str(tmp_path))
+    with TestClient(app) as client:
+        yield client
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def test_multipart_upload_publishes_verified_files(client, tmp_path):
+    response = client.post("/upload/dataset", data={
+        "dataset_name": "cats", "checksums": json.dumps({"1.png": _sha256(b"png")}),
+    }, files=[("files", ("1.png", b"png")), ("files", ("1.txt", b"a cat"))])
+
+    assert response.status_code == 201
+    assert response.json()["message"] == "Successfully uploaded 2 files"
+    assert (tmp_path / "workspace" / "input" / "cats" / "1.txt").read_bytes() == b"a cat"
+    assert list((tmp_path / "workspace" / ".uploads").iterdir()) == []
+
+
+def test_duplicate_file_names_are_rejected(client, tmp_path):
+    response = client.post("/upload/dataset", data={"dataset_name": "cats"}, files=[
+        ("files", ("a/1.png", b"first")), ("files", ("b/1.png", b"second")),
+    ])
+
+    assert response.status_code == 409
+    assert "1.png" in response.json()["detail"]
+    assert not (tmp_path / "workspace" / "input" / "cats").exists()
+    assert not (tmp_path / "workspace" / ".uploads").exists()
+
+
+def test_resumable_upload_resumes_at_offset_and_commits(client, tmp_path):
+    data = b"0123456789" * 100
+    url = "/upload/dataset/dogs/files/1.png"
+
+    assert client.put(url, params={"offset": 0}, content=data[:300]).json()["received"] == 300
+    # The client lost its connection: ask where to resume
+    assert client.get(url).json() == {"filename": "1.png", "received": 300}
+    stale = client.put(url, params={"offset": 0}, content=data[:300])
+    assert stale.status_code == 409 and "expected 300" in stale.json()["detail"]
+    assert client.put(url, params={"offset": 300}, content=data[300:]).json()["received"] == len(data)
+
+    response = client.post("/upload/dataset/dogs/commit",
+                           data={"checksums": json.dumps({"1.png": _sha256(data)})})
+
+    assert response.status_code == 201
+    assert (tmp_path / "workspace" / "input" / "dogs" / "1.png").read_bytes() == data
+    assert not (tmp_path / "workspace" / ".uploads" / "dogs.resumable").exists()
+    assert client.post("/upload/dataset/dogs/commit").status_code == 404
+
+
+def test_commit_rejects_checksum_mismatch_and_keeps_the_upload(client, tmp_path):
+    client.put("/upload/dataset/dogs/files/1.png", content=b"truncated")
+
+    response = client.post("/upload/dataset/dogs/commit",
+                           data={"checksums": json.dumps({"1.png": _sha256(b"truncated!")})})
+
+    assert response.status_code == 400
+    assert "1.png" in response.json()["detail"]
+    assert not (tmp_path / "workspace" / "input" / "dogs").exists()
+    # The partial file stays so the client can resume and commit again
+    assert client.get("/upload/dataset/dogs/files/1.png").json()["received"] == len(b"truncated")